@@ -6,44 +6,83 @@ from __future__ import (
 )
 
 import getopt
+import importlib
 import os
 import sys
 import logging
 
-from pcs import (
-    acl,
-    booth,
-    cluster,
-    config,
-    constraint,
-    node,
-    pcsd,
-    prop,
-    qdevice,
-    quorum,
-    resource,
-    settings,
-    status,
-    stonith,
-    usage,
-    utils,
-    alert,
-)
-
-from pcs.cli.common import completion, parse_args
+from pcs import settings
+from pcs.cli.common import completion
 
 
 logging.basicConfig()
 usefile = False
 filename = ""
+
+def _command(module_name, function_name):
+    """
+    Return a command entry point which imports the command module when run
+
+    Command modules import big parts of pcs and its dependencies, so only the
+    module of the command being run gets imported.
+    """
+    def run(argv):
+        module = importlib.import_module("pcs." + module_name)
+        return getattr(module, function_name)(argv)
+    return run
+
+def _library_command(module_name, function_name):
+    """
+    Return an entry point of a command using the library, see _command
+    """
+    def run(argv):
+        from pcs import utils
+        module = importlib.import_module("pcs." + module_name)
+        return getattr(module, function_name)(
+            utils.get_library_wrapper(),
+            argv,
+            utils.get_modificators()
+        )
+    return run
+
+def _get_completion_tree():
+    """
+    Return the completion tree from the cache, generate and cache it if needed
+
+    Generating the tree from usage takes much longer than completing a word.
+    """
+    usage_file = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "usage.py"
+    )
+    try:
+        usage_stat = os.stat(usage_file)
+        usage_fingerprint = [usage_stat.st_mtime, usage_stat.st_size]
+    except EnvironmentError:
+        usage_fingerprint = None
+    cache_key = [settings.pcs_version, usage_fingerprint]
+    cache_file_path = completion.get_tree_cache_file_path()
+
+    tree = completion.read_tree_cache(cache_file_path, cache_key)
+    if tree is None:
+        from pcs import usage
+        tree = usage.generate_completion_tree_from_usage()
+        completion.write_tree_cache(cache_file_path, cache_key, tree)
+    return tree
+
+def _print_usage():
+    # usage is big, it is not imported unless needed
+    from pcs import usage
+    usage.main()
+
 def main(argv=None):
     if completion.has_applicable_environment(os.environ):
-        print(completion.make_suggestions(
-            os.environ,
-            usage.generate_completion_tree_from_usage()
-        ))
+        print(completion.make_suggestions(os.environ, _get_completion_tree()))
         sys.exit()
 
+    # completion is done without them to be fast
+    from pcs import utils
+    from pcs.cli.common import parse_args
+
     argv = argv if argv else sys.argv[1:]
     utils.subprocess_setup()
     global filename, usefile
@@ -73,7 +112,7 @@ def main(argv=None):
         )
     except getopt.GetoptError as err:
         print(err)
-        usage.main()
+        _print_usage()
         sys.exit(1)
     argv = parse_args.filter_out_options(argv)
     for o, a in pcs_options:
@@ -90,7 +129,7 @@ def main(argv=None):
 
         if o == "-h" or o == "--help":
             if len(argv) == 0:
-                usage.main()
+                _print_usage()
                 sys.exit()
             else:
                 argv = [argv[0], "help" ] + argv[1:]
@@ -107,6 +146,7 @@ def main(argv=None):
             print(settings.pcs_version)
             sys.exit()
         elif o == "--fullhelp":
+            from pcs import usage
             usage.full_usage()
             sys.exit()
         elif o == "--wait":
@@ -127,9 +167,25 @@ def main(argv=None):
                         "a positive integer"
                     ).format(a)
                 )
+        elif o == "--max-parallel":
+            max_parallel_valid = False
+            try:
+                max_parallel = int(a)
+                if max_parallel > 0:
+                    settings.node_max_parallel = max_parallel
+                    max_parallel_valid = True
+            except ValueError:
+                pass
+            if not max_parallel_valid:
+                utils.err(
+                    (
+                        "'{0}' is not a valid --max-parallel value, use "
+                        "a positive integer"
+                    ).format(a)
+                )
 
     if len(argv) == 0:
-        usage.main()
+        _print_usage()
         sys.exit(1)
 
     # create a dummy logger
@@ -140,50 +196,26 @@ def main(argv=None):
 
     command = argv.pop(0)
     if (command == "-h" or command == "help"):
-        usage.main()
+        _print_usage()
         return
     cmd_map = {
-        "resource": resource.resource_cmd,
-        "cluster": cluster.cluster_cmd,
-        "stonith": stonith.stonith_cmd,
-        "property": prop.property_cmd,
-        "constraint": constraint.constraint_cmd,
-        "acl": lambda argv: acl.acl_cmd(
-            utils.get_library_wrapper(),
-            argv,
-            utils.get_modificators()
-        ),
-        "status": status.status_cmd,
-        "config": config.config_cmd,
-        "pcsd": pcsd.pcsd_cmd,
-        "node": lambda argv: node.node_cmd(
-            utils.get_library_wrapper(),
-            argv,
-            utils.get_modificators()
-        ),
-        "quorum": lambda argv: quorum.quorum_cmd(
-            utils.get_library_wrapper(),
-            argv,
-            utils.get_modificators()
-        ),
-        "qdevice": lambda argv: qdevice.qdevice_cmd(
-            utils.get_library_wrapper(),
-            argv,
-            utils.get_modificators()
-        ),
-        "alert": lambda args: alert.alert_cmd(
-            utils.get_library_wrapper(),
-            args,
-            utils.get_modificators()
-        ),
-        "booth": lambda argv: booth.booth_cmd(
-            utils.get_library_wrapper(),
-            argv,
-            utils.get_modificators()
-        ),
+        "resource": _command("resource", "resource_cmd"),
+        "cluster": _command("cluster", "cluster_cmd"),
+        "stonith": _command("stonith", "stonith_cmd"),
+        "property": _command("prop", "property_cmd"),
+        "constraint": _command("constraint", "constraint_cmd"),
+        "acl": _library_command("acl", "acl_cmd"),
+        "status": _command("status", "status_cmd"),
+        "config": _command("config", "config_cmd"),
+        "pcsd": _command("pcsd", "pcsd_cmd"),
+        "node": _library_command("node", "node_cmd"),
+        "quorum": _library_command("quorum", "quorum_cmd"),
+        "qdevice": _library_command("qdevice", "qdevice_cmd"),
+        "alert": _library_command("alert", "alert_cmd"),
+        "booth": _library_command("booth", "booth_cmd"),
     }
     if command not in cmd_map:
-        usage.main()
+        _print_usage()
         sys.exit(1)
     # root can run everything directly, also help can be displayed,
     # working on a local file also do not need to run under root
@@ -5,6 +5,12 @@ from __future__ import (
     unicode_literals,
 )
 
+import os
+
+from pcs import settings
+from pcs.common.json_cache import read_json_cache, write_json_cache
+
+
 def has_applicable_environment(environment):
     """
     dict environment - very likely os.environ
@@ -99,3 +105,45 @@ def _get_subcommands(suggestion_tree, previous_subcommand_list):
             return []
         subcommand_tree = subcommand_tree[subcommand]
     return sorted(list(subcommand_tree.keys()))
+
+def get_tree_cache_file_path():
+    """
+    Return the path of the completion tree cache of the user running pcs
+    """
+    if os.geteuid() == 0:
+        return settings.completion_tree_cache_file
+    return os.path.join(
+        os.path.expanduser("~/.pcs"),
+        os.path.basename(settings.completion_tree_cache_file)
+    )
+
+def read_tree_cache(cache_file_path, key):
+    """
+    Return the cached completion tree or None if not cached or outdated
+
+    string cache_file_path -- path of the cache file
+    list key -- identifies the source of the tree, e.g. the pcs version
+    """
+    cached = read_json_cache(cache_file_path)
+    try:
+        if cached["key"] == key:
+            return cached["tree"]
+    except (TypeError, KeyError):
+        pass
+    return None
+
+def write_tree_cache(cache_file_path, key, suggestion_tree):
+    """
+    Store the completion tree, fail silently as the cache is not essential
+
+    string cache_file_path -- path of the cache file
+    list key -- identifies the source of the tree, e.g. the pcs version
+    dict suggestion_tree -- {'acl': {'role': {'create': ...}}}...
+    """
+    write_json_cache(
+        cache_file_path,
+        {
+            "key": key,
+            "tree": suggestion_tree,
+        }
+    )
@@ -5,13 +5,20 @@ from __future__ import (
     unicode_literals,
 )
 
-from pcs.test.tools.pcs_unittest import TestCase
+import os.path
+import shutil
+import tempfile
+
+from pcs.test.tools.pcs_unittest import TestCase, mock
 
 from pcs.cli.common.completion import (
     _find_suggestions,
+    get_tree_cache_file_path,
     has_applicable_environment,
     make_suggestions,
+    read_tree_cache,
     _split_words,
+    write_tree_cache,
 )
 
 tree = {
@@ -164,3 +171,56 @@ class SplitWordsTest(TestCase):
             EnvironmentError,
             lambda: _split_words("pcs resource op a ", ["3", "8", "2", "1"])
         )
+
+class TreeCacheTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.tmp_dir, "cache", "tree.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_not_cached(self):
+        self.assertIsNone(read_tree_cache(self.cache_file, ["0.9"]))
+
+    def test_cached(self):
+        write_tree_cache(self.cache_file, ["0.9", [1.5, 20]], tree)
+        self.assertEqual(
+            tree, read_tree_cache(self.cache_file, ["0.9", [1.5, 20]])
+        )
+
+    def test_outdated(self):
+        write_tree_cache(self.cache_file, ["0.9", [1.5, 20]], tree)
+        self.assertIsNone(read_tree_cache(self.cache_file, ["0.9", [1.5, 21]]))
+
+    def test_broken_cache(self):
+        os.mkdir(os.path.dirname(self.cache_file))
+        with open(self.cache_file, "w") as cache:
+            cache.write("not json")
+        self.assertIsNone(read_tree_cache(self.cache_file, ["0.9"]))
+
+    def test_no_parent_dir(self):
+        cache_file = os.path.join(self.tmp_dir, "no", "cache", "tree.json")
+        write_tree_cache(cache_file, ["0.9"], tree)
+        self.assertFalse(os.path.exists(os.path.dirname(cache_file)))
+
+    @mock.patch("pcs.cli.common.completion.os.geteuid", lambda: 0)
+    def test_root_cache_file(self):
+        with mock.patch(
+            "pcs.cli.common.completion.settings.completion_tree_cache_file",
+            "/var/lib/pcs/tree.json"
+        ):
+            self.assertEqual(
+                "/var/lib/pcs/tree.json", get_tree_cache_file_path()
+            )
+
+    @mock.patch("pcs.cli.common.completion.os.geteuid", lambda: 1000)
+    def test_user_cache_file(self):
+        with mock.patch(
+            "pcs.cli.common.completion.settings.completion_tree_cache_file",
+            "/var/lib/pcs/tree.json"
+        ):
+            self.assertEqual(
+                os.path.expanduser("~/.pcs/tree.json"),
+                get_tree_cache_file_path()
+            )
@@ -13,7 +13,6 @@ import socket
 import tempfile
 import datetime
 import json
-import time
 import xml.dom.minidom
 try:
     # python2
@@ -64,6 +63,7 @@ from pcs.lib.external import (
 from pcs.lib.node import NodeAddresses
 from pcs.lib.nodes_task import check_corosync_offline_on_nodes
 import pcs.lib.pacemaker.live as lib_pacemaker
+from pcs.lib.pacemaker.wait import wait_for_condition
 from pcs.lib.tools import environment_file_to_dict
 
 def cluster_cmd(argv):
@@ -962,25 +962,49 @@ def is_node_fully_started(node_status):
         node_status["online"] and not node_status["pending"]
     )
 
-def wait_for_local_node_started(stop_at, interval):
-    try:
-        while True:
-            time.sleep(interval)
+def wait_for_local_node_started(timeout):
+    # the status is polled, skip its validation to save cpu time
+    error_list = []
+    def check():
+        try:
             node_status = lib_pacemaker.get_local_node_status(
-                utils.cmd_runner()
+                utils.cmd_runner(),
+                validate=False
             )
-            if is_node_fully_started(node_status):
-                return 0, "Started"
-            if datetime.datetime.now() > stop_at:
-                return 1, "Waiting timeout"
-    except LibraryError as e:
-        return 1, "Unable to get node status: {0}".format(
-            "\n".join([build_report_message(item) for item in e.args])
-        )
+        except LibraryError as e:
+            # The node may not be known to the cluster yet while it is
+            # starting. Other errors won't get fixed by waiting.
+            if all(
+                item.code in _LOCAL_NODE_STARTING_REPORT_CODES
+                for item in e.args
+            ):
+                error_list[:] = e.args
+                return None
+            return 1, _local_node_status_error(e.args)
+        error_list[:] = []
+        if is_node_fully_started(node_status):
+            return 0, "Started"
+        return None
+
+    result = wait_for_condition(check, timeout)
+    if result is not None:
+        return result
+    if error_list:
+        return 1, _local_node_status_error(error_list)
+    return 1, "Waiting timeout"
+
+_LOCAL_NODE_STARTING_REPORT_CODES = (
+    report_codes.NODE_NOT_FOUND,
+    report_codes.PACEMAKER_LOCAL_NODE_NAME_NOT_FOUND,
+)
+
+def _local_node_status_error(report_list):
+    return "Unable to get node status: {0}".format(
+        "\n".join([build_report_message(item) for item in report_list])
+    )
 
-def wait_for_remote_node_started(node, stop_at, interval):
-    while True:
-        time.sleep(interval)
+def wait_for_remote_node_started(node, timeout):
+    def check():
         code, output = utils.getPacemakerNodeStatus(node)
         # HTTP error, permission denied or unable to auth
         # there is no point in trying again as it won't get magically fixed
@@ -994,23 +1018,23 @@ def wait_for_remote_node_started(node, stop_at, interval):
             except (ValueError, KeyError):
                 # this won't get fixed either
                 return 1, "Unable to get node status"
-        if datetime.datetime.now() > stop_at:
-            return 1, "Waiting timeout"
+        return None
+
+    result = wait_for_condition(check, timeout)
+    return result if result is not None else (1, "Waiting timeout")
 
 def wait_for_nodes_started(node_list, timeout=None):
     timeout = 60 * 15 if timeout is None else timeout
-    interval = 2
-    stop_at = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
     print("Waiting for node(s) to start...")
     if not node_list:
-        code, output = wait_for_local_node_started(stop_at, interval)
+        code, output = wait_for_local_node_started(timeout)
         if code != 0:
             utils.err(output)
         else:
             print(output)
     else:
         node_errors = parallel_for_nodes(
-            wait_for_remote_node_started, node_list, stop_at, interval
+            wait_for_remote_node_started, node_list, timeout
         )
         if node_errors:
             utils.err("unable to verify all nodes have started")
@@ -1123,13 +1147,27 @@ def enable_cluster_all():
 def disable_cluster_all():
     disable_cluster_nodes(utils.getNodesFromCorosyncConf())
 
+def _run_on_nodes_print_in_order(action, nodes):
+    """
+    Run action on all nodes at the same time, print the results in the order
+        of nodes, return a list of errors
+    """
+    error_list = []
+    result_list = utils.map_parallel(action, nodes, quiet=True)
+    for node, (retval, output) in zip(nodes, result_list):
+        if retval == 0:
+            print(node + ": " + output.strip())
+        else:
+            error_list.append(output)
+    return error_list
+
 def enable_cluster_nodes(nodes):
-    error_list = utils.map_for_error_list(utils.enableCluster, nodes)
+    error_list = _run_on_nodes_print_in_order(utils.enableCluster, nodes)
     if len(error_list) > 0:
         utils.err("unable to enable all nodes\n" + "\n".join(error_list))
 
 def disable_cluster_nodes(nodes):
-    error_list = utils.map_for_error_list(utils.disableCluster, nodes)
+    error_list = _run_on_nodes_print_in_order(utils.disableCluster, nodes)
     if len(error_list) > 0:
         utils.err("unable to disable all nodes\n" + "\n".join(error_list))
 
@@ -1620,8 +1658,9 @@ def node_add(lib_env, node0, node1, modifiers):
 
     # Now add the new node to corosync.conf / cluster.conf
     corosync_conf = None
-    for my_node in utils.getNodesFromCorosyncConf():
-        retval, output = utils.addLocalNode(my_node, node0, node1)
+    node_list = utils.getNodesFromCorosyncConf()
+    result_list = utils.map_parallel(utils.addLocalNode, node_list, node0, node1)
+    for my_node, (retval, output) in zip(node_list, result_list):
         if retval != 0:
             utils.err(
                 "unable to add %s on %s - %s" % (node0, my_node, output.strip()),
@@ -1734,12 +1773,12 @@ def node_remove(lib_env, node0, modifiers):
         utils.process_library_reports(e.args)
 
     nodesRemoved = False
-    c_nodes = utils.getNodesFromCorosyncConf()
+    c_nodes = [
+        node for node in utils.getNodesFromCorosyncConf() if node != node0
+    ]
     destroy_cluster([node0], keep_going=("--force" in utils.pcs_options))
-    for my_node in c_nodes:
-        if my_node == node0:
-            continue
-        retval, output = utils.removeLocalNode(my_node, node0)
+    result_list = utils.map_parallel(utils.removeLocalNode, c_nodes, node0)
+    for my_node, (retval, output) in zip(c_nodes, result_list):
         if retval != 0:
             utils.err(
                 "unable to remove %s on %s - %s" % (node0,my_node,output.strip()),
@@ -2091,22 +2130,22 @@ def cluster_remote_node(argv):
             usage.cluster(["remote-node"])
             sys.exit(1)
         hostname = argv.pop(0)
-        dom = utils.get_cib_dom()
-        nvpairs = dom.getElementsByTagName("nvpair")
+        dom = utils.get_cib_snapshot()
+        nvpairs = dom.findall(".//nvpair")
         nvpairs_to_remove = []
         for nvpair in nvpairs:
-            if nvpair.getAttribute("name") == "remote-node" and nvpair.getAttribute("value") == hostname:
-                for np in nvpair.parentNode.getElementsByTagName("nvpair"):
-                    if np.getAttribute("name").startswith("remote-"):
+            if nvpair.get("name") == "remote-node" and nvpair.get("value") == hostname:
+                for np in nvpair.getparent().findall(".//nvpair"):
+                    if np.get("name", "").startswith("remote-"):
                         nvpairs_to_remove.append(np)
 
         if len(nvpairs_to_remove) == 0:
             utils.err("unable to remove: cannot find remote-node '%s'" % hostname)
 
         for nvpair in nvpairs_to_remove[:]:
-            nvpair.parentNode.removeChild(nvpair)
-        dom = constraint.remove_constraints_containing_node(dom, hostname)
-        utils.replace_cib_configuration(dom)
+            nvpair.getparent().remove(nvpair)
+        constraint.remove_constraints_containing_node(dom, hostname)
+        utils.push_cib_snapshot()
         if not utils.usefile:
             output, retval = utils.run([
                 "crm_node", "--force", "--remove", hostname
@@ -0,0 +1,111 @@
+"""
+Reuse curl handles for requests to the same host
+
+A curl handle keeps its connection open after a request (HTTP keep-alive), so
+consecutive requests to one node done by the same handle do not need to
+connect and make a TLS handshake again. Handles share DNS and TLS session
+caches, so even a new connection to a known node is cheaper.
+"""
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import threading
+
+from pcs import settings
+from pcs.common import pcs_pycurl as pycurl
+
+
+def create_curl_share():
+    """
+    Return a CurlShare sharing DNS and TLS session caches or None if pycurl
+    does not support it
+    """
+    try:
+        share = pycurl.CurlShare()
+        share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+        if hasattr(pycurl, "LOCK_DATA_SSL_SESSION"):
+            share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION)
+        return share
+    except (AttributeError, pycurl.error):
+        return None
+
+
+class CurlHandlePool(object):
+    def __init__(self, max_idle_per_host, share=None):
+        """
+        int max_idle_per_host -- how many unused handles are kept for a host
+        pycurl.CurlShare share -- shared caches set up in every handle
+        """
+        self._max_idle_per_host = max_idle_per_host
+        self._share = share
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def get_handle(self, host):
+        """
+        Return a curl handle with no options set to be used for a request to
+        the host, give it back by put_handle when the request is done
+
+        string host -- address of the host the handle is used for
+        """
+        with self._lock:
+            idle_list = self._idle.get(host)
+            handle = idle_list.pop() if idle_list else None
+        if handle is None:
+            handle = pycurl.Curl()
+            if self._share is not None:
+                handle.setopt(pycurl.SHARE, self._share)
+        else:
+            # reset keeps the open connection as well as the shared caches
+            handle.reset()
+        return handle
+
+    def put_handle(self, host, handle, reusable=True):
+        """
+        Give back a handle obtained by get_handle
+
+        string host -- address of the host the handle has been used for
+        pycurl.Curl handle -- the handle
+        bool reusable -- False if the handle should not be used anymore, e.g.
+            because its connection failed
+        """
+        if reusable:
+            with self._lock:
+                idle_list = self._idle.setdefault(host, [])
+                if len(idle_list) < self._max_idle_per_host:
+                    idle_list.append(handle)
+                    return
+        handle.close()
+
+    def clear(self):
+        """
+        Close all unused handles
+        """
+        with self._lock:
+            idle = self._idle
+            self._idle = {}
+        for idle_list in idle.values():
+            for handle in idle_list:
+                handle.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_curl_handle_pool():
+    """
+    Return the pool of curl handles shared by the whole process
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CurlHandlePool(
+                settings.node_idle_connections_per_host,
+                create_curl_share()
+            )
+        return _pool
@@ -0,0 +1,59 @@
+"""
+Json files caching data which are expensive to get, e.g. agents' metadata
+
+A cache is not essential, so its errors are ignored. This module does not
+import lxml, it is used by TAB completion which must start fast.
+"""
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import json
+import os
+import tempfile
+
+
+def read_json_cache(cache_file_path):
+    """
+    Return data stored by write_json_cache or None if they cannot be loaded
+
+    string cache_file_path -- path of the cache file
+    """
+    try:
+        with open(cache_file_path, "rb") as cache:
+            return json.loads(cache.read().decode("utf-8"))
+    except (EnvironmentError, ValueError):
+        return None
+
+def write_json_cache(cache_file_path, data):
+    """
+    Store json-serializable data atomically, fail silently as a cache is not
+        essential
+
+    Only the last directory of the path is created if it does not exist,
+    otherwise there is no place for the cache.
+
+    string cache_file_path -- path of the cache file
+    data -- json-serializable data to store
+    """
+    cache_dir = os.path.dirname(cache_file_path)
+    try:
+        if not os.path.isdir(cache_dir):
+            if not os.path.isdir(os.path.dirname(cache_dir)):
+                return
+            os.mkdir(cache_dir, 0o700)
+        # pcs may run several times at once, readers never see a partial file
+        cache_fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+        try:
+            with os.fdopen(cache_fd, "wb") as cache:
+                cache.write(json.dumps(data).encode("utf-8"))
+            os.rename(tmp_path, cache_file_path)
+        except EnvironmentError:
+            os.remove(tmp_path)
+            raise
+    except EnvironmentError:
+        pass
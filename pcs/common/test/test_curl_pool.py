@@ -0,0 +1,88 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from pcs.test.tools.pcs_unittest import TestCase, mock
+
+from pcs.common import curl_pool, pcs_pycurl as pycurl
+
+
+@mock.patch("pcs.common.curl_pool.pycurl.Curl")
+class CurlHandlePoolTest(TestCase):
+    def test_new_handle(self, mock_curl):
+        pool = curl_pool.CurlHandlePool(2)
+        self.assertIs(mock_curl.return_value, pool.get_handle("node1"))
+        mock_curl.return_value.reset.assert_not_called()
+
+    def test_reuse_handle_for_the_same_host(self, mock_curl):
+        handle = mock.Mock()
+        mock_curl.side_effect = [handle, mock.Mock()]
+        pool = curl_pool.CurlHandlePool(2)
+        pool.put_handle("node1", pool.get_handle("node1"))
+        self.assertIs(handle, pool.get_handle("node1"))
+        handle.reset.assert_called_once_with()
+        self.assertEqual(1, mock_curl.call_count)
+
+    def test_do_not_reuse_handle_for_other_host(self, mock_curl):
+        handle1 = mock.Mock()
+        handle2 = mock.Mock()
+        mock_curl.side_effect = [handle1, handle2]
+        pool = curl_pool.CurlHandlePool(2)
+        pool.put_handle("node1", pool.get_handle("node1"))
+        self.assertIs(handle2, pool.get_handle("node2"))
+
+    def test_handles_in_use_are_not_shared(self, mock_curl):
+        handle1 = mock.Mock()
+        handle2 = mock.Mock()
+        mock_curl.side_effect = [handle1, handle2]
+        pool = curl_pool.CurlHandlePool(2)
+        self.assertIs(handle1, pool.get_handle("node1"))
+        self.assertIs(handle2, pool.get_handle("node1"))
+
+    def test_close_not_reusable_handle(self, mock_curl):
+        handle = mock.Mock()
+        mock_curl.side_effect = [handle, mock.Mock()]
+        pool = curl_pool.CurlHandlePool(2)
+        pool.put_handle("node1", pool.get_handle("node1"), reusable=False)
+        handle.close.assert_called_once_with()
+        self.assertIsNot(handle, pool.get_handle("node1"))
+
+    def test_close_handles_over_limit(self, mock_curl):
+        handle_list = [mock.Mock(), mock.Mock(), mock.Mock()]
+        mock_curl.side_effect = handle_list
+        pool = curl_pool.CurlHandlePool(2)
+        for handle in [pool.get_handle("node1") for dummy in range(3)]:
+            pool.put_handle("node1", handle)
+        handle_list[0].close.assert_not_called()
+        handle_list[1].close.assert_not_called()
+        handle_list[2].close.assert_called_once_with()
+
+    def test_set_share(self, mock_curl):
+        share = mock.Mock()
+        pool = curl_pool.CurlHandlePool(2, share)
+        pool.put_handle("node1", pool.get_handle("node1"))
+        pool.get_handle("node1")
+        self.assertEqual(
+            [mock.call(pycurl.SHARE, share)],
+            mock_curl.return_value.setopt.mock_calls
+        )
+
+    def test_clear(self, mock_curl):
+        handle = mock.Mock()
+        mock_curl.side_effect = [handle, mock.Mock()]
+        pool = curl_pool.CurlHandlePool(2)
+        pool.put_handle("node1", pool.get_handle("node1"))
+        pool.clear()
+        handle.close.assert_called_once_with()
+        self.assertIsNot(handle, pool.get_handle("node1"))
+
+
+class GetCurlHandlePoolTest(TestCase):
+    def test_pool_is_shared(self):
+        self.assertIs(
+            curl_pool.get_curl_handle_pool(),
+            curl_pool.get_curl_handle_pool()
+        )
@@ -0,0 +1,45 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import os
+import shutil
+import tempfile
+
+from pcs.test.tools.pcs_unittest import TestCase, mock
+
+from pcs.common import json_cache
+
+
+class JsonCacheTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        self.cache_file = os.path.join(self.cache_dir, "data.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_not_cached(self):
+        self.assertIsNone(json_cache.read_json_cache(self.cache_file))
+
+    def test_cached(self):
+        json_cache.write_json_cache(self.cache_file, {"a": [1, "b"]})
+        self.assertEqual(
+            {"a": [1, "b"]}, json_cache.read_json_cache(self.cache_file)
+        )
+        self.assertEqual(["data.json"], os.listdir(self.cache_dir))
+
+    def test_no_parent_dir(self):
+        cache_file = os.path.join(self.tmp_dir, "no", "cache", "data.json")
+        json_cache.write_json_cache(cache_file, {})
+        self.assertFalse(os.path.exists(os.path.dirname(cache_file)))
+
+    @mock.patch("pcs.common.json_cache.os.rename")
+    def test_remove_temporary_file_on_failure(self, mock_rename):
+        mock_rename.side_effect = OSError("rename failed")
+        json_cache.write_json_cache(self.cache_file, {})
+        self.assertEqual([], os.listdir(self.cache_dir))
@@ -5,8 +5,12 @@ from __future__ import (
     unicode_literals,
 )
 
+from collections import deque
 from lxml import etree
 import threading
+import time
+
+from pcs import settings
 
 
 def simple_cache(func):
@@ -24,16 +28,98 @@ def simple_cache(func):
     return wrapper
 
 
-def run_parallel(worker, data_list):
-    thread_list = []
-    for args, kwargs in data_list:
-        thread = threading.Thread(target=worker, args=args, kwargs=kwargs)
-        thread.daemon = True
-        thread_list.append(thread)
-        thread.start()
+def run_parallel(worker, data_list, max_workers=None):
+    """
+    Run worker for each (args, kwargs) pair of data_list, used for running
+        a task on several nodes at once
+
+    If a worker raised an exception, the first one is raised again once all
+    the tasks have ended.
+
+    callable worker -- called with args and kwargs of a data_list item
+    iterable data_list -- (args, kwargs) pairs
+    int max_workers -- maximal number of tasks running at the same time,
+        settings.node_max_parallel by default
+    Return a list of results in the order of data_list.
+    """
+    result_list = run_parallel_bounded(
+        lambda item: worker(*item[0], **item[1]),
+        data_list,
+        settings.node_max_parallel if max_workers is None else max_workers
+    )
+    for dummy_finished, dummy_result, exception in result_list:
+        if exception is not None:
+            raise exception
+    return [result for dummy_finished, result, dummy in result_list]
+
+def run_parallel_bounded(worker, data_list, max_workers, timeout=None):
+    """
+    Run worker for each item of data_list with at most max_workers running at
+        once, return results in the order of data_list
+
+    A task which has not finished in timeout seconds since it started is left
+    running in the background and does not block the others any longer. When
+    the waiting is interrupted (e.g. by Ctrl-C), no more tasks are started and
+    the exception is propagated.
+
+    callable worker -- called with an item of data_list
+    iterable data_list -- items to process
+    int max_workers -- maximal number of tasks running at the same time
+    timeout -- seconds to wait for a task, None means no limit
+    Return a list of (finished, result, exception) tuples. Result and exception
+    are None if the task did not finish in time. Exception is an exception
+    raised in the task.
+    """
+    data_list = list(data_list)
+    result_list = [None] * len(data_list)
+    task_finished = threading.Condition()
+
+    def create_task(index):
+        def task():
+            try:
+                result = (True, worker(data_list[index]), None)
+            except BaseException as e:
+                # SystemExit and others must be caught as well, otherwise the
+                # task would never be considered finished
+                result = (True, None, e)
+            with task_finished:
+                # the result of a timed out task is not interesting anymore
+                if result_list[index] is None:
+                    result_list[index] = result
+                task_finished.notify()
+        return task
+
+    waiting = deque(range(len(data_list)))
+    running = {}
+    with task_finished:
+        while waiting or running:
+            while waiting and len(running) < max(1, max_workers):
+                index = waiting.popleft()
+                thread = threading.Thread(target=create_task(index))
+                thread.daemon = True
+                thread.start()
+                running[index] = time.time()
+
+            now = time.time()
+            for index, started in list(running.items()):
+                if result_list[index] is not None:
+                    del running[index]
+                elif timeout is not None and now - started >= timeout:
+                    # the task is given up, its result is dropped
+                    result_list[index] = (False, None, None)
+                    del running[index]
+            if not running:
+                continue
 
-    for thread in thread_list:
-        thread.join()
+            # wait in short steps so the main thread is able to process Ctrl-C
+            wait_seconds = 1
+            if timeout is not None:
+                wait_seconds = min(
+                    wait_seconds,
+                    max(0, min(running.values()) + timeout - now)
+                )
+            task_finished.wait(wait_seconds)
+    return result_list
 
 def format_environment_error(e):
     if e.filename:
@@ -62,11 +148,11 @@ def is_string(candidate):
 
     return any([isinstance(candidate, string) for string in string_list])
 
-def xml_fromstring(xml):
+def xml_fromstring(xml, parser=None):
     # If the xml contains encoding declaration such as:
     # <?xml version="1.0" encoding="UTF-8"?>
     # we get an exception in python3:
     # ValueError: Unicode strings with encoding declaration are not supported.
     # Please use bytes input or XML fragments without declaration.
     # So we encode the string to bytes.
-    return etree.fromstring(xml.encode("utf-8"))
+    return etree.fromstring(xml.encode("utf-8"), parser)
@@ -42,6 +42,7 @@ from pcs import (
     utils,
     alert,
 )
+from pcs.common.tools import run_parallel as tools_run_parallel
 from pcs.lib.errors import LibraryError
 from pcs.lib.commands import quorum as lib_quorum
 import pcs.cli.constraint_colocation.command as colocation_command
@@ -247,13 +248,24 @@ def config_restore(argv):
         sys.exit(exitcode)
 
 def config_restore_remote(infile_name, infile_obj):
+    # the tarball is read only once, all nodes get the same data
+    try:
+        if infile_obj:
+            infile_obj.seek(0)
+            tarball_data = infile_obj.read()
+        else:
+            with open(infile_name, "rb") as tarball_file:
+                tarball_data = tarball_file.read()
+    except EnvironmentError as e:
+        utils.err("unable to read the tarball: %s" % e)
+
     extracted = {
         "version.txt": "",
         "corosync.conf": "",
         "cluster.conf": "",
     }
     try:
-        tarball = tarfile.open(infile_name, "r|*", infile_obj)
+        tarball = tarfile.open(infile_name, "r|*", BytesIO(tarball_data))
         while True:
             # next(tarball) does not work in python2.6
             tar_member_info = tarball.next()
@@ -275,13 +287,11 @@ def config_restore_remote(infile_name, infile_obj):
     if not node_list:
         utils.err("no nodes found in the tarball")
 
-    err_msgs = []
-    for node in node_list:
+    def check_node(node):
         try:
             retval, output = utils.checkStatus(node)
             if retval != 0:
-                err_msgs.append(output)
-                continue
+                return output
             status = json.loads(output)
             if (
                 status["corosync"]
@@ -293,52 +303,68 @@ def config_restore_remote(infile_name, infile_obj):
                 # not supported by older pcsd, do not fail if not present
                 status.get("pacemaker_remote", False)
             ):
-                err_msgs.append(
+                return (
                     "Cluster is currently running on node %s. You need to stop "
                         "the cluster in order to restore the configuration."
                     % node
                 )
-                continue
         except (ValueError, NameError, LookupError):
-            err_msgs.append("unable to determine status of the node %s" % node)
-    if err_msgs:
-        for msg in err_msgs:
-            utils.err(msg, False)
-        sys.exit(1)
+            return "unable to determine status of the node %s" % node
+        return None
 
     # Temporarily disable config files syncing thread in pcsd so it will not
     # rewrite restored files. 10 minutes should be enough time to restore.
     # If node returns HTTP 404 it does not support config syncing at all.
-    for node in node_list:
+    def pause_node(node):
         retval, output = utils.pauseConfigSyncing(node, 10 * 60)
         if not (retval == 0 or "(HTTP error: 404)" in output):
-            utils.err(output)
+            return output
+        return None
 
-    if infile_obj:
-        infile_obj.seek(0)
-        tarball_data = infile_obj.read()
-    else:
-        with open(infile_name, "rb") as tarball:
-            tarball_data = tarball.read()
+    # the request data are encoded only once as well
+    restore_data = utils.format_restore_config_data(tarball_data)
 
+    for worker in (check_node, pause_node):
+        err_msgs = _config_restore_run_on_nodes(worker, node_list)
+        if err_msgs:
+            for msg in err_msgs:
+                utils.err(msg, False)
+            sys.exit(1)
+
+    # nodes are restored in parallel, their results are printed in order
     error_list = []
-    for node in node_list:
-        retval, error = utils.restoreConfig(node, tarball_data)
-        if retval != 0:
-            error_list.append(error)
+    result_list = utils.map_parallel(
+        utils.restoreConfig, node_list, restore_data
+    )
+    for node, (retval, output) in zip(node_list, result_list):
+        if retval == 0:
+            print(node + ": " + output.strip())
+        else:
+            error_list.append(output)
     if error_list:
         utils.err("unable to restore all nodes\n" + "\n".join(error_list))
 
+def _config_restore_run_on_nodes(worker, node_list):
+    """
+    Run worker for all nodes at the same time, return its error messages
+
+    callable worker -- takes a node, returns an error message or None
+    list node_list -- nodes to run the worker for
+    """
+    return [
+        error
+        for error in tools_run_parallel(
+            worker, [([node], {}) for node in node_list]
+        )
+        if error
+    ]
+
 def config_restore_local(infile_name, infile_obj):
-    if (
-        status.is_service_running("cman")
-        or
-        status.is_service_running("corosync")
-        or
-        status.is_service_running("pacemaker")
-        or
-        status.is_service_running("pacemaker_remote")
-    ):
+    service_state = utils.get_services_state(
+        utils.cmd_runner(),
+        ["cman", "corosync", "pacemaker", "pacemaker_remote"]
+    )
+    if any(state["running"] for state in service_state.values()):
         utils.err(
             "Cluster is currently running on this node. You need to stop "
                 "the cluster in order to restore the configuration."
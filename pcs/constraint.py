@@ -6,9 +6,9 @@ from __future__ import (
 )
 
 import sys
-import xml.dom.minidom
 from collections import defaultdict
-from xml.dom.minidom import parseString
+
+from lxml import etree
 
 from pcs import (
     rule as rule_utils,
@@ -166,16 +166,25 @@ def colocation_rm(argv):
     resource1 = argv[0]
     resource2 = argv[1]
 
-    for co_loc in constraintsElement.getElementsByTagName('rsc_colocation')[:]:
-        if co_loc.getAttribute("rsc") == resource1 and co_loc.getAttribute("with-rsc") == resource2:
-            constraintsElement.removeChild(co_loc)
-            elementFound = True
-        if co_loc.getAttribute("rsc") == resource2 and co_loc.getAttribute("with-rsc") == resource1:
-            constraintsElement.removeChild(co_loc)
+    for co_loc in constraintsElement.findall(".//rsc_colocation"):
+        if (
+            (
+                co_loc.get("rsc") == resource1
+                and
+                co_loc.get("with-rsc") == resource2
+            )
+            or
+            (
+                co_loc.get("rsc") == resource2
+                and
+                co_loc.get("with-rsc") == resource1
+            )
+        ):
+            co_loc.getparent().remove(co_loc)
             elementFound = True
 
     if elementFound == True:
-        utils.replace_cib_configuration(dom)
+        utils.push_cib_snapshot()
     else:
         print("No matching resources found in ordering list")
 
@@ -236,7 +245,7 @@ def colocation_add(argv):
         resource1 = argv.pop(0)
         resource2 = argv.pop(0)
 
-    cib_dom = utils.get_cib_dom()
+    cib_dom = utils.get_cib_snapshot()
     resource_valid, resource_error, correct_id \
         = utils.validate_constraint_resource(cib_dom, resource1)
     if "--autocorrect" in utils.pcs_options and correct_id:
@@ -279,16 +288,16 @@ def colocation_add(argv):
         role2 = DEFAULT_ROLE
     if role2 != "" and role1 == "":
         role1 = DEFAULT_ROLE
-    element = dom.createElement("rsc_colocation")
-    element.setAttribute("rsc",resource1)
-    element.setAttribute("with-rsc",resource2)
-    element.setAttribute("score",score)
+    element = etree.Element("rsc_colocation")
+    element.set("rsc",resource1)
+    element.set("with-rsc",resource2)
+    element.set("score",score)
     if role1 != "":
-        element.setAttribute("rsc-role", role1)
+        element.set("rsc-role", role1)
     if role2 != "":
-        element.setAttribute("with-rsc-role", role2)
+        element.set("with-rsc-role", role2)
     for nv_pair in nv_pairs:
-        element.setAttribute(nv_pair[0], nv_pair[1])
+        element.set(nv_pair[0], nv_pair[1])
     if "--force" not in utils.pcs_options:
         duplicates = colocation_find_duplicates(constraintsElement, element)
         if duplicates:
@@ -296,29 +305,29 @@ def colocation_add(argv):
                 "duplicate constraint already exists, use --force to override\n"
                 + "\n".join([
                     "  " + constraint_colocation.console_report.constraint_plain(
-                            {"options": dict(dup.attributes.items())},
+                            {"options": dict(dup.attrib)},
                             True
                         )
                     for dup in duplicates
                 ])
             )
-    constraintsElement.appendChild(element)
-    utils.replace_cib_configuration(dom)
+    constraintsElement.append(element)
+    utils.push_cib_snapshot()
 
 def colocation_find_duplicates(dom, constraint_el):
     def normalize(const_el):
         return (
-            const_el.getAttribute("rsc"),
-            const_el.getAttribute("with-rsc"),
-            const_el.getAttribute("rsc-role").capitalize() or DEFAULT_ROLE,
-            const_el.getAttribute("with-rsc-role").capitalize() or DEFAULT_ROLE,
+            const_el.get("rsc", ""),
+            const_el.get("with-rsc", ""),
+            const_el.get("rsc-role", "").capitalize() or DEFAULT_ROLE,
+            const_el.get("with-rsc-role", "").capitalize() or DEFAULT_ROLE,
         )
 
     normalized_el = normalize(constraint_el)
     return [
         other_el
-        for other_el in dom.getElementsByTagName("rsc_colocation")
-        if not other_el.getElementsByTagName("resource_set")
+        for other_el in dom.findall(".//rsc_colocation")
+        if other_el.find(".//resource_set") is None
             and constraint_el is not other_el
             and normalized_el == normalize(other_el)
     ]
@@ -332,29 +341,33 @@ def order_rm(argv):
     (dom,constraintsElement) = getCurrentConstraints()
 
     for resource in argv:
-        for ord_loc in constraintsElement.getElementsByTagName('rsc_order')[:]:
-            if ord_loc.getAttribute("first") == resource or ord_loc.getAttribute("then") == resource:
-                constraintsElement.removeChild(ord_loc)
+        for ord_loc in constraintsElement.findall(".//rsc_order"):
+            if (
+                ord_loc.get("first") == resource
+                or
+                ord_loc.get("then") == resource
+            ):
+                ord_loc.getparent().remove(ord_loc)
                 elementFound = True
 
         resource_refs_to_remove = []
-        for ord_set in constraintsElement.getElementsByTagName('resource_ref'):
-            if ord_set.getAttribute("id") == resource:
+        for ord_set in constraintsElement.findall(".//resource_ref"):
+            if ord_set.get("id") == resource:
                 resource_refs_to_remove.append(ord_set)
                 elementFound = True
 
         for res_ref in resource_refs_to_remove:
-            res_set = res_ref.parentNode
-            res_order = res_set.parentNode
+            res_set = res_ref.getparent()
+            res_order = res_set.getparent()
 
-            res_ref.parentNode.removeChild(res_ref)
-            if len(res_set.getElementsByTagName('resource_ref')) <= 0:
-                res_set.parentNode.removeChild(res_set)
-                if len(res_order.getElementsByTagName('resource_set')) <= 0:
-                    res_order.parentNode.removeChild(res_order)
+            res_set.remove(res_ref)
+            if res_set.find(".//resource_ref") is None:
+                res_order.remove(res_set)
+                if res_order.find(".//resource_set") is None:
+                    res_order.getparent().remove(res_order)
 
     if elementFound == True:
-        utils.replace_cib_configuration(dom)
+        utils.push_cib_snapshot()
     else:
         utils.err("No matching resources found in ordering list")
 
@@ -405,7 +418,7 @@ def order_add(argv,returnElementOnly=False):
     resource1 = argv.pop(0)
     resource2 = argv.pop(0)
 
-    cib_dom = utils.get_cib_dom()
+    cib_dom = utils.get_cib_snapshot()
     resource_valid, resource_error, correct_id \
         = utils.validate_constraint_resource(cib_dom, resource1)
     if "--autocorrect" in utils.pcs_options and correct_id:
@@ -479,12 +492,11 @@ def order_add(argv,returnElementOnly=False):
         order_options.append(("id", order_id))
 
     (dom,constraintsElement) = getCurrentConstraints()
-    element = dom.createElement("rsc_order")
-    element.setAttribute("first",resource1)
-    element.setAttribute("then",resource2)
+    element = etree.SubElement(constraintsElement, "rsc_order")
+    element.set("first",resource1)
+    element.set("then",resource2)
     for order_opt in order_options:
-        element.setAttribute(order_opt[0], order_opt[1])
-    constraintsElement.appendChild(element)
+        element.set(order_opt[0], order_opt[1])
     if "--force" not in utils.pcs_options:
         duplicates = order_find_duplicates(constraintsElement, element)
         if duplicates:
@@ -492,7 +504,7 @@ def order_add(argv,returnElementOnly=False):
                 "duplicate constraint already exists, use --force to override\n"
                 + "\n".join([
                     "  " + constraint_order.console_report.constraint_plain(
-                            {"options": dict(dup.attributes.items())},
+                            {"options": dict(dup.attrib)},
                             True
                         ) for dup in duplicates
                 ])
@@ -502,24 +514,24 @@ def order_add(argv,returnElementOnly=False):
     )
 
     if returnElementOnly == False:
-        utils.replace_cib_configuration(dom)
+        utils.push_cib_snapshot()
     else:
-        return element.toxml()
+        return etree.tostring(element).decode()
 
 def order_find_duplicates(dom, constraint_el):
     def normalize(constraint_el):
         return (
-            constraint_el.getAttribute("first"),
-            constraint_el.getAttribute("then"),
-            constraint_el.getAttribute("first-action").lower() or DEFAULT_ACTION,
-            constraint_el.getAttribute("then-action").lower() or DEFAULT_ACTION,
+            constraint_el.get("first", ""),
+            constraint_el.get("then", ""),
+            constraint_el.get("first-action", "").lower() or DEFAULT_ACTION,
+            constraint_el.get("then-action", "").lower() or DEFAULT_ACTION,
         )
 
     normalized_el = normalize(constraint_el)
     return [
         other_el
-        for other_el in dom.getElementsByTagName("rsc_order")
-        if not other_el.getElementsByTagName("resource_set")
+        for other_el in dom.findall(".//rsc_order")
+        if other_el.find(".//resource_set") is None
             and constraint_el is not other_el
             and normalized_el == normalize(other_el)
     ]
@@ -551,34 +563,38 @@ def location_show(argv):
     else:
         valid_noderes = []
 
-    (dummy_dom,constraintsElement) = getCurrentConstraints()
+    # nothing is going to be modified, use the cib snapshot
+    constraintsElement = (
+        utils.get_cib_snapshot_readonly().find(".//constraints")
+    )
+    if constraintsElement is None:
+        utils.err("unable to process cib")
     nodehashon = {}
     nodehashoff = {}
     rschashon = {}
     rschashoff = {}
     ruleshash = defaultdict(list)
-    all_loc_constraints = constraintsElement.getElementsByTagName('rsc_location')
+    all_loc_constraints = constraintsElement.findall(".//rsc_location")
 
     print("Location Constraints:")
     for rsc_loc in all_loc_constraints:
-        if rsc_loc.hasAttribute("rsc-pattern"):
+        if "rsc-pattern" in rsc_loc.attrib:
             lc_rsc_type = RESOURCE_TYPE_REGEXP
-            lc_rsc_value = rsc_loc.getAttribute("rsc-pattern")
+            lc_rsc_value = rsc_loc.get("rsc-pattern")
             lc_name = "Resource pattern: {0}".format(lc_rsc_value)
         else:
             lc_rsc_type = RESOURCE_TYPE_RESOURCE
-            lc_rsc_value = rsc_loc.getAttribute("rsc")
+            lc_rsc_value = rsc_loc.get("rsc", "")
             lc_name = "Resource: {0}".format(lc_rsc_value)
         lc_rsc = lc_rsc_type, lc_rsc_value, lc_name
-        lc_id = rsc_loc.getAttribute("id")
-        lc_node = rsc_loc.getAttribute("node")
-        lc_score = rsc_loc.getAttribute("score")
-        lc_role = rsc_loc.getAttribute("role")
-        lc_resource_discovery = rsc_loc.getAttribute("resource-discovery")
+        lc_id = rsc_loc.get("id", "")
+        lc_node = rsc_loc.get("node", "")
+        lc_score = rsc_loc.get("score", "")
+        lc_role = rsc_loc.get("role", "")
+        lc_resource_discovery = rsc_loc.get("resource-discovery", "")
 
-        for child in rsc_loc.childNodes:
-            if child.nodeType == child.ELEMENT_NODE and child.tagName == "rule":
-                ruleshash[lc_rsc].append(child)
+        for child in rsc_loc.findall("rule"):
+            ruleshash[lc_rsc].append(child)
 
 # NEED TO FIX FOR GROUP LOCATION CONSTRAINTS (where there are children of
 # rsc_location)
@@ -717,11 +733,15 @@ def show_location_rules(ruleshash, showDetail, noheader=False):
         if not noheader:
             print("  {0}".format(rsc[2]))
         for rule in ruleshash[rsc]:
-            constraint_id = rule.parentNode.getAttribute("id")
+            constraint_el = rule.getparent()
+            constraint_id = constraint_el.get("id", "")
             constrainthash[constraint_id].append(rule)
             constraint_options[constraint_id] = []
-            if rule.parentNode.getAttribute("resource-discovery"):
-                constraint_options[constraint_id].append("resource-discovery=%s" % rule.parentNode.getAttribute("resource-discovery"))
+            if constraint_el.get("resource-discovery"):
+                constraint_options[constraint_id].append(
+                    "resource-discovery=%s"
+                    % constraint_el.get("resource-discovery")
+                )
 
         for constraint_id in sorted(constrainthash.keys()):
             if constraint_id in constraint_options and len(constraint_options[constraint_id]) > 0:
@@ -824,7 +844,7 @@ def location_add(argv,rm=False):
     if required_version:
         dom = utils.cluster_upgrade_to_version(required_version)
     else:
-        dom = utils.get_cib_dom()
+        dom = utils.get_cib_snapshot()
 
     if rsc_type == RESOURCE_TYPE_RESOURCE:
         rsc_valid, rsc_error, correct_id = utils.validate_constraint_resource(
@@ -840,45 +860,44 @@ def location_add(argv,rm=False):
     dummy_dom, constraintsElement = getCurrentConstraints(dom)
     elementsToRemove = []
     # If the id matches, or the rsc & node match, then we replace/remove
-    for rsc_loc in constraintsElement.getElementsByTagName('rsc_location'):
+    for rsc_loc in constraintsElement.findall(".//rsc_location"):
         if (
-            rsc_loc.getAttribute("id") == constraint_id
+            rsc_loc.get("id") == constraint_id
             or
             (
-                rsc_loc.getAttribute("node") == node
+                rsc_loc.get("node") == node
                 and
                 (
                     (
                         RESOURCE_TYPE_RESOURCE == rsc_type
                         and
-                        rsc_loc.getAttribute("rsc") == rsc_value
+                        rsc_loc.get("rsc") == rsc_value
                     )
                     or
                     (
                         RESOURCE_TYPE_REGEXP == rsc_type
                         and
-                        rsc_loc.getAttribute("rsc-pattern") == rsc_value
+                        rsc_loc.get("rsc-pattern") == rsc_value
                     )
                 )
             )
         ):
             elementsToRemove.append(rsc_loc)
     for etr in elementsToRemove:
-        constraintsElement.removeChild(etr)
+        etr.getparent().remove(etr)
 
-    element = dom.createElement("rsc_location")
-    element.setAttribute("id",constraint_id)
+    element = etree.SubElement(constraintsElement, "rsc_location")
+    element.set("id",constraint_id)
     if rsc_type == RESOURCE_TYPE_RESOURCE:
-        element.setAttribute("rsc", rsc_value)
+        element.set("rsc", rsc_value)
     elif rsc_type == RESOURCE_TYPE_REGEXP:
-        element.setAttribute("rsc-pattern", rsc_value)
-    element.setAttribute("node",node)
-    element.setAttribute("score",score)
+        element.set("rsc-pattern", rsc_value)
+    element.set("node",node)
+    element.set("score",score)
     for option in options:
-        element.setAttribute(option[0], option[1])
-    constraintsElement.appendChild(element)
+        element.set(option[0], option[1])
 
-    utils.replace_cib_configuration(dom)
+    utils.push_cib_snapshot()
 
 def location_remove(argv):
     # This code was originally merged in the location_add function and was
@@ -897,16 +916,16 @@ def location_remove(argv):
     dom, constraintsElement = getCurrentConstraints()
 
     elementsToRemove = []
-    for rsc_loc in constraintsElement.getElementsByTagName('rsc_location'):
-        if constraint_id == rsc_loc.getAttribute("id"):
+    for rsc_loc in constraintsElement.findall(".//rsc_location"):
+        if constraint_id == rsc_loc.get("id"):
             elementsToRemove.append(rsc_loc)
 
     if (len(elementsToRemove) == 0):
         utils.err("resource location id: " + constraint_id + " not found.")
     for etr in elementsToRemove:
-        constraintsElement.removeChild(etr)
+        etr.getparent().remove(etr)
 
-    utils.replace_cib_configuration(dom)
+    utils.push_cib_snapshot()
 
 def location_rule(argv):
     if len(argv) < 3:
@@ -941,7 +960,7 @@ def location_rule(argv):
     if required_version:
         dom = utils.cluster_upgrade_to_version(required_version)
     else:
-        dom = utils.get_cib_dom()
+        dom = utils.get_cib_snapshot()
 
     if rsc_type == RESOURCE_TYPE_RESOURCE:
         rsc_valid, rsc_error, correct_id = utils.validate_constraint_resource(
@@ -953,14 +972,13 @@ def location_rule(argv):
             utils.err(rsc_error)
 
     cib, constraints = getCurrentConstraints(dom)
-    lc = cib.createElement("rsc_location")
+    lc = etree.SubElement(constraints, "rsc_location")
 
     # If resource-discovery is specified, we use it with the rsc_location
     # element not the rule
     if resource_discovery:
-        lc.setAttribute("resource-discovery", options.pop("resource-discovery"))
+        lc.set("resource-discovery", options.pop("resource-discovery"))
 
-    constraints.appendChild(lc)
     if options.get("constraint-id"):
         id_valid, id_error = utils.validate_xml_id(
             options["constraint-id"], 'constraint id'
@@ -972,21 +990,21 @@ def location_rule(argv):
                 "id '%s' is already in use, please specify another one"
                 % options["constraint-id"]
             )
-        lc.setAttribute("id", options["constraint-id"])
+        lc.set("id", options["constraint-id"])
         del options["constraint-id"]
     else:
-        lc.setAttribute(
+        lc.set(
             "id",
             utils.find_unique_id(dom, sanitize_id("location-" + rsc_value))
         )
     if rsc_type == RESOURCE_TYPE_RESOURCE:
-        lc.setAttribute("rsc", rsc_value)
+        lc.set("rsc", rsc_value)
     elif rsc_type == RESOURCE_TYPE_REGEXP:
-        lc.setAttribute("rsc-pattern", rsc_value)
+        lc.set("rsc-pattern", rsc_value)
 
     rule_utils.dom_rule_add(lc, options, rule_argv)
     location_rule_check_duplicates(constraints, lc)
-    utils.replace_cib_configuration(cib)
+    utils.push_cib_snapshot()
 
 def location_rule_check_duplicates(dom, constraint_el):
     if "--force" not in utils.pcs_options:
@@ -994,8 +1012,8 @@ def location_rule_check_duplicates(dom, constraint_el):
         if duplicates:
             lines = []
             for dup in duplicates:
-                lines.append("  Constraint: %s" % dup.getAttribute("id"))
-                for dup_rule in utils.dom_get_children_by_tag_name(dup, "rule"):
+                lines.append("  Constraint: %s" % dup.get("id", ""))
+                for dup_rule in dup.iterchildren("rule"):
                     lines.append(rule_utils.ExportDetailed().get_string(
                         dup_rule, True, "    "
                     ))
@@ -1006,46 +1024,40 @@ def location_rule_check_duplicates(dom, constraint_el):
 
 def location_rule_find_duplicates(dom, constraint_el):
     def normalize(constraint_el):
-        if constraint_el.hasAttribute("rsc-pattern"):
+        if "rsc-pattern" in constraint_el.attrib:
             rsc = (
                 RESOURCE_TYPE_REGEXP,
-                constraint_el.getAttribute("rsc-pattern")
+                constraint_el.get("rsc-pattern")
             )
         else:
             rsc = (
                 RESOURCE_TYPE_RESOURCE,
-                constraint_el.getAttribute("rsc")
+                constraint_el.get("rsc", "")
             )
         return (
             rsc,
             [
                 rule_utils.ExportAsExpression().get_string(rule_el, True)
-                for rule_el in constraint_el.getElementsByTagName("rule")
+                for rule_el in constraint_el.iterdescendants("rule")
             ]
         )
 
     normalized_el = normalize(constraint_el)
     return [
         other_el
-        for other_el in dom.getElementsByTagName("rsc_location")
-        if other_el.getElementsByTagName("rule")
+        for other_el in dom.iter("rsc_location")
+        if other_el.find(".//rule") is not None
             and constraint_el is not other_el
             and normalized_el == normalize(other_el)
     ]
 
 # Grabs the current constraints and returns the dom and constraint element
+# If no dom is passed, the cib snapshot is used as the dom to build changes on
 def getCurrentConstraints(passed_dom=None):
-    if passed_dom:
-        dom = passed_dom
-    else:
-        current_constraints_xml = utils.get_cib_xpath('//constraints')
-        if current_constraints_xml == "":
-            utils.err("unable to process cib")
-        # Verify current constraint doesn't already exist
-        # If it does we replace it with the new constraint
-        dom = parseString(current_constraints_xml)
-
-    constraintsElement = dom.getElementsByTagName('constraints')[0]
+    dom = utils.get_cib_snapshot() if passed_dom is None else passed_dom
+    constraintsElement = dom.find(".//constraints")
+    if constraintsElement is None:
+        utils.err("unable to process cib")
     return (dom, constraintsElement)
 
 # If returnStatus is set, then we don't error out, we just print the error
@@ -1068,33 +1080,31 @@ def constraint_rm(argv,returnStatus=False, constraintsElement=None, passed_dom=N
 
     elementFound = False
 
-    if not constraintsElement:
+    if constraintsElement is None:
         (dom, constraintsElement) = getCurrentConstraints(passed_dom)
         use_cibadmin = True
     else:
         use_cibadmin = False
 
-    for co in constraintsElement.childNodes[:]:
-        if co.nodeType != xml.dom.Node.ELEMENT_NODE:
-            continue
-        if co.getAttribute("id") == c_id:
-            constraintsElement.removeChild(co)
+    for co in list(constraintsElement.iterchildren(etree.Element)):
+        if co.get("id") == c_id:
+            constraintsElement.remove(co)
             elementFound = True
 
     if not elementFound:
-        for rule in constraintsElement.getElementsByTagName("rule")[:]:
-            if rule.getAttribute("id") == c_id:
+        for rule in constraintsElement.findall(".//rule"):
+            if rule.get("id") == c_id:
                 elementFound = True
-                parent = rule.parentNode
-                parent.removeChild(rule)
-                if len(parent.getElementsByTagName("rule")) == 0:
-                    parent.parentNode.removeChild(parent)
+                parent = rule.getparent()
+                parent.remove(rule)
+                if parent.find(".//rule") is None:
+                    parent.getparent().remove(parent)
 
     if elementFound == True:
-        if passed_dom:
+        if passed_dom is not None:
             return dom
         if use_cibadmin:
-            utils.replace_cib_configuration(dom)
+            utils.push_cib_snapshot()
         if returnStatus:
             return True
     else:
@@ -1103,7 +1113,6 @@ def constraint_rm(argv,returnStatus=False, constraintsElement=None, passed_dom=N
             return False
         sys.exit(1)
 
-
 def constraint_ref(argv):
     if len(argv) == 0:
         usage.constraint()
@@ -1120,78 +1129,102 @@ def constraint_ref(argv):
             for constraint in sorted(set_constraints):
                 print("  " + constraint)
 
-def remove_constraints_containing(resource_id,output=False,constraints_element = None, passed_dom=None):
-    constraints,set_constraints = find_constraints_containing(resource_id, passed_dom)
-    for c in constraints:
-        if output == True:
-            print("Removing Constraint - " + c)
-        if constraints_element != None:
-            constraint_rm([c], True, constraints_element, passed_dom=passed_dom)
-        else:
-            constraint_rm([c], passed_dom=passed_dom)
+def remove_constraints_containing_any(dom, resource_id_list, output=False):
+    """
+    Remove constraints referencing any of the resources and the resources from
+        constraint sets, the constraints are walked only once
 
-    if len(set_constraints) != 0:
-        (dom, constraintsElement) = getCurrentConstraints(passed_dom)
-        for c in constraintsElement.getElementsByTagName("resource_ref")[:]:
+    Removed constraints are reported in the order of resource_id_list.
+    """
+    constraints_el = dom.find(".//constraints")
+    if constraints_el is None:
+        return dom
+    rank = {}
+    for index, resource_id in enumerate(resource_id_list):
+        rank.setdefault(resource_id, index)
+    constraint_list_by_rank = [[] for dummy in resource_id_list]
+    ref_list_by_rank = [[] for dummy in resource_id_list]
+    for constraint_el in constraints_el.iterchildren(etree.Element):
+        rank_list = [
+            rank[constraint_el.get(attr)]
+            for attr in ("rsc", "first", "then", "with-rsc")
+            if constraint_el.get(attr) in rank
+        ]
+        if rank_list:
+            constraint_list_by_rank[min(rank_list)].append(constraint_el)
+            continue
+        for ref_el in constraint_el.iterfind("./resource_set/resource_ref"):
+            if ref_el.get("id") in rank:
+                ref_list_by_rank[rank[ref_el.get("id")]].append(ref_el)
+
+    for index, resource_id in enumerate(resource_id_list):
+        for constraint_el in constraint_list_by_rank[index]:
+            if output == True:
+                print("Removing Constraint - " + constraint_el.get("id"))
+            constraints_el.remove(constraint_el)
+        for ref_el in ref_list_by_rank[index]:
             # If resource id is in a set, remove it from the set, if the set
             # is empty, then we remove the set, if the parent of the set
             # is empty then we remove it
-            if c.getAttribute("id") == resource_id:
-                pn = c.parentNode
-                pn.removeChild(c)
-                if output == True:
-                    print("Removing %s from set %s" % (resource_id,pn.getAttribute("id")))
-                if pn.getElementsByTagName("resource_ref").length == 0:
-                    print("Removing set %s" % pn.getAttribute("id"))
-                    pn2 = pn.parentNode
-                    pn2.removeChild(pn)
-                    if pn2.getElementsByTagName("resource_set").length == 0:
-                        pn2.parentNode.removeChild(pn2)
-                        print("Removing constraint %s" % pn2.getAttribute("id"))
-        if passed_dom:
-            return dom
-        utils.replace_cib_configuration(dom)
+            set_el = ref_el.getparent()
+            constraint_el = set_el.getparent()
+            if constraint_el is None or constraint_el.getparent() is None:
+                # the set has been removed with another resource of it
+                continue
+            set_el.remove(ref_el)
+            if output == True:
+                print("Removing %s from set %s" % (
+                    resource_id, set_el.get("id")
+                ))
+            if set_el.find("./resource_ref") is None:
+                print("Removing set %s" % set_el.get("id"))
+                constraint_el.remove(set_el)
+                if constraint_el.find("./resource_set") is None:
+                    constraints_el.remove(constraint_el)
+                    print("Removing constraint %s" % constraint_el.get("id"))
+    return dom
 
 def find_constraints_containing(resource_id, passed_dom=None):
-    if passed_dom:
-        dom = passed_dom
-    else:
-        dom = utils.get_cib_dom()
+    cib = (
+        utils.get_cib_snapshot_readonly() if passed_dom is None
+        else passed_dom
+    )
     constraints_found = []
     set_constraints = []
 
-    resources = dom.getElementsByTagName("primitive")
-    resource_match = None
-    for res in resources:
-        if res.getAttribute("id") == resource_id:
-            resource_match = res
-            break
-
-    if resource_match:
-        if resource_match.parentNode.tagName == "master" or resource_match.parentNode.tagName == "clone":
-            constraints_found,set_constraints = find_constraints_containing(resource_match.parentNode.getAttribute("id"), dom)
+    for parent_id in cib.xpath(
+        """
+        (./descendant::primitive[@id=$id])[1]
+            /parent::*[self::clone or self::master]/@id
+        """,
+        id=resource_id
+    ):
+        constraints_found, set_constraints = find_constraints_containing(
+            str(parent_id), cib
+        )
 
-    constraints = dom.getElementsByTagName("constraints")
-    if len(constraints) == 0:
+    constraints = cib.find(".//constraints")
+    if constraints is None:
         return [],[]
-    else:
-        constraints = constraints[0]
-
-    myConstraints = constraints.getElementsByTagName("rsc_colocation")
-    myConstraints += constraints.getElementsByTagName("rsc_location")
-    myConstraints += constraints.getElementsByTagName("rsc_order")
-    myConstraints += constraints.getElementsByTagName("rsc_ticket")
-    attr_to_match = ["rsc", "first", "then", "with-rsc", "first", "then"]
-    for c in myConstraints:
-        for attr in attr_to_match:
-            if c.getAttribute(attr) == resource_id:
-                constraints_found.append(c.getAttribute("id"))
-                break
 
-    setConstraints = constraints.getElementsByTagName("resource_ref")
-    for c in setConstraints:
-        if c.getAttribute("id") == resource_id:
-            set_constraints.append(c.parentNode.parentNode.getAttribute("id"))
+    for tag in ("rsc_colocation", "rsc_location", "rsc_order", "rsc_ticket"):
+        constraints_found.extend([
+            str(constraint_id) for constraint_id in constraints.xpath(
+                """
+                ./descendant::{0}[
+                    @rsc=$id or @first=$id or @then=$id or @with-rsc=$id
+                ]/@id
+                """.format(tag),
+                id=resource_id
+            )
+        ])
+
+    set_constraints.extend([
+        str(constraint_id) for constraint_id in constraints.xpath(
+            "./descendant::resource_ref[@id=$id]/../../@id",
+            id=resource_id
+        )
+    ])
 
     # Remove duplicates
     set_constraints = list(set(set_constraints))
@@ -1200,41 +1233,37 @@ def find_constraints_containing(resource_id, passed_dom=None):
 def remove_constraints_containing_node(dom, node, output=False):
     for constraint in find_constraints_containing_node(dom, node):
         if output:
-            print("Removing Constraint - %s" % constraint.getAttribute("id"))
-        constraint.parentNode.removeChild(constraint)
+            print("Removing Constraint - %s" % constraint.get("id"))
+        constraint.getparent().remove(constraint)
     return dom
 
 def find_constraints_containing_node(dom, node):
-    return [
-        constraint
-        for constraint in dom.getElementsByTagName("rsc_location")
-            if constraint.getAttribute("node") == node
-    ]
+    return dom.xpath(".//rsc_location[@node=$node]", node=node)
 
 # Re-assign any constraints referencing a resource to its parent (a clone
 # or master)
 def constraint_resource_update(old_id, passed_dom=None):
-    dom = utils.get_cib_dom() if passed_dom is None else passed_dom
+    dom = utils.get_cib_snapshot() if passed_dom is None else passed_dom
 
     new_id = None
     clone_ms_parent = utils.dom_get_resource_clone_ms_parent(dom, old_id)
-    if clone_ms_parent:
-        new_id = clone_ms_parent.getAttribute("id")
+    if clone_ms_parent is not None:
+        new_id = clone_ms_parent.get("id")
 
     if new_id:
-        constraints = dom.getElementsByTagName("rsc_location")
-        constraints += dom.getElementsByTagName("rsc_order")
-        constraints += dom.getElementsByTagName("rsc_colocation")
+        constraints = dom.xpath(
+            "//rsc_location | //rsc_order | //rsc_colocation"
+        )
         attrs_to_update=["rsc","first","then", "with-rsc"]
         for constraint in constraints:
             for attr in attrs_to_update:
-                if constraint.getAttribute(attr) == old_id:
-                    constraint.setAttribute(attr, new_id)
+                if constraint.get(attr) == old_id:
+                    constraint.set(attr, new_id)
 
         if passed_dom is None:
-            utils.replace_cib_configuration(dom)
+            utils.push_cib_snapshot()
 
-    if passed_dom:
+    if passed_dom is not None:
         return dom
 
 def constraint_rule(argv):
@@ -1250,23 +1279,20 @@ def constraint_rule(argv):
 
     if command == "add":
         constraint_id = argv.pop(0)
-        cib = utils.get_cib_dom()
+        cib, constraints = getCurrentConstraints()
         constraint = utils.dom_get_element_with_id(
-            cib.getElementsByTagName("constraints")[0],
-            "rsc_location",
-            constraint_id
+            constraints, "rsc_location", constraint_id
         )
-        if not constraint:
+        if constraint is None:
             utils.err("Unable to find constraint: " + constraint_id)
         options, rule_argv = rule_utils.parse_argv(argv)
         rule_utils.dom_rule_add(constraint, options, rule_argv)
-        location_rule_check_duplicates(cib, constraint)
-        utils.replace_cib_configuration(cib)
+        location_rule_check_duplicates(constraints, constraint)
+        utils.push_cib_snapshot()
 
     elif command in ["remove","delete"]:
-        cib = utils.get_cib_etree()
+        cib, constraints = getCurrentConstraints()
         temp_id = argv.pop(0)
-        constraints = cib.find('.//constraints')
         loc_cons = cib.findall(str('.//rsc_location'))
 
         for loc_con in loc_cons:
@@ -1289,7 +1315,7 @@ def constraint_rule(argv):
                 break
 
         if found:
-            utils.replace_cib_configuration(cib)
+            utils.push_cib_snapshot()
         else:
             utils.err("unable to find rule with id: %s" % temp_id)
     else:
@@ -7,16 +7,16 @@ from __future__ import (
 
 from functools import partial
 
-from lxml import etree
-
 from pcs.lib import reports
 from pcs.lib.errors import LibraryError
 from pcs.lib.cib.tools import (
     etree_element_attibutes_to_dict,
     check_new_id_applicable,
+    create_subelement,
     does_id_exist,
     find_unique_id,
     find_element_by_tag_and_id,
+    remove_element,
 )
 
 
@@ -126,7 +126,7 @@ def create_role(acl_section, role_id, description=None):
     description role description
     """
     check_new_id_applicable(acl_section, "ACL role", role_id)
-    role = etree.SubElement(acl_section, TAG_ROLE, id=role_id)
+    role = create_subelement(acl_section, TAG_ROLE, id=role_id)
     if description:
         role.set("description", description)
     return role
@@ -141,12 +141,12 @@ def remove_role(acl_section, role_id, autodelete_users_groups=False):
     autodelete_users_group -- if True remove targets with no role after removing
     """
     acl_role = find_role(acl_section, role_id)
-    acl_role.getparent().remove(acl_role)
+    remove_element(acl_role)
     for role_el in acl_section.findall(".//role[@id='{0}']".format(role_id)):
         role_parent = role_el.getparent()
-        role_parent.remove(role_el)
+        remove_element(role_el)
         if autodelete_users_groups and role_parent.find(".//role") is None:
-            role_parent.getparent().remove(role_parent)
+            remove_element(role_parent)
 
 def _assign_role(acl_section, role_id, target_el):
     try:
@@ -160,7 +160,7 @@ def _assign_role(acl_section, role_id, target_el):
         return [reports.acl_role_is_already_assigned_to_target(
             role_el.get("id"), target_el.get("id")
         )]
-    etree.SubElement(target_el, "role", {"id": role_el.get("id")})
+    create_subelement(target_el, "role", {"id": role_el.get("id")})
     return []
 
 
@@ -208,9 +208,9 @@ def unassign_role(target_el, role_id, autodelete_target=False):
         raise LibraryError(reports.acl_role_is_not_assigned_to_target(
             role_id, target_el.get("id")
         ))
-    target_el.remove(assigned_role)
+    remove_element(assigned_role)
     if autodelete_target and target_el.find("./role") is None:
-        target_el.getparent().remove(target_el)
+        remove_element(target_el)
 
 
 def provide_role(acl_section, role_id):
@@ -237,7 +237,7 @@ def create_target(acl_section, target_id):
         is not None
     ):
         raise LibraryError(reports.acl_target_already_exists(target_id))
-    return etree.SubElement(acl_section, TAG_TARGET, id=target_id)
+    return create_subelement(acl_section, TAG_TARGET, id=target_id)
 
 
 def create_group(acl_section, group_id):
@@ -249,7 +249,7 @@ def create_group(acl_section, group_id):
     group_id -- id of new group
     """
     check_new_id_applicable(acl_section, "ACL group", group_id)
-    return etree.SubElement(acl_section, TAG_GROUP, id=group_id)
+    return create_subelement(acl_section, TAG_GROUP, id=group_id)
 
 
 def remove_target(acl_section, target_id):
@@ -261,7 +261,7 @@ def remove_target(acl_section, target_id):
     target_id -- id of target element to remove
     """
     target = find_target(acl_section, target_id)
-    target.getparent().remove(target)
+    remove_element(target)
 
 
 def remove_group(acl_section, group_id):
@@ -273,7 +273,7 @@ def remove_group(acl_section, group_id):
     group_id -- id of group element to remove
     """
     group = find_group(acl_section, group_id)
-    group.getparent().remove(group)
+    remove_element(group)
 
 
 def add_permissions_to_role(role_el, permission_info_list):
@@ -289,13 +289,13 @@ def add_permissions_to_role(role_el, permission_info_list):
         'id': 'reference',
     }
     for permission, scope_type, scope in permission_info_list:
-        perm = etree.SubElement(role_el, "acl_permission")
-        perm.set(
-            "id",
-            find_unique_id(
+        perm = create_subelement(
+            role_el,
+            "acl_permission",
+            id=find_unique_id(
                 role_el,
                 "{0}-{1}".format(role_el.get("id", "role"), permission)
-            )
+            ),
         )
         perm.set("kind", permission)
         perm.set(area_type_attribute_map[scope_type], scope)
@@ -309,7 +309,7 @@ def remove_permission(acl_section, permission_id):
     permission_id -- id of permission element to be removed
     """
     permission = _find(TAG_PERMISSION, acl_section, permission_id)
-    permission.getparent().remove(permission)
+    remove_element(permission)
 
 
 def get_role_list(acl_section):
@@ -418,13 +418,17 @@ def remove_permissions_referencing(tree, reference):
     tree -- etree node
     reference -- reference identifier
     """
-    xpath = './/acl_permission[@reference="{0}"]'.format(reference)
-    for permission in tree.findall(xpath):
-        permission.getparent().remove(permission)
+    remove_permissions_referencing_any(tree, [reference])
+
 
+def remove_permissions_referencing_any(tree, reference_list):
+    """
+    Removes all permission referencing any of specified references.
 
-def dom_remove_permissions_referencing(dom, reference):
-    # TODO: remove once we go fully lxml
-    for permission in dom.getElementsByTagName("acl_permission"):
-        if permission.getAttribute("reference") == reference:
-            permission.parentNode.removeChild(permission)
+    tree -- etree node
+    iterable reference_list -- reference identifiers
+    """
+    reference_set = frozenset(reference_list)
+    for permission in tree.findall(".//acl_permission[@reference]"):
+        if permission.get("reference") in reference_set:
+            remove_element(permission)
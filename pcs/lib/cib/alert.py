@@ -5,7 +5,6 @@ from __future__ import (
     unicode_literals,
 )
 
-from lxml import etree
 from functools import partial
 
 from pcs.common import report_codes
@@ -14,11 +13,13 @@ from pcs.lib.errors import ReportItemSeverity as Severities
 from pcs.lib.cib.nvpair import arrange_first_nvset, get_nvset
 from pcs.lib.cib.tools import (
     check_new_id_applicable,
+    create_subelement,
     get_sub_element,
     find_unique_id,
     get_alerts,
     validate_id_does_not_exist,
     find_element_by_tag_and_id,
+    remove_element,
 )
 
 TAG_ALERT = "alert"
@@ -94,7 +95,7 @@ def create_alert(tree, alert_id, path, description=""):
     else:
         alert_id = find_unique_id(tree, "alert")
 
-    alert = etree.SubElement(get_alerts(tree), "alert", id=alert_id, path=path)
+    alert = create_subelement(get_alerts(tree), "alert", id=alert_id, path=path)
     if description:
         alert.set("description", description)
 
@@ -128,7 +129,7 @@ def remove_alert(tree, alert_id):
     alert_id -- id of alert which should be removed
     """
     alert = find_alert(get_alerts(tree), alert_id)
-    alert.getparent().remove(alert)
+    remove_element(alert)
 
 
 def add_recipient(
@@ -162,7 +163,7 @@ def add_recipient(
     ensure_recipient_value_is_unique(
         reporter, alert, recipient_value, allow_duplicity=allow_same_value
     )
-    recipient = etree.SubElement(
+    recipient = create_subelement(
         alert, "recipient", id=recipient_id, value=recipient_value
     )
 
@@ -215,7 +216,7 @@ def remove_recipient(tree, recipient_id):
     recipient_id -- id of recipient to be removed
     """
     recipient = find_recipient(get_alerts(tree), recipient_id)
-    recipient.getparent().remove(recipient)
+    remove_element(recipient)
 
 
 def get_all_recipients(alert):
@@ -5,14 +5,12 @@ from __future__ import (
     unicode_literals,
 )
 
-
-from lxml import etree
-
 from pcs.common import report_codes
 from pcs.lib import reports
 from pcs.lib.cib import resource
 from pcs.lib.cib.constraint import resource_set
 from pcs.lib.cib.tools import (
+    create_subelement,
     export_attributes,
     find_unique_id,
     find_parent,
@@ -142,8 +140,7 @@ def check_is_without_duplication(
 def create_with_set(constraint_section, tag_name, options, resource_set_list):
     if not resource_set_list:
         raise LibraryError(reports.empty_resource_set_list())
-    element = etree.SubElement(constraint_section, tag_name)
-    element.attrib.update(options)
+    element = create_subelement(constraint_section, tag_name, options)
     for resource_set_item in resource_set_list:
         resource_set.create(element, resource_set_item)
     return element
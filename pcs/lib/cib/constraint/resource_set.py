@@ -5,10 +5,9 @@ from __future__ import (
     unicode_literals,
 )
 
-from lxml import etree
-
 from pcs.lib import reports
 from pcs.lib.cib.tools import (
+    create_subelement,
     find_unique_id,
     export_attributes,
 )
@@ -49,15 +48,15 @@ def create(parent, resource_set):
     """
     parent - lxml element for append new resource_set
     """
-    element = etree.SubElement(parent, "resource_set")
-    element.attrib.update(resource_set["options"])
-    element.attrib["id"] = find_unique_id(
+    attrib = dict(resource_set["options"])
+    attrib["id"] = find_unique_id(
         parent.getroottree(),
         "pcs_rsc_set_{0}".format("_".join(resource_set["ids"]))
     )
+    element = create_subelement(parent, "resource_set", attrib)
 
     for id in resource_set["ids"]:
-        etree.SubElement(element, "resource_ref").attrib["id"] = id
+        create_subelement(element, "resource_ref", id=id)
 
     return element
 
@@ -7,8 +7,6 @@ from __future__ import (
 
 from functools import partial
 
-from lxml import etree
-
 from pcs.lib import reports
 from pcs.lib.cib.constraint import constraint
 from pcs.lib.cib import tools
@@ -100,8 +98,7 @@ def prepare_options_plain(cib, options, ticket, resource_id):
     )
 
 def create_plain(constraint_section, options):
-    element = etree.SubElement(constraint_section, TAG_NAME)
-    element.attrib.update(options)
+    element = tools.create_subelement(constraint_section, TAG_NAME, options)
     return element
 
 def remove_plain(constraint_section, ticket_key, resource_id):
@@ -111,7 +108,7 @@ def remove_plain(constraint_section, ticket_key, resource_id):
     )
 
     for ticket_element in ticket_element_list:
-        ticket_element.getparent().remove(ticket_element)
+        tools.remove_element(ticket_element)
 
     return len(ticket_element_list) > 0
 
@@ -123,12 +120,12 @@ def remove_with_resource_set(constraint_section, ticket_key, resource_id):
 
     for ref_element in ref_element_list:
         set_element = ref_element.getparent()
-        set_element.remove(ref_element)
+        tools.remove_element(ref_element)
         if not len(set_element):
             ticket_element = set_element.getparent()
-            ticket_element.remove(set_element)
+            tools.remove_element(set_element)
             if not len(ticket_element):
-                ticket_element.getparent().remove(ticket_element)
+                tools.remove_element(ticket_element)
 
     return len(ref_element_list) > 0
 
@@ -5,8 +5,6 @@ from __future__ import (
     unicode_literals,
 )
 
-from lxml import etree
-
 from pcs.common import report_codes
 from pcs.common.fencing_topology import (
     TARGET_TYPE_NODE,
@@ -15,7 +13,11 @@ from pcs.common.fencing_topology import (
 )
 from pcs.lib import reports
 from pcs.lib.cib.stonith import is_stonith_resource
-from pcs.lib.cib.tools import find_unique_id
+from pcs.lib.cib.tools import (
+    create_subelement,
+    find_unique_id,
+    remove_element,
+)
 from pcs.lib.errors import ReportItemSeverity
 from pcs.lib.pacemaker.values import sanitize_id, validate_id
 
@@ -57,7 +59,7 @@ def remove_all_levels(topology_el):
     etree topology_el -- etree element to remove the levels from
     """
     for level_el in topology_el.findall("fencing-level"):
-        level_el.getparent().remove(level_el)
+        remove_element(level_el)
 
 def remove_levels_by_params(
     reporter, topology_el, level=None, target_type=None, target_value=None,
@@ -89,7 +91,7 @@ def remove_levels_by_params(
             level, target_type, target_value, devices
         ))
     for el in level_el_list:
-        el.getparent().remove(el)
+        remove_element(el)
 
 def remove_device_from_all_levels(topology_el, device_id):
     """
@@ -98,16 +100,26 @@ def remove_device_from_all_levels(topology_el, device_id):
     etree topology_el -- etree element with levels to remove the device from
     string device_id -- stonith device to remove
     """
+    remove_devices_from_all_levels(topology_el, [device_id])
+
+def remove_devices_from_all_levels(topology_el, device_id_list):
+    """
+    Remove specified stonith devices from all fencing levels.
+
+    etree topology_el -- etree element with levels to remove the devices from
+    iterable device_id_list -- stonith devices to remove
+    """
+    device_id_set = frozenset(device_id_list)
     for level_el in topology_el.findall("fencing-level"):
         new_devices = [
             dev
             for dev in level_el.get("devices").split(",")
-            if dev != device_id
+            if dev not in device_id_set
         ]
         if new_devices:
             level_el.set("devices", ",".join(new_devices))
         else:
-            level_el.getparent().remove(level_el)
+            remove_element(level_el)
 
 def export(topology_el):
     """
@@ -269,27 +281,24 @@ def _validate_level_target_devices_does_not_exist(
         )
 
 def _append_level_element(tree, level, target_type, target_value, devices):
-    level_el = etree.SubElement(
-        tree,
-        "fencing-level",
-        index=str(level),
-        devices=",".join(devices)
-    )
+    attrib = {
+        "index": str(level),
+        "devices": ",".join(devices),
+    }
     if target_type == TARGET_TYPE_NODE:
-        level_el.set("target", target_value)
+        attrib["target"] = target_value
         id_part = target_value
     elif target_type == TARGET_TYPE_REGEXP:
-        level_el.set("target-pattern", target_value)
+        attrib["target-pattern"] = target_value
         id_part = target_value
     elif target_type == TARGET_TYPE_ATTRIBUTE:
-        level_el.set("target-attribute", target_value[0])
-        level_el.set("target-value", target_value[1])
+        attrib["target-attribute"] = target_value[0]
+        attrib["target-value"] = target_value[1]
         id_part = target_value[0]
-    level_el.set(
-        "id",
-        find_unique_id(tree, sanitize_id("fl-{0}-{1}".format(id_part, level)))
+    attrib["id"] = find_unique_id(
+        tree, sanitize_id("fl-{0}-{1}".format(id_part, level))
     )
-    return level_el
+    return create_subelement(tree, "fencing-level", attrib)
 
 def _find_level_elements(
     tree, level=None, target_type=None, target_value=None, devices=None
@@ -5,11 +5,9 @@ from __future__ import (
     unicode_literals,
 )
 
-from lxml import etree
-
 from pcs.lib import reports
 from pcs.lib.cib.nvpair import update_nvset
-from pcs.lib.cib.tools import get_nodes, find_unique_id
+from pcs.lib.cib.tools import create_subelement, get_nodes, find_unique_id
 from pcs.lib.errors import LibraryError
 
 
@@ -32,7 +30,7 @@ def update_node_instance_attrs(cib, node_name, attrs, state_nodes=None):
     # first one found. So we just mimic this behavior here.
     attrs_el = node_el.find("./instance_attributes")
     if attrs_el is None:
-        attrs_el = etree.SubElement(
+        attrs_el = create_subelement(
             node_el,
             "instance_attributes",
             id=find_unique_id(cib, "nodes-{0}".format(node_el.get("id")))
@@ -84,7 +82,7 @@ def _create_node(tree, node_id, uname, node_type=None):
     string uname -- node name
     string node_type -- optional node type (normal, member, ping, remote)
     """
-    node = etree.SubElement(tree, "node", id=node_id, uname=uname)
+    node = create_subelement(tree, "node", id=node_id, uname=uname)
     if node_type:
         node.set("type", node_type)
     return node
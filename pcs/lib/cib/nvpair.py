@@ -5,12 +5,13 @@ from __future__ import (
     unicode_literals,
 )
 
-from lxml import etree
 from functools import partial
 
 from pcs.lib.cib.tools import (
+    create_subelement,
     get_sub_element,
     create_subelement_id,
+    remove_element,
 )
 
 def _append_new_nvpair(nvset_element, name, value):
@@ -21,7 +22,7 @@ def _append_new_nvpair(nvset_element, name, value):
     string name is name attribute of new nvpair
     string value is value attribute of new nvpair
     """
-    etree.SubElement(
+    create_subelement(
         nvset_element,
         "nvpair",
         id=create_subelement_id(nvset_element, name),
@@ -46,7 +47,7 @@ def set_nvpair_in_nvset(nvset_element, name, value):
         if value:
             nvpair.set("value", value)
         else:
-            nvset_element.remove(nvpair)
+            remove_element(nvpair)
 
 def arrange_first_nvset(tag_name, context_element, nvpair_dict):
     """
@@ -87,7 +88,7 @@ def append_new_nvset(tag_name, context_element, nvpair_dict):
     etree.Element context_element is element where new nvset will be appended
     dict nvpair_dict contains source for nvpair children
     """
-    nvset_element = etree.SubElement(context_element, tag_name, {
+    nvset_element = create_subelement(context_element, tag_name, {
         "id": create_subelement_id(context_element, tag_name)
     })
     for name, value in sorted(nvpair_dict.items()):
@@ -10,10 +10,8 @@ from __future__ import (
     unicode_literals,
 )
 
-from lxml import etree
-
 from pcs.lib.cib.nvpair import append_new_meta_attributes
-from pcs.lib.cib.tools import find_unique_id
+from pcs.lib.cib.tools import create_subelement, find_unique_id
 
 
 TAG_CLONE = "clone"
@@ -46,7 +44,7 @@ def append_new(clone_tag, resources_section, primitive_element, options):
     etree.Element primitive_element is resource which will be cloned.
     dict options is source for clone meta options
     """
-    clone_element = etree.SubElement(
+    clone_element = create_subelement(
         resources_section,
         clone_tag,
         id=create_id(clone_tag, primitive_element),
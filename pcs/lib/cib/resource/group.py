@@ -5,10 +5,11 @@ from __future__ import (
     unicode_literals,
 )
 
-from lxml import etree
-
 from pcs.lib import reports
-from pcs.lib.cib.tools import find_element_by_tag_and_id
+from pcs.lib.cib.tools import (
+    create_subelement,
+    find_element_by_tag_and_id,
+)
 from pcs.lib.errors import LibraryError
 
 
@@ -29,7 +30,7 @@ def provide_group(resources_section, group_id):
         none_if_id_unused=True
     )
     if group_element is None:
-        group_element = etree.SubElement(
+        group_element = create_subelement(
             resources_section,
             "group",
             id=group_id
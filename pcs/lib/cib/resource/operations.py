@@ -7,13 +7,11 @@ from __future__ import (
 
 from collections import defaultdict
 
-from lxml import etree
-
 from pcs.common import report_codes
 from pcs.lib import reports, validate
 from pcs.lib.resource_agent import get_default_interval, complete_all_intervals
 from pcs.lib.cib.nvpair import append_new_instance_attributes
-from pcs.lib.cib.tools import create_subelement_id
+from pcs.lib.cib.tools import create_subelement, create_subelement_id
 from pcs.lib.pacemaker.values import timeout_to_seconds
 
 OPERATION_NVPAIR_ATTRIBUTES = [
@@ -276,7 +274,7 @@ def create_operations(primitive_element, operation_list):
     list operation_list contains dictionaries with attributes of operation
     etree primitive_element is context element
     """
-    operations_element = etree.SubElement(primitive_element, "operations")
+    operations_element = create_subelement(primitive_element, "operations")
     for operation in sorted(operation_list, key=lambda op: op["name"]):
         append_new_operation(operations_element, operation)
 
@@ -297,7 +295,7 @@ def append_new_operation(operations_element, options):
             options["interval"]
         )
     })
-    op_element = etree.SubElement(
+    op_element = create_subelement(
         operations_element,
         "op",
         attribute_map,
@@ -5,8 +5,6 @@ from __future__ import (
     unicode_literals,
 )
 
-from lxml import etree
-
 from pcs.lib import reports
 from pcs.lib.cib.nvpair import (
     append_new_instance_attributes,
@@ -17,7 +15,7 @@ from pcs.lib.cib.resource.operations import(
     prepare as prepare_operations,
     create_operations,
 )
-from pcs.lib.cib.tools import does_id_exist
+from pcs.lib.cib.tools import create_subelement, does_id_exist
 from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.values import validate_id
 
@@ -119,7 +117,7 @@ def append_new(
     }
     if provider:
         attributes["provider"] = provider
-    primitive_element = etree.SubElement(
+    primitive_element = create_subelement(
         resources_section,
         "primitive",
         attributes
@@ -684,6 +684,31 @@ class RemovePermissionForReferenceTest(LibraryAclTest):
             ''')
         )
 
+    def test_remove_references_to_any(self):
+        self.cib.append_to_first_tag_name('configuration', '''
+            <acls>
+              <acl_role id="role1">
+                <acl_permission id="role1-read" kind="read" reference="dummy"/>
+                <acl_permission id="role1-read" kind="read" reference="dummy2"/>
+                <acl_permission id="role1-xpath" kind="read" xpath="/cib"/>
+              </acl_role>
+            </acls>
+        ''')
+
+        lib.remove_permissions_referencing_any(
+            self.cib.tree, ["dummy", "dummy2"]
+        )
+
+        self.assert_cib_equal(
+            self.create_cib().append_to_first_tag_name('configuration', '''
+              <acls>
+                <acl_role id="role1">
+                  <acl_permission id="role1-xpath" kind="read" xpath="/cib"/>
+                </acl_role>
+              </acls>
+            ''')
+        )
+
 
 class RemovePermissionTest(LibraryAclTest):
     def setUp(self):
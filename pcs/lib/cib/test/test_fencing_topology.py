@@ -429,6 +429,22 @@ class RemoveDeviceFromAllLevels(TestCase, CibMixin):
         assert_xml_equal(original_xml, etree_to_str(self.tree))
 
 
+class RemoveDevicesFromAllLevels(TestCase, CibMixin):
+    def test_success(self):
+        tree = self.get_cib()
+        lib.remove_devices_from_all_levels(tree, ["d1", "d3", "dX"])
+        self.assertEqual(
+            [
+                ("fl1", "d2"), ("fl3", "d2"), ("fl5", "d4"), ("fl7", "d4"),
+                ("fl8", "d5"), ("fl9", "dR"), ("fl10", "dR-special"),
+            ],
+            [
+                (level.get("id"), level.get("devices"))
+                for level in tree.findall("fencing-level")
+            ]
+        )
+
+
 class Export(TestCase, CibMixin):
     def test_empty(self):
         self.assertEqual(
@@ -5,6 +5,7 @@ from __future__ import (
     unicode_literals,
 )
 
+from copy import deepcopy
 from functools import partial
 
 from lxml import etree
@@ -106,6 +107,144 @@ class DoesIdExistTest(CibToolsTest):
         tree = etree.fromstring('<root><direct id="a"/></root>')
         self.assertTrue(lib.does_id_exist(tree, "a"))
 
+    def test_tree_changed_after_lookup(self):
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "otherId"))
+
+        primitive = self.cib.tree.find(".//primitive")
+        primitive.getparent().remove(primitive)
+        self.fixture_add_primitive_with_id("otherId")
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "myId"))
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "otherId"))
+
+        self.cib.tree.find(".//primitive").set("id", "changedId")
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "otherId"))
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "changedId"))
+
+    def test_element_moved_to_status(self):
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        self.cib.tree.find(".//status").append(
+            self.cib.tree.find(".//primitive")
+        )
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "myId"))
+
+class DoesIdExistIndexedTest(TestCase):
+    def setUp(self):
+        self.cib = etree.fromstring(
+            """
+            <cib>
+                <configuration>
+                    <resources>
+                        <primitive id="myId"/>
+                    </resources>
+                </configuration>
+                <status>
+                    <node_state id="status-1"/>
+                </status>
+            </cib>
+            """,
+            lib.create_cib_parser()
+        )
+        self.resources = self.cib.find(".//resources")
+
+    def test_existing_id(self):
+        self.assertTrue(lib.does_id_exist(self.cib, "myId"))
+        self.assertFalse(lib.does_id_exist(self.cib, "status-1"))
+
+    @mock.patch("pcs.lib.cib.tools._search_id_holder")
+    def test_answered_from_index(self, mock_search):
+        self.assertTrue(lib.does_id_exist(self.cib, "myId"))
+        self.assertFalse(lib.does_id_exist(self.cib, "otherId"))
+        self.assertEqual("myId-1", lib.find_unique_id(self.cib, "myId"))
+        mock_search.assert_not_called()
+
+    def test_no_tree_search_when_creating_ids(self):
+        lib.does_id_exist(self.cib, "myId")
+        xpath_calls = []
+        def xpath(element, *args, **kwargs):
+            xpath_calls.append(args)
+            return etree.ElementBase.xpath(element, *args, **kwargs)
+        with mock.patch.object(lib._CibRootElement, "xpath", xpath):
+            for dummy_i in range(10):
+                lib.create_subelement(
+                    self.resources,
+                    "primitive",
+                    id=lib.find_unique_id(self.cib, "foo"),
+                )
+            lib.validate_id_does_not_exist(self.cib, "bar")
+            self.assertTrue(lib.does_id_exist(self.cib, "foo-9"))
+        self.assertEqual([], xpath_calls)
+        self.assertEqual(11, len(self.resources.findall("primitive")))
+
+    def test_element_created_before_index_is_built(self):
+        lib.create_subelement(self.resources, "primitive", id="B")
+        self.assertTrue(lib.does_id_exist(self.cib, "B"))
+        self.assertEqual("B-1", lib.find_unique_id(self.cib, "B"))
+
+    def test_element_created_after_lookup(self):
+        self.assertEqual("myId-1", lib.find_unique_id(self.cib, "myId"))
+        lib.create_subelement(self.resources, "primitive", id="myId-1")
+        self.assertTrue(lib.does_id_exist(self.cib, "myId-1"))
+        self.assertEqual("myId-2", lib.find_unique_id(self.cib, "myId"))
+
+    def test_element_created_in_status(self):
+        lib.does_id_exist(self.cib, "myId")
+        lib.create_subelement(self.cib.find("status"), "node_state", id="B")
+        self.assertFalse(lib.does_id_exist(self.cib, "B"))
+
+    def test_element_removed(self):
+        self.assertTrue(lib.does_id_exist(self.cib, "myId"))
+        primitive = lib.create_subelement(self.resources, "primitive", id="B")
+        lib.create_subelement(primitive, "meta_attributes", id="B-meta")
+        self.assertTrue(lib.does_id_exist(self.cib, "B-meta"))
+        lib.remove_element(primitive)
+        self.assertFalse(lib.does_id_exist(self.cib, "B"))
+        self.assertFalse(lib.does_id_exist(self.cib, "B-meta"))
+        self.assertEqual([], self.resources.findall("primitive[@id='B']"))
+
+    def test_element_removed_or_moved(self):
+        self.assertTrue(lib.does_id_exist(self.cib, "myId"))
+        primitive = self.resources.find("primitive")
+        self.cib.find("status").append(primitive)
+        self.assertFalse(lib.does_id_exist(self.cib, "myId"))
+        self.cib.find("status").remove(primitive)
+        self.assertFalse(lib.does_id_exist(self.cib, "myId"))
+
+    def test_index_is_not_shared_with_copy(self):
+        lib.does_id_exist(self.cib, "myId")
+        cib_copy = deepcopy(self.cib)
+        lib.create_subelement(
+            cib_copy.find(".//resources"), "primitive", id="copyId"
+        )
+        self.assertTrue(lib.does_id_exist(cib_copy, "copyId"))
+        self.assertFalse(lib.does_id_exist(self.cib, "copyId"))
+
+    def test_find_element_by_tag_and_id(self):
+        lib.does_id_exist(self.cib, "myId")
+        group = lib.create_subelement(self.resources, "group", id="G")
+        primitive = lib.create_subelement(group, "primitive", id="B")
+        self.assertIs(
+            primitive,
+            lib.find_element_by_tag_and_id("primitive", group, "B")
+        )
+        self.assertIsNone(lib.find_element_by_tag_and_id(
+            "primitive", group, "C", none_if_id_unused=True
+        ))
+        assert_raise_library_error(
+            lambda: lib.find_element_by_tag_and_id("group", group, "B"),
+            (
+                severities.ERROR,
+                report_codes.ID_BELONGS_TO_UNEXPECTED_TYPE,
+                {
+                    "id": "B",
+                    "expected_types": ["group"],
+                    "current_type": "primitive",
+                },
+            ),
+        )
+
 class FindUniqueIdTest(CibToolsTest):
     def test_already_unique(self):
         self.fixture_add_primitive_with_id("myId")
@@ -464,6 +603,44 @@ class FindTagWithId(TestCase):
         self.assertEqual("group", element.tag)
         self.assertEqual("a", element.attrib["id"])
 
+    def test_returns_element_added_after_lookup(self):
+        tree = etree.fromstring(
+            '<cib><resources><group id="a"/></resources></cib>'
+        )
+        resources = tree.find(".//resources")
+        find_group(resources, "a")
+        etree.SubElement(resources, "group", id="b")
+        self.assertEqual("b", find_group(resources, "b").attrib["id"])
+
+    def test_raises_when_moved_to_another_context(self):
+        tree = etree.fromstring("""
+            <cib>
+                <resources>
+                    <group id="g1"><primitive id="a"/></group>
+                    <group id="g2"/>
+                </resources>
+            </cib>
+        """)
+        group_1 = tree.find('.//resources/group[@id="g1"]')
+        group_2 = tree.find('.//resources/group[@id="g2"]')
+        find_primitive = partial(lib.find_element_by_tag_and_id, "primitive")
+        self.assertEqual("a", find_primitive(group_1, "a").attrib["id"])
+        group_2.append(group_1.find("primitive"))
+        self.assertEqual("a", find_primitive(group_2, "a").attrib["id"])
+        assert_raise_library_error(
+            lambda: find_primitive(group_1, "a"),
+            (
+                severities.ERROR,
+                report_codes.OBJECT_WITH_ID_IN_UNEXPECTED_CONTEXT,
+                {
+                    "type": "primitive",
+                    "id": "a",
+                    "expected_context_type": "group",
+                    "expected_context_id": "g1",
+                },
+            ),
+        )
+
     def test_raises_when_is_under_another_tag(self):
         tree = etree.fromstring(
             '<cib><resources><primitive id="a"/></resources></cib>'
@@ -18,22 +18,149 @@ def get_root(tree):
     # ElementTree has getroot, Elemet has getroottree
     return tree.getroot() if hasattr(tree, "getroot") else tree.getroottree()
 
+# do not search in /cib/status, it may contain references to previously
+# existing and deleted resources and thus preventing creating them again
+_ID_HOLDERS_XPATH = (
+    '(/cib/*[name()!="status"]|/*[name()!="cib"])'
+    '//*[name()!="acl_target" and name()!="role" and @id{0}]'
+)
+_ID_IGNORED_TAGS = ("acl_target", "role")
+
+class _CibRootElement(etree.ElementBase):
+    """
+    Root element of a CIB tree holding an index of ids in the tree
+
+    The index lives as long as the root element object does. It is built on
+    the first id lookup and kept up to date by create_subelement and
+    remove_element, so elements holding ids must be added to the tree by
+    create_subelement to be known to the index.
+    """
+    # {id: list of elements holding the id}
+    id_index = None
+
+def create_cib_parser():
+    """
+    Return a parser which creates CIB trees able to hold an index of ids
+    """
+    lookup = etree.ElementNamespaceClassLookup()
+    lookup.get_namespace(None)["cib"] = _CibRootElement
+    parser = etree.XMLParser()
+    parser.set_element_class_lookup(lookup)
+    return parser
+
+def _get_root_element(tree):
+    root = get_root(tree)
+    return root.getroot() if hasattr(root, "getroot") else root
+
+def _get_id_index(root):
+    """
+    Return an index of ids in a tree or None if the tree cannot hold one
+
+    etree.Element root -- root element of the tree
+    """
+    if not isinstance(root, _CibRootElement):
+        return None
+    if root.id_index is None:
+        root.id_index = {}
+        for element in root.xpath(_ID_HOLDERS_XPATH.format("")):
+            root.id_index.setdefault(element.get("id"), []).append(element)
+    return root.id_index
+
+def _is_id_holder(root, element, element_id):
+    """
+    Check an indexed element still holds the id in the tree
+
+    An element may have been moved out of the tree or got another id since it
+    was indexed. It is O(depth of the element).
+    """
+    if (
+        element.get("id") != element_id
+        or
+        element.tag in _ID_IGNORED_TAGS
+    ):
+        return False
+    ancestors = list(element.iterancestors())
+    if not ancestors or ancestors[-1] is not root:
+        return False
+    if root.tag == "cib":
+        return len(ancestors) > 1 and ancestors[-2].tag != "status"
+    return True
+
+def _search_id_holder(root, element_id):
+    element_list = root.xpath(
+        _ID_HOLDERS_XPATH.format(" and @id=$id"), id=element_id
+    )
+    return element_list[0] if element_list else None
+
+def _get_id_holders(root, index, element_id):
+    holder_list = [
+        element for element in index.get(element_id, [])
+        if _is_id_holder(root, element, element_id)
+    ]
+    if holder_list:
+        index[element_id] = holder_list
+    else:
+        index.pop(element_id, None)
+    return holder_list
+
+def _find_id_holder(tree, element_id):
+    """
+    Return an element holding the specified id or None
+
+    Trees parsed by create_cib_parser answer from their index of ids, other
+    trees are searched on each lookup.
+    """
+    root = _get_root_element(tree)
+    index = _get_id_index(root)
+    if index is None:
+        return _search_id_holder(root, element_id)
+    holder_list = _get_id_holders(root, index, element_id)
+    return holder_list[0] if holder_list else None
+
+def create_subelement(parent, tag, attrib=None, **extra):
+    """
+    Create a new element in parent and put ids it holds to the index of ids
+
+    Works like etree.SubElement. Elements holding ids must be created by this
+    function in trees parsed by create_cib_parser, otherwise their ids are
+    reported as free.
+
+    etree.Element parent -- element where the new element will be appended
+    string tag -- tag of the new element
+    dict attrib -- attributes of the new element
+    """
+    element = etree.SubElement(parent, tag, attrib or {}, **extra)
+    root = _get_root_element(parent)
+    # an index which has not been built yet will find the element in the tree
+    index = root.id_index if isinstance(root, _CibRootElement) else None
+    if index is not None:
+        element_id = element.get("id")
+        if element_id is not None and _is_id_holder(root, element, element_id):
+            index.setdefault(element_id, []).append(element)
+    return element
+
+def remove_element(element):
+    """
+    Remove an element from its tree and drop ids it holds from the index of ids
+
+    etree.Element element -- element to remove
+    """
+    root = _get_root_element(element)
+    index = root.id_index if isinstance(root, _CibRootElement) else None
+    if index is not None:
+        for descendant in element.iter(tag=etree.Element):
+            holder_list = index.get(descendant.get("id"), [])
+            if descendant in holder_list:
+                holder_list.remove(descendant)
+    element.getparent().remove(element)
+
 def does_id_exist(tree, check_id):
     """
     Checks to see if id exists in the xml dom passed
     tree cib etree node
     check_id id to check
     """
-
-    # do not search in /cib/status, it may contain references to previously
-    # existing and deleted resources and thus preventing creating them again
-    existing = get_root(tree).xpath(
-        (
-            '(/cib/*[name()!="status"]|/*[name()!="cib"])'
-            '//*[name()!="acl_target" and name()!="role" and @id="{0}"]'
-        ).format(check_id)
-    )
-    return len(existing) > 0
+    return _find_id_holder(tree, check_id) is not None
 
 def validate_id_does_not_exist(tree, id):
     """
@@ -72,19 +199,34 @@ def find_element_by_tag_and_id(
     string id_description optional description for id
     """
     tag_list = [tag] if is_string(tag) else tag
-    element_list = context_element.xpath(
-        './/*[({0}) and @id="{1}"]'.format(
-            " or ".join(["self::{0}".format(one_tag) for one_tag in tag_list]),
-            element_id
+    root = _get_root_element(context_element)
+    index = _get_id_index(root)
+    if index is None or set(tag_list) & set(_ID_IGNORED_TAGS):
+        element_list = context_element.xpath(
+            './/*[({0}) and @id="{1}"]'.format(
+                " or ".join(
+                    ["self::{0}".format(one_tag) for one_tag in tag_list]
+                ),
+                element_id
+            )
         )
-    )
-
-    if element_list:
-        return element_list[0]
-
-    element = get_root(context_element).find(
-        './/*[@id="{0}"]'.format(element_id)
-    )
+        if element_list:
+            return element_list[0]
+        element = get_root(context_element).find(
+            './/*[@id="{0}"]'.format(element_id)
+        )
+    else:
+        context = (
+            context_element.getroot() if hasattr(context_element, "getroot")
+            else context_element
+        )
+        holder_list = _get_id_holders(root, index, element_id)
+        for element in holder_list:
+            if element.tag in tag_list and any(
+                ancestor is context for ancestor in element.iterancestors()
+            ):
+                return element
+        element = holder_list[0] if holder_list else None
 
     if element is not None:
         raise LibraryError(
@@ -206,12 +348,10 @@ def get_sub_element(element, sub_element_tag, new_id=None, new_index=None):
     """
     sub_element = element.find("./{0}".format(sub_element_tag))
     if sub_element is None:
-        sub_element = etree.Element(sub_element_tag)
-        if new_id:
-            sub_element.set("id", new_id)
-        if new_index is None:
-            element.append(sub_element)
-        else:
+        sub_element = create_subelement(
+            element, sub_element_tag, {"id": new_id} if new_id else None
+        )
+        if new_index is not None:
             element.insert(new_index, sub_element)
     return sub_element
 
@@ -8,18 +8,25 @@ from __future__ import (
 from contextlib import contextmanager
 from functools import partial
 
+from pcs.common.tools import is_string
+from pcs.lib import reports
 from pcs.lib.resource_agent import(
     find_valid_resource_agent_by_name as get_agent
 )
 from pcs.lib.cib import resource
+from pcs.lib.cib.nvpair import append_new_meta_attributes
 from pcs.lib.cib.resource.common import (
     disable_meta,
     are_meta_disabled,
     is_clone_deactivated_by_meta
 )
-from pcs.lib.cib.tools import get_resources
+from pcs.lib.cib.tools import does_id_exist, get_resources
+from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.values import validate_id
-from pcs.lib.pacemaker.state import ensure_resource_state
+from pcs.lib.pacemaker.state import (
+    ensure_resource_state,
+    get_resource_state_report,
+)
 
 @contextmanager
 def resource_environment(env, resource_id, wait, disabled_after_wait):
@@ -225,3 +232,298 @@ def create_in_group(
 
 create_as_clone = partial(_create_as_clone_common, resource.clone.TAG_CLONE)
 create_as_master = partial(_create_as_clone_common, resource.clone.TAG_MASTER)
+
+BULK_TYPE_PRIMITIVE = "primitive"
+BULK_TYPE_GROUP = "group"
+BULK_TYPE_CLONE = resource.clone.TAG_CLONE
+BULK_TYPE_MASTER = resource.clone.TAG_MASTER
+
+_BULK_OPTIONS = {
+    BULK_TYPE_PRIMITIVE: {
+        "allowed": [
+            "type", "id", "agent", "operations", "meta_attributes",
+            "instance_attributes",
+        ],
+        "required": ["id", "agent"],
+    },
+    BULK_TYPE_GROUP: {
+        "allowed": ["type", "id", "resources", "meta_attributes"],
+        "required": ["id", "resources"],
+    },
+    BULK_TYPE_CLONE: {
+        "allowed": ["type", "resource", "meta_attributes"],
+        "required": ["resource"],
+    },
+}
+_BULK_OPTIONS[BULK_TYPE_MASTER] = _BULK_OPTIONS[BULK_TYPE_CLONE]
+
+def _bulk_value_to_string(value):
+    """
+    Return a string form of an attribute value or None if it has none
+
+    YAML and JSON load plain numbers and booleans as such, the cib needs them
+    as strings.
+    """
+    if is_string(value):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return None
+
+def _validate_bulk_nvpairs(nvpair_dict):
+    return [
+        reports.invalid_option_value(name, value, "a string or a number")
+        for name, value in sorted(nvpair_dict.items(), key=lambda x: str(x[0]))
+        if not is_string(name) or _bulk_value_to_string(value) is None
+    ]
+
+def _normalize_bulk_item(item):
+    """
+    Return a copy of a valid bulk_create item with attribute values as strings
+    """
+    def normalize_nvpairs(nvpair_dict):
+        return dict([
+            (name, _bulk_value_to_string(value))
+            for name, value in nvpair_dict.items()
+        ])
+    normalized = dict(item)
+    for name in ["meta_attributes", "instance_attributes"]:
+        if name in item:
+            normalized[name] = normalize_nvpairs(item[name])
+    if "operations" in item:
+        normalized["operations"] = [
+            normalize_nvpairs(operation) for operation in item["operations"]
+        ]
+    if "resources" in item:
+        normalized["resources"] = [
+            _normalize_bulk_item(member) for member in item["resources"]
+        ]
+    if "resource" in item:
+        normalized["resource"] = _normalize_bulk_item(item["resource"])
+    return normalized
+
+def _validate_bulk_item(item, allowed_types):
+    """
+    Return a list of reports describing errors in a bulk_create item
+
+    dict item -- description of a resource, group or clone
+    list allowed_types -- types the item may be of
+    """
+    if not isinstance(item, dict):
+        return [reports.invalid_option_value(
+            "resource", item, "a resource description"
+        )]
+    item_type = item.get("type", BULK_TYPE_PRIMITIVE)
+    if not is_string(item_type) or item_type not in allowed_types:
+        return [reports.invalid_option_value("type", item_type, allowed_types)]
+
+    report_list = []
+    options = _BULK_OPTIONS[item_type]
+    invalid_names = sorted(set(item.keys()) - set(options["allowed"]))
+    if invalid_names:
+        report_list.append(
+            reports.invalid_option(invalid_names, options["allowed"], item_type)
+        )
+    missing_names = [name for name in options["required"] if name not in item]
+    if missing_names:
+        report_list.append(
+            reports.required_option_is_missing(missing_names, item_type)
+        )
+
+    for name in ["id", "agent"]:
+        if name in item and not is_string(item[name]):
+            report_list.append(
+                reports.invalid_option_value(name, item[name], "a string")
+            )
+    for name in ["meta_attributes", "instance_attributes"]:
+        if name in item:
+            if isinstance(item[name], dict):
+                report_list.extend(_validate_bulk_nvpairs(item[name]))
+            else:
+                report_list.append(reports.invalid_option_value(
+                    name, item[name], "a dictionary"
+                ))
+    if "operations" in item:
+        if (
+            isinstance(item["operations"], list)
+            and
+            all([isinstance(op, dict) for op in item["operations"]])
+        ):
+            for operation in item["operations"]:
+                report_list.extend(_validate_bulk_nvpairs(operation))
+        else:
+            report_list.append(reports.invalid_option_value(
+                "operations", item["operations"], "a list of dictionaries"
+            ))
+
+    if item_type == BULK_TYPE_GROUP and "resources" in item:
+        if not isinstance(item["resources"], list) or not item["resources"]:
+            report_list.append(reports.invalid_option_value(
+                "resources", item["resources"], "a non-empty list"
+            ))
+        else:
+            for member in item["resources"]:
+                report_list.extend(
+                    _validate_bulk_item(member, [BULK_TYPE_PRIMITIVE])
+                )
+    if item_type in (BULK_TYPE_CLONE, BULK_TYPE_MASTER) and "resource" in item:
+        report_list.extend(_validate_bulk_item(
+            item["resource"], [BULK_TYPE_PRIMITIVE, BULK_TYPE_GROUP]
+        ))
+    return report_list
+
+def _get_bulk_primitive_list(item_list):
+    """
+    Return descriptions of all primitives in the bulk_create items
+    """
+    primitive_list = []
+    for item in item_list:
+        item_type = item.get("type", BULK_TYPE_PRIMITIVE)
+        if item_type == BULK_TYPE_PRIMITIVE:
+            primitive_list.append(item)
+        elif item_type == BULK_TYPE_GROUP:
+            primitive_list.extend(_get_bulk_primitive_list(item["resources"]))
+        else:
+            primitive_list.extend(_get_bulk_primitive_list([item["resource"]]))
+    return primitive_list
+
+def bulk_create(
+    env, resource_list,
+    allow_absent_agent=False,
+    allow_invalid_operation=False,
+    allow_invalid_instance_attributes=False,
+    use_default_operations=True,
+    ensure_disabled=False,
+    wait=False,
+):
+    """
+    Create several resources, groups and clones in one cib update
+
+    Each distinct resource agent is loaded only once, all the resources are
+    put into one cib which is pushed once. Nothing is created if any of the
+    resources cannot be created.
+
+    LibraryEnvironment env provides all for communication with externals
+    list of dict resource_list describes the resources to create, each item is
+        one of:
+        primitive: {"type": "primitive" (default), "id": ..., "agent": ...,
+            "operations": [{...}], "meta_attributes": {...},
+            "instance_attributes": {...}}
+        group: {"type": "group", "id": ..., "resources": [primitives],
+            "meta_attributes": {...}}
+        clone: {"type": "clone" or "master", "resource": primitive or group,
+            "meta_attributes": {...}}
+    bool allow_absent_agent is a flag for allowing agent that is not installed
+        in a system
+    bool allow_invalid_operation is a flag for allowing to use operations that
+        are not listed in a resource agent metadata
+    bool allow_invalid_instance_attributes is a flag for allowing to use
+        instance attributes that are not listed in a resource agent metadata
+        or for allowing to not use the instance_attributes that are required in
+        resource agent metadata
+    bool use_default_operations is a flag for stopping stopping of adding
+        default cib operations (specified in a resource agent)
+    bool ensure_disabled is flag that keeps resources in target-role "Stopped"
+    mixed wait is flag for controlling waiting for pacemaker iddle mechanism
+    """
+    report_list = []
+    for item in resource_list:
+        report_list.extend(_validate_bulk_item(item, sorted(_BULK_OPTIONS)))
+    if report_list:
+        raise LibraryError(*report_list)
+    resource_list = [_normalize_bulk_item(item) for item in resource_list]
+
+    agent_dict = {}
+    for primitive in _get_bulk_primitive_list(resource_list):
+        if primitive["agent"] not in agent_dict:
+            agent_dict[primitive["agent"]] = get_agent(
+                env.report_processor,
+                env.cmd_runner(),
+                primitive["agent"],
+                allow_absent_agent,
+            )
+
+    env.ensure_wait_satisfiable(wait)
+    cib = env.get_cib()
+    resources_section = get_resources(cib)
+    # (primitive id, is expected to be stopped)
+    state_check_list = []
+
+    def create_primitive(item, disabled_by_parent, ensure_primitive_disabled):
+        meta_attributes = item.get("meta_attributes", {})
+        state_check_list.append((
+            item["id"],
+            ensure_disabled
+            or
+            disabled_by_parent
+            or
+            are_meta_disabled(meta_attributes)
+        ))
+        return resource.primitive.create(
+            env.report_processor, resources_section,
+            item["id"], agent_dict[item["agent"]],
+            item.get("operations", []),
+            meta_attributes,
+            item.get("instance_attributes", {}),
+            allow_invalid_operation,
+            allow_invalid_instance_attributes,
+            use_default_operations,
+            ensure_primitive_disabled,
+        )
+
+    def create_group(item, disabled_by_parent, ensure_members_disabled):
+        group_id = item["id"]
+        validate_id(group_id, "group name")
+        if does_id_exist(resources_section, group_id):
+            raise LibraryError(reports.id_already_exists(group_id))
+        group_element = resource.group.provide_group(
+            resources_section, group_id
+        )
+        meta_attributes = item.get("meta_attributes", {})
+        if meta_attributes:
+            append_new_meta_attributes(group_element, meta_attributes)
+        for member in item["resources"]:
+            resource.group.place_resource(
+                group_element,
+                create_primitive(
+                    member,
+                    disabled_by_parent or are_meta_disabled(meta_attributes),
+                    ensure_members_disabled
+                )
+            )
+        return group_element
+
+    for item in resource_list:
+        item_type = item.get("type", BULK_TYPE_PRIMITIVE)
+        if item_type == BULK_TYPE_PRIMITIVE:
+            create_primitive(item, False, ensure_disabled)
+        elif item_type == BULK_TYPE_GROUP:
+            create_group(item, False, ensure_disabled)
+        else:
+            clone_meta_options = item.get("meta_attributes", {})
+            clone_disabled = is_clone_deactivated_by_meta(clone_meta_options)
+            child = item["resource"]
+            if child.get("type", BULK_TYPE_PRIMITIVE) == BULK_TYPE_GROUP:
+                child_element = create_group(child, clone_disabled, False)
+            else:
+                child_element = create_primitive(child, clone_disabled, False)
+            if ensure_disabled:
+                clone_meta_options = disable_meta(clone_meta_options)
+            resource.clone.append_new(
+                item_type,
+                resources_section,
+                child_element,
+                clone_meta_options,
+            )
+
+    env.push_cib(cib, wait)
+    if wait is not False:
+        cluster_state = env.get_cluster_state()
+        env.report_processor.process_list([
+            get_resource_state_report(
+                not disabled, cluster_state, resource_id
+            )
+            for resource_id, disabled in state_check_list
+        ])
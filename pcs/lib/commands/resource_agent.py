@@ -87,29 +87,48 @@ def _complete_agent_list(
         ]
 
     # complete the output and load descriptions if requested
+    def get_info(name):
+        agent_metadata = metadata_class(runner, name)
+        if describe:
+            return agent_metadata.get_description_info()
+        return agent_metadata.get_name_info()
+
+    if describe:
+        result_list = resource_agent.load_agents_in_parallel(
+            get_info, agent_names
+        )
+    else:
+        # no metadata are loaded, there is no reason to use threads
+        result_list = []
+        for name in agent_names:
+            try:
+                result_list.append((True, get_info(name), None))
+            except resource_agent.ResourceAgentError as e:
+                result_list.append((True, None, e))
+
     agent_list = []
-    for name in agent_names:
-        try:
-            agent_metadata = metadata_class(runner, name)
-            if describe:
-                agent_list.append(agent_metadata.get_description_info())
-            else:
-                agent_list.append(agent_metadata.get_name_info())
-        except resource_agent.ResourceAgentError:
-            #we don't return it in the list:
-            #
-            #UnableToGetAgentMetadata - if we cannot get valid metadata, it's
-            #not a resource agent
-            #
-            #InvalidResourceAgentName - invalid name cannot be used with a new
-            #resource. The list of names is gained from "crm_resource" whilst
-            #pcs is doing the validation. So there can be a name that pcs does
-            #not recognize as valid.
-            #
-            #Providing a warning is not the way (currently). Other components
-            #read this list and do not expect warnings there. Using the stderr
-            #(to separate warnings) is currently difficult.
-            pass
+    for finished, info, exception in result_list:
+        if not finished:
+            # The agent has not provided its metadata in time. It cannot be
+            # used, so skip it as any other agent with invalid metadata.
+            continue
+        if exception is None:
+            agent_list.append(info)
+        elif not isinstance(exception, resource_agent.ResourceAgentError):
+            raise exception
+        #ResourceAgentError - we don't return it in the list:
+        #
+        #UnableToGetAgentMetadata - if we cannot get valid metadata, it's
+        #not a resource agent
+        #
+        #InvalidResourceAgentName - invalid name cannot be used with a new
+        #resource. The list of names is gained from "crm_resource" whilst
+        #pcs is doing the validation. So there can be a name that pcs does
+        #not recognize as valid.
+        #
+        #Providing a warning is not the way (currently). Other components
+        #read this list and do not expect warnings there. Using the stderr
+        #(to separate warnings) is currently difficult.
     return agent_list
 
 
@@ -165,25 +165,40 @@ def enable_sbd(
             )
             lib_env.push_corosync_conf(corosync_conf, ignore_offline_nodes)
 
-    # distribute SBD configuration
+    # Distribute SBD configuration and remove cluster prop
+    # 'stonith_watchdog_timeout'. Nodes do not depend on each other here, each
+    # node goes through the steps on its own.
     config = sbd.get_default_sbd_config()
     config.update(sbd_options)
-    sbd.set_sbd_config_on_all_nodes(
-        lib_env.report_processor,
-        lib_env.node_communicator(),
+    report_processor = lib_env.report_processor
+    node_communicator = lib_env.node_communicator()
+    report_processor.process(reports.sbd_config_distribution_started())
+    nodes_task.run_steps_on_nodes(
         online_nodes,
-        config,
-        full_watchdog_dict
+        [
+            lambda node: sbd.set_sbd_config_on_node(
+                report_processor,
+                node_communicator,
+                node,
+                config,
+                full_watchdog_dict.get(node)
+            ),
+            lambda node: sbd.remove_stonith_watchdog_timeout(
+                node_communicator, node
+            ),
+        ]
     )
 
-    # remove cluster prop 'stonith_watchdog_timeout'
-    sbd.remove_stonith_watchdog_timeout_on_all_nodes(
-        lib_env.node_communicator(), online_nodes
-    )
-
-    # enable SBD service an all nodes
-    sbd.enable_sbd_service_on_all_nodes(
-        lib_env.report_processor, lib_env.node_communicator(), online_nodes
+    # Enable SBD service only when all nodes have accepted the config, so
+    # the cluster is not left with SBD enabled on some nodes only.
+    report_processor.process(reports.sbd_enabling_started())
+    nodes_task.run_steps_on_nodes(
+        online_nodes,
+        [
+            lambda node: sbd.enable_sbd_service_on_node(
+                report_processor, node_communicator, node
+            ),
+        ]
     )
 
     lib_env.report_processor.process(
@@ -210,13 +225,20 @@ def disable_sbd(lib_env, ignore_offline_nodes=False):
             ignore_offline_nodes
         )
 
-    sbd.set_stonith_watchdog_timeout_to_zero_on_all_nodes(
-        lib_env.node_communicator(), node_list
-    )
-    sbd.disable_sbd_service_on_all_nodes(
-        lib_env.report_processor,
-        lib_env.node_communicator(),
-        node_list
+    # each node sets 'stonith_watchdog_timeout' and disables SBD on its own
+    report_processor = lib_env.report_processor
+    node_communicator = lib_env.node_communicator()
+    report_processor.process(reports.sbd_disabling_started())
+    nodes_task.run_steps_on_nodes(
+        node_list,
+        [
+            lambda node: sbd.set_stonith_watchdog_timeout_to_zero(
+                node_communicator, node
+            ),
+            lambda node: sbd.disable_sbd_service_on_node(
+                report_processor, node_communicator, node
+            ),
+        ]
     )
 
     if not lib_env.is_cman_cluster:
@@ -235,24 +257,28 @@ def _get_online_nodes(lib_env, node_list, ignore_offline_nodes=False):
     ignore_offline_nodes -- if True offline nodes are just omitted from
         returned list.
     """
-    to_raise = []
-    online_node_list = NodeAddressesList()
-
     def is_node_online(node):
         try:
             nodes_task.node_check_auth(lib_env.node_communicator(), node)
-            online_node_list.append(node)
+            return True, []
         except NodeConnectionException as e:
             if ignore_offline_nodes:
-                to_raise.append(reports.omitting_node(node.label))
-            else:
-                to_raise.append(node_communicator_exception_to_report_item(
-                    e, Severities.ERROR, report_codes.SKIP_OFFLINE_NODES
-                ))
+                return False, [reports.omitting_node(node.label)]
+            return False, [node_communicator_exception_to_report_item(
+                e, Severities.ERROR, report_codes.SKIP_OFFLINE_NODES
+            )]
         except NodeCommunicationException as e:
-            to_raise.append(node_communicator_exception_to_report_item(e))
+            return False, [node_communicator_exception_to_report_item(e)]
 
-    tools.run_parallel(is_node_online, [([node], {}) for node in node_list])
+    to_raise = []
+    online_node_list = NodeAddressesList()
+    result_list = tools.run_parallel(
+        is_node_online, [([node], {}) for node in node_list]
+    )
+    for node, (online, report_list) in zip(node_list, result_list):
+        if online:
+            online_node_list.append(node)
+        to_raise.extend(report_list)
 
     lib_env.report_processor.process_list(to_raise)
     return online_node_list
@@ -273,47 +299,55 @@ def get_cluster_sbd_status(lib_env):
     lib_env -- LibraryEnvironment
     """
     node_list = _get_cluster_nodes(lib_env)
-    report_item_list = []
-    successful_node_list = []
-    status_list = []
 
     def get_sbd_status(node):
         try:
-            status_list.append({
-                "node": node,
-                "status": json.loads(
-                    sbd.check_sbd(lib_env.node_communicator(), node, "")
-                )["sbd"]
-            })
-            successful_node_list.append(node)
+            return json.loads(
+                sbd.check_sbd(lib_env.node_communicator(), node, "")
+            )["sbd"], []
         except NodeCommunicationException as e:
-            report_item_list.append(node_communicator_exception_to_report_item(
-                e,
-                severity=Severities.WARNING
-            ))
-            report_item_list.append(reports.unable_to_get_sbd_status(
-                node.label,
-                "", #reason is in previous report item
-                #warning is there implicit
-            ))
+            return None, [
+                node_communicator_exception_to_report_item(
+                    e,
+                    severity=Severities.WARNING
+                ),
+                reports.unable_to_get_sbd_status(
+                    node.label,
+                    "", #reason is in previous report item
+                    #warning is there implicit
+                ),
+            ]
         except (ValueError, KeyError) as e:
-            report_item_list.append(reports.unable_to_get_sbd_status(
-                node.label, str(e)
-            ))
+            return None, [
+                reports.unable_to_get_sbd_status(node.label, str(e))
+            ]
 
-    tools.run_parallel(get_sbd_status, [([node], {}) for node in node_list])
-    lib_env.report_processor.process_list(report_item_list)
-
-    for node in node_list:
-        if node not in successful_node_list:
+    report_item_list = []
+    status_list = []
+    failed_node_list = []
+    result_list = tools.run_parallel(
+        get_sbd_status, [([node], {}) for node in node_list]
+    )
+    for node, (status, report_list) in zip(node_list, result_list):
+        report_item_list.extend(report_list)
+        if report_list:
+            failed_node_list.append(node)
+        else:
             status_list.append({
                 "node": node,
-                "status": {
-                    "installed": None,
-                    "enabled": None,
-                    "running": None
-                }
+                "status": status,
             })
+    lib_env.report_processor.process_list(report_item_list)
+
+    for node in failed_node_list:
+        status_list.append({
+            "node": node,
+            "status": {
+                "installed": None,
+                "enabled": None,
+                "running": None
+            }
+        })
     return status_list
 
 
@@ -334,48 +368,58 @@ def get_cluster_sbd_config(lib_env):
     lib_env -- LibraryEnvironment
     """
     node_list = _get_cluster_nodes(lib_env)
-    config_list = []
-    successful_node_list = []
-    report_item_list = []
 
     def get_sbd_config(node):
         try:
-            config_list.append({
-                "node": node,
-                "config": environment_file_to_dict(
-                    sbd.get_sbd_config(lib_env.node_communicator(), node)
-                )
-            })
-            successful_node_list.append(node)
+            return environment_file_to_dict(
+                sbd.get_sbd_config(lib_env.node_communicator(), node)
+            ), []
         except NodeCommandUnsuccessfulException as e:
-            report_item_list.append(reports.unable_to_get_sbd_config(
-                node.label,
-                e.reason,
-                Severities.WARNING
-            ))
+            return None, [
+                reports.unable_to_get_sbd_config(
+                    node.label,
+                    e.reason,
+                    Severities.WARNING
+                )
+            ]
         except NodeCommunicationException as e:
-            report_item_list.append(node_communicator_exception_to_report_item(
-                e,
-                severity=Severities.WARNING
-            ))
-            report_item_list.append(reports.unable_to_get_sbd_config(
-                node.label,
-                "", #reason is in previous report item
-                Severities.WARNING
-            ))
+            return None, [
+                node_communicator_exception_to_report_item(
+                    e,
+                    severity=Severities.WARNING
+                ),
+                reports.unable_to_get_sbd_config(
+                    node.label,
+                    "", #reason is in previous report item
+                    Severities.WARNING
+                ),
+            ]
 
-    tools.run_parallel(get_sbd_config, [([node], {}) for node in node_list])
+    config_list = []
+    failed_node_list = []
+    report_item_list = []
+    result_list = tools.run_parallel(
+        get_sbd_config, [([node], {}) for node in node_list]
+    )
+    for node, (config, report_list) in zip(node_list, result_list):
+        report_item_list.extend(report_list)
+        if report_list:
+            failed_node_list.append(node)
+        else:
+            config_list.append({
+                "node": node,
+                "config": config,
+            })
     lib_env.report_processor.process_list(report_item_list)
 
     if not len(config_list):
         return []
 
-    for node in node_list:
-        if node not in successful_node_list:
-            config_list.append({
-                "node": node,
-                "config": None
-            })
+    for node in failed_node_list:
+        config_list.append({
+            "node": node,
+            "config": None
+        })
     return config_list
 
 
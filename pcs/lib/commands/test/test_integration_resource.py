@@ -14,14 +14,23 @@ from pcs.test.tools.pcs_unittest import TestCase, mock
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.commands import resource
 from pcs.test.tools.custom_mock import MockLibraryReportProcessor
-from pcs.test.tools.misc import get_test_resource as rc, outdent
-from pcs.test.tools.integration_lib import Runner, Call
+from pcs.test.tools.misc import (
+    TemporaryAgentMetadataCache,
+    get_test_resource as rc,
+    outdent,
+)
+from pcs.test.tools.integration_lib import Runner, Call, TmpFiles
 from pcs.common import report_codes
 from pcs.lib.errors import ReportItemSeverity as severities
 from pcs.test.tools.assertions import assert_raise_library_error
 
 
 runner = Runner()
+tmp_files = TmpFiles()
+
+_metadata_cache = TemporaryAgentMetadataCache()
+setUpModule = _metadata_cache.start
+tearDownModule = _metadata_cache.stop
 
 fixture_cib_resources_xml_simplest = """<resources>
     <primitive class="ocf" id="A" provider="heartbeat"
@@ -220,8 +229,16 @@ def fixture_cib_calls(cib_resources_xml):
     return [
         Call("cibadmin --local --query", cib_xml),
         Call(
-            "cibadmin --replace --verbose --xml-pipe --scope configuration",
-            check_stdin=Call.create_check_stdin_xml(etree.tostring(cib))
+            "crm_diff --original {0} --new {1} --no-version".format(
+                tmp_files.get_name(1), tmp_files.get_name(2)
+            ),
+            "<diff/>",
+            returncode=1,
+            check_stdin=tmp_files.create_check_xml(2, etree.tostring(cib))
+        ),
+        Call(
+            "cibadmin --patch --verbose --xml-pipe",
+            check_stdin=Call.create_check_stdin_xml(b"<diff/>")
         ),
     ]
 
@@ -273,12 +290,19 @@ class CommonResourceTest(TestCase):
             lambda self: runner
         )
         cls.patcher.start()
+        cls.tmp_files_patcher = mock.patch(
+            "pcs.lib.pacemaker.live.write_tmpfile",
+            tmp_files.write
+        )
+        cls.tmp_files_patcher.start()
 
     @classmethod
     def tearDownClass(cls):
+        cls.tmp_files_patcher.stop()
         cls.patcher.stop()
 
     def setUp(self):
+        tmp_files.reset()
         self.env = LibraryEnvironment(
             mock.MagicMock(logging.Logger),
             MockLibraryReportProcessor()
@@ -930,3 +954,299 @@ class CreateAsClone(CommonResourceTest):
             </resources>""",
             fixture_state_resources_xml(role="Stopped"),
         )
+
+def fixture_primitive_xml(resource_id, meta_xml=""):
+    return """
+        <primitive class="ocf" id="{id}" provider="heartbeat" type="Dummy">
+            {meta}
+            <operations>
+                <op id="{id}-monitor-interval-10" interval="10"
+                    name="monitor" timeout="20"
+                />
+                <op id="{id}-start-interval-0s" interval="0s" name="start"
+                    timeout="20"
+                />
+                <op id="{id}-stop-interval-0s" interval="0s" name="stop"
+                    timeout="20"
+                />
+            </operations>
+        </primitive>
+    """.format(id=resource_id, meta=meta_xml)
+
+fixture_cib_resources_xml_bulk = """<resources>
+    {A}
+    <group id="G">
+        {B}
+        {C}
+    </group>
+    <clone id="D-clone">
+        {D}
+        <meta_attributes id="D-clone-meta_attributes">
+            <nvpair id="D-clone-meta_attributes-interleave" name="interleave"
+                value="true"
+            />
+        </meta_attributes>
+    </clone>
+</resources>""".format(
+    A=fixture_primitive_xml("A"),
+    B=fixture_primitive_xml("B"),
+    C=fixture_primitive_xml("C"),
+    D=fixture_primitive_xml("D"),
+)
+
+def fixture_bulk_resource_list():
+    return [
+        {"id": "A", "agent": "ocf:heartbeat:Dummy"},
+        {
+            "type": "group",
+            "id": "G",
+            "resources": [
+                {"id": "B", "agent": "ocf:heartbeat:Dummy"},
+                {"id": "C", "agent": "ocf:heartbeat:Dummy"},
+            ],
+        },
+        {
+            "type": "clone",
+            "resource": {"id": "D", "agent": "ocf:heartbeat:Dummy"},
+            "meta_attributes": {"interleave": "true"},
+        },
+    ]
+
+class BulkCreate(CommonResourceTest):
+    def get_create(self):
+        return resource.bulk_create
+
+    def fixture_state_xml(self, resource_id_list, role="Started"):
+        return "<resources>{0}</resources>".format("".join([
+            """
+            <resource id="{id}" resource_agent="ocf::heartbeat:Dummy"
+                role="{role}" active="true" orphaned="false" managed="true"
+                failed="false" failure_ignored="false" nodes_running_on="1"
+            >
+                <node name="node1" id="1" cached="false"/>
+            </resource>
+            """.format(id=resource_id, role=role)
+            for resource_id in resource_id_list
+        ]))
+
+    def test_create_in_one_push(self):
+        # the agent metadata are loaded once and the cib is pushed once
+        self.assert_command_effect(
+            lambda: self.create(fixture_bulk_resource_list()),
+            fixture_cib_resources_xml_bulk
+        )
+
+    def test_wait_ok_run_ok(self):
+        runner.set_runs(
+            fixture_calls_including_waiting(
+                fixture_cib_resources_xml_bulk,
+                self.fixture_state_xml(["A", "B", "C", "D:0"])
+            )
+        )
+        self.create(fixture_bulk_resource_list(), wait="10")
+        self.env.report_processor.assert_reports([
+            (
+                severities.INFO,
+                report_codes.RESOURCE_RUNNING_ON_NODES,
+                {
+                    "roles_with_nodes": {"Started": ["node1"]},
+                    "resource_id": resource_id,
+                },
+                None
+            )
+            for resource_id in ["A", "B", "C", "D"]
+        ])
+        runner.assert_everything_launched()
+
+    def test_wait_ok_run_fail(self):
+        runner.set_runs(
+            fixture_calls_including_waiting(
+                fixture_cib_resources_xml_bulk,
+                self.fixture_state_xml(["A", "C", "D:0"])
+            )
+        )
+        assert_raise_library_error(
+            lambda: self.create(fixture_bulk_resource_list(), wait="10"),
+            (
+                severities.ERROR,
+                report_codes.RESOURCE_DOES_NOT_RUN,
+                {
+                    "resource_id": "B",
+                },
+                None
+            )
+        )
+        runner.assert_everything_launched()
+
+    def test_invalid_manifest(self):
+        runner.set_runs([])
+        assert_raise_library_error(
+            lambda: self.create([
+                {"id": "A", "agent": "ocf:heartbeat:Dummy", "clone": {}},
+                {"type": "group", "resources": []},
+                {"type": "bundle"},
+            ]),
+            (
+                severities.ERROR,
+                report_codes.INVALID_OPTION,
+                {
+                    "option_names": ["clone"],
+                    "option_type": "primitive",
+                    "allowed": [
+                        "agent", "id", "instance_attributes",
+                        "meta_attributes", "operations", "type",
+                    ],
+                },
+                None
+            ),
+            (
+                severities.ERROR,
+                report_codes.REQUIRED_OPTION_IS_MISSING,
+                {
+                    "option_names": ["id"],
+                    "option_type": "group",
+                },
+                None
+            ),
+            (
+                severities.ERROR,
+                report_codes.INVALID_OPTION_VALUE,
+                {
+                    "option_name": "resources",
+                    "option_value": [],
+                    "allowed_values": "a non-empty list",
+                },
+                None
+            ),
+            (
+                severities.ERROR,
+                report_codes.INVALID_OPTION_VALUE,
+                {
+                    "option_name": "type",
+                    "option_value": "bundle",
+                    "allowed_values": ["clone", "group", "master", "primitive"],
+                },
+                None
+            ),
+        )
+        runner.assert_everything_launched()
+
+    def test_nothing_pushed_on_error(self):
+        runner.set_runs(
+            fixture_agent_load_calls()
+            +
+            [Call("cibadmin --local --query", open(rc("cib-empty.xml")).read())]
+        )
+        assert_raise_library_error(
+            lambda: self.create([
+                {"id": "A", "agent": "ocf:heartbeat:Dummy"},
+                {"id": "A", "agent": "ocf:heartbeat:Dummy"},
+            ]),
+            (
+                severities.ERROR,
+                report_codes.ID_ALREADY_EXISTS,
+                {
+                    "id": "A",
+                },
+                None
+            ),
+        )
+        runner.assert_everything_launched()
+
+    def test_numeric_values_converted(self):
+        # YAML loads bare numbers and booleans as such
+        self.assert_command_effect(
+            lambda: self.create([{
+                "id": "A",
+                "agent": "ocf:heartbeat:Dummy",
+                "meta_attributes": {
+                    "migration-threshold": 3,
+                    "is-managed": True,
+                },
+                "operations": [
+                    {"name": "monitor", "interval": 10, "timeout": 20},
+                ],
+            }]),
+            """<resources>
+                {0}
+            </resources>""".format(fixture_primitive_xml(
+                "A",
+                """
+                <meta_attributes id="A-meta_attributes">
+                    <nvpair id="A-meta_attributes-is-managed"
+                        name="is-managed" value="true"
+                    />
+                    <nvpair id="A-meta_attributes-migration-threshold"
+                        name="migration-threshold" value="3"
+                    />
+                </meta_attributes>
+                """
+            ))
+        )
+
+    def test_invalid_value_types(self):
+        runner.set_runs([])
+        assert_raise_library_error(
+            lambda: self.create([
+                {"id": 5, "agent": "ocf:heartbeat:Dummy"},
+                {"id": "B", "agent": 5},
+                {
+                    "id": "C",
+                    "agent": "ocf:heartbeat:Dummy",
+                    "meta_attributes": {"target-role": None},
+                    "operations": [{"name": "monitor", "interval": [10]}],
+                },
+                {"type": 5},
+            ]),
+            (
+                severities.ERROR,
+                report_codes.INVALID_OPTION_VALUE,
+                {
+                    "option_name": "id",
+                    "option_value": 5,
+                    "allowed_values": "a string",
+                },
+                None
+            ),
+            (
+                severities.ERROR,
+                report_codes.INVALID_OPTION_VALUE,
+                {
+                    "option_name": "agent",
+                    "option_value": 5,
+                    "allowed_values": "a string",
+                },
+                None
+            ),
+            (
+                severities.ERROR,
+                report_codes.INVALID_OPTION_VALUE,
+                {
+                    "option_name": "target-role",
+                    "option_value": None,
+                    "allowed_values": "a string or a number",
+                },
+                None
+            ),
+            (
+                severities.ERROR,
+                report_codes.INVALID_OPTION_VALUE,
+                {
+                    "option_name": "interval",
+                    "option_value": [10],
+                    "allowed_values": "a string or a number",
+                },
+                None
+            ),
+            (
+                severities.ERROR,
+                report_codes.INVALID_OPTION_VALUE,
+                {
+                    "option_name": "type",
+                    "option_value": 5,
+                    "allowed_values": ["clone", "group", "master", "primitive"],
+                },
+                None
+            ),
+        )
+        runner.assert_everything_launched()
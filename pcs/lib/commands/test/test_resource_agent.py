@@ -6,10 +6,12 @@ from __future__ import (
 )
 
 import logging
+import time
 from lxml import etree
 
 from pcs.test.tools.assertions import assert_raise_library_error, start_tag_error_text
 from pcs.test.tools.custom_mock import MockLibraryReportProcessor
+from pcs.test.tools.misc import TemporaryAgentMetadataCache
 from pcs.test.tools.pcs_unittest import mock, TestCase
 
 from pcs.common import report_codes
@@ -20,6 +22,11 @@ from pcs.lib.errors import ReportItemSeverity as severity
 from pcs.lib.commands import resource_agent as lib
 
 
+_metadata_cache = TemporaryAgentMetadataCache()
+setUpModule = _metadata_cache.start
+tearDownModule = _metadata_cache.stop
+
+
 @mock.patch("pcs.lib.resource_agent.list_resource_agents_standards")
 @mock.patch.object(
     LibraryEnvironment,
@@ -304,6 +311,35 @@ class CompleteAgentList(TestCase):
             metadata_class=Agent,
         ))
 
+    def test_skip_agents_with_invalid_or_slow_metadata(self):
+        class Agent(object):
+            def __init__(self, runner, name):
+                self.name = name
+
+            def get_description_info(self):
+                if self.name == "ocf:heartbeat:Invalid":
+                    raise lib_ra.UnableToGetAgentMetadata(self.name)
+                if self.name == "ocf:heartbeat:Hung":
+                    time.sleep(5)
+                return {"name": self.name}
+
+        with mock.patch.object(lib_ra.settings, "agent_metadata_timeout", 1):
+            self.assertEqual(
+                [{"name": "ocf:heartbeat:A"}, {"name": "ocf:heartbeat:B"}],
+                lib._complete_agent_list(
+                    mock.MagicMock(),
+                    [
+                        "ocf:heartbeat:A",
+                        "ocf:heartbeat:Hung",
+                        "ocf:heartbeat:Invalid",
+                        "ocf:heartbeat:B",
+                    ],
+                    describe=True,
+                    search=False,
+                    metadata_class=Agent,
+                )
+            )
+
 @mock.patch.object(lib_ra.ResourceAgent, "_load_metadata", autospec=True)
 @mock.patch("pcs.lib.resource_agent.guess_exactly_one_resource_agent_full_name")
 @mock.patch.object(
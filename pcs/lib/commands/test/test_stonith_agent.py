@@ -10,6 +10,7 @@ from lxml import etree
 
 from pcs.test.tools.assertions import assert_raise_library_error, start_tag_error_text
 from pcs.test.tools.custom_mock import MockLibraryReportProcessor
+from pcs.test.tools.misc import TemporaryAgentMetadataCache
 from pcs.test.tools.pcs_unittest import mock, TestCase
 
 from pcs.common import report_codes
@@ -20,6 +21,11 @@ from pcs.lib.errors import ReportItemSeverity as severity
 from pcs.lib.commands import stonith_agent as lib
 
 
+_metadata_cache = TemporaryAgentMetadataCache()
+setUpModule = _metadata_cache.start
+tearDownModule = _metadata_cache.stop
+
+
 @mock.patch(
     "pcs.lib.resource_agent.list_stonith_agents",
     lambda runner: [
@@ -121,31 +121,30 @@ class Section(object):
 
 
 def parse_string(conf_text):
-    root = Section("")
-    _parse_section(conf_text.split("\n"), root)
-    return root
-
-def _parse_section(lines, section):
     # parser is trying to work the same way as an original corosync parser
-    while lines:
-        current_line = lines.pop(0).strip()
+    root = Section("")
+    # the currently open section is the last one
+    section_stack = [root]
+    for line in conf_text.split("\n"):
+        current_line = line.strip()
         if not current_line or current_line[0] == "#":
             continue
         if "{" in current_line:
             section_name, dummy_junk = current_line.rsplit("{", 1)
             new_section = Section(section_name.strip())
-            section.add_section(new_section)
-            _parse_section(lines, new_section)
+            section_stack[-1].add_section(new_section)
+            section_stack.append(new_section)
         elif "}" in current_line:
-            if not section.parent:
+            if len(section_stack) == 1:
                 raise UnexpectedClosingBraceException()
-            return
+            section_stack.pop()
         elif ":" in current_line:
-            section.add_attribute(
+            section_stack[-1].add_attribute(
                 *[x.strip() for x in current_line.split(":", 1)]
             )
-    if section.parent:
+    if len(section_stack) > 1:
         raise MissingClosingBraceException()
+    return root
 
 
 class CorosyncConfParserException(Exception):
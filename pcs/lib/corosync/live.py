@@ -50,6 +50,21 @@ def set_remote_corosync_conf(node_communicator, node_addr, config_text):
         NodeCommunicator.format_data_dict({'corosync_conf': config_text})
     )
 
+def set_remote_corosync_conf_many(
+    node_communicator, node_addr_list, config_text
+):
+    """
+    Send corosync.conf to several nodes at once, return an iterator of
+        NodeCommunicator.call_nodes_many results
+    node_addr_list list of NodeAddresses instances
+    config_text corosync.conf text
+    """
+    data = NodeCommunicator.format_data_dict({'corosync_conf': config_text})
+    return node_communicator.call_nodes_many([
+        (node_addr, "remote/set_corosync_conf", data)
+        for node_addr in node_addr_list
+    ])
+
 def reload_config(runner):
     """
     Ask corosync to reload its configuration
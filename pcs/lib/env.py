@@ -25,6 +25,7 @@ from pcs.lib.external import (
     is_service_running,
     CommandRunner,
     NodeCommunicator,
+    UnreachableHostCache,
 )
 from pcs.lib.errors import LibraryError
 from pcs.lib.nodes_task import (
@@ -33,10 +34,12 @@ from pcs.lib.nodes_task import (
     qdevice_reload_on_nodes,
 )
 from pcs.lib.pacemaker.live import (
+    diff_cibs_xml,
     ensure_wait_for_idle_support,
     ensure_cib_version,
     get_cib,
     get_cib_xml,
+    push_cib_diff_xml,
     replace_cib_configuration_xml,
     wait_for_idle,
     get_cluster_status_xml,
@@ -80,8 +83,16 @@ class LibraryEnvironment(object):
         self._auth_tokens = None
         self._cib_upgraded = False
         self._cib_data_tmp_file = None
+        # live CIB as loaded by get_cib, pushed CIBs are diffed against it
+        self._loaded_cib_xml = None
 
         self.__timeout_cache = {}
+        # nodes unreachable in this library call are not waited for again
+        self._unreachable_host_cache = UnreachableHostCache(
+            settings.node_unreachable_ttl
+        )
+        # addresses of nodes which responded: {ring0: address}
+        self._node_host_cache = {}
 
     @property
     def logger(self):
@@ -116,7 +127,10 @@ class LibraryEnvironment(object):
             return self._cib_data
 
     def get_cib(self, minimal_version=None):
-        cib = get_cib(self._get_cib_xml())
+        cib_xml = self._get_cib_xml()
+        if self.is_cib_live:
+            self._loaded_cib_xml = cib_xml
+        cib = get_cib(cib_xml)
         if minimal_version is not None:
             upgraded_cib = ensure_cib_version(
                 self.cmd_runner(),
@@ -137,11 +151,37 @@ class LibraryEnvironment(object):
 
     def _push_cib_xml(self, cib_data):
         if self.is_cib_live:
-            replace_cib_configuration_xml(self.cmd_runner(), cib_data)
+            if self._cib_upgraded or not self._push_cib_diff_xml(cib_data):
+                replace_cib_configuration_xml(self.cmd_runner(), cib_data)
             self._cib_upgraded = False
+            self._loaded_cib_xml = cib_data
         else:
             self._cib_data = cib_data
 
+    def _push_cib_diff_xml(self, cib_data):
+        """
+        Push only changes made to the loaded CIB, return False if not possible
+
+        Pacemaker does not need to process and broadcast the whole
+        configuration section when only a small part of it has been changed.
+        """
+        if self._loaded_cib_xml is None:
+            return False
+        runner = self.cmd_runner()
+        try:
+            cib_diff_xml = diff_cibs_xml(
+                runner, self._loaded_cib_xml, cib_data
+            )
+            if cib_diff_xml:
+                push_cib_diff_xml(runner, cib_diff_xml)
+        except LibraryError as e:
+            self.logger.debug(
+                "Unable to push CIB diff, replacing the CIB: %s",
+                "; ".join([str(item.info) for item in e.args])
+            )
+            return False
+        return True
+
     def _get_wait_timeout(self, wait):
         if wait is False:
             return False
@@ -295,7 +335,9 @@ class LibraryEnvironment(object):
             self.__get_auth_tokens(),
             self.user_login,
             self.user_groups,
-            self._request_timeout
+            self._request_timeout,
+            self._unreachable_host_cache,
+            self._node_host_cache
         )
 
     def __get_auth_tokens(self):
@@ -5,6 +5,7 @@ from __future__ import (
     unicode_literals,
 )
 
+from collections import deque
 import base64
 import io
 import json
@@ -20,6 +21,8 @@ import re
 import signal
 import subprocess
 import sys
+import threading
+import time
 try:
     # python2
     from urllib import urlencode as urllib_urlencode
@@ -32,6 +35,7 @@ from pcs.common import (
     pcs_pycurl as pycurl,
     report_codes,
 )
+from pcs.common.curl_pool import get_curl_handle_pool
 from pcs.common.tools import (
     join_multilines,
     simple_cache,
@@ -224,23 +228,126 @@ def kill_services(runner, services):
             raise KillServicesError(list(services), message)
 
 
-def is_service_enabled(runner, service, instance=None):
+# systemctl is-enabled exits with 0 for these unit file states
+_SYSTEMD_ENABLED_STATES = frozenset((
+    "alias",
+    "enabled",
+    "enabled-runtime",
+    "generated",
+    "indirect",
+    "static",
+    "transient",
+))
+# systemctl is-active exits with 0 for these unit states
+_SYSTEMD_RUNNING_STATES = frozenset(("active", "reloading"))
+
+def get_services_state(runner, service_list, instance=None):
     """
-    Check if specified service is enabled in local system.
+    Check if specified services are installed, enabled and running
+
+    On systemd systems the states of all the services are read by one
+    systemctl call. Return a dict service name: {
+        "installed": bool,
+        "enabled": bool,
+        "running": bool,
+    }
 
     runner -- CommandRunner
-    service -- name of service
+    service_list -- names of services
+    instance -- systemd service instance, used for all the services
     """
+    if not service_list:
+        return {}
     if is_systemctl():
-        dummy_stdout, dummy_stderr, retval = runner.run(
-            [_systemctl, "is-enabled", _get_service_name(service, instance)]
+        return _get_systemd_services_state(runner, service_list, instance)
+    return _get_non_systemd_services_state(runner, service_list)
+
+def _get_systemd_services_state(runner, service_list, instance):
+    state_dict = dict(
+        (
+            service,
+            {"installed": False, "enabled": False, "running": False}
         )
-    else:
-        dummy_stdout, dummy_stderr, retval = runner.run([_chkconfig, service])
+        for service in service_list
+    )
+    stdout, dummy_stderr, retval = runner.run(
+        [
+            _systemctl,
+            "show",
+            "--property=LoadState,ActiveState,UnitFileState",
+        ]
+        +
+        [_get_service_name(service, instance) for service in service_list]
+    )
+    if retval != 0:
+        return state_dict
 
+    # systemctl prints one block of properties for each unit in the order the
+    # units were specified, the blocks are separated by an empty line
+    block_list = [
+        dict(
+            line.split("=", 1) for line in block.splitlines() if "=" in line
+        )
+        for block in re.split(r"\n\s*\n", stdout.strip())
+    ]
+    for service, properties in zip(service_list, block_list):
+        state_dict[service] = {
+            "installed": (
+                properties.get("LoadState", "not-found")
+                not in ("", "not-found")
+            ),
+            "enabled": (
+                properties.get("UnitFileState", "") in _SYSTEMD_ENABLED_STATES
+            ),
+            "running": (
+                properties.get("ActiveState", "") in _SYSTEMD_RUNNING_STATES
+            ),
+        }
+    return state_dict
+
+def _get_non_systemd_services_state(runner, service_list):
+    # there is no way to get states of more services at once, at least skip
+    # services which are not installed
+    installed_list = get_non_systemd_services(runner)
+    state_dict = {}
+    for service in service_list:
+        installed = service in installed_list
+        state_dict[service] = {
+            "installed": installed,
+            "enabled": installed and _is_non_systemd_service_enabled(
+                runner, service
+            ),
+            "running": installed and _is_non_systemd_service_running(
+                runner, service
+            ),
+        }
+    return state_dict
+
+def _is_non_systemd_service_enabled(runner, service):
+    dummy_stdout, dummy_stderr, retval = runner.run([_chkconfig, service])
+    return retval == 0
+
+def _is_non_systemd_service_running(runner, service):
+    dummy_stdout, dummy_stderr, retval = runner.run(
+        [_service, service, "status"]
+    )
     return retval == 0
 
 
+def is_service_enabled(runner, service, instance=None):
+    """
+    Check if specified service is enabled in local system.
+
+    runner -- CommandRunner
+    service -- name of service
+    """
+    if is_systemctl():
+        return get_services_state(
+            runner, [service], instance
+        )[service]["enabled"]
+    return _is_non_systemd_service_enabled(runner, service)
+
+
 def is_service_running(runner, service, instance=None):
     """
     Check if specified service is currently running on local system.
@@ -249,17 +356,10 @@ def is_service_running(runner, service, instance=None):
     service -- name of service
     """
     if is_systemctl():
-        dummy_stdout, dummy_stderr, retval = runner.run([
-            _systemctl,
-            "is-active",
-            _get_service_name(service, instance)
-        ])
-    else:
-        dummy_stdout, dummy_stderr, retval = runner.run(
-            [_service, service, "status"]
-        )
-
-    return retval == 0
+        return get_services_state(
+            runner, [service], instance
+        )[service]["running"]
+    return _is_non_systemd_service_running(runner, service)
 
 
 def is_service_installed(runner, service, instance=None):
@@ -271,10 +371,10 @@ def is_service_installed(runner, service, instance=None):
     instance -- systemd service instance
     """
     if is_systemctl():
-        service_name = "{0}{1}".format(service, "" if instance is None else "@")
-        return service_name in get_systemd_services(runner)
-    else:
-        return service in get_non_systemd_services(runner)
+        return get_services_state(
+            runner, [service], instance
+        )[service]["installed"]
+    return service in get_non_systemd_services(runner)
 
 
 def get_non_systemd_services(runner):
@@ -444,10 +544,13 @@ class CommandRunner(object):
 
 class NodeCommunicationException(Exception):
     # pylint: disable=super-init-not-called
-    def __init__(self, node, command, reason):
+    def __init__(self, node, command, reason, request_sent=True):
         self.node = node
         self.command = command
         self.reason = reason
+        # False if the request has not reached the node, so it is safe to send
+        # it again, e.g. to another address of the node
+        self.request_sent = request_sent
 
 
 class NodeConnectionException(NodeCommunicationException):
@@ -508,6 +611,77 @@ def node_communicator_exception_to_report_item(
         )
     raise e
 
+class _NodeTransfer(object):
+    """
+    State of one request sent by NodeCommunicator
+    """
+    def __init__(self, handler, host, request):
+        self.handler = handler
+        self.host = host
+        self.request = request
+        self.url = "https://{host}:2224/{request}".format(
+            host=("[{0}]".format(host) if ":" in host else host),
+            request=request
+        )
+        self.output = io.BytesIO()
+        self.debug_output = io.BytesIO()
+        # False if the connection failed and the handler should not be reused
+        self.reusable = True
+        # True once the request has been sent, the node may have processed it
+        # even if no response comes then
+        self.request_sent = False
+
+
+class UnreachableHostCache(object):
+    """
+    Remembers hosts which could not be connected to
+
+    A request to such a host fails at once with the error of the failed
+    connection instead of waiting for the connection to time out again.
+    """
+    def __init__(self, ttl):
+        """
+        float ttl -- for how many seconds a host is considered unreachable,
+            0 disables the cache
+        """
+        self._ttl = ttl
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def get_failure(self, host):
+        """
+        Return the exception of the last failed connection to the host or None
+            if the host is not considered unreachable
+
+        string host -- host address
+        """
+        with self._lock:
+            failure = self._failures.get(host)
+            if failure is None:
+                return None
+            failed_at, exception = failure
+            if time.time() - failed_at >= self._ttl:
+                del self._failures[host]
+                return None
+            return exception
+
+    def add_failure(self, host, exception):
+        """
+        string host -- host address
+        NodeCommunicationException exception -- the connection error
+        """
+        if self._ttl > 0:
+            with self._lock:
+                self._failures[host] = (time.time(), exception)
+
+    def remove_failure(self, host):
+        """
+        string host -- host address which has been connected to
+        """
+        with self._lock:
+            self._failures.pop(host, None)
+
+
 class NodeCommunicator(object):
     """
     Sends requests to nodes
@@ -529,13 +703,18 @@ class NodeCommunicator(object):
 
     def __init__(
         self, logger, reporter, auth_tokens, user=None, groups=None,
-        request_timeout=None
+        request_timeout=None, unreachable_host_cache=None,
+        node_host_cache=None
     ):
         """
         auth_tokens authorization tokens for nodes: {node: token}
         user username
         groups groups the user is member of
         request_timeout -- positive integer, time for one reqest in seconds
+        unreachable_host_cache -- UnreachableHostCache shared by communicators
+            of one library call, None means hosts are always connected to
+        node_host_cache -- dict shared by communicators of one library call,
+            remembers which address of a node responded: {ring0: address}
         """
         self._logger = logger
         self._reporter = reporter
@@ -543,6 +722,10 @@ class NodeCommunicator(object):
         self._user = user
         self._groups = groups
         self._request_timeout = request_timeout
+        self._unreachable_host_cache = unreachable_host_cache
+        self._node_host_cache = (
+            {} if node_host_cache is None else node_host_cache
+        )
 
     @property
     def request_timeout(self):
@@ -552,16 +735,47 @@ class NodeCommunicator(object):
                 else self._request_timeout
         )
 
-    def call_node(self, node_addr, request, data, request_timeout=None):
+    def call_node(
+        self, node_addr, request, data, request_timeout=None,
+        retry_unreachable=False
+    ):
         """
         Send a request to a node
         node_addr destination node, instance of NodeAddresses
         request command to be run on the node
         data command parameters, encoded by format_data_* method
-        """
-        return self.call_host(node_addr.ring0, request, data, request_timeout)
+        retry_unreachable connect even if the node was unreachable recently
 
-    def call_host(self, host, request, data, request_timeout=None):
+        If the node cannot be connected to using its ring0 address, its ring1
+        address is tried. The address which responded is used first next time.
+        """
+        host_list = self.__get_node_host_list(node_addr)
+        for host in host_list:
+            try:
+                response = self.__call_host(
+                    host,
+                    request,
+                    data,
+                    request_timeout,
+                    retry_unreachable,
+                    token_host=node_addr.ring0
+                )
+            except NodeCommunicationException as e:
+                if not e.request_sent:
+                    if host == host_list[-1]:
+                        raise
+                    self.__log_node_host_failover(node_addr, host)
+                    continue
+                # the node responded, its address works
+                self._node_host_cache[node_addr.ring0] = host
+                raise
+            self._node_host_cache[node_addr.ring0] = host
+            return response
+
+    def call_host(
+        self, host, request, data, request_timeout=None,
+        retry_unreachable=False
+    ):
         """
         Send a request to a host
         host host address
@@ -569,8 +783,216 @@ class NodeCommunicator(object):
         data command parameters, encoded by format_data_* method
         request timeout float timeout for request, if not set object property
             will be used
+        retry_unreachable connect even if the host was unreachable recently
+        """
+        return self.__call_host(
+            host, request, data, request_timeout, retry_unreachable
+        )
+
+    def __call_host(
+        self, host, request, data, request_timeout, retry_unreachable,
+        token_host=None
+    ):
+        exception = self.__get_unreachable_error(
+            host, request, retry_unreachable
+        )
+        if exception is not None:
+            raise exception
+        curl_handle_pool = get_curl_handle_pool()
+        transfer = self.__start_transfer(
+            curl_handle_pool.get_handle(host),
+            host,
+            request,
+            data,
+            request_timeout,
+            token_host
+        )
+        try:
+            transfer.handler.perform()
+            return self.__process_response(transfer)
+        except pycurl.error as e:
+            transfer.reusable = False
+            raise self.__process_connection_error(transfer, e)
+        finally:
+            self.__finish_transfer(transfer)
+            curl_handle_pool.put_handle(
+                host, transfer.handler, transfer.reusable
+            )
+
+    def call_nodes_many(
+        self, request_list, request_timeout=None, retry_unreachable=False
+    ):
+        """
+        Send requests to nodes at once, yield results as they come
+
+        All the requests are driven by one curl multi handle instead of
+        a thread for each request. At most settings.node_max_parallel requests
+        are being sent at the same time.
+
+        iterable request_list -- (node_addr, request, data) tuples, node_addr
+            is an instance of NodeAddresses, request is a command to be run on
+            the node, data are command parameters encoded by format_data_*
+        float request_timeout -- timeout for each request, if not set object
+            property will be used
+        bool retry_unreachable -- connect even to nodes which were unreachable
+            recently
+        Yields (index, response, exception) tuples in the order of the
+            requests being finished. Index is the index of the request in
+            request_list, exception is a NodeCommunicationException or None.
+            Requests to nodes which cannot be connected to using their ring0
+            address are sent to their ring1 address as in call_node.
         """
+        curl_handle_pool = get_curl_handle_pool()
+        waiting = deque([
+            (
+                index,
+                node_addr,
+                request,
+                data,
+                tuple(self.__get_node_host_list(node_addr))
+            )
+            for index, (node_addr, request, data) in enumerate(request_list)
+        ])
+        running = {}
+        multi_handler = pycurl.CurlMulti()
+
+        def finish(handler, error):
+            # Returns a result tuple or None if the request has been sent to
+            # the next address of the node.
+            request_info, transfer = running.pop(handler)
+            multi_handler.remove_handle(handler)
+            response, exception = None, None
+            try:
+                if error is None:
+                    response = self.__process_response(transfer)
+                else:
+                    transfer.reusable = False
+                    exception = self.__process_connection_error(
+                        transfer, error
+                    )
+            except NodeCommunicationException as e:
+                exception = e
+            finally:
+                self.__finish_transfer(transfer)
+                curl_handle_pool.put_handle(
+                    transfer.host, handler, transfer.reusable
+                )
+            return self.__finish_node_request(
+                waiting, request_info, response, exception
+            )
+
+        try:
+            while waiting or running:
+                while waiting and len(running) < settings.node_max_parallel:
+                    request_info = waiting.popleft()
+                    dummy_index, node_addr, request, data, host_list = (
+                        request_info
+                    )
+                    host = host_list[0]
+                    exception = self.__get_unreachable_error(
+                        host, request, retry_unreachable
+                    )
+                    if exception is not None:
+                        result = self.__finish_node_request(
+                            waiting, request_info, None, exception
+                        )
+                        if result is not None:
+                            yield result
+                        continue
+                    handler = curl_handle_pool.get_handle(host)
+                    running[handler] = (
+                        request_info,
+                        self.__start_transfer(
+                            handler,
+                            host,
+                            request,
+                            data,
+                            request_timeout,
+                            node_addr.ring0
+                        )
+                    )
+                    multi_handler.add_handle(handler)
+
+                while True:
+                    ret, dummy_handlers_count = multi_handler.perform()
+                    if ret != pycurl.E_CALL_MULTI_PERFORM:
+                        break
+
+                finished_list = []
+                while True:
+                    queued, ok_list, error_list = multi_handler.info_read()
+                    finished_list.extend([
+                        (handler, None) for handler in ok_list
+                    ])
+                    finished_list.extend([
+                        (handler, pycurl.error(errno, reason))
+                        for handler, errno, reason in error_list
+                    ])
+                    if not queued:
+                        break
+                for handler, error in finished_list:
+                    result = finish(handler, error)
+                    if result is not None:
+                        yield result
+
+                if running and not finished_list:
+                    # wait for a socket activity, timeouts are handled by curl
+                    multi_handler.select(1.0)
+        finally:
+            # the caller stopped reading results or something went wrong
+            for handler in list(running.keys()):
+                multi_handler.remove_handle(handler)
+                curl_handle_pool.put_handle(
+                    running.pop(handler)[1].host, handler, reusable=False
+                )
+            multi_handler.close()
+
+    def __get_node_host_list(self, node_addr):
+        """
+        Return addresses of a node in the order they should be tried in
+        """
+        host_list = [node_addr.ring0]
+        if node_addr.ring1:
+            host_list.append(node_addr.ring1)
+        preferred = self._node_host_cache.get(node_addr.ring0)
+        if preferred in host_list:
+            host_list.remove(preferred)
+            host_list.insert(0, preferred)
+        return host_list
+
+    def __log_node_host_failover(self, node_addr, host):
+        self._logger.debug(
+            "Unable to connect to {node} using {host}, trying its other "
+            "address".format(node=node_addr.label, host=host)
+        )
+
+    def __finish_node_request(self, waiting, request_info, response, exception):
+        """
+        Return a call_nodes_many result or None if the request has been queued
+            to be sent to the next address of the node
+        """
+        index, node_addr, request, data, host_list = request_info
+        if exception is not None and not exception.request_sent:
+            if len(host_list) > 1:
+                self.__log_node_host_failover(node_addr, host_list[0])
+                waiting.appendleft(
+                    (index, node_addr, request, data, host_list[1:])
+                )
+                return None
+        else:
+            # the node responded, its address works
+            self._node_host_cache[node_addr.ring0] = host_list[0]
+        return index, response, exception
+
+    def __start_transfer(
+        self, handler, host, request, data, request_timeout, token_host=None
+    ):
+        transfer = _NodeTransfer(handler, host, request)
+        debug_output = transfer.debug_output
+
         def __debug_callback(data_type, debug_data):
+            if data_type == pycurl.DEBUG_HEADER_OUT:
+                transfer.request_sent = True
             prefixes = {
                 pycurl.DEBUG_TEXT: b"* ",
                 pycurl.DEBUG_HEADER_IN: b"< ",
@@ -584,24 +1006,21 @@ class NodeCommunicator(object):
                 if not debug_data.endswith(b"\n"):
                     debug_output.write(b"\n")
 
-        output = io.BytesIO()
-        debug_output = io.BytesIO()
-        cookies = self.__prepare_cookies(host)
+        cookies = self.__prepare_cookies(host, token_host)
         timeout = (
             request_timeout
             if request_timeout is not None
             else self.request_timeout
         )
-        url = "https://{host}:2224/{request}".format(
-            host=("[{0}]".format(host) if ":" in host else host),
-            request=request
-        )
+        # do not wait for an unreachable address for the whole request timeout
+        connect_timeout = min(settings.node_connect_timeout, timeout)
+        url = transfer.url
 
-        handler = pycurl.Curl()
         handler.setopt(pycurl.PROTOCOLS, pycurl.PROTO_HTTPS)
         handler.setopt(pycurl.TIMEOUT_MS, int(timeout * 1000))
+        handler.setopt(pycurl.CONNECTTIMEOUT_MS, int(connect_timeout * 1000))
         handler.setopt(pycurl.URL, url.encode("utf-8"))
-        handler.setopt(pycurl.WRITEFUNCTION, output.write)
+        handler.setopt(pycurl.WRITEFUNCTION, transfer.output.write)
         handler.setopt(pycurl.VERBOSE, 1)
         handler.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
         handler.setopt(pycurl.SSL_VERIFYHOST, 0)
@@ -619,87 +1038,140 @@ class NodeCommunicator(object):
         self._reporter.process(
             reports.node_communication_started(url, data)
         )
+        return transfer
+
+    def __process_response(self, transfer):
+        host = transfer.host
+        request = transfer.request
+        if self._unreachable_host_cache is not None:
+            # the host responded, it is reachable now
+            self._unreachable_host_cache.remove_failure(host)
         result_msg = (
             "Finished calling: {url}\nResponse Code: {code}"
             + "\n--Debug Response Start--\n{response}\n--Debug Response End--"
         )
-
-        try:
-            handler.perform()
-            response_data = output.getvalue().decode("utf-8")
-            response_code = handler.getinfo(pycurl.RESPONSE_CODE)
-            self._logger.debug(result_msg.format(
-                url=url,
-                code=response_code,
-                response=response_data
-            ))
-            self._reporter.process(reports.node_communication_finished(
-                url, response_code, response_data
-            ))
-            if response_code == 400:
-                # old pcsd protocol: error messages are commonly passed in plain
-                # text in response body with HTTP code 400
-                # we need to be backward compatible with that
-                raise NodeCommandUnsuccessfulException(
-                    host, request, response_data.rstrip()
-                )
-            elif response_code == 401:
-                raise NodeAuthenticationException(
-                    host, request, "HTTP error: {0}".format(response_code)
-                )
-            elif response_code == 403:
-                raise NodePermissionDeniedException(
-                    host, request, "HTTP error: {0}".format(response_code)
-                )
-            elif response_code == 404:
-                raise NodeUnsupportedCommandException(
-                    host, request, "HTTP error: {0}".format(response_code)
-                )
-            elif response_code >= 400:
-                raise NodeCommunicationException(
-                    host, request, "HTTP error: {0}".format(response_code)
-                )
-            return response_data
-        except pycurl.error as e:
-            # In pycurl versions lower then 7.19.3 it is not possible to set
-            # NOPROXY option. Therefore for the proper support of proxy settings
-            # we have to use environment variables.
-            if is_proxy_set(os.environ):
-                self._logger.warning("Proxy is set")
-                self._reporter.process(
-                    reports.node_communication_proxy_is_set()
-                )
-            errno, reason = e.args
-            msg = "Unable to connect to {node} ({reason})"
-            self._logger.debug(msg.format(node=host, reason=reason))
-            self._reporter.process(
-                reports.node_communication_not_connected(host, reason)
+        response_data = transfer.output.getvalue().decode("utf-8")
+        response_code = transfer.handler.getinfo(pycurl.RESPONSE_CODE)
+        self._logger.debug(result_msg.format(
+            url=transfer.url,
+            code=response_code,
+            response=response_data
+        ))
+        self._reporter.process(reports.node_communication_finished(
+            transfer.url, response_code, response_data
+        ))
+        if response_code == 400:
+            # old pcsd protocol: error messages are commonly passed in plain
+            # text in response body with HTTP code 400
+            # we need to be backward compatible with that
+            raise NodeCommandUnsuccessfulException(
+                host, request, response_data.rstrip()
             )
-            if errno == pycurl.E_OPERATION_TIMEDOUT:
-                raise NodeConnectionTimedOutException(host, request, reason)
-            else:
-                raise NodeConnectionException(host, request, reason)
-        finally:
-            debug_data = debug_output.getvalue().decode("utf-8", "ignore")
-            self._logger.debug(
-                (
-                    "Communication debug info for calling: {url}\n"
-                    "--Debug Communication Info Start--\n"
-                    "{data}\n"
-                    "--Debug Communication Info End--"
-                ).format(url=url, data=debug_data)
+        elif response_code == 401:
+            raise NodeAuthenticationException(
+                host, request, "HTTP error: {0}".format(response_code)
+            )
+        elif response_code == 403:
+            raise NodePermissionDeniedException(
+                host, request, "HTTP error: {0}".format(response_code)
+            )
+        elif response_code == 404:
+            raise NodeUnsupportedCommandException(
+                host, request, "HTTP error: {0}".format(response_code)
+            )
+        elif response_code >= 400:
+            raise NodeCommunicationException(
+                host, request, "HTTP error: {0}".format(response_code)
             )
+        return response_data
+
+    def __get_unreachable_error(self, host, request, retry_unreachable):
+        """
+        Return an exception to be raised if the host was unreachable recently
+        """
+        if self._unreachable_host_cache is None or retry_unreachable:
+            return None
+        failure = self._unreachable_host_cache.get_failure(host)
+        if failure is None:
+            return None
+        self._logger.debug(
+            "Not connecting to {node}, it was unreachable ({reason})".format(
+                node=host, reason=failure.reason
+            )
+        )
+        self._reporter.process(
+            reports.node_communication_not_connected(host, failure.reason)
+        )
+        return failure.__class__(
+            host, request, failure.reason, request_sent=False
+        )
+
+    def __process_connection_error(self, transfer, error):
+        """
+        Report a pycurl error, return an exception to be raised
+        """
+        host = transfer.host
+        # In pycurl versions lower then 7.19.3 it is not possible to set
+        # NOPROXY option. Therefore for the proper support of proxy settings
+        # we have to use environment variables.
+        if is_proxy_set(os.environ):
+            self._logger.warning("Proxy is set")
             self._reporter.process(
-                reports.node_communication_debug_info(url, debug_data)
+                reports.node_communication_proxy_is_set()
             )
+        errno, reason = error.args
+        msg = "Unable to connect to {node} ({reason})"
+        self._logger.debug(msg.format(node=host, reason=reason))
+        self._reporter.process(
+            reports.node_communication_not_connected(host, reason)
+        )
+        # Only a request which has not been sent may be sent to another
+        # address of the node. A request sent over a reused connection does
+        # not need a new connection to be established, so the connection
+        # state cannot tell whether the request has been delivered.
+        exception_class = (
+            NodeConnectionTimedOutException
+            if errno == pycurl.E_OPERATION_TIMEDOUT
+            else NodeConnectionException
+        )
+        exception = exception_class(
+            host, transfer.request, reason, transfer.request_sent
+        )
+        if (
+            not transfer.request_sent
+            and
+            self._unreachable_host_cache is not None
+        ):
+            self._unreachable_host_cache.add_failure(host, exception)
+        return exception
+
+    def __finish_transfer(self, transfer):
+        debug_data = transfer.debug_output.getvalue().decode("utf-8", "ignore")
+        self._logger.debug(
+            (
+                "Communication debug info for calling: {url}\n"
+                "--Debug Communication Info Start--\n"
+                "{data}\n"
+                "--Debug Communication Info End--"
+            ).format(url=transfer.url, data=debug_data)
+        )
+        self._reporter.process(
+            reports.node_communication_debug_info(transfer.url, debug_data)
+        )
 
-    def __prepare_cookies(self, host):
+    def __prepare_cookies(self, host, token_host=None):
         # Let's be safe about characters in variables (they can come from env)
         # and do base64. We cannot do it for CIB_user however to be backward
         # compatible so we at least remove disallowed characters.
         cookies = []
-        if host in self._auth_tokens:
-            cookies.append("token={0}".format(self._auth_tokens[host]))
+        # nodes are authenticated by their ring0 address, use its token when
+        # connecting to their ring1 address
+        for token_key in (host, token_host):
+            if token_key in self._auth_tokens:
+                cookies.append(
+                    "token={0}".format(self._auth_tokens[token_key])
+                )
+                break
         if self._user:
             cookies.append("CIB_user={0}".format(
                 re.sub(r"[^!-~]", "", self._user).replace(";", "")
@@ -730,21 +1202,25 @@ def parallel_nodes_communication_helper(
     if skip_offline_nodes:
         failure_severity = ReportItemSeverity.WARNING
         failure_forceable = None
-    report_items = []
 
     def _parallel(*args, **kwargs):
         try:
             func(*args, **kwargs)
         except NodeCommunicationException as e:
-            report_items.append(
+            return [
                 node_communicator_exception_to_report_item(
                     e,
                     failure_severity,
                     failure_forceable
                 )
-            )
+            ]
         except LibraryError as e:
-            report_items.extend(e.args)
+            return list(e.args)
+        return []
 
-    tools_run_parallel(_parallel, func_args_kwargs)
+    report_items = []
+    for node_report_items in tools_run_parallel(
+        _parallel, func_args_kwargs
+    ):
+        report_items.extend(node_report_items)
     reporter.process_list(report_items)
@@ -23,6 +23,49 @@ from pcs.lib.corosync import (
 )
 
 
+def run_steps_on_nodes(node_list, step_list):
+    """
+    Run a chain of steps for each node, nodes do not wait for each other
+
+    Each node runs the steps one after another and stops at its first failed
+    step. Unlike running each step on all nodes before the next one, a slow
+    node does not hold up the others. Call this function again to put
+    a barrier between steps where all nodes have to finish a step first.
+    Raises LibraryError with reports of all failed nodes.
+
+    iterable node_list -- NodeAddresses of nodes to run the steps for
+    list step_list -- callables, each takes NodeAddresses of a node
+    """
+    def _run_node_steps(node):
+        try:
+            for step in step_list:
+                step(node)
+        except NodeCommunicationException as e:
+            return [node_communicator_exception_to_report_item(e)]
+        except LibraryError as e:
+            return list(e.args)
+        return []
+
+    report_list = []
+    for node_report_list in tools_run_parallel(
+        _run_node_steps,
+        [((node, ), {}) for node in node_list]
+    ):
+        report_list.extend(node_report_list)
+    if report_list:
+        raise LibraryError(*report_list)
+
+def _node_reports_in_order(node_report_map):
+    """
+    Return reports of nodes in the order the nodes were given
+
+    dict node_report_map -- index of a node: list of its reports
+    """
+    report_list = []
+    for index in sorted(node_report_map):
+        report_list.extend(node_report_map[index])
+    return report_list
+
 def distribute_corosync_conf(
     node_communicator, reporter, node_addr_list, config_text,
     skip_offline_nodes=False
@@ -38,40 +81,36 @@ def distribute_corosync_conf(
     if skip_offline_nodes:
         failure_severity = ReportItemSeverity.WARNING
         failure_forceable = None
-    report_items = []
 
-    def _parallel(node):
-        try:
-            corosync_live.set_remote_corosync_conf(
-                node_communicator,
-                node,
-                config_text
-            )
+    node_list = list(node_addr_list)
+    reporter.process(reports.corosync_config_distribution_started())
+    # successes are reported as nodes respond, errors are reported at the end
+    # in the order the nodes were given
+    node_report_map = {}
+    for index, dummy_response, exception in (
+        corosync_live.set_remote_corosync_conf_many(
+            node_communicator, node_list, config_text
+        )
+    ):
+        node = node_list[index]
+        if exception is None:
             reporter.process(
                 reports.corosync_config_accepted_by_node(node.label)
             )
-        except NodeCommunicationException as e:
-            report_items.append(
-                node_communicator_exception_to_report_item(
-                    e,
-                    failure_severity,
-                    failure_forceable
-                )
-            )
-            report_items.append(
-                reports.corosync_config_distribution_node_error(
-                    node.label,
-                    failure_severity,
-                    failure_forceable
-                )
-            )
-
-    reporter.process(reports.corosync_config_distribution_started())
-    tools_run_parallel(
-        _parallel,
-        [((node, ), {}) for node in node_addr_list]
-    )
-    reporter.process_list(report_items)
+            continue
+        node_report_map[index] = [
+            node_communicator_exception_to_report_item(
+                exception,
+                failure_severity,
+                failure_forceable
+            ),
+            reports.corosync_config_distribution_node_error(
+                node.label,
+                failure_severity,
+                failure_forceable
+            ),
+        ]
+    reporter.process_list(_node_reports_in_order(node_report_map))
 
 def check_corosync_offline_on_nodes(
     node_communicator, reporter, node_addr_list, skip_offline_nodes=False
@@ -86,49 +125,48 @@ def check_corosync_offline_on_nodes(
     if skip_offline_nodes:
         failure_severity = ReportItemSeverity.WARNING
         failure_forceable = None
-    report_items = []
 
-    def _parallel(node):
-        try:
-            status = node_communicator.call_node(node, "remote/status", None)
-            if not json.loads(status)["corosync"]:
-                reporter.process(
-                    reports.corosync_not_running_on_node_ok(node.label)
-                )
-            else:
-                report_items.append(
-                    reports.corosync_running_on_node_fail(node.label)
-                )
-        except NodeCommunicationException as e:
-            report_items.append(
+    node_list = list(node_addr_list)
+    reporter.process(reports.corosync_not_running_check_started())
+    # successes are reported as nodes respond, errors are reported at the end
+    # in the order the nodes were given
+    node_report_map = {}
+    for index, status, exception in node_communicator.call_nodes_many([
+        (node, "remote/status", None) for node in node_list
+    ]):
+        node = node_list[index]
+        if exception is not None:
+            node_report_map[index] = [
                 node_communicator_exception_to_report_item(
-                    e,
+                    exception,
                     failure_severity,
                     failure_forceable
-                )
-            )
-            report_items.append(
+                ),
                 reports.corosync_not_running_check_node_error(
                     node.label,
                     failure_severity,
                     failure_forceable
+                ),
+            ]
+            continue
+        try:
+            if not json.loads(status)["corosync"]:
+                reporter.process(
+                    reports.corosync_not_running_on_node_ok(node.label)
                 )
-            )
+            else:
+                node_report_map[index] = [
+                    reports.corosync_running_on_node_fail(node.label)
+                ]
         except (ValueError, LookupError):
-            report_items.append(
+            node_report_map[index] = [
                 reports.corosync_not_running_check_node_error(
                     node.label,
                     failure_severity,
                     failure_forceable
                 )
-            )
-
-    reporter.process(reports.corosync_not_running_check_started())
-    tools_run_parallel(
-        _parallel,
-        [((node, ), {}) for node in node_addr_list]
-    )
-    reporter.process_list(report_items)
+            ]
+    reporter.process_list(_node_reports_in_order(node_report_map))
 
 def qdevice_reload_on_nodes(
     node_communicator, reporter, node_addr_list, skip_offline_nodes=False
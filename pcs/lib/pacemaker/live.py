@@ -14,9 +14,13 @@ from pcs.common.tools import (
     xml_fromstring
 )
 from pcs.lib import reports
-from pcs.lib.cib.tools import get_pacemaker_version_by_which_cib_was_validated
+from pcs.lib.cib.tools import (
+    create_cib_parser,
+    get_pacemaker_version_by_which_cib_was_validated,
+)
 from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.state import ClusterState
+from pcs.lib.tools import write_tmpfile
 
 
 __EXITCODE_WAIT_TIMEOUT = 62
@@ -62,7 +66,7 @@ def get_cib_xml(runner, scope=None):
     return stdout
 
 def parse_cib_xml(xml):
-    return xml_fromstring(xml)
+    return xml_fromstring(xml, create_cib_parser())
 
 def get_cib(xml):
     try:
@@ -82,6 +86,45 @@ def replace_cib_configuration_xml(runner, xml):
     if retval != 0:
         raise LibraryError(reports.cib_push_error(stderr, stdout))
 
+def diff_cibs_xml(runner, cib_old_xml, cib_new_xml):
+    """
+    Return xml diff of two CIBs, an empty string if the CIBs are the same
+
+    CommandRunner runner
+    string cib_old_xml -- original CIB
+    string cib_new_xml -- modified CIB
+    """
+    try:
+        cib_old_tmp_file = write_tmpfile(cib_old_xml)
+        cib_new_tmp_file = write_tmpfile(cib_new_xml)
+    except EnvironmentError as e:
+        raise LibraryError(reports.cib_save_tmp_error(str(e)))
+    try:
+        stdout, stderr, retval = runner.run([
+            __exec("crm_diff"),
+            "--original", cib_old_tmp_file.name,
+            "--new", cib_new_tmp_file.name,
+            "--no-version",
+        ])
+    finally:
+        cib_old_tmp_file.close()
+        cib_new_tmp_file.close()
+    # crm_diff returns 0 when the CIBs are the same and 1 when they differ
+    if retval > 1:
+        raise LibraryError(reports.cib_diff_error(stderr.strip()))
+    return stdout.strip()
+
+def push_cib_diff_xml(runner, cib_diff_xml):
+    cmd = [
+        __exec("cibadmin"),
+        "--patch",
+        "--verbose",
+        "--xml-pipe",
+    ]
+    stdout, stderr, retval = runner.run(cmd, stdin_string=cib_diff_xml)
+    if retval != 0:
+        raise LibraryError(reports.cib_push_error(stderr, stdout))
+
 def replace_cib_configuration(runner, tree):
     #etree returns bytes: b'xml'
     #python 3 removed .encode() from bytes
@@ -211,9 +254,12 @@ def get_local_node_name(runner):
         )
     return node_name
 
-def get_local_node_status(runner):
+def get_local_node_status(runner, validate=True):
     try:
-        cluster_status = ClusterState(get_cluster_status_xml(runner))
+        cluster_status = ClusterState(
+            get_cluster_status_xml(runner),
+            validate=validate
+        )
     except CrmMonErrorException:
         return {"offline": True}
     node_name = get_local_node_name(runner)
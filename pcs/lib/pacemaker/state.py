@@ -57,18 +57,27 @@ class _Children(object):
         self.dom_part = dom_part
         self.children = children
         self.sections = sections
+        # the wrapped dom is not expected to change, so the results of findall
+        # are kept to not walk the dom again on each attribute access
+        self._cache = {}
 
     def __getattr__(self, name):
         if name in self.children.keys():
-            element_name, wrapper = self.children[name]
-            return [
-                wrapper(element)
-                for element in self.dom_part.findall('.//' + element_name)
-            ]
+            if name not in self._cache:
+                element_name, wrapper = self.children[name]
+                self._cache[name] = [
+                    wrapper(element)
+                    for element in self.dom_part.findall('.//' + element_name)
+                ]
+            return list(self._cache[name])
 
         if name in self.sections.keys():
-            element_name, wrapper = self.sections[name]
-            return wrapper(self.dom_part.findall('.//' + element_name)[0])
+            if name not in self._cache:
+                element_name, wrapper = self.sections[name]
+                self._cache[name] = wrapper(
+                    self.dom_part.findall('.//' + element_name)[0]
+                )
+            return self._cache[name]
 
         raise AttributeError(
             "'{0}' does not declare child or section '{1}'"
@@ -135,11 +144,44 @@ class _NodeSection(_Element):
         'nodes': ('node', _Node),
     }
 
-def get_cluster_state_dom(xml):
+# schema path -> (schema mtime, compiled schema)
+_relaxng_cache = {}
+
+def _get_relaxng(schema_path):
+    """
+    Return compiled RelaxNG schema or None if the schema file does not exist
+
+    Compiled schemas are kept for the whole process and recompiled only when
+    the schema file changes.
+
+    string schema_path -- path to a RelaxNG schema file
+    """
+    try:
+        mtime = os.path.getmtime(schema_path)
+    except OSError:
+        _relaxng_cache.pop(schema_path, None)
+        return None
+    cached = _relaxng_cache.get(schema_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    schema = etree.RelaxNG(file=schema_path)
+    _relaxng_cache[schema_path] = (mtime, schema)
+    return schema
+
+def get_cluster_state_dom(xml, validate=True):
+    """
+    Parse crm_mon xml output
+
+    string xml -- crm_mon xml output
+    bool validate -- check the document against the crm_mon schema, it may be
+        turned off when the status is polled repeatedly
+    """
     try:
         dom = xml_fromstring(xml)
-        if os.path.isfile(settings.crm_mon_schema):
-            etree.RelaxNG(file=settings.crm_mon_schema).assertValid(dom)
+        if validate:
+            schema = _get_relaxng(settings.crm_mon_schema)
+            if schema is not None:
+                schema.assertValid(dom)
         return dom
     except (etree.XMLSyntaxError, etree.DocumentInvalid):
         raise LibraryError(reports.cluster_state_invalid_format())
@@ -150,8 +192,8 @@ class ClusterState(_Element):
         'node_section': ('nodes', _NodeSection),
     }
 
-    def __init__(self, xml):
-        self.dom = get_cluster_state_dom(xml)
+    def __init__(self, xml, validate=True):
+        self.dom = get_cluster_state_dom(xml, validate)
         super(ClusterState, self).__init__(self.dom)
 
 def get_resource_roles_with_nodes(cluster_state, resource_id):
@@ -178,19 +220,30 @@ def get_resource_roles_with_nodes(cluster_state, resource_id):
 def ensure_resource_state(
     expected_running, report_processor, cluster_state, resource_id
 ):
+    report_processor.process(get_resource_state_report(
+        expected_running, cluster_state, resource_id
+    ))
+
+def get_resource_state_report(expected_running, cluster_state, resource_id):
+    """
+    Return a report of the resource state, an error if the resource is not in
+        the expected state
+
+    bool expected_running -- True if the resource should be running
+    ClusterState cluster_state -- the cluster status
+    string resource_id -- id of the checked resource
+    """
     roles_with_nodes = get_resource_roles_with_nodes(
         cluster_state,
         resource_id
     )
-
     if not roles_with_nodes:
-        report_processor.process(reports.resource_does_not_run(
+        return reports.resource_does_not_run(
             resource_id,
             severities.INFO if not expected_running else severities.ERROR
-        ))
-    else:
-        report_processor.process(reports.resource_running_on_nodes(
-            resource_id,
-            roles_with_nodes,
-            severities.INFO if expected_running else severities.ERROR
-        ))
+        )
+    return reports.resource_running_on_nodes(
+        resource_id,
+        roles_with_nodes,
+        severities.INFO if expected_running else severities.ERROR
+    )
@@ -281,6 +281,122 @@ class ReplaceCibConfigurationTest(LibraryPacemakerTest):
             stdin_string=xml
         )
 
+@mock.patch("pcs.lib.pacemaker.live.write_tmpfile")
+class DiffCibsXmlTest(LibraryPacemakerTest):
+    def setUp(self):
+        self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        self.old_tmpfile = mock.Mock()
+        self.old_tmpfile.name = "/tmp/old.pcs"
+        self.new_tmpfile = mock.Mock()
+        self.new_tmpfile.name = "/tmp/new.pcs"
+
+    def assert_crm_diff_called(self, mock_write_tmpfile):
+        self.assertEqual(
+            [mock.call("<cib old/>"), mock.call("<cib new/>")],
+            mock_write_tmpfile.mock_calls
+        )
+        self.mock_runner.run.assert_called_once_with([
+            self.path("crm_diff"),
+            "--original", "/tmp/old.pcs",
+            "--new", "/tmp/new.pcs",
+            "--no-version",
+        ])
+        self.old_tmpfile.close.assert_called_once_with()
+        self.new_tmpfile.close.assert_called_once_with()
+
+    def test_success(self, mock_write_tmpfile):
+        mock_write_tmpfile.side_effect = [self.old_tmpfile, self.new_tmpfile]
+        self.mock_runner.run.return_value = ("<diff/>\n", "", 1)
+
+        self.assertEqual(
+            "<diff/>",
+            lib.diff_cibs_xml(self.mock_runner, "<cib old/>", "<cib new/>")
+        )
+        self.assert_crm_diff_called(mock_write_tmpfile)
+
+    def test_no_difference(self, mock_write_tmpfile):
+        mock_write_tmpfile.side_effect = [self.old_tmpfile, self.new_tmpfile]
+        self.mock_runner.run.return_value = ("", "", 0)
+
+        self.assertEqual(
+            "",
+            lib.diff_cibs_xml(self.mock_runner, "<cib old/>", "<cib new/>")
+        )
+        self.assert_crm_diff_called(mock_write_tmpfile)
+
+    def test_difference_with_stderr(self, mock_write_tmpfile):
+        mock_write_tmpfile.side_effect = [self.old_tmpfile, self.new_tmpfile]
+        self.mock_runner.run.return_value = ("<diff/>\n", "a warning\n", 1)
+
+        self.assertEqual(
+            "<diff/>",
+            lib.diff_cibs_xml(self.mock_runner, "<cib old/>", "<cib new/>")
+        )
+        self.assert_crm_diff_called(mock_write_tmpfile)
+
+    def test_error(self, mock_write_tmpfile):
+        mock_write_tmpfile.side_effect = [self.old_tmpfile, self.new_tmpfile]
+        self.mock_runner.run.return_value = ("", "an error\n", 2)
+
+        assert_raise_library_error(
+            lambda: lib.diff_cibs_xml(
+                self.mock_runner, "<cib old/>", "<cib new/>"
+            ),
+            (
+                Severity.ERROR,
+                report_codes.CIB_DIFF_ERROR,
+                {
+                    "reason": "an error",
+                }
+            )
+        )
+        self.assert_crm_diff_called(mock_write_tmpfile)
+
+    def test_tmpfile_error(self, mock_write_tmpfile):
+        mock_write_tmpfile.side_effect = EnvironmentError("no space left")
+
+        assert_raise_library_error(
+            lambda: lib.diff_cibs_xml(
+                self.mock_runner, "<cib old/>", "<cib new/>"
+            ),
+            (
+                Severity.ERROR,
+                report_codes.CIB_SAVE_TMP_ERROR,
+                {
+                    "reason": "no space left",
+                }
+            )
+        )
+        self.mock_runner.run.assert_not_called()
+
+class PushCibDiffXmlTest(LibraryPacemakerTest):
+    def test_success(self):
+        mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        mock_runner.run.return_value = ("", "", 0)
+
+        lib.push_cib_diff_xml(mock_runner, "<diff/>")
+
+        mock_runner.run.assert_called_once_with(
+            [self.path("cibadmin"), "--patch", "--verbose", "--xml-pipe"],
+            stdin_string="<diff/>"
+        )
+
+    def test_error(self):
+        mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        mock_runner.run.return_value = ("expected output", "an error", 1)
+
+        assert_raise_library_error(
+            lambda: lib.push_cib_diff_xml(mock_runner, "<diff/>"),
+            (
+                Severity.ERROR,
+                report_codes.CIB_PUSH_ERROR,
+                {
+                    "reason": "an error",
+                    "pushed_cib": "expected output",
+                }
+            )
+        )
+
 class UpgradeCibTest(TestCase):
     def setUp(self):
         self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
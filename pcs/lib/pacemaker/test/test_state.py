@@ -5,6 +5,10 @@ from __future__ import (
     unicode_literals,
 )
 
+import os
+import shutil
+import tempfile
+
 from pcs.test.tools.pcs_unittest import TestCase, mock
 from lxml import etree
 
@@ -67,6 +71,25 @@ class ChildrenTest(TestCase):
         children = _Children('test', self.dom, {}, {})
         self.assertRaises(AttributeError, lambda: children.some_section)
 
+    def test_walks_dom_once(self):
+        wrap = mock.Mock(side_effect=self.wrap)
+        children = _Children(
+            'test',
+            self.dom,
+            {'anys': ('any', wrap)},
+            {'some_section': ('some', wrap)}
+        )
+        self.assertEqual(['any.1', 'any.2'], children.anys)
+        self.assertEqual(['any.1', 'any.2'], children.anys)
+        self.assertEqual('some.0', children.some_section)
+        self.assertEqual('some.0', children.some_section)
+        self.assertEqual(3, wrap.call_count)
+
+    def test_returned_children_list_is_a_copy(self):
+        children = _Children('test', self.dom, {'anys': ('any', self.wrap)}, {})
+        children.anys.append('any.3')
+        self.assertEqual(['any.1', 'any.2'], children.anys)
+
 
 class TestBase(TestCase):
     def setUp(self):
@@ -97,6 +120,71 @@ class ClusterStatusTest(TestBase):
         )
 
 
+class GetRelaxngTest(TestCase):
+    schema = '''
+        <element name="status" xmlns="http://relaxng.org/ns/structure/1.0">
+            <attribute name="{0}"><text/></attribute>
+        </element>
+    '''
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.schema_path = os.path.join(self.tmp_dir, "crm_mon.rng")
+        state._relaxng_cache.clear()
+
+    def tearDown(self):
+        state._relaxng_cache.clear()
+        shutil.rmtree(self.tmp_dir)
+
+    def write_schema(self, attr_name, mtime):
+        with open(self.schema_path, "w") as schema_file:
+            schema_file.write(self.schema.format(attr_name))
+        os.utime(self.schema_path, (mtime, mtime))
+
+    def test_missing_schema(self):
+        self.assertIsNone(state._get_relaxng(self.schema_path))
+
+    def test_compile_schema_once(self):
+        self.write_schema("a", 1000)
+        schema = state._get_relaxng(self.schema_path)
+        self.assertTrue(schema.validate(etree.fromstring('<status a="1"/>')))
+        self.assertIs(schema, state._get_relaxng(self.schema_path))
+
+    def test_recompile_changed_schema(self):
+        self.write_schema("a", 1000)
+        schema = state._get_relaxng(self.schema_path)
+        self.write_schema("b", 2000)
+        new_schema = state._get_relaxng(self.schema_path)
+        self.assertIsNot(schema, new_schema)
+        self.assertFalse(
+            new_schema.validate(etree.fromstring('<status a="1"/>'))
+        )
+        self.assertTrue(
+            new_schema.validate(etree.fromstring('<status b="1"/>'))
+        )
+
+    def test_forget_removed_schema(self):
+        self.write_schema("a", 1000)
+        state._get_relaxng(self.schema_path)
+        os.remove(self.schema_path)
+        self.assertIsNone(state._get_relaxng(self.schema_path))
+        self.assertEqual({}, state._relaxng_cache)
+
+    def test_skip_validation(self):
+        self.write_schema("a", 1000)
+        with mock.patch.object(
+            state.settings, "crm_mon_schema", self.schema_path
+        ):
+            assert_raise_library_error(
+                lambda: state.get_cluster_state_dom('<status b="1"/>'),
+                (severities.ERROR, report_codes.BAD_CLUSTER_STATE_FORMAT, {})
+            )
+            dom = state.get_cluster_state_dom(
+                '<status b="1"/>', validate=False
+            )
+        self.assertEqual("1", dom.get("b"))
+
+
 class WorkWithClusterStatusNodesTest(TestBase):
     def fixture_node_string(self, **kwargs):
         attrs = dict(name='name', id='id', type='member')
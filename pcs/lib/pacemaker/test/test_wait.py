@@ -0,0 +1,65 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from pcs.test.tools.pcs_unittest import TestCase, mock
+
+import pcs.lib.pacemaker.wait as lib
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.sleep_list = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleep_list.append(seconds)
+        self.now += seconds
+
+class WaitForConditionTest(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(lib, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_condition_reached(self):
+        result_list = [None, None, "done"]
+        self.assertEqual(
+            "done",
+            lib.wait_for_condition(lambda: result_list.pop(0), 60)
+        )
+        self.assertEqual([0.25, 0.5, 1], self.clock.sleep_list)
+
+    def test_interval_limited(self):
+        result_list = [None] * 5 + [False]
+        self.assertEqual(
+            False,
+            lib.wait_for_condition(
+                lambda: result_list.pop(0), 60, initial_interval=1,
+                max_interval=4
+            )
+        )
+        self.assertEqual([1, 2, 4, 4, 4, 4], self.clock.sleep_list)
+
+    def test_timeout(self):
+        check = mock.Mock(return_value=None)
+        self.assertIsNone(lib.wait_for_condition(check, 5))
+        self.assertEqual([0.25, 0.5, 1, 2, 1.25], self.clock.sleep_list)
+        # checked right at the deadline
+        self.assertEqual(5, check.call_count)
+        self.assertEqual(1005.0, self.clock.now)
+
+    def test_no_timeout(self):
+        result_list = [None] * 20 + ["done"]
+        self.assertEqual(
+            "done",
+            lib.wait_for_condition(lambda: result_list.pop(0), None)
+        )
+        self.assertEqual(21, len(self.clock.sleep_list))
@@ -0,0 +1,42 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import time
+
+
+def wait_for_condition(
+    check, timeout, initial_interval=0.25, max_interval=2, backoff_factor=2
+):
+    """
+    Call check repeatedly until it reports the condition has been reached
+
+    The first check is done after initial_interval, the interval grows
+    exponentially up to max_interval then. So a condition reached shortly is
+    noticed soon while long waits do not run status tools too often.
+
+    callable check -- takes no arguments, returns None if the condition has not
+        been reached yet, anything else stops the waiting
+    float timeout -- seconds to wait at most, None means no limit
+    float initial_interval -- seconds to wait before the first check
+    float max_interval -- the longest time between two checks
+    float backoff_factor -- how much the interval grows after each check
+    Returns the value returned by check or None if the timeout elapsed
+    """
+    deadline = None if timeout is None else time.time() + timeout
+    interval = initial_interval
+    while True:
+        if deadline is not None:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            # check once more right before the deadline
+            interval = min(interval, remaining)
+        time.sleep(interval)
+        result = check()
+        if result is not None:
+            return result
+        interval = min(interval * backoff_factor, max_interval)
@@ -0,0 +1,85 @@
+"""
+Read pcsd authentication tokens without running pcsd-cli
+
+The tokens file is written by pcsd, pcs only reads it. The format is the same
+as the one pcsd understands (see PCSTokens in pcsd/config.rb).
+"""
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import json
+import os
+import threading
+
+from pcs import settings
+
+
+_cache_lock = threading.Lock()
+# tokens file path -> (file stat signature, tokens)
+_cache = {}
+
+def get_tokens_file_path():
+    """
+    Return the path of the tokens file of the user running pcs
+    """
+    # same rules as token_file_path in pcsd/cfgsync.rb
+    if os.environ.get("PCS_TOKEN_FILE"):
+        return os.environ["PCS_TOKEN_FILE"]
+    if os.geteuid() == 0:
+        return settings.pcsd_tokens_location
+    return os.path.expanduser("~/.pcs/tokens")
+
+def parse_tokens(text):
+    """
+    Return tokens {node: token} stored in the tokens file content
+
+    string text -- content of a tokens file
+    """
+    if not text or not text.strip():
+        return {}
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    if "format_version" in data and "tokens" in data:
+        # format version 2 and newer
+        tokens = data["tokens"] or {}
+        return tokens if isinstance(tokens, dict) else {}
+    # format version 1: the whole file is a {node: token} dict
+    return data
+
+def read_tokens(path=None):
+    """
+    Return tokens {node: token} of the user running pcs
+
+    The file is parsed once per process and parsed again only if it changes,
+    e.g. when nodes get authenticated during a pcs run.
+
+    string path -- tokens file path, defaults to the file of the current user
+    """
+    if path is None:
+        path = get_tokens_file_path()
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return {}
+    signature = (stat.st_mtime, stat.st_size, stat.st_ino)
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is None or cached[0] != signature:
+            try:
+                with open(path) as tokens_file:
+                    tokens = parse_tokens(tokens_file.read())
+            except EnvironmentError:
+                return {}
+            cached = (signature, tokens)
+            _cache[path] = cached
+    # callers get their own copy so they cannot spoil the cache
+    return dict(cached[1])
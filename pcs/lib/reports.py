@@ -1132,6 +1132,18 @@ def cib_push_error(reason, pushed_cib):
         }
     )
 
+def cib_diff_error(reason):
+    """
+    cannot obtain a diff of CIBs, only logged as the whole CIB is pushed then
+    string reason error description
+    """
+    return ReportItem.error(
+        report_codes.CIB_DIFF_ERROR,
+        info={
+            "reason": reason,
+        }
+    )
+
 def cib_save_tmp_error(reason):
     """
     cannot save CIB into a temporary file
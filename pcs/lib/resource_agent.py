@@ -5,15 +5,18 @@ from __future__ import (
     unicode_literals,
 )
 
+import hashlib
 import os
 import re
+import threading
 from collections import namedtuple
 
 from lxml import etree
 
 from pcs import settings
 from pcs.common import report_codes
-from pcs.common.tools import xml_fromstring
+from pcs.common.json_cache import read_json_cache, write_json_cache
+from pcs.common.tools import run_parallel_bounded, xml_fromstring
 from pcs.lib import reports
 from pcs.lib.errors import LibraryError, ReportItemSeverity
 from pcs.lib.pacemaker.values import is_true
@@ -75,6 +78,117 @@ def complete_all_intervals(raw_operation_list):
         operation_list.append(operation)
     return operation_list
 
+def _get_files_fingerprint(file_path_list):
+    """
+    Return a json-serializable description of the files' versions or None if
+        any of the files does not exist
+
+    list file_path_list -- paths of the files
+    """
+    fingerprint = []
+    for file_path in file_path_list:
+        try:
+            file_stat = os.stat(file_path)
+        except EnvironmentError:
+            return None
+        fingerprint.append([file_path, file_stat.st_mtime, file_stat.st_size])
+    return fingerprint
+
+def _get_metadata_cache_file_path(agent_name):
+    return os.path.join(
+        settings.agent_metadata_cache_dir,
+        hashlib.sha1(agent_name.encode("utf-8")).hexdigest()
+    )
+
+def _read_metadata_cache(agent_name, fingerprint):
+    cached = read_json_cache(_get_metadata_cache_file_path(agent_name))
+    try:
+        if (
+            cached["name"] == agent_name
+            and
+            cached["fingerprint"] == fingerprint
+        ):
+            return cached["metadata"]
+    except (TypeError, KeyError):
+        pass
+    return None
+
+# the cache is pruned at most once per pcs run
+_metadata_cache_prune_lock = threading.Lock()
+_metadata_cache_pruned = False
+
+def _prune_metadata_cache():
+    """
+    Remove cached metadata of agents whose files do not exist anymore
+
+    Without that entries of removed agents would stay in the cache forever.
+    Pruning reads the whole cache, so it is done only once per pcs run.
+    """
+    global _metadata_cache_pruned
+    with _metadata_cache_prune_lock:
+        if _metadata_cache_pruned:
+            return
+        _metadata_cache_pruned = True
+    cache_dir = settings.agent_metadata_cache_dir
+    try:
+        file_name_list = os.listdir(cache_dir)
+    except EnvironmentError:
+        return
+    for file_name in file_name_list:
+        cache_file_path = os.path.join(cache_dir, file_name)
+        cached = read_json_cache(cache_file_path)
+        try:
+            source_file_list = [item[0] for item in cached["fingerprint"]]
+        except (TypeError, KeyError, IndexError):
+            # not an entry, e.g. an entry being written by another pcs
+            continue
+        if _get_files_fingerprint(source_file_list) is None:
+            try:
+                os.remove(cache_file_path)
+            except EnvironmentError:
+                pass
+
+def _write_metadata_cache(agent_name, fingerprint, metadata):
+    cache_file_path = _get_metadata_cache_file_path(agent_name)
+    # Agents are removed by package updates which change other agents too. So
+    # the cache is pruned when an outdated entry is replaced, not when the
+    # cache is being filled.
+    if os.path.exists(cache_file_path):
+        _prune_metadata_cache()
+    # Only the cache dir is created, pcs var dir is created on install. The
+    # cache is only an optimization, pcs works without it.
+    write_json_cache(
+        cache_file_path,
+        {
+            "name": agent_name,
+            "fingerprint": fingerprint,
+            "metadata": metadata,
+        }
+    )
+
+def load_cached_metadata(agent_name, source_file_list, load_metadata):
+    """
+    Return metadata of an agent from the on-disk cache, load and cache them
+        if they are not cached yet or the agent has changed since
+
+    Metadata are cached only if all the files they come from exist. The cache
+    is invalidated when any of the files changes (e.g. by a package update).
+
+    string agent_name -- name of the agent, key in the cache
+    list source_file_list -- paths of files producing the metadata
+    callable load_metadata -- returns metadata string, it is only called
+        if the metadata are not cached
+    """
+    fingerprint = _get_files_fingerprint(source_file_list)
+    if fingerprint is None:
+        return load_metadata()
+    metadata = _read_metadata_cache(agent_name, fingerprint)
+    if metadata is None:
+        metadata = load_metadata()
+        _write_metadata_cache(agent_name, fingerprint, metadata)
+    return metadata
+
+
 class ResourceAgentError(Exception):
     # pylint: disable=super-init-not-called
     def __init__(self, agent, message=""):
@@ -253,9 +367,42 @@ def guess_resource_agent_full_name(runner, search_agent_name):
         ResourceAgent(runner, agent) for agent in possible_names
     ]
     # check if the agent is valid
-    return [
-        agent for agent in agent_candidates if agent.is_valid_metadata()
-    ]
+    valid_agents = []
+    for agent, (finished, valid, exception) in zip(
+        agent_candidates,
+        load_agents_in_parallel(
+            lambda agent: agent.is_valid_metadata(),
+            agent_candidates
+        )
+    ):
+        if exception is not None:
+            if not isinstance(exception, ResourceAgentError):
+                raise exception
+            # the agent cannot be used, skip it as an invalid one
+            continue
+        # an agent which has not provided its metadata in time is skipped
+        if finished and valid:
+            valid_agents.append(agent)
+    return valid_agents
+
+
+def load_agents_in_parallel(worker, data_list):
+    """
+    Run worker loading agents' metadata for each item of data_list in parallel
+
+    Loading metadata of an agent means running the agent, so several agents
+    are run at once and an agent which hangs is given up after a timeout.
+    Return a list of (finished, result, exception) in the order of data_list.
+
+    callable worker -- gets an item, loads metadata and returns a result
+    iterable data_list -- items to process, e.g. agent names
+    """
+    return run_parallel_bounded(
+        worker,
+        data_list,
+        settings.agent_metadata_max_parallel,
+        settings.agent_metadata_timeout
+    )
 
 
 def guess_exactly_one_resource_agent_full_name(runner, search_agent_name):
@@ -631,6 +778,14 @@ class StonithdMetadata(FakeAgentMetadata):
 
 
     def _load_metadata(self):
+        return load_cached_metadata(
+            self.get_name(),
+            [settings.stonithd_binary],
+            self._load_metadata_from_stonithd
+        )
+
+
+    def _load_metadata_from_stonithd(self):
         stdout, stderr, dummy_retval = self._runner.run(
             [settings.stonithd_binary, "metadata"]
         )
@@ -687,7 +842,25 @@ class CrmAgent(Agent):
         self._get_metadata()
         return self
 
+    def _get_agent_file_path(self):
+        """
+        Return path of the agent's executable or None if it is not known
+        """
+        return None
+
     def _load_metadata(self):
+        agent_file_path = self._get_agent_file_path()
+        if agent_file_path is None:
+            return self._load_metadata_from_crm_resource()
+        # crm_resource processes metadata of some agents, so its version
+        # matters as well
+        return load_cached_metadata(
+            self._get_full_name(),
+            [agent_file_path, _crm_resource],
+            self._load_metadata_from_crm_resource
+        )
+
+    def _load_metadata_from_crm_resource(self):
         env_path = ":".join([
             # otherwise pacemaker cannot run RHEL fence agents to get their
             # metadata
@@ -719,6 +892,18 @@ class ResourceAgent(CrmAgent):
     def get_name(self):
         return self._get_full_name()
 
+    def _get_agent_file_path(self):
+        # Metadata of other standards are generated by pacemaker or there is
+        # no single file to watch for changes.
+        if self.get_standard() != "ocf":
+            return None
+        return os.path.join(
+            settings.ocf_root,
+            "resource.d",
+            self.get_provider(),
+            self.get_type()
+        )
+
     def get_parameters(self):
         parameters = super(ResourceAgent, self).get_parameters()
         if (
@@ -802,6 +987,12 @@ class StonithAgent(CrmAgent):
     def get_name(self):
         return self.get_type()
 
+    def _get_agent_file_path(self):
+        # cluster-glue agents (e.g. external/ssh) are not cached
+        if "/" in self.get_type():
+            return None
+        return os.path.join(settings.fence_agent_binaries, self.get_type())
+
     def get_parameters(self):
         return (
             self._filter_parameters(
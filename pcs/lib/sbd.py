@@ -8,44 +8,16 @@ from __future__ import (
 import json
 
 from pcs import settings
-from pcs.common import tools
 from pcs.lib import (
     external,
+    nodes_task,
     reports,
 )
 from pcs.lib.tools import dict_to_environment_file
-from pcs.lib.external import (
-    NodeCommunicator,
-    node_communicator_exception_to_report_item,
-    NodeCommunicationException,
-)
+from pcs.lib.external import NodeCommunicator
 from pcs.lib.errors import LibraryError
 
 
-def _run_parallel_and_raise_lib_error_on_failure(func, param_list):
-    """
-    Run function func in parallel for all specified parameters in arg_list.
-    Raise LibraryError on any failure.
-
-    func -- function to be run
-    param_list -- list of tuples: (*args, **kwargs)
-    """
-    report_list = []
-
-    def _parallel(*args, **kwargs):
-        try:
-            func(*args, **kwargs)
-        except NodeCommunicationException as e:
-            report_list.append(node_communicator_exception_to_report_item(e))
-        except LibraryError as e:
-            report_list.extend(e.args)
-
-    tools.run_parallel(_parallel, param_list)
-
-    if report_list:
-        raise LibraryError(*report_list)
-
-
 def _even_number_of_nodes_and_no_qdevice(
     corosync_conf_facade, node_number_modifier=0
 ):
@@ -176,11 +148,12 @@ def check_sbd_on_all_nodes(report_processor, node_communicator, nodes_watchdog):
         as value
     """
     report_processor.process(reports.sbd_check_started())
-    _run_parallel_and_raise_lib_error_on_failure(
-        check_sbd_on_node,
+    nodes_task.run_steps_on_nodes(
+        sorted(nodes_watchdog),
         [
-            ([report_processor, node_communicator, node, watchdog], {})
-            for node, watchdog in sorted(nodes_watchdog.items())
+            lambda node: check_sbd_on_node(
+                report_processor, node_communicator, node, nodes_watchdog[node]
+            ),
         ]
     )
 
@@ -223,37 +196,6 @@ def set_sbd_config_on_node(
     )
 
 
-def set_sbd_config_on_all_nodes(
-    report_processor, node_communicator, node_list, config, watchdog_dict
-):
-    """
-    Send SBD configuration 'config' to all nodes in 'node_list'. Option
-        SBD_OPTS="-n <node_name>" is added automatically.
-    Raises LibraryError with all ReportItems in case of any failure.
-
-    report_processor --
-    node_communicator -- NodeCommunicator
-    node_list -- NodeAddressesList
-    config -- dictionary in format: <SBD config option>: <value>
-    watchdog_dict -- dictionary of watchdogs where key is NodeAdresses object
-        and value is path to watchdog
-    """
-    report_processor.process(reports.sbd_config_distribution_started())
-    _run_parallel_and_raise_lib_error_on_failure(
-        set_sbd_config_on_node,
-        [
-            (
-                [
-                    report_processor, node_communicator, node, config,
-                    watchdog_dict.get(node)
-                ],
-                {}
-            )
-            for node in node_list
-        ]
-    )
-
-
 def enable_sbd_service(communicator, node):
     """
     Enable SBD service on 'node'.
@@ -277,27 +219,6 @@ def enable_sbd_service_on_node(report_processor, node_communicator, node):
     report_processor.process(reports.service_enable_success("sbd", node.label))
 
 
-def enable_sbd_service_on_all_nodes(
-        report_processor, node_communicator, node_list
-):
-    """
-    Enable SBD service on all nodes in 'node_list'.
-    Raises LibraryError with all ReportItems in case of any failure.
-
-    report_processor --
-    node_communicator -- NodeCommunicator
-    node_list -- NodeAddressesList
-    """
-    report_processor.process(reports.sbd_enabling_started())
-    _run_parallel_and_raise_lib_error_on_failure(
-        enable_sbd_service_on_node,
-        [
-            ([report_processor, node_communicator, node], {})
-            for node in node_list
-        ]
-    )
-
-
 def disable_sbd_service(communicator, node):
     """
     Disable SBD service on 'node'.
@@ -320,27 +241,6 @@ def disable_sbd_service_on_node(report_processor, node_communicator, node):
     report_processor.process(reports.service_disable_success("sbd", node.label))
 
 
-def disable_sbd_service_on_all_nodes(
-    report_processor, node_communicator, node_list
-):
-    """
-    Disable SBD service on all nodes in 'node_list'.
-    Raises LibraryError with all ReportItems in case of any failure.
-
-    report_processor --
-    node_communicator -- NodeCommunicator
-    node_list -- NodeAddressesList
-    """
-    report_processor.process(reports.sbd_disabling_started())
-    _run_parallel_and_raise_lib_error_on_failure(
-        disable_sbd_service_on_node,
-        [
-            ([report_processor, node_communicator, node], {})
-            for node in node_list
-        ]
-    )
-
-
 def set_stonith_watchdog_timeout_to_zero(communicator, node):
     """
     Set cluster property 'stonith-watchdog-timeout' to value '0' on 'node'.
@@ -353,28 +253,6 @@ def set_stonith_watchdog_timeout_to_zero(communicator, node):
     )
 
 
-def set_stonith_watchdog_timeout_to_zero_on_all_nodes(
-    node_communicator, node_list
-):
-    """
-    Sets cluster property 'stonith-watchdog-timeout' to value '0' an all nodes
-        in 'node_list', even if cluster is not currently running on them (direct
-        editing CIB file).
-    Raises LibraryError with all ReportItems in case of any failure.
-
-    node_communicator -- NodeCommunicator
-    node_list -- NodeAddressesList
-    """
-    report_list = []
-    for node in node_list:
-        try:
-            set_stonith_watchdog_timeout_to_zero(node_communicator, node)
-        except NodeCommunicationException as e:
-            report_list.append(node_communicator_exception_to_report_item(e))
-    if report_list:
-        raise LibraryError(*report_list)
-
-
 def remove_stonith_watchdog_timeout(communicator, node):
     """
     Remove cluster property 'stonith-watchdog-timeout' on 'node'.
@@ -385,26 +263,6 @@ def remove_stonith_watchdog_timeout(communicator, node):
     communicator.call_node(node, "remote/remove_stonith_watchdog_timeout", None)
 
 
-def remove_stonith_watchdog_timeout_on_all_nodes(node_communicator, node_list):
-    """
-    Removes cluster property 'stonith-watchdog-timeout' from all nodes
-        in 'node_list', even if cluster is not currently running on them (direct
-        editing CIB file).
-    Raises LibraryError with all ReportItems in case of any failure.
-
-    node_communicator -- NodeCommunicator
-    node_list -- NodeAddressesList
-    """
-    report_list = []
-    for node in node_list:
-        try:
-            remove_stonith_watchdog_timeout(node_communicator, node)
-        except NodeCommunicationException as e:
-            report_list.append(node_communicator_exception_to_report_item(e))
-    if report_list:
-        raise LibraryError(*report_list)
-
-
 def get_default_sbd_config():
     """
     Returns default SBD configuration as dictionary.
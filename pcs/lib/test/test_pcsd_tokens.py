@@ -0,0 +1,134 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import json
+import os
+import shutil
+import tempfile
+
+from pcs.test.tools.pcs_unittest import TestCase, mock
+
+from pcs.lib import pcsd_tokens
+
+
+class GetTokensFilePathTest(TestCase):
+    @mock.patch.dict(os.environ, {"PCS_TOKEN_FILE": "/tmp/my_tokens"})
+    def test_environment_override(self):
+        self.assertEqual("/tmp/my_tokens", pcsd_tokens.get_tokens_file_path())
+
+    @mock.patch.dict(os.environ, {"PCS_TOKEN_FILE": ""})
+    @mock.patch("pcs.lib.pcsd_tokens.os.geteuid", lambda: 0)
+    def test_root(self):
+        self.assertEqual(
+            pcsd_tokens.settings.pcsd_tokens_location,
+            pcsd_tokens.get_tokens_file_path()
+        )
+
+    @mock.patch.dict(os.environ, {"PCS_TOKEN_FILE": ""})
+    @mock.patch("pcs.lib.pcsd_tokens.os.geteuid", lambda: 1000)
+    def test_user(self):
+        self.assertEqual(
+            os.path.expanduser("~/.pcs/tokens"),
+            pcsd_tokens.get_tokens_file_path()
+        )
+
+
+class ParseTokensTest(TestCase):
+    def test_empty(self):
+        self.assertEqual({}, pcsd_tokens.parse_tokens(""))
+        self.assertEqual({}, pcsd_tokens.parse_tokens("  \n"))
+
+    def test_invalid(self):
+        self.assertEqual({}, pcsd_tokens.parse_tokens("not a json"))
+        self.assertEqual({}, pcsd_tokens.parse_tokens("[1, 2]"))
+
+    def test_format_version_1(self):
+        self.assertEqual(
+            {"node1": "token1", "node2": "token2"},
+            pcsd_tokens.parse_tokens(
+                '{"node1": "token1", "node2": "token2"}'
+            )
+        )
+
+    def test_format_version_2(self):
+        self.assertEqual(
+            {"node1": "token1", "node2": "token2"},
+            pcsd_tokens.parse_tokens(json.dumps({
+                "format_version": 2,
+                "data_version": 5,
+                "tokens": {"node1": "token1", "node2": "token2"},
+            }))
+        )
+
+    def test_format_version_2_no_tokens(self):
+        self.assertEqual(
+            {},
+            pcsd_tokens.parse_tokens(
+                '{"format_version": 2, "data_version": 1, "tokens": null}'
+            )
+        )
+
+
+class ReadTokensTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "tokens")
+        pcsd_tokens._cache.clear()
+
+    def tearDown(self):
+        pcsd_tokens._cache.clear()
+        shutil.rmtree(self.tmp_dir)
+
+    def write_tokens(self, tokens, mtime):
+        with open(self.path, "w") as tokens_file:
+            tokens_file.write(json.dumps({
+                "format_version": 2,
+                "data_version": 1,
+                "tokens": tokens,
+            }))
+        os.utime(self.path, (mtime, mtime))
+
+    def test_missing_file(self):
+        self.assertEqual({}, pcsd_tokens.read_tokens(self.path))
+
+    def test_file_parsed_once(self):
+        self.write_tokens({"node1": "token1"}, 1000)
+        with mock.patch(
+            "pcs.lib.pcsd_tokens.parse_tokens",
+            side_effect=pcsd_tokens.parse_tokens
+        ) as mock_parse:
+            self.assertEqual(
+                {"node1": "token1"}, pcsd_tokens.read_tokens(self.path)
+            )
+            self.assertEqual(
+                {"node1": "token1"}, pcsd_tokens.read_tokens(self.path)
+            )
+        self.assertEqual(1, mock_parse.call_count)
+
+    def test_changed_file_parsed_again(self):
+        self.write_tokens({"node1": "token1"}, 1000)
+        self.assertEqual(
+            {"node1": "token1"}, pcsd_tokens.read_tokens(self.path)
+        )
+        self.write_tokens({"node1": "token1", "node2": "token2"}, 2000)
+        self.assertEqual(
+            {"node1": "token1", "node2": "token2"},
+            pcsd_tokens.read_tokens(self.path)
+        )
+
+    def test_cache_cannot_be_modified(self):
+        self.write_tokens({"node1": "token1"}, 1000)
+        pcsd_tokens.read_tokens(self.path)["node2"] = "token2"
+        self.assertEqual(
+            {"node1": "token1"}, pcsd_tokens.read_tokens(self.path)
+        )
+
+    @mock.patch("pcs.lib.pcsd_tokens.get_tokens_file_path")
+    def test_default_path(self, mock_path):
+        mock_path.return_value = self.path
+        self.write_tokens({"node1": "token1"}, 1000)
+        self.assertEqual({"node1": "token1"}, pcsd_tokens.read_tokens())
@@ -5,6 +5,9 @@ from __future__ import (
     unicode_literals,
 )
 
+import os
+import shutil
+import tempfile
 from lxml import etree
 from functools import partial
 
@@ -15,7 +18,7 @@ from pcs.test.tools.assertions import (
     assert_xml_equal,
     start_tag_error_text,
 )
-from pcs.test.tools.misc import create_patcher
+from pcs.test.tools.misc import TemporaryAgentMetadataCache, create_patcher
 from pcs.test.tools.pcs_unittest import TestCase, mock
 from pcs.test.tools.xml import XmlManipulation
 
@@ -27,6 +30,10 @@ from pcs.lib.external import CommandRunner
 patch_agent = create_patcher("pcs.lib.resource_agent")
 patch_agent_object = partial(mock.patch.object, lib_ra.Agent)
 
+_metadata_cache = TemporaryAgentMetadataCache()
+setUpModule = _metadata_cache.start
+tearDownModule = _metadata_cache.stop
+
 
 class GetDefaultInterval(TestCase):
     def test_return_0s_on_name_different_from_monitor(self):
@@ -586,15 +593,19 @@ class GuessResourceAgentFullNameTest(TestCase):
         )
 
     def test_two_agents_one_valid_list(self):
+        # metadata are loaded in parallel, so they must not depend on the
+        # order of the calls
+        listing = list(self.mock_runner_side_effect)
+        metadata = {
+            "ocf:heartbeat:Dummy": ("<resource-agent />", "", 0),
+            "ocf:pacemaker:Dummy": ("invalid metadata", "", 0),
+        }
+        def run(args, **kwargs):
+            if "--show-metadata" in args:
+                return metadata[args[-1]]
+            return listing.pop(0)
         mock_runner = mock.MagicMock(spec_set=CommandRunner)
-        mock_runner.run.side_effect = (
-            self.mock_runner_side_effect
-            +
-            [
-                ("<resource-agent />", "", 0),
-                ("invalid metadata", "", 0),
-            ]
-        )
+        mock_runner.run.side_effect = run
 
         self.assertEqual(
             [
@@ -675,6 +686,42 @@ class GuessResourceAgentFullNameTest(TestCase):
             []
         )
 
+    @mock.patch.object(lib_ra.ResourceAgent, "is_valid_metadata")
+    def test_skip_agent_error(self, mock_valid):
+        mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        mock_runner.run.side_effect = self.mock_runner_side_effect
+        mock_valid.side_effect = lib_ra.ResourceAgentError("agent")
+
+        self.assertEqual(
+            lib_ra.guess_resource_agent_full_name(mock_runner, "Delay"),
+            []
+        )
+
+    @mock.patch.object(lib_ra.ResourceAgent, "is_valid_metadata")
+    def test_raise_other_errors(self, mock_valid):
+        mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        mock_runner.run.side_effect = self.mock_runner_side_effect
+        mock_valid.side_effect = KeyError("unexpected")
+
+        self.assertRaises(
+            KeyError,
+            lambda: lib_ra.guess_resource_agent_full_name(mock_runner, "Delay")
+        )
+
+    @mock.patch("pcs.lib.resource_agent.load_agents_in_parallel")
+    def test_skip_timed_out_agent(self, mock_load):
+        mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        mock_runner.run.side_effect = self.mock_runner_side_effect
+        mock_load.return_value = [(False, None, None), (True, True, None)]
+
+        self.assertEqual(
+            [
+                agent.get_name() for agent in
+                lib_ra.guess_resource_agent_full_name(mock_runner, "dummy")
+            ],
+            ["ocf:pacemaker:Dummy"]
+        )
+
 
 @patch_agent_object("_get_metadata")
 class AgentMetadataGetShortdescTest(TestCase):
@@ -1896,3 +1943,203 @@ class AbsentResourceAgentTest(TestCase):
         self.assertEqual(([], []), absent.validate_parameters_values({
             "whatever": "anything"
         }))
+
+
+class LoadCachedMetadataTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache/")
+        self.agent_file = os.path.join(self.tmp_dir, "agent")
+        self.fixture_agent_file("agent")
+        self.load_metadata = mock.Mock(return_value="<resource-agent/>")
+        for patcher in [
+            mock.patch.object(
+                lib_ra.settings, "agent_metadata_cache_dir", self.cache_dir
+            ),
+            mock.patch.object(lib_ra, "_metadata_cache_pruned", False),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def fixture_agent_file(self, content):
+        with open(self.agent_file, "w") as agent_file:
+            agent_file.write(content)
+
+    def load(self, source_file_list=None):
+        return lib_ra.load_cached_metadata(
+            "ocf:heartbeat:Dummy",
+            [self.agent_file] if source_file_list is None
+                else source_file_list
+            ,
+            self.load_metadata
+        )
+
+    def test_load_once(self):
+        self.assertEqual("<resource-agent/>", self.load())
+        self.assertEqual("<resource-agent/>", self.load())
+        self.assertEqual(1, self.load_metadata.call_count)
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+
+    def test_reload_when_agent_changed(self):
+        self.load()
+        self.fixture_agent_file("updated agent")
+        self.load_metadata.return_value = "<resource-agent version='2'/>"
+        self.assertEqual("<resource-agent version='2'/>", self.load())
+        self.assertEqual("<resource-agent version='2'/>", self.load())
+        self.assertEqual(2, self.load_metadata.call_count)
+
+    def test_do_not_cache_missing_agent(self):
+        missing = [os.path.join(self.tmp_dir, "missing")]
+        self.assertEqual("<resource-agent/>", self.load(missing))
+        self.assertEqual("<resource-agent/>", self.load(missing))
+        self.assertEqual(2, self.load_metadata.call_count)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_do_not_cache_failure(self):
+        self.load_metadata.side_effect = lib_ra.UnableToGetAgentMetadata(
+            "ocf:heartbeat:Dummy", "error"
+        )
+        self.assertRaises(lib_ra.UnableToGetAgentMetadata, self.load)
+        self.assertRaises(lib_ra.UnableToGetAgentMetadata, self.load)
+        self.assertEqual(2, self.load_metadata.call_count)
+
+    def test_work_without_var_dir(self):
+        with mock.patch.object(
+            lib_ra.settings,
+            "agent_metadata_cache_dir",
+            os.path.join(self.tmp_dir, "missing/cache/")
+        ):
+            self.assertEqual("<resource-agent/>", self.load())
+            self.assertEqual("<resource-agent/>", self.load())
+        self.assertEqual(2, self.load_metadata.call_count)
+
+    def test_ignore_broken_cache(self):
+        self.load()
+        cache_file = os.path.join(
+            self.cache_dir, os.listdir(self.cache_dir)[0]
+        )
+        with open(cache_file, "w") as cache:
+            cache.write("garbage")
+        self.assertEqual("<resource-agent/>", self.load())
+        self.assertEqual(2, self.load_metadata.call_count)
+
+    def fixture_other_agent(self, content):
+        other_agent_file = os.path.join(self.tmp_dir, "other_agent")
+        with open(other_agent_file, "w") as agent_file:
+            agent_file.write(content)
+        lib_ra.load_cached_metadata(
+            "ocf:heartbeat:Other", [other_agent_file], self.load_metadata
+        )
+
+    def test_prune_removed_agent_when_replacing_entry(self):
+        self.load()
+        self.fixture_other_agent("other agent")
+        os.remove(self.agent_file)
+        self.fixture_other_agent("updated other agent")
+        self.assertEqual(
+            [lib_ra._get_metadata_cache_file_path("ocf:heartbeat:Other")],
+            [
+                os.path.join(self.cache_dir, name)
+                for name in os.listdir(self.cache_dir)
+            ]
+        )
+
+    def test_do_not_prune_when_adding_entry(self):
+        self.load()
+        os.remove(self.agent_file)
+        with mock.patch(
+            "pcs.lib.resource_agent.os.listdir"
+        ) as mock_listdir:
+            self.fixture_other_agent("other agent")
+        mock_listdir.assert_not_called()
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+
+    def test_prune_once(self):
+        self.load()
+        self.fixture_agent_file("updated agent")
+        self.load()
+        self.fixture_agent_file("agent updated again")
+        with mock.patch(
+            "pcs.lib.resource_agent.os.listdir"
+        ) as mock_listdir:
+            self.load()
+        mock_listdir.assert_not_called()
+        self.assertEqual(3, self.load_metadata.call_count)
+
+    def test_keep_unreadable_files_when_pruning(self):
+        os.makedirs(self.cache_dir)
+        other_file = os.path.join(self.cache_dir, "other")
+        with open(other_file, "w") as other:
+            other.write("garbage")
+        self.load()
+        self.fixture_agent_file("updated agent")
+        self.load()
+        self.assertTrue(os.path.exists(other_file))
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+
+
+class CrmAgentMetadataCacheTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        self.mock_runner.run.return_value = ("<resource-agent/>", "", 0)
+        os.makedirs(os.path.join(self.tmp_dir, "ocf/resource.d/heartbeat"))
+        for file_path in ("ocf/resource.d/heartbeat/Dummy", "crm_resource"):
+            with open(os.path.join(self.tmp_dir, file_path), "w") as a_file:
+                a_file.write(file_path)
+        for patcher in [
+            mock.patch.object(
+                lib_ra.settings,
+                "agent_metadata_cache_dir",
+                os.path.join(self.tmp_dir, "cache/")
+            ),
+            mock.patch.object(
+                lib_ra.settings, "ocf_root", os.path.join(self.tmp_dir, "ocf")
+            ),
+            mock.patch.object(
+                lib_ra,
+                "_crm_resource",
+                os.path.join(self.tmp_dir, "crm_resource")
+            ),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_ocf_agent_cached(self):
+        for dummy_i in range(2):
+            agent = lib_ra.ResourceAgent(
+                self.mock_runner, "ocf:heartbeat:Dummy"
+            )
+            self.assertEqual("", agent.get_shortdesc())
+        self.assertEqual(1, self.mock_runner.run.call_count)
+
+    def test_other_standard_not_cached(self):
+        for dummy_i in range(2):
+            agent = lib_ra.ResourceAgent(self.mock_runner, "systemd:Dummy")
+            self.assertEqual("", agent.get_shortdesc())
+        self.assertEqual(2, self.mock_runner.run.call_count)
+
+    def test_absent_agent_does_not_use_cache(self):
+        self.mock_runner.run.return_value = (
+            "<resource-agent><shortdesc>desc</shortdesc></resource-agent>",
+            "",
+            0
+        )
+        self.assertEqual(
+            "desc",
+            lib_ra.ResourceAgent(
+                self.mock_runner, "ocf:heartbeat:Dummy"
+            ).get_shortdesc()
+        )
+        self.assertEqual(
+            "",
+            lib_ra.AbsentResourceAgent(
+                self.mock_runner, "ocf:heartbeat:Dummy"
+            ).get_shortdesc()
+        )
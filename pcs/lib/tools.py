@@ -5,6 +5,8 @@ from __future__ import (
     unicode_literals,
 )
 
+import tempfile
+
 
 def environment_file_to_dict(config):
     """
@@ -47,3 +49,18 @@ def dict_to_environment_file(config_dict):
     for key, val in sorted(config_dict.items()):
         lines.append("{key}={val}\n".format(key=key, val=val))
     return "".join(lines)
+
+
+def write_tmpfile(data):
+    """
+    Write data to a new temporary file and return the file object
+
+    The file is deleted once the returned object is closed or garbage
+    collected. Raises EnvironmentError when the file cannot be written.
+
+    string data -- data to write to the file
+    """
+    tmpfile = tempfile.NamedTemporaryFile("w+", suffix=".pcs")
+    tmpfile.write(data)
+    tmpfile.flush()
+    return tmpfile
@@ -10,9 +10,10 @@ import xml.dom.minidom
 from xml.dom.minidom import parseString
 import re
 import textwrap
-import time
 import json
 
+from lxml import etree
+
 from pcs import (
     usage,
     utils,
@@ -21,12 +22,15 @@ from pcs import (
 from pcs.settings import pacemaker_wait_timeout_status as \
     PACEMAKER_WAIT_TIMEOUT_STATUS
 import pcs.lib.cib.acl as lib_acl
+import pcs.lib.cib.fencing_topology as lib_fencing_topology
+import pcs.lib.cib.nvpair as lib_nvpair
 from pcs.cli.common.errors import CmdLineInputError
 from pcs.cli.common.parse_args import prepare_options
 from pcs.cli.resource.parse_args import parse_create as parse_create_args
 from pcs.lib.errors import LibraryError
 import pcs.lib.pacemaker.live as lib_pacemaker
 from pcs.lib.pacemaker.values import timeout_to_seconds
+from pcs.lib.pacemaker.wait import wait_for_condition
 import pcs.lib.resource_agent as lib_ra
 from pcs.cli.common.console_report import error
 
@@ -51,6 +55,8 @@ def resource_cmd(argv):
             resource_list_options(lib, argv_next, modifiers)
         elif sub_cmd == "create":
             resource_create(lib, argv_next, modifiers)
+        elif sub_cmd == "bulk-create":
+            resource_bulk_create(lib, argv_next, modifiers)
         elif sub_cmd == "move":
             resource_move(argv_next)
         elif sub_cmd == "ban":
@@ -83,8 +89,7 @@ def resource_cmd(argv):
             if len(argv_next) == 0:
                 usage.resource(["delete"])
                 sys.exit(1)
-            res_id = argv_next.pop(0)
-            resource_remove(res_id)
+            resource_remove_many(argv_next)
         elif sub_cmd == "show":
             resource_show(argv_next)
         elif sub_cmd == "group":
@@ -414,6 +419,48 @@ def resource_create(lib, argv, modifiers):
             **settings
         )
 
+def _load_resource_manifest(path):
+    """
+    Return resource descriptions loaded from a JSON or YAML file
+    """
+    try:
+        with open(path) as manifest_file:
+            data = manifest_file.read()
+    except EnvironmentError as e:
+        utils.err("Unable to read {0}: {1}".format(path, e.strerror))
+    try:
+        resource_list = json.loads(data)
+    except ValueError as json_error:
+        # imported here so it does not slow down other commands
+        try:
+            import yaml
+        except ImportError:
+            utils.err("Unable to parse {0} as JSON ({1})".format(
+                path, json_error
+            ))
+        try:
+            resource_list = yaml.safe_load(data)
+        except yaml.YAMLError as e:
+            utils.err("Unable to parse {0} as JSON or YAML: {1}".format(
+                path, e
+            ))
+    if not isinstance(resource_list, list):
+        utils.err("{0} does not contain a list of resources".format(path))
+    return resource_list
+
+def resource_bulk_create(lib, argv, modifiers):
+    if len(argv) != 1:
+        raise CmdLineInputError()
+    lib.resource.bulk_create(
+        _load_resource_manifest(argv[0]),
+        allow_absent_agent=modifiers["force"],
+        allow_invalid_operation=modifiers["force"],
+        allow_invalid_instance_attributes=modifiers["force"],
+        use_default_operations=not modifiers["no-default-ops"],
+        ensure_disabled=modifiers["disabled"],
+        wait=modifiers["wait"],
+    )
+
 def resource_move(argv,clear=False,ban=False):
     other_options = []
     if len(argv) == 0:
@@ -666,12 +713,12 @@ def resource_update(res_id,args):
             if clone_child:
                 child_id = clone_child.getAttribute("id")
                 return resource_update_clone_master(
-                    dom, clone, "clone", child_id, args, wait, wait_timeout
+                    res_id, "clone", child_id, args, wait, wait_timeout
                 )
         master = utils.dom_get_master(dom, res_id)
         if master:
             return resource_update_clone_master(
-                dom, master, "master", res_id, args, wait, wait_timeout
+                res_id, "master", res_id, args, wait, wait_timeout
             )
         utils.err("Unable to find resource: %s" % res_id)
 
@@ -818,21 +865,22 @@ def resource_update(res_id,args):
             utils.err("\n".join(msg).strip())
 
 def resource_update_clone_master(
-    dom, clone, clone_type, res_id, args, wait, wait_timeout
+    clone_id, clone_type, res_id, args, wait, wait_timeout
 ):
+    dom = utils.get_cib_snapshot()
     if clone_type == "clone":
         dom, dummy_clone_id = resource_clone_create(dom, [res_id] + args, True)
     elif clone_type == "master":
         dom, dummy_master_id = resource_master_create(dom, [res_id] + args, True)
 
-    utils.replace_cib_configuration(dom)
+    utils.push_cib_snapshot()
 
     if wait:
         args = ["crm_resource", "--wait"]
         if wait_timeout:
             args.extend(["--timeout=%s" % wait_timeout])
         output, retval = utils.run(args)
-        running_on = utils.resource_running_on(clone.getAttribute("id"))
+        running_on = utils.resource_running_on(clone_id)
         if retval == 0:
             print(running_on["message"])
         else:
@@ -1070,12 +1118,12 @@ def resource_group(argv):
             sys.exit(1)
         group_name = argv.pop(0)
         resource_ids = argv
-        cib = resource_group_add(utils.get_cib_dom(), group_name, resource_ids)
+        resource_group_add(utils.get_cib_snapshot(), group_name, resource_ids)
 
         if "--wait" in utils.pcs_options:
             wait_timeout = utils.validate_wait_get_timeout()
 
-        utils.replace_cib_configuration(cib)
+        utils.push_cib_snapshot()
 
         if "--wait" in utils.pcs_options:
             args = ["crm_resource", "--wait"]
@@ -1102,14 +1150,12 @@ def resource_group(argv):
         group_name = argv.pop(0)
         resource_ids = argv
 
-        cib_dom = resource_group_rm(
-            utils.get_cib_dom(), group_name, resource_ids
-        )
+        resource_group_rm(utils.get_cib_snapshot(), group_name, resource_ids)
 
         if "--wait" in utils.pcs_options:
             wait_timeout = utils.validate_wait_get_timeout()
 
-        utils.replace_cib_configuration(cib_dom)
+        utils.push_cib_snapshot()
 
         if "--wait" in utils.pcs_options:
             args = ["crm_resource", "--wait"]
@@ -1134,14 +1180,14 @@ def resource_clone(argv):
         sys.exit(1)
 
     res = argv[0]
-    cib_dom = utils.get_cib_dom()
+    cib_dom = utils.get_cib_snapshot()
 
     if "--wait" in utils.pcs_options:
         wait_timeout = utils.validate_wait_get_timeout()
 
     cib_dom, clone_id = resource_clone_create(cib_dom, argv)
-    cib_dom = constraint.constraint_resource_update(res, cib_dom)
-    utils.replace_cib_configuration(cib_dom)
+    constraint.constraint_resource_update(res, cib_dom)
+    utils.push_cib_snapshot()
 
     if "--wait" in utils.pcs_options:
         args = ["crm_resource", "--wait"]
@@ -1163,34 +1209,37 @@ def resource_clone(argv):
 def resource_clone_create(cib_dom, argv, update_existing=False):
     name = argv.pop(0)
 
-    re = cib_dom.getElementsByTagName("resources")[0]
-    element = utils.dom_get_resource(re, name) or utils.dom_get_group(re, name)
-    if not element:
+    re = cib_dom.find(".//resources")
+    element = utils.dom_get_resource(re, name)
+    if element is None:
+        element = utils.dom_get_group(re, name)
+    if element is None:
         utils.err("unable to find group or resource: %s" % name)
 
     if not update_existing:
-        if utils.dom_get_resource_clone(cib_dom, name):
+        if utils.dom_get_resource_clone(cib_dom, name) is not None:
             utils.err("%s is already a clone resource" % name)
 
-        if utils.dom_get_group_clone(cib_dom, name):
+        if utils.dom_get_group_clone(cib_dom, name) is not None:
             utils.err("cannot clone a group that has already been cloned")
 
-    if utils.dom_get_resource_masterslave(cib_dom, name):
+    if utils.dom_get_resource_masterslave(cib_dom, name) is not None:
         utils.err("%s is already a master/slave resource" % name)
 
     # If element is currently in a group and it's the last member, we get rid of the group
-    if element.parentNode.tagName == "group" and element.parentNode.getElementsByTagName("primitive").length <= 1:
-        element.parentNode.parentNode.removeChild(element.parentNode)
+    parent = element.getparent()
+    if parent.tag == "group" and len(parent.findall(".//primitive")) <= 1:
+        parent.getparent().remove(parent)
 
     if update_existing:
-        if element.parentNode.tagName != "clone":
+        if parent.tag != "clone":
             utils.err("%s is not currently a clone" % name)
-        clone = element.parentNode
+        clone = parent
     else:
-        clone = cib_dom.createElement("clone")
-        clone.setAttribute("id", utils.find_unique_id(cib_dom, name + "-clone"))
-        clone.appendChild(element)
-        re.appendChild(clone)
+        clone = etree.SubElement(
+            re, "clone", id=utils.find_unique_id(cib_dom, name + "-clone")
+        )
+        clone.append(element)
 
     generic_values, op_values, meta_values = parse_resource_options(argv)
     if op_values:
@@ -1198,7 +1247,7 @@ def resource_clone_create(cib_dom, argv, update_existing=False):
     final_meta = prepare_options(generic_values + meta_values)
     utils.dom_update_meta_attr(clone, sorted(final_meta.items()))
 
-    return cib_dom, clone.getAttribute("id")
+    return cib_dom, clone.get("id")
 
 def resource_clone_master_remove(argv):
     if len(argv) != 1:
@@ -1206,22 +1255,24 @@ def resource_clone_master_remove(argv):
         sys.exit(1)
 
     name = argv.pop()
-    dom = utils.get_cib_dom()
-    re = dom.documentElement.getElementsByTagName("resources")[0]
+    dom = utils.get_cib_snapshot()
+    re = dom.find("./configuration/resources")
 
     # get the resource no matter if user entered a clone or a cloned resource
-    resource = (
-        utils.dom_get_resource(re, name)
-        or
-        utils.dom_get_group(re, name)
-        or
-        utils.dom_get_clone_ms_resource(re, name)
-    )
-    if not resource:
+    resource = None
+    for get_resource in (
+        utils.dom_get_resource,
+        utils.dom_get_group,
+        utils.dom_get_clone_ms_resource,
+    ):
+        resource = get_resource(re, name)
+        if resource is not None:
+            break
+    if resource is None:
         utils.err("could not find resource: %s" % name)
-    resource_id = resource.getAttribute("id")
+    resource_id = resource.get("id")
     clone = utils.dom_get_resource_clone_ms_parent(re, resource_id)
-    if not clone:
+    if clone is None:
         utils.err("'%s' is not a clone resource" % name)
 
     if "--wait" in utils.pcs_options:
@@ -1230,20 +1281,20 @@ def resource_clone_master_remove(argv):
     # if user requested uncloning a resource contained in a cloned group
     # remove the resource from the group and leave the clone itself alone
     # unless the resource is the last one in the group
-    clone_child = utils.dom_get_clone_ms_resource(re, clone.getAttribute("id"))
+    clone_child = utils.dom_get_clone_ms_resource(re, clone.get("id"))
     if (
-        clone_child.tagName == "group"
+        clone_child.tag == "group"
         and
-        resource.tagName != "group"
+        resource.tag != "group"
         and
-        len(clone_child.getElementsByTagName("primitive")) > 1
+        len(clone_child.findall(".//primitive")) > 1
     ):
-        resource_group_rm(dom, clone_child.getAttribute("id"), [resource_id])
+        resource_group_rm(dom, clone_child.get("id"), [resource_id])
     else:
-        remove_resource_references(dom, clone.getAttribute("id"))
-        clone.parentNode.appendChild(resource)
-        clone.parentNode.removeChild(clone)
-    utils.replace_cib_configuration(dom)
+        remove_resource_references(dom, [clone.get("id")])
+        clone.getparent().append(resource)
+        clone.getparent().remove(clone)
+    utils.push_cib_snapshot()
 
     if "--wait" in utils.pcs_options:
         args = ["crm_resource", "--wait"]
@@ -1276,14 +1327,14 @@ def resource_master(argv):
     else:
         master_id = argv.pop(0)
         res_id = argv[0]
-    cib_dom = utils.get_cib_dom()
+    cib_dom = utils.get_cib_snapshot()
 
     if "--wait" in utils.pcs_options:
         wait_timeout = utils.validate_wait_get_timeout()
 
     cib_dom, master_id = resource_master_create(cib_dom, argv, False, master_id)
-    cib_dom = constraint.constraint_resource_update(res_id, cib_dom)
-    utils.replace_cib_configuration(cib_dom)
+    constraint.constraint_resource_update(res_id, cib_dom)
+    utils.push_cib_snapshot()
 
     if "--wait" in utils.pcs_options:
         args = ["crm_resource", "--wait"]
@@ -1311,49 +1362,38 @@ def resource_master_create(dom, argv, update=False, master_id=None):
         master_id_autogenerated = True
 
     if (update):
-        master_found = False
-        for master in dom.getElementsByTagName("master"):
-            if master.getAttribute("id") == master_id:
-                master_element = master
-                master_found = True
-                break
-        if not master_found:
+        master_element = utils.dom_get_master(dom, master_id)
+        if master_element is None:
             utils.err("Unable to find multi-state resource with id %s" % master_id)
     else:
         rg_id = argv.pop(0)
         if not master_id_autogenerated and utils.does_id_exist(dom, master_id):
             utils.err("%s already exists in the cib" % master_id)
 
-        if utils.dom_get_resource_clone(dom, rg_id):
+        if utils.dom_get_resource_clone(dom, rg_id) is not None:
             utils.err("%s is already a clone resource" % rg_id)
 
-        if utils.dom_get_resource_masterslave(dom, rg_id):
+        if utils.dom_get_resource_masterslave(dom, rg_id) is not None:
             utils.err("%s is already a master/slave resource" % rg_id)
 
-        resources = dom.getElementsByTagName("resources")[0]
-        rg_found = False
-        for resource in (resources.getElementsByTagName("primitive") +
-            resources.getElementsByTagName("group")):
-            if resource.getAttribute("id") == rg_id:
-                rg_found = True
-                break
-        if not rg_found:
+        resources = dom.find(".//resources")
+        resource_list = resources.xpath(
+            "./descendant::*[self::primitive or self::group][@id=$id]",
+            id=rg_id
+        )
+        if not resource_list:
             utils.err("Unable to find resource or group with id %s" % rg_id)
+        resource = resource_list[0]
         # If the resource elements parent is a group, and it's the last
         # element in the group, we remove the group
-        if resource.parentNode.tagName == "group" and resource.parentNode.getElementsByTagName("primitive").length <= 1:
-            resource.parentNode.parentNode.removeChild(resource.parentNode)
+        parent = resource.getparent()
+        if parent.tag == "group" and len(parent.findall(".//primitive")) <= 1:
+            parent.getparent().remove(parent)
 
-        master_element = dom.createElement("master")
         if master_id_autogenerated:
-            master_element.setAttribute(
-                "id", utils.find_unique_id(dom, master_id)
-            )
-        else:
-            master_element.setAttribute("id", master_id)
-        resource.parentNode.removeChild(resource)
-        master_element.appendChild(resource)
-        resources.appendChild(master_element)
+            master_id = utils.find_unique_id(dom, master_id)
+        master_element = etree.SubElement(resources, "master", id=master_id)
+        master_element.append(resource)
 
     if len(argv) > 0:
         generic_values, op_values, meta_values = parse_resource_options(argv)
@@ -1362,238 +1402,276 @@ def resource_master_create(dom, argv, update=False, master_id=None):
         final_meta = prepare_options(generic_values + meta_values)
         utils.dom_update_meta_attr(master_element, list(final_meta.items()))
 
-    return dom, master_element.getAttribute("id")
+    return dom, master_element.get("id")
+
+def _wait_for_resource_stopped(resource_id, timeout=15):
+    """
+    Wait for a resource to stop when crm_resource --wait is not supported,
+        return True if it stopped
+    """
+    return wait_for_condition(
+        lambda: (
+            None if utils.resource_running_on(resource_id)["is_running"]
+            else True
+        ),
+        timeout,
+        max_interval=1
+    ) is not None
 
 def resource_remove(resource_id, output = True):
-    dom = utils.get_cib_dom()
-    # if resource is a clone or a master, work with its child instead
-    cloned_resource = utils.dom_get_clone_ms_resource(dom, resource_id)
-    if cloned_resource:
-        resource_id = cloned_resource.getAttribute("id")
-
-    if utils.does_exist('//group[@id="'+resource_id+'"]'):
-        print("Removing group: " + resource_id + " (and all resources within group)")
-        group = utils.get_cib_xpath('//group[@id="'+resource_id+'"]')
-        group_dom = parseString(group)
-        print("Stopping all resources in group: %s..." % resource_id)
-        resource_disable([resource_id])
-        if "--force" not in utils.pcs_options and not utils.usefile:
-            output, retval = utils.run(["crm_resource", "--wait"])
-            if retval != 0 and "unrecognized option '--wait'" in output:
-                output = ""
-                retval = 0
-                for res in reversed(
-                    group_dom.documentElement.getElementsByTagName("primitive")
-                ):
-                    res_id = res.getAttribute("id")
-                    res_stopped = False
-                    for _ in range(15):
-                        time.sleep(1)
-                        if not utils.resource_running_on(res_id)["is_running"]:
-                            res_stopped = True
-                            break
-                    if not res_stopped:
-                        break
-            stopped = True
-            state = utils.getClusterState()
-            for res in group_dom.documentElement.getElementsByTagName("primitive"):
-                res_id = res.getAttribute("id")
-                if utils.resource_running_on(res_id, state)["is_running"]:
-                    stopped = False
+    return resource_remove_many([resource_id], output)
+
+def _get_resources_to_remove(resource_id_list):
+    """
+    Return a list of (resource or group id, [primitive ids]) tuples to be
+        removed, exit with an error if any of the resources does not exist
+    """
+    cib = utils.get_cib_snapshot_readonly()
+    target_list = []
+    seen_primitives = set()
+    missing_list = []
+    for resource_id in resource_id_list:
+        # if resource is a clone or a master, work with its child instead
+        cloned_resource = utils.dom_get_clone_ms_resource(cib, resource_id)
+        if cloned_resource is not None:
+            resource_id = cloned_resource.get("id")
+        group = utils.dom_get_group(cib, resource_id)
+        if group is not None:
+            primitive_id_list = [
+                str(primitive_id)
+                for primitive_id in group.xpath("./primitive/@id")
+            ]
+        elif cib.xpath(
+            "/cib/configuration/resources/descendant::primitive[@id=$id]",
+            id=resource_id
+        ):
+            primitive_id_list = [resource_id]
+        else:
+            missing_list.append(resource_id)
+            continue
+        # a resource may be specified directly and as a member of its group
+        primitive_id_list = [
+            primitive_id for primitive_id in primitive_id_list
+            if primitive_id not in seen_primitives
+        ]
+        seen_primitives.update(primitive_id_list)
+        target_list.append(
+            (resource_id, group is not None, primitive_id_list)
+        )
+    if missing_list:
+        for resource_id in missing_list:
+            utils.err(
+                "Resource '{0}' does not exist.".format(resource_id), False
+            )
+        sys.exit(1)
+    return target_list
+
+def _stop_resources_to_remove(target_list):
+    """
+    Stop running resources to be removed using one cib update and one wait
+    """
+    state = utils.getClusterState()
+    running_list = [
+        (resource_id, is_group, primitive_id_list)
+        for resource_id, is_group, primitive_id_list in target_list
+        if any([
+            utils.resource_running_on(primitive_id, state)["is_running"]
+            for primitive_id in primitive_id_list
+        ])
+    ]
+    if not running_list:
+        return
+    for resource_id, is_group, dummy_list in running_list:
+        if is_group:
+            print("Stopping all resources in group: %s..." % resource_id)
+    primitive_label = ", ".join([
+        resource_id for resource_id, is_group, dummy_list in running_list
+        if not is_group
+    ])
+    if primitive_label:
+        sys.stdout.write("Attempting to stop: " + primitive_label + "...")
+        sys.stdout.flush()
+
+    dom = utils.get_cib_snapshot()
+    for resource_id, dummy_is_group, dummy_list in running_list:
+        lib_nvpair.arrange_first_nvset(
+            "meta_attributes",
+            utils.dom_get_any_resource(dom, resource_id),
+            {"target-role": "Stopped"}
+        )
+    utils.push_cib_snapshot()
+
+    output, retval = utils.run(["crm_resource", "--wait"])
+    if retval != 0 and "unrecognized option '--wait'" in output:
+        output = ""
+        retval = 0
+        for dummy_id, dummy_is_group, primitive_id_list in running_list:
+            for primitive_id in reversed(primitive_id_list):
+                if not _wait_for_resource_stopped(primitive_id):
                     break
-            if not stopped:
-                msg = [
-                    "Unable to stop group: %s before deleting "
-                    "(re-run with --force to force deletion)"
-                    % resource_id
-                ]
-                if retval != 0 and output:
-                    msg.append("\n" + output)
-                utils.err("\n".join(msg).strip())
-        for res in group_dom.documentElement.getElementsByTagName("primitive"):
-            resource_remove(res.getAttribute("id"))
-        sys.exit(0)
 
-    # now we know resource is not a group, a clone nor a master
-    # because of the conditions above
-    if not utils.does_exist('//resources/descendant::primitive[@id="'+resource_id+'"]'):
-        utils.err("Resource '{0}' does not exist.".format(resource_id))
+    state = utils.getClusterState()
+    msg = []
+    for resource_id, is_group, primitive_id_list in running_list:
+        if any([
+            utils.resource_running_on(primitive_id, state)["is_running"]
+            for primitive_id in primitive_id_list
+        ]):
+            msg.append(
+                "Unable to stop{0}: {1} before deleting "
+                "(re-run with --force to force deletion)".format(
+                    " group" if is_group else "", resource_id
+                )
+            )
+    if msg:
+        if retval != 0 and output:
+            msg.append("\n" + output)
+        utils.err("\n".join(msg).strip())
+    if primitive_label:
+        print("Stopped")
 
-    group_xpath = '//group/primitive[@id="'+resource_id+'"]/..'
-    group = utils.get_cib_xpath(group_xpath)
-    num_resources_in_group = 0
+def _remove_primitive_from_dom(dom, resource_id):
+    """
+    Remove a primitive and the group and the clone left empty by removing it
+        from dom, references to them are kept
 
-    if (group != ""):
-        num_resources_in_group = len(parseString(group).documentElement.getElementsByTagName("primitive"))
+    Return a tuple: ids of the removed elements in the order their references
+    are to be reported, remote node name of the primitive, deletion message.
+    """
+    resource_el = utils.dom_get_resource(dom, resource_id)
+    remote_node_name = utils.dom_get_resource_remote_node_name(resource_el)
 
+    parent_el = resource_el.getparent()
     if (
-        "--force" not in utils.pcs_options
-        and
-        not utils.usefile
-        and
-        utils.resource_running_on(resource_id)["is_running"]
+        parent_el.tag != "group"
+        or
+        len(parent_el.findall("./primitive")) > 1
     ):
-        sys.stdout.write("Attempting to stop: "+ resource_id + "...")
-        sys.stdout.flush()
-        resource_disable([resource_id])
-        output, retval = utils.run(["crm_resource", "--wait"])
-        if retval != 0 and "unrecognized option '--wait'" in output:
-            output = ""
-            retval = 0
-            for _ in range(15):
-                time.sleep(1)
-                if not utils.resource_running_on(resource_id)["is_running"]:
-                    break
-        if utils.resource_running_on(resource_id)["is_running"]:
-            msg = [
-                "Unable to stop: %s before deleting "
-                "(re-run with --force to force deletion)"
-                % resource_id
-            ]
-            if retval != 0 and output:
-                msg.append("\n" + output)
-            utils.err("\n".join(msg).strip())
-        print("Stopped")
-
-    utils.replace_cib_configuration(
-        remove_resource_references(utils.get_cib_dom(), resource_id, output)
-    )
-    dom = utils.get_cib_dom()
-    resource_el = utils.dom_get_resource(dom, resource_id)
-    remote_node_name = None
-    if resource_el:
-        remote_node_name = utils.dom_get_resource_remote_node_name(resource_el)
-        if remote_node_name:
-            dom = constraint.remove_constraints_containing_node(
-                dom, remote_node_name, output
-            )
-            utils.replace_cib_configuration(dom)
-            dom = utils.get_cib_dom()
-
-    if (group == "" or num_resources_in_group > 1):
-        master_xpath = '//master/primitive[@id="'+resource_id+'"]/..'
-        clone_xpath = '//clone/primitive[@id="'+resource_id+'"]/..'
-        if utils.get_cib_xpath(clone_xpath) != "":
-            args = ["cibadmin", "-o", "resources", "-D", "--xpath", clone_xpath]
-        elif utils.get_cib_xpath(master_xpath) != "":
-            args = ["cibadmin", "-o", "resources", "-D", "--xpath", master_xpath]
-        else:
-            args = ["cibadmin", "-o", "resources", "-D", "--xpath", "//primitive[@id='"+resource_id+"']"]
-        if output == True:
-            print("Deleting Resource - " + resource_id)
-        output,retVal = utils.run(args)
-        if retVal != 0:
-            utils.err("unable to remove resource: %s, it may still be referenced in constraints." % resource_id)
+        to_remove_el = resource_el
+        removed_id_list = [resource_id]
+        if parent_el.tag in ["clone", "master"]:
+            to_remove_el = parent_el
+            removed_id_list.insert(0, parent_el.get("id"))
+        message = "Deleting Resource - " + resource_id
     else:
-        top_master_xpath = '//master/group/primitive[@id="'+resource_id+'"]/../..'
-        top_clone_xpath = '//clone/group/primitive[@id="'+resource_id+'"]/../..'
-        top_master = utils.get_cib_xpath(top_master_xpath)
-        top_clone = utils.get_cib_xpath(top_clone_xpath)
-        if top_master != "":
-            to_remove_xpath = top_master_xpath
+        group_el = parent_el
+        removed_id_list = [resource_id, group_el.get("id")]
+        if group_el.getparent().tag == "master":
             msg = "and group and M/S"
-            to_remove_dom = parseString(top_master).getElementsByTagName("master")
-            to_remove_id = to_remove_dom[0].getAttribute("id")
-            utils.replace_cib_configuration(
-                remove_resource_references(
-                    utils.get_cib_dom(),
-                    to_remove_dom[0].getElementsByTagName("group")[0].getAttribute("id")
-                )
-            )
-        elif top_clone != "":
-            to_remove_xpath = top_clone_xpath
+            to_remove_el = group_el.getparent()
+            removed_id_list.append(to_remove_el.get("id"))
+        elif group_el.getparent().tag == "clone":
             msg = "and group and clone"
-            to_remove_dom = parseString(top_clone).getElementsByTagName("clone")
-            to_remove_id = to_remove_dom[0].getAttribute("id")
-            utils.replace_cib_configuration(
-                remove_resource_references(
-                    utils.get_cib_dom(),
-                    to_remove_dom[0].getElementsByTagName("group")[0].getAttribute("id")
-                )
-            )
+            to_remove_el = group_el.getparent()
+            removed_id_list.append(to_remove_el.get("id"))
         else:
-            to_remove_xpath = group_xpath
             msg = "and group"
-            to_remove_dom = parseString(group).getElementsByTagName("group")
-            to_remove_id = to_remove_dom[0].getAttribute("id")
+            to_remove_el = group_el
+        message = "Deleting Resource ("+msg+") - " + resource_id
+    to_remove_el.getparent().remove(to_remove_el)
+    return removed_id_list, remote_node_name, message
+
+def resource_remove_many(resource_id_list, output=True):
+    """
+    Remove resources, groups, clones and masters in one transaction
+
+    Running resources are disabled in one cib update and waited for once, then
+    all the resources and references to them are removed in one cib update.
+    """
+    target_list = _get_resources_to_remove(resource_id_list)
+    for resource_id, is_group, dummy_list in target_list:
+        if is_group:
+            print(
+                "Removing group: " + resource_id
+                +
+                " (and all resources within group)"
+            )
 
-        utils.replace_cib_configuration(
-            remove_resource_references(
-                utils.get_cib_dom(), to_remove_id, output
+    if "--force" not in utils.pcs_options and not utils.usefile:
+        _stop_resources_to_remove(target_list)
+
+    # all the changes are done in one dom and pushed to the cib at once
+    dom = utils.get_cib_snapshot()
+    removed_id_list = []
+    remote_node_list = []
+    message_list = []
+    for dummy_id, dummy_is_group, primitive_id_list in target_list:
+        for primitive_id in primitive_id_list:
+            primitive_removed_id_list, remote_node_name, message = (
+                _remove_primitive_from_dom(dom, primitive_id)
             )
+            removed_id_list.extend(primitive_removed_id_list)
+            if remote_node_name:
+                remote_node_list.append(remote_node_name)
+            message_list.append(message)
+    # references to all the removed elements are removed in one walk
+    remove_resource_references(dom, removed_id_list, output)
+    for remote_node_name in remote_node_list:
+        constraint.remove_constraints_containing_node(
+            dom, remote_node_name, output
         )
-
-        args = ["cibadmin", "-o", "resources", "-D", "--xpath", to_remove_xpath]
-        if output == True:
-            print("Deleting Resource ("+msg+") - " + resource_id)
-        dummy_cmdoutput,retVal = utils.run(args)
-        if retVal != 0:
-            if output == True:
-                utils.err("Unable to remove resource '%s' (do constraints exist?)" % (resource_id))
-            return False
-    if remote_node_name and not utils.usefile:
-        output, retval = utils.run([
-            "crm_node", "--force", "--remove", remote_node_name
-        ])
+    if output == True:
+        for message in message_list:
+            print(message)
+    utils.push_cib_snapshot()
+
+    if not utils.usefile:
+        for remote_node_name in remote_node_list:
+            utils.run(["crm_node", "--force", "--remove", remote_node_name])
     return True
 
-# moved to pcs.lib.cib.fencing_topology.remove_device_from_all_levels
-def stonith_level_rm_device(cib_dom, stn_id):
-    topology_el_list = cib_dom.getElementsByTagName("fencing-topology")
-    if not topology_el_list:
+def stonith_level_rm_devices(cib_dom, stn_id_list):
+    topology_el = cib_dom.find(".//fencing-topology")
+    if topology_el is None:
         return cib_dom
-    topology_el = topology_el_list[0]
-    for level_el in topology_el.getElementsByTagName("fencing-level"):
-        device_list = level_el.getAttribute("devices").split(",")
-        if stn_id in device_list:
-            new_device_list = [dev for dev in device_list if dev != stn_id]
-            if new_device_list:
-                level_el.setAttribute("devices", ",".join(new_device_list))
-            else:
-                level_el.parentNode.removeChild(level_el)
-    if not topology_el.getElementsByTagName("fencing-level"):
-        topology_el.parentNode.removeChild(topology_el)
+    lib_fencing_topology.remove_devices_from_all_levels(
+        topology_el, stn_id_list
+    )
+    if topology_el.find("fencing-level") is None:
+        topology_el.getparent().remove(topology_el)
     return cib_dom
 
 
-def remove_resource_references(
-    dom, resource_id, output=False, constraints_element=None
-):
-    constraint.remove_constraints_containing(
-        resource_id, output, constraints_element, dom
+def remove_resource_references(dom, resource_id_list, output=False):
+    """
+    Remove constraints, fencing levels and acl permissions referencing any of
+        the resources, each part of the cib is walked only once
+    """
+    constraint.remove_constraints_containing_any(
+        dom, resource_id_list, output
     )
-    stonith_level_rm_device(dom, resource_id)
-    lib_acl.dom_remove_permissions_referencing(dom, resource_id)
+    stonith_level_rm_devices(dom, resource_id_list)
+    lib_acl.remove_permissions_referencing_any(dom, resource_id_list)
     return dom
 
 # This removes a resource from a group, but keeps it in the config
 def resource_group_rm(cib_dom, group_name, resource_ids):
-    dom = cib_dom.getElementsByTagName("configuration")[0]
+    dom = cib_dom.find(".//configuration")
 
     all_resources = len(resource_ids) == 0
 
     group_match = utils.dom_get_group(dom, group_name)
-    if not group_match:
+    if group_match is None:
         utils.err("Group '%s' does not exist" % group_name)
 
-    if group_match.parentNode.tagName == "master" and group_match.getElementsByTagName("primitive").length > 1:
+    if group_match.getparent().tag == "master" and len(group_match.findall(".//primitive")) > 1:
         utils.err("Groups that have more than one resource and are master/slave resources cannot be removed.  The group may be deleted with 'pcs resource delete %s'." % group_name)
 
     resources_to_move = []
 
     if all_resources:
-        for resource in group_match.getElementsByTagName("primitive"):
+        for resource in group_match.findall(".//primitive"):
             resources_to_move.append(resource)
     else:
         for resource_id in resource_ids:
             resource = utils.dom_get_resource(group_match, resource_id)
-            if resource:
+            if resource is not None:
                 resources_to_move.append(resource)
             else:
                 utils.err("Resource '%s' does not exist in group '%s'" % (resource_id, group_name))
 
-    if group_match.parentNode.tagName in ["clone", "master"]:
-        res_in_group = len(group_match.getElementsByTagName("primitive"))
+    if group_match.getparent().tag in ["clone", "master"]:
+        res_in_group = len(group_match.findall(".//primitive"))
         if (
             res_in_group > 1
             and
@@ -1601,55 +1679,52 @@ def resource_group_rm(cib_dom, group_name, resource_ids):
         ):
             utils.err("Cannot remove more than one resource from cloned group")
 
-    target_node = group_match.parentNode
+    target_node = group_match.getparent()
     if (
-        target_node.tagName in ["clone", "master"]
+        target_node.tag in ["clone", "master"]
         and
-        len(group_match.getElementsByTagName("primitive")) > 1
+        len(group_match.findall(".//primitive")) > 1
     ):
-        target_node = dom.getElementsByTagName("resources")[0]
+        target_node = dom.find(".//resources")
     for resource in resources_to_move:
-        resource.parentNode.removeChild(resource)
-        target_node.appendChild(resource)
+        target_node.append(resource)
 
-    if len(group_match.getElementsByTagName("primitive")) == 0:
-        group_match.parentNode.removeChild(group_match)
-        remove_resource_references(dom, group_name, output=True)
+    if group_match.find(".//primitive") is None:
+        group_match.getparent().remove(group_match)
+        remove_resource_references(dom, [group_name], output=True)
 
     return cib_dom
 
 def resource_group_add(cib_dom, group_name, resource_ids):
-    resources_element = cib_dom.getElementsByTagName("resources")[0]
+    resources_element = cib_dom.find(".//resources")
 
     name_valid, name_error = utils.validate_xml_id(group_name, 'group name')
     if not name_valid:
         utils.err(name_error)
 
     mygroup = utils.dom_get_group(resources_element, group_name)
-    if not mygroup:
-        if utils.dom_get_resource(resources_element, group_name):
+    if mygroup is None:
+        if utils.dom_get_resource(resources_element, group_name) is not None:
             utils.err("'%s' is already a resource" % group_name)
-        if utils.dom_get_clone(resources_element, group_name):
+        if utils.dom_get_clone(resources_element, group_name) is not None:
             utils.err("'%s' is already a clone resource" % group_name)
-        if utils.dom_get_master(resources_element, group_name):
+        if utils.dom_get_master(resources_element, group_name) is not None:
             utils.err("'%s' is already a master/slave resource" % group_name)
-        mygroup = cib_dom.createElement("group")
-        mygroup.setAttribute("id", group_name)
-        resources_element.appendChild(mygroup)
+        mygroup = etree.SubElement(resources_element, "group", id=group_name)
 
     after = before = None
     if "--after" in utils.pcs_options and "--before" in utils.pcs_options:
         utils.err("you cannot specify both --before and --after")
     if "--after" in utils.pcs_options:
         after = utils.dom_get_resource(mygroup, utils.pcs_options["--after"])
-        if not after:
+        if after is None:
             utils.err(
                 "there is no resource '%s' in the group '%s'"
                 % (utils.pcs_options["--after"], group_name)
             )
     if "--before" in utils.pcs_options:
         before = utils.dom_get_resource(mygroup, utils.pcs_options["--before"])
-        if not before:
+        if before is None:
             utils.err(
                 "there is no resource '%s' in the group '%s'"
                 % (utils.pcs_options["--before"], group_name)
@@ -1658,56 +1733,46 @@ def resource_group_add(cib_dom, group_name, resource_ids):
     resources_to_move = []
     for resource_id in resource_ids:
         if (
-            utils.dom_get_resource(mygroup, resource_id)
-            and not after and not before
+            utils.dom_get_resource(mygroup, resource_id) is not None
+            and after is None and before is None
         ):
             utils.err(resource_id + " already exists in " + group_name)
-        if after and after.getAttribute("id") == resource_id:
+        if after is not None and after.get("id") == resource_id:
             utils.err("cannot put resource after itself")
-        if before and before.getAttribute("id") == resource_id:
+        if before is not None and before.get("id") == resource_id:
             utils.err("cannot put resource before itself")
 
-        resource_found = False
-        for resource in resources_element.getElementsByTagName("primitive"):
-            if resource.nodeType == xml.dom.minidom.Node.TEXT_NODE:
-                continue
-            if resource.getAttribute("id") == resource_id:
-                if resource.parentNode.tagName == "master":
-                    utils.err("cannot group master/slave resources")
-                if resource.parentNode.tagName == "clone":
-                    utils.err("cannot group clone resources")
-                resources_to_move.append(resource)
-                resource_found = True
-                break
-
-        if resource_found == False:
+        resource = utils.dom_get_resource(resources_element, resource_id)
+        if resource is None:
             utils.err("Unable to find resource: " + resource_id)
             continue
+        if resource.getparent().tag == "master":
+            utils.err("cannot group master/slave resources")
+        if resource.getparent().tag == "clone":
+            utils.err("cannot group clone resources")
+        resources_to_move.append(resource)
 
     if resources_to_move:
         for resource in resources_to_move:
-            oldParent = resource.parentNode
-            if after and after.nextSibling:
-                mygroup.insertBefore(resource, after.nextSibling)
+            oldParent = resource.getparent()
+            if after is not None:
+                after.addnext(resource)
                 after = resource
-            elif before:
-                mygroup.insertBefore(resource, before)
+            elif before is not None:
+                before.addprevious(resource)
             else:
-                mygroup.appendChild(resource)
+                mygroup.append(resource)
             if (
-                oldParent.tagName == "group"
+                oldParent.tag == "group"
                 and
-                len(oldParent.getElementsByTagName("primitive")) == 0
+                len(oldParent.findall(".//primitive")) == 0
             ):
-                if oldParent.parentNode.tagName in ["clone", "master"]:
-                    oldParent.parentNode.parentNode.removeChild(
-                        oldParent.parentNode
-                    )
+                if oldParent.getparent().tag in ["clone", "master"]:
+                    clone = oldParent.getparent()
+                    clone.getparent().remove(clone)
                 else:
-                    oldParent.parentNode.removeChild(oldParent)
+                    oldParent.getparent().remove(oldParent)
         return cib_dom
-    else:
-        utils.err("No resources to add.")
 
 def resource_group_list(argv):
     group_xpath = "//group"
@@ -1748,8 +1813,7 @@ def resource_show(argv, stonith=False):
         return
 
     if "--full" in utils.pcs_options:
-        root = utils.get_cib_etree()
-        resources = root.find(".//resources")
+        resources = utils.get_cib_snapshot_readonly().find(".//resources")
         for child in resources:
             if stonith and "class" in child.attrib and child.attrib["class"] == "stonith":
                 print_node(child,1)
@@ -1801,18 +1865,20 @@ def resource_show(argv, stonith=False):
                     print(line)
         return
 
-    root = utils.get_cib_etree()
-    resources = root.find(".//resources")
-    resource_found = False
+    resources = utils.get_cib_snapshot_readonly().find(".//resources")
+    wanted_ids = set(argv)
+    found_elements = {}
+    for child in resources.findall(str(".//*")):
+        child_id = child.get("id")
+        if child_id in wanted_ids and child_id not in found_elements:
+            found_elements[child_id] = child
     for arg in argv:
-        for child in resources.findall(str(".//*")):
-            if "id" in child.attrib and child.attrib["id"] == arg and ((stonith and utils.is_stonith_resource(arg)) or (not stonith and not utils.is_stonith_resource(arg))):
-                print_node(child,1)
-                resource_found = True
-                break
-        if not resource_found:
+        element = found_elements.get(arg)
+        if element is None or stonith != (
+            element.tag == "primitive" and element.get("class") == "stonith"
+        ):
             utils.err("unable to find resource '"+arg+"'")
-        resource_found = False
+        print_node(element, 1)
 
 def resource_disable(argv):
     if len(argv) < 1:
@@ -2076,23 +2142,24 @@ def resource_manage(argv, set_managed):
 
 def is_managed(resource_id):
     state_dom = utils.getClusterState()
-    for resource_el in state_dom.getElementsByTagName("resource"):
-        if resource_el.getAttribute("id") in [resource_id, resource_id + ":0"]:
-            if resource_el.getAttribute("managed") == "false":
+    id_list = [resource_id, resource_id + ":0"]
+    for resource_el in state_dom.iterdescendants("resource"):
+        if resource_el.get("id") in id_list:
+            if resource_el.get("managed") == "false":
                 return False
             return True
-    for resource_el in state_dom.getElementsByTagName("group"):
-        if resource_el.getAttribute("id") in [resource_id, resource_id + ":0"]:
-            for primitive_el in resource_el.getElementsByTagName("resource"):
-                if primitive_el.getAttribute("managed") == "false":
+    for resource_el in state_dom.iterdescendants("group"):
+        if resource_el.get("id") in id_list:
+            for primitive_el in resource_el.iterdescendants("resource"):
+                if primitive_el.get("managed") == "false":
                     return False
             return True
-    for resource_el in state_dom.getElementsByTagName("clone"):
-        if resource_el.getAttribute("id") == resource_id:
-            if resource_el.getAttribute("managed") == "false":
+    for resource_el in state_dom.iterdescendants("clone"):
+        if resource_el.get("id") == resource_id:
+            if resource_el.get("managed") == "false":
                 return False
-            for primitive_el in resource_el.getElementsByTagName("resource"):
-                if primitive_el.getAttribute("managed") == "false":
+            for primitive_el in resource_el.iterdescendants("resource"):
+                if primitive_el.get("managed") == "false":
                     return False
             return True
     utils.err("unable to find a resource/clone/master/group: %s" % resource_id)
@@ -2474,7 +2541,7 @@ def resource_relocate_run(cib_dom, resources=None, dry=True):
             utils.err("This command cannot be used with -f")
 
     # create constraints
-    cib_dom, constraint_el = constraint.getCurrentConstraints(cib_dom)
+    constraint_el = cib_dom.getElementsByTagName("constraints")[0]
     for location in resource_relocate_get_locations(cib_dom, resources):
         if not("start_on_node" in location or "promote_on_node" in location):
             continue
@@ -6,7 +6,8 @@ from __future__ import (
 )
 
 import re
-import xml.dom.minidom
+
+from lxml import etree
 
 from pcs import utils
 
@@ -57,7 +58,7 @@ def dom_rule_add(dom_element, options, rule_argv):
         id_valid, id_error = utils.validate_xml_id(options["id"], 'rule id')
         if not id_valid:
             utils.err(id_error)
-        if utils.does_id_exist(dom_element.ownerDocument, options["id"]):
+        if utils.does_id_exist(dom_element, options["id"]):
             utils.err(
                 "id '%s' is already in use, please specify another one"
                 % options["id"]
@@ -90,15 +91,13 @@ def dom_rule_add(dom_element, options, rule_argv):
         options["score"] = "INFINITY"
     for name, value in options.items():
         if name != "id" and value is not None:
-            dom_rule.setAttribute(name, value)
+            dom_rule.set(name, value)
     # score or score-attribute is required for the nested rules in order to have
     # valid CIB, pacemaker does not use the score of the nested rules
-    for rule in dom_rule.getElementsByTagName("rule"):
-        rule.setAttribute("score", "0")
-    if dom_element.hasAttribute("score"):
-        dom_element.removeAttribute("score")
-    if dom_element.hasAttribute("node"):
-        dom_element.removeAttribute("node")
+    for rule in dom_rule.iterdescendants("rule"):
+        rule.set("score", "0")
+    dom_element.attrib.pop("score", None)
+    dom_element.attrib.pop("node", None)
     return dom_element
 
 
@@ -113,60 +112,58 @@ class ExportDetailed(object):
 
     def list_rule(self, rule):
         rule_parts = ["Rule: %s" % " ".join(self.list_attributes(rule))]
-        for child in rule.childNodes:
-            if child.nodeType == xml.dom.minidom.Node.TEXT_NODE:
-                continue
-            if child.tagName == "expression":
+        for child in rule.iterchildren(etree.Element):
+            if child.tag == "expression":
                 self.indent_append(rule_parts, self.list_expression(child))
-            elif child.tagName == "date_expression":
+            elif child.tag == "date_expression":
                 self.indent_append(rule_parts, self.list_date_expression(child))
-            elif child.tagName == "rule":
+            elif child.tag == "rule":
                 self.indent_append(rule_parts, self.list_rule(child))
         return rule_parts
 
     def list_expression(self, expression):
-        if "value" in expression.attributes.keys():
+        if "value" in expression.attrib:
             exp_parts = [
-                expression.getAttribute("attribute"),
-                expression.getAttribute("operation")
+                expression.get("attribute", ""),
+                expression.get("operation", "")
             ]
-            if expression.hasAttribute("type"):
-                exp_parts.append(expression.getAttribute("type"))
-            exp_parts.append(expression.getAttribute("value"))
+            if "type" in expression.attrib:
+                exp_parts.append(expression.get("type"))
+            exp_parts.append(expression.get("value", ""))
         else:
             exp_parts = [
-                expression.getAttribute("operation"),
-                expression.getAttribute("attribute")
+                expression.get("operation", ""),
+                expression.get("attribute", "")
             ]
         if self.show_detail:
-            exp_parts.append(" (id:%s)" % expression.getAttribute("id"))
+            exp_parts.append(" (id:%s)" % expression.get("id", ""))
         return ["Expression: %s" % " ".join(exp_parts)]
 
     def list_date_expression(self, expression):
-        operation = expression.getAttribute("operation")
+        operation = expression.get("operation", "")
         if operation == "date_spec":
             date_spec_parts = self.list_attributes(
-                expression.getElementsByTagName("date_spec")[0]
+                expression.find(".//date_spec")
             )
             exp_parts = ["Expression:"]
             if self.show_detail:
-                exp_parts.append(" (id:%s)" % expression.getAttribute("id"))
+                exp_parts.append(" (id:%s)" % expression.get("id", ""))
             return self.indent_append(
                 [" ".join(exp_parts)],
                 ["Date Spec: %s" % " ".join(date_spec_parts)]
             )
         elif operation == "in_range":
             exp_parts = ["date", "in_range"]
-            if expression.hasAttribute("start"):
-                exp_parts.extend([expression.getAttribute("start"), "to"])
-            if expression.hasAttribute("end"):
-                exp_parts.append(expression.getAttribute("end"))
-            durations = expression.getElementsByTagName("duration")
+            if "start" in expression.attrib:
+                exp_parts.extend([expression.get("start"), "to"])
+            if "end" in expression.attrib:
+                exp_parts.append(expression.get("end"))
+            durations = expression.findall(".//duration")
             if durations:
                 exp_parts.append("duration")
                 duration_parts = self.list_attributes(durations[0])
             if self.show_detail:
-                exp_parts.append(" (id:%s)" % expression.getAttribute("id"))
+                exp_parts.append(" (id:%s)" % expression.get("id", ""))
             result = ["Expression: %s" % " ".join(exp_parts)]
             if durations:
                 self.indent_append(
@@ -175,19 +172,19 @@ class ExportDetailed(object):
                 )
             return result
         else:
-            exp_parts = ["date", expression.getAttribute("operation")]
-            if expression.hasAttribute("start"):
-                exp_parts.append(expression.getAttribute("start"))
-            if expression.hasAttribute("end"):
-                exp_parts.append(expression.getAttribute("end"))
+            exp_parts = ["date", expression.get("operation", "")]
+            if "start" in expression.attrib:
+                exp_parts.append(expression.get("start"))
+            if "end" in expression.attrib:
+                exp_parts.append(expression.get("end"))
             if self.show_detail:
-                exp_parts.append(" (id:%s)" % expression.getAttribute("id"))
+                exp_parts.append(" (id:%s)" % expression.get("id", ""))
             return ["Expression: " + " ".join(exp_parts)]
 
     def list_attributes(self, element):
         attributes = utils.dom_attrs_to_list(element, with_id=False)
         if self.show_detail:
-            attributes.append(" (id:%s)" % (element.getAttribute("id")))
+            attributes.append(" (id:%s)" % (element.get("id", "")))
         return attributes
 
     def indent_append(self, target, source, indent="  "):
@@ -205,66 +202,64 @@ class ExportAsExpression(object):
         return self.string_rule(rule)
 
     def string_rule(self, rule):
-        boolean_op = rule.getAttribute("boolean-op") or "or"
+        boolean_op = rule.get("boolean-op") or "or"
         rule_parts = []
-        for child in rule.childNodes:
-            if child.nodeType == xml.dom.minidom.Node.TEXT_NODE:
-                continue
-            if child.tagName == "expression":
+        for child in rule.iterchildren(etree.Element):
+            if child.tag == "expression":
                 rule_parts.append(self.string_expression(child))
-            elif child.tagName == "date_expression":
+            elif child.tag == "date_expression":
                 rule_parts.append(self.string_date_expression(child))
-            elif child.tagName == "rule":
+            elif child.tag == "rule":
                 rule_parts.append("(%s)" % self.string_rule(child))
         if self.normalize:
             rule_parts.sort()
         return (" %s " % boolean_op).join(rule_parts)
 
     def string_expression(self, expression):
-        if "value" in expression.attributes.keys():
+        if "value" in expression.attrib:
             exp_parts = [
-                expression.getAttribute("attribute"),
-                expression.getAttribute("operation")
+                expression.get("attribute", ""),
+                expression.get("operation", "")
             ]
-            if expression.hasAttribute("type"):
-                exp_parts.append(expression.getAttribute("type"))
+            if "type" in expression.attrib:
+                exp_parts.append(expression.get("type"))
             elif self.normalize:
                 exp_parts.append("string")
-            value = expression.getAttribute("value")
+            value = expression.get("value", "")
             if " " in value:
                 value = '"%s"' % value
             exp_parts.append(value)
         else:
             exp_parts = [
-                expression.getAttribute("operation"),
-                expression.getAttribute("attribute")
+                expression.get("operation", ""),
+                expression.get("attribute", "")
             ]
         return " ".join(exp_parts)
 
     def string_date_expression(self, expression):
-        operation = expression.getAttribute("operation")
+        operation = expression.get("operation", "")
         if operation == "date_spec":
             exp_parts = ["date-spec"] + self.list_attributes(
-                expression.getElementsByTagName("date_spec")[0]
+                expression.find(".//date_spec")
             )
             return " ".join(exp_parts)
         elif operation == "in_range":
             exp_parts = ["date", "in_range"]
-            if expression.hasAttribute("start"):
-                exp_parts.extend([expression.getAttribute("start"), "to"])
-            if expression.hasAttribute("end"):
-                exp_parts.append(expression.getAttribute("end"))
-            durations = expression.getElementsByTagName("duration")
+            if "start" in expression.attrib:
+                exp_parts.extend([expression.get("start"), "to"])
+            if "end" in expression.attrib:
+                exp_parts.append(expression.get("end"))
+            durations = expression.findall(".//duration")
             if durations:
                 exp_parts.append("duration")
                 exp_parts.extend(self.list_attributes(durations[0]))
             return " ".join(exp_parts)
         else:
-            exp_parts = ["date", expression.getAttribute("operation")]
-            if expression.hasAttribute("start"):
-                exp_parts.append(expression.getAttribute("start"))
-            if expression.hasAttribute("end"):
-                exp_parts.append(expression.getAttribute("end"))
+            exp_parts = ["date", expression.get("operation", "")]
+            if "start" in expression.attrib:
+                exp_parts.append(expression.get("start"))
+            if "end" in expression.attrib:
+                exp_parts.append(expression.get("end"))
             return " ".join(exp_parts)
 
     def list_attributes(self, element):
@@ -835,7 +830,7 @@ class CibBuilder(object):
         dom_rule = self.add_element(
             dom_element,
             "rule",
-            rule_id if rule_id else dom_element.getAttribute("id") + "-rule"
+            rule_id if rule_id else dom_element.get("id", "") + "-rule"
         )
         self.build_rule(dom_rule, syntactic_tree)
         return dom_rule
@@ -867,54 +862,54 @@ class CibBuilder(object):
         dom_expression = self.add_element(
             dom_element,
             "date_expression",
-            dom_element.getAttribute("id") + "-expr"
+            dom_element.get("id", "") + "-expr"
         )
-        dom_expression.setAttribute("operation", "date_spec")
+        dom_expression.set("operation", "date_spec")
         dom_datespec = self.add_element(
             dom_expression,
             "date_spec",
-            dom_expression.getAttribute("id") + "-datespec"
+            dom_expression.get("id", "") + "-datespec"
         )
         for key, value in syntactic_tree.children[0].value.parts.items():
-            dom_datespec.setAttribute(key, value)
+            dom_datespec.set(key, value)
 
     def build_expression(self, dom_element, syntactic_tree):
         dom_expression = self.add_element(
             dom_element,
             "expression",
-            dom_element.getAttribute("id") + "-expr"
+            dom_element.get("id", "") + "-expr"
         )
-        dom_expression.setAttribute("operation", syntactic_tree.symbol_id)
-        dom_expression.setAttribute(
+        dom_expression.set("operation", syntactic_tree.symbol_id)
+        dom_expression.set(
             "attribute", syntactic_tree.children[0].value
         )
         if not isinstance(syntactic_tree, SymbolPrefix):
             child = syntactic_tree.children[1]
             if isinstance(child, SymbolType):
-                dom_expression.setAttribute(
+                dom_expression.set(
                     "type",
                     "number" if child.symbol_id == "integer" else child.symbol_id
                 )
                 child = child.children[0]
-            dom_expression.setAttribute("value", child.value)
+            dom_expression.set("value", child.value)
 
     def build_date_expression(self, dom_element, syntactic_tree):
         dom_expression = self.add_element(
             dom_element,
             "date_expression",
-            dom_element.getAttribute("id") + "-expr"
+            dom_element.get("id", "") + "-expr"
         )
-        dom_expression.setAttribute("operation", syntactic_tree.symbol_id)
+        dom_expression.set("operation", syntactic_tree.symbol_id)
         if syntactic_tree.symbol_id == 'gt':
-            dom_expression.setAttribute(
+            dom_expression.set(
                 "start", syntactic_tree.children[1].value
             )
         elif syntactic_tree.symbol_id == 'lt':
-            dom_expression.setAttribute(
+            dom_expression.set(
                 "end", syntactic_tree.children[1].value
             )
         elif syntactic_tree.symbol_id == 'in_range':
-            dom_expression.setAttribute(
+            dom_expression.set(
                 "start", syntactic_tree.children[1].value
             )
             if (
@@ -925,18 +920,18 @@ class CibBuilder(object):
                 dom_duration = self.add_element(
                     dom_expression,
                     "duration",
-                    dom_expression.getAttribute("id") + "-duration"
+                    dom_expression.get("id", "") + "-duration"
                 )
                 duration = syntactic_tree.children[2].children[0].value
                 for key, value in duration.parts.items():
-                    dom_duration.setAttribute(key, value)
+                    dom_duration.set(key, value)
             else:
-                dom_expression.setAttribute(
+                dom_expression.set(
                     "end", syntactic_tree.children[2].value
                 )
 
     def build_boolean(self, dom_element, syntactic_tree):
-        dom_element.setAttribute("boolean-op", syntactic_tree.symbol_id)
+        dom_element.set("boolean-op", syntactic_tree.symbol_id)
         for subtree in syntactic_tree.children:
             if (
                 subtree.symbol_id in RuleParser.boolean_list
@@ -946,15 +941,14 @@ class CibBuilder(object):
                 self.build(
                     dom_element,
                     subtree,
-                    dom_element.getAttribute("id") + "-rule"
+                    dom_element.get("id", "") + "-rule"
                 )
             else:
                 self.build_rule(dom_element, subtree)
 
     def add_element(self, parent, tag_name, element_id):
-        dom = parent.ownerDocument
-        child = parent.appendChild(dom.createElement(tag_name))
-        child.setAttribute("id", utils.find_unique_id(dom, element_id))
+        child = etree.SubElement(parent, tag_name)
+        child.set("id", utils.find_unique_id(parent, element_id))
         return child
 
 
@@ -21,6 +21,7 @@ corosync_qdevice_net_client_certs_dir = os.path.join(
 corosync_qdevice_net_client_ca_file_name = "qnetd-cacert.crt"
 cluster_conf_file = "/etc/cluster/cluster.conf"
 fence_agent_binaries = "/usr/sbin/"
+ocf_root = "/usr/lib/ocf/"
 pengine_binary = "/usr/libexec/pacemaker/pengine"
 crmd_binary = "/usr/libexec/pacemaker/crmd"
 cib_binary = "/usr/libexec/pacemaker/cib"
@@ -37,6 +38,10 @@ pcsd_users_conf_location = "/var/lib/pcsd/pcs_users.conf"
 pcsd_settings_conf_location = "/var/lib/pcsd/pcs_settings.conf"
 pcsd_exec_location = "/usr/lib/pcsd/"
 cib_dir = "/var/lib/pacemaker/cib/"
+pcs_var_dir = "/var/lib/pcs/"
+agent_metadata_cache_dir = os.path.join(pcs_var_dir, "agent_metadata_cache/")
+# users other than root keep the cache in ~/.pcs/
+completion_tree_cache_file = os.path.join(pcs_var_dir, "completion_tree.json")
 pacemaker_uname = "hacluster"
 pacemaker_gname = "haclient"
 sbd_watchdog_default = "/dev/watchdog"
@@ -45,3 +50,19 @@ pacemaker_wait_timeout_status = 62
 booth_config_dir = "/etc/booth"
 booth_binary = "/usr/sbin/booth"
 default_request_timeout = 60
+# seconds to wait for each piece of information displayed by 'pcs status'
+status_probe_timeout = 90
+# how many agents' metadata are loaded at once and how many seconds to wait
+# for metadata of one agent
+agent_metadata_max_parallel = 8
+agent_metadata_timeout = 30
+# maximal number of nodes pcs communicates with at once
+node_max_parallel = 32
+# how many unused connections to a node are kept open for next requests
+node_idle_connections_per_host = 4
+# for how many seconds a node which could not be connected to is considered
+# unreachable and requests to it fail at once, 0 disables it
+node_unreachable_ttl = 60
+# how many seconds to wait for a connection to a node to be established, then
+# its next address is tried
+node_connect_timeout = 10
@@ -9,13 +9,11 @@ import sys
 import os
 
 from pcs import (
-    resource,
-    usage,
+    settings,
     utils,
 )
-from pcs.qdevice import qdevice_status_cmd
-from pcs.quorum import quorum_status_cmd
 from pcs.cli.common.errors import CmdLineInputError
+from pcs.common.tools import run_parallel_bounded
 from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.state import ClusterState
 
@@ -24,12 +22,17 @@ def status_cmd(argv):
         full_status()
         sys.exit(0)
 
+    # modules of other commands and usage are imported only when needed, so
+    # plain pcs status, which is run often by monitoring tools, starts fast
     sub_cmd = argv.pop(0)
     if (sub_cmd == "help"):
+        from pcs import usage
         usage.status(argv)
     elif (sub_cmd == "resources"):
+        from pcs import resource
         resource.resource_show(argv)
     elif (sub_cmd == "groups"):
+        from pcs import resource
         resource.resource_group_list(argv)
     elif (sub_cmd == "cluster"):
         cluster_status(argv)
@@ -42,6 +45,7 @@ def status_cmd(argv):
     elif (sub_cmd == "corosync"):
         corosync_status()
     elif sub_cmd == "qdevice":
+        from pcs.qdevice import qdevice_status_cmd
         try:
             qdevice_status_cmd(
                 utils.get_library_wrapper(),
@@ -53,6 +57,7 @@ def status_cmd(argv):
         except CmdLineInputError as e:
             utils.exit_on_cmdline_input_errror(e, "status", sub_cmd)
     elif sub_cmd == "quorum":
+        from pcs.quorum import quorum_status_cmd
         try:
             quorum_status_cmd(
                 utils.get_library_wrapper(),
@@ -64,6 +69,7 @@ def status_cmd(argv):
         except CmdLineInputError as e:
             utils.exit_on_cmdline_input_errror(e, "status", sub_cmd)
     else:
+        from pcs import usage
         usage.status()
         sys.exit(1)
 
@@ -79,34 +85,119 @@ def full_status():
             ["--show-detail", "--show-node-attributes", "--failcounts"]
         )
 
-    output, retval = utils.run(monitor_command)
+    show_cluster_name = (
+        not utils.usefile or "--corosync_conf" in utils.pcs_options
+    )
 
+    # There is nothing to display if the cluster is not running, so its status
+    # is checked first. The other pieces of information are independent, so
+    # they are gathered at the same time then and displayed in the usual order
+    # once they are available.
+    timeout = settings.status_probe_timeout
+    finished, cluster_info = _get_probe_result(
+        _run_status_probes(
+            [("cluster", lambda: utils.run(monitor_command))], timeout
+        ),
+        "cluster"
+    )
+    if not finished:
+        utils.err(
+            "unable to get cluster status in {0} seconds".format(timeout)
+        )
+    output, retval = cluster_info
     if (retval != 0):
         utils.err("cluster is not currently running on this node")
 
-    if not utils.usefile or "--corosync_conf" in utils.pcs_options:
-        cluster_name = utils.getClusterName()
-        print("Cluster name: %s" % cluster_name)
-
-    if utils.stonithCheck():
+    probe_list = []
+    if show_cluster_name:
+        probe_list.append(("cluster_name", utils.getClusterName))
+    probe_list.append(("stonith", utils.stonithCheck))
+    if not utils.usefile and not utils.is_rhel6():
+        probe_list.append(("node_names", utils.corosyncPacemakerNodeCheck))
+    if not utils.usefile:
+        if "--full" in utils.pcs_options and utils.hasCorosyncConf():
+            probe_list.append(("pcsd", get_pcsd_daemon_status_lines))
+        probe_list.append(
+            ("daemons", lambda: utils.get_service_status_lines("  "))
+        )
+    probe_results = _run_status_probes(probe_list, timeout)
+    # get the results in the order the probes ran one by one before, so their
+    # errors are printed in the same order
+    probe_value_map = {}
+    for name, dummy_probe in probe_list:
+        probe_value_map[name] = _get_probe_result(probe_results, name)
+
+    if show_cluster_name:
+        finished, cluster_name = probe_value_map["cluster_name"]
+        if finished:
+            print("Cluster name: %s" % cluster_name)
+
+    finished, stonith_missing = probe_value_map["stonith"]
+    if finished and stonith_missing:
         print("WARNING: no stonith devices and stonith-enabled is not false")
 
-    if (
-        not utils.usefile
-        and
-        not utils.is_rhel6()
-        and
-        utils.corosyncPacemakerNodeCheck()
-    ):
-        print("WARNING: corosync and pacemaker node names do not match (IPs used in setup?)")
+    if "node_names" in probe_value_map:
+        finished, node_names_mismatch = probe_value_map["node_names"]
+        if finished and node_names_mismatch:
+            print("WARNING: corosync and pacemaker node names do not match (IPs used in setup?)")
 
     print(output)
 
-    if not utils.usefile:
-        if  "--full" in utils.pcs_options and utils.hasCorosyncConf():
-            print_pcsd_daemon_status()
-            print()
-        utils.serviceStatus("  ")
+    if "pcsd" in probe_value_map:
+        finished, line_list = probe_value_map["pcsd"]
+        if not finished:
+            line_list = ["PCSD Status:", "Unable to get PCSD status"]
+        for line in line_list:
+            print(line)
+        print()
+    if "daemons" in probe_value_map:
+        finished, line_list = probe_value_map["daemons"]
+        if not finished:
+            line_list = ["Daemon Status:", "  Unable to get daemon status"]
+        for line in line_list:
+            print(line)
+
+def _run_status_probes(probe_list, timeout):
+    """
+    Run probes at the same time
+
+    Probes do not print errors from their threads, the errors are collected
+    and printed by _get_probe_result.
+
+    list probe_list -- (name, callable) pairs
+    timeout -- seconds to wait for a probe
+    Return a dict name: (finished, (value, error list, exit exception)).
+    """
+    result_list = run_parallel_bounded(
+        utils.run_collecting_errors,
+        [probe for dummy_name, probe in probe_list],
+        len(probe_list),
+        timeout
+    )
+    probe_results = {}
+    for (name, dummy_probe), (finished, result, exception) in zip(
+        probe_list, result_list
+    ):
+        if exception is not None:
+            raise exception
+        probe_results[name] = (finished, result)
+    return probe_results
+
+def _get_probe_result(probe_results, name):
+    """
+    Print errors of a probe, exit if the probe exited
+
+    Return a (finished, value) pair.
+    """
+    finished, result = probe_results[name]
+    if not finished:
+        return False, None
+    value, error_list, exit_exception = result
+    for error in error_list:
+        utils.err(error, False)
+    if exit_exception is not None:
+        raise exit_exception
+    return True, value
 
 # Parse crm_mon for status
 def nodes_status(argv):
@@ -160,8 +251,8 @@ def nodes_status(argv):
 
     info_dom = utils.getClusterState()
 
-    nodes = info_dom.getElementsByTagName("nodes")
-    if nodes.length == 0:
+    nodes = info_dom.findall(".//nodes")
+    if not nodes:
         utils.err("No nodes section found")
 
     onlinenodes = []
@@ -172,16 +263,16 @@ def nodes_status(argv):
     remote_offlinenodes = []
     remote_standbynodes = []
     remote_maintenancenodes = []
-    for node in nodes[0].getElementsByTagName("node"):
-        node_name = node.getAttribute("name")
-        node_remote = node.getAttribute("type") == "remote"
-        if node.getAttribute("online") == "true":
-            if node.getAttribute("standby") == "true":
+    for node in nodes[0].iterdescendants("node"):
+        node_name = node.get("name", "")
+        node_remote = node.get("type") == "remote"
+        if node.get("online") == "true":
+            if node.get("standby") == "true":
                 if node_remote:
                     remote_standbynodes.append(node_name)
                 else:
                     standbynodes.append(node_name)
-            elif node.getAttribute("maintenance") == "true":
+            elif node.get("maintenance") == "true":
                 if node_remote:
                     remote_maintenancenodes.append(node_name)
                 else:
@@ -215,20 +306,18 @@ def resources_status(argv):
 
     print("Resources:")
 
-    resources = info_dom.getElementsByTagName("resources")
-    if resources.length == 0:
+    resources = info_dom.findall(".//resources")
+    if not resources:
         utils.err("no resources section found")
 
-    for resource in resources[0].getElementsByTagName("resource"):
-        nodes = resource.getElementsByTagName("node")
+    for resource in resources[0].iterdescendants("resource"):
         node_line = ""
-        if nodes.length > 0:
-            for node in nodes:
-                node_line += node.getAttribute("name") + " "
+        for node in resource.iterdescendants("node"):
+            node_line += node.get("name", "") + " "
 
-        print("", resource.getAttribute("id"), end=' ')
-        print("(" + resource.getAttribute("resource_agent") + ")", end=' ')
-        print("- " + resource.getAttribute("role") + " " + node_line)
+        print("", resource.get("id", ""), end=' ')
+        print("(" + resource.get("resource_agent", "") + ")", end=' ')
+        print("- " + resource.get("role", "") + " " + node_line)
 
 def cluster_status(argv):
     (output, retval) = utils.run(["crm_mon", "-1", "-r"])
@@ -265,32 +354,31 @@ def xml_status():
         utils.err("running crm_mon, is pacemaker running?")
     print(output, end="")
 
-def is_service_running(service):
-    if utils.is_systemctl():
-        dummy_output, retval = utils.run(["systemctl", "status", service])
-    else:
-        dummy_output, retval = utils.run(["service", service, "status"])
-    return retval == 0
-
 def print_pcsd_daemon_status():
-    print("PCSD Status:")
+    for line in get_pcsd_daemon_status_lines():
+        print(line)
+
+def get_pcsd_daemon_status_lines():
+    line_list = ["PCSD Status:"]
     if os.getuid() == 0:
-        cluster_pcsd_status([], True)
+        cluster_pcsd_status([], True, line_list.append)
     else:
         err_msgs, exitcode, std_out, dummy_std_err = utils.call_local_pcsd(
             ['status', 'pcsd'], True
         )
         if err_msgs:
-            for msg in err_msgs:
-                print(msg)
+            line_list.extend(err_msgs)
         if 0 == exitcode:
-            print(std_out)
+            line_list.append(std_out)
         else:
-            print("Unable to get PCSD status")
+            line_list.append("Unable to get PCSD status")
+    return line_list
 
-def check_nodes(node_list, prefix=""):
+def check_nodes(node_list, prefix="", printer=print):
     """
     Print pcsd status on node_list, return if there is any pcsd not online
+
+    callable printer -- called with each line to be printed
     """
     if not utils.is_rhel6():
         pm_nodes = utils.getPacemakerNodesID(allow_failure=True)
@@ -303,7 +391,7 @@ def check_nodes(node_list, prefix=""):
     }
     status_list = []
     def report(node, returncode, output):
-        print("{0}{1}: {2}".format(
+        printer("{0}{1}: {2}".format(
             prefix,
             node if utils.is_rhel6() else utils.prepare_node_name(
                 node, pm_nodes, cs_nodes
@@ -320,7 +408,7 @@ def check_nodes(node_list, prefix=""):
 
 # If no arguments get current cluster node status, otherwise get listed
 # nodes status
-def cluster_pcsd_status(argv, dont_exit=False):
+def cluster_pcsd_status(argv, dont_exit=False, printer=print):
     bad_nodes = False
     if len(argv) == 0:
         nodes = utils.getNodesFromCorosyncConf()
@@ -329,8 +417,8 @@ def cluster_pcsd_status(argv, dont_exit=False):
                 utils.err("no nodes found in cluster.conf")
             else:
                 utils.err("no nodes found in corosync.conf")
-        bad_nodes = check_nodes(nodes, "  ")
+        bad_nodes = check_nodes(nodes, "  ", printer)
     else:
-        bad_nodes = check_nodes(argv, "  ")
+        bad_nodes = check_nodes(argv, "  ", printer)
     if bad_nodes and not dont_exit:
         sys.exit(2)
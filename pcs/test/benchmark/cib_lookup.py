@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Compare minidom and lxml when parsing and searching a big CIB
+
+Run from the pcs root dir:
+python -m pcs.test.benchmark.cib_lookup [number of primitives]
+"""
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import sys
+import timeit
+from xml.dom.minidom import parseString
+
+from pcs import constraint, utils
+from pcs.common.tools import xml_fromstring
+
+
+def cib_xml(primitive_count):
+    resources = []
+    constraints = []
+    for i in range(primitive_count):
+        primitive = (
+            '<primitive id="R{0}" class="ocf" provider="heartbeat" '
+            'type="Dummy"><meta_attributes id="R{0}-meta_attributes">'
+            '<nvpair id="R{0}-meta_attributes-target-role" name="target-role"'
+            ' value="Started"/></meta_attributes></primitive>'
+        ).format(i)
+        if i % 10 == 0:
+            resources.append('<clone id="R{0}-clone">{1}</clone>'.format(
+                i, primitive
+            ))
+        else:
+            resources.append(primitive)
+        if i % 2 == 0:
+            constraints.append(
+                '<rsc_location id="L{0}" rsc="R{0}" node="node1" '
+                'score="INFINITY"/>'.format(i)
+            )
+    return (
+        '<cib epoch="1" num_updates="0" admin_epoch="0" '
+        'validate-with="pacemaker-2.5"><configuration><crm_config/><nodes/>'
+        '<resources>{0}</resources><constraints>{1}</constraints>'
+        '</configuration><status/></cib>'
+    ).format("".join(resources), "".join(constraints))
+
+def crm_mon_xml(primitive_count):
+    return (
+        '<crm_mon version="1.1.15"><summary/><nodes/><resources>{0}'
+        '</resources></crm_mon>'
+    ).format("".join([
+        (
+            '<resource id="R{0}" resource_agent="ocf::heartbeat:Dummy" '
+            'role="Started" failed="false" managed="true">'
+            '<node name="node1" id="1" cached="false"/></resource>'
+        ).format(i)
+        for i in range(primitive_count)
+    ]))
+
+def measure(label, function, repeat):
+    seconds = min(timeit.repeat(function, number=1, repeat=repeat))
+    print("{0:<45} {1:>10.2f} ms".format(label, seconds * 1000))
+
+def main(primitive_count):
+    cib = cib_xml(primitive_count)
+    state = crm_mon_xml(primitive_count)
+    cib_dom = parseString(cib)
+    cib_lxml = xml_fromstring(cib)
+    state_lxml = xml_fromstring(state)
+    last_id = "R{0}".format(primitive_count - 1)
+    cloned_id = "R{0}".format((primitive_count - 1) // 10 * 10)
+
+    print("CIB with {0} primitives, {1} bytes".format(
+        primitive_count, len(cib)
+    ))
+    measure("parse cib: minidom", lambda: parseString(cib), 3)
+    measure("parse cib: lxml", lambda: xml_fromstring(cib), 3)
+    measure("parse crm_mon: minidom", lambda: parseString(state), 3)
+    measure("parse crm_mon: lxml", lambda: xml_fromstring(state), 3)
+    measure(
+        "dom_get_resource: minidom",
+        lambda: utils.dom_get_resource(cib_dom, last_id),
+        5
+    )
+    measure(
+        "dom_get_resource: lxml",
+        lambda: utils.dom_get_resource(cib_lxml, last_id),
+        5
+    )
+    measure(
+        "dom_get_resource_clone_ms_parent: minidom",
+        lambda: utils.dom_get_resource_clone_ms_parent(cib_dom, cloned_id),
+        5
+    )
+    measure(
+        "dom_get_resource_clone_ms_parent: lxml",
+        lambda: utils.dom_get_resource_clone_ms_parent(cib_lxml, cloned_id),
+        5
+    )
+    measure(
+        "find_constraints_containing: lxml",
+        lambda: constraint.find_constraints_containing(cloned_id, cib_lxml),
+        3
+    )
+    measure(
+        "resource_running_on: lxml",
+        lambda: utils.resource_running_on(last_id, state_lxml),
+        5
+    )
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
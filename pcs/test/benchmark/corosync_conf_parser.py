@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Compare the corosync.conf parser with the previous recursive one on configs
+with 10 nodes, 1,000 nodes and 10,000 lines
+
+Run from the pcs root dir:
+python -m pcs.test.benchmark.corosync_conf_parser
+"""
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import timeit
+
+from pcs.lib.corosync import config_parser
+
+
+def recursive_parse_string(conf_text):
+    # the parser used before, kept here for comparison
+    root = config_parser.Section("")
+    _recursive_parse_section(conf_text.split("\n"), root)
+    return root
+
+def _recursive_parse_section(lines, section):
+    while lines:
+        current_line = lines.pop(0).strip()
+        if not current_line or current_line[0] == "#":
+            continue
+        if "{" in current_line:
+            section_name, dummy_junk = current_line.rsplit("{", 1)
+            new_section = config_parser.Section(section_name.strip())
+            section.add_section(new_section)
+            _recursive_parse_section(lines, new_section)
+        elif "}" in current_line:
+            if not section.parent:
+                raise config_parser.UnexpectedClosingBraceException()
+            return
+        elif ":" in current_line:
+            section.add_attribute(
+                *[x.strip() for x in current_line.split(":", 1)]
+            )
+    if section.parent:
+        raise config_parser.MissingClosingBraceException()
+
+def corosync_conf(node_count, logger_count=0):
+    lines = [
+        "totem {",
+        "    version: 2",
+        "    cluster_name: benchmark",
+        "    transport: udpu",
+        "}",
+        "",
+        "nodelist {",
+    ]
+    for i in range(1, node_count + 1):
+        lines.extend([
+            "    node {",
+            "        ring0_addr: node{0}".format(i),
+            "        nodeid: {0}".format(i),
+            "    }",
+        ])
+    lines.extend([
+        "}",
+        "",
+        "quorum {",
+        "    provider: corosync_votequorum",
+        "}",
+        "",
+        "logging {",
+        "    to_logfile: yes",
+        "    logfile: /var/log/cluster/corosync.log",
+        "    to_syslog: yes",
+    ])
+    for i in range(logger_count):
+        lines.extend([
+            "",
+            "    # logger for a subsystem",
+            "    logger_subsys {",
+            "        subsys: SUBSYS{0}".format(i),
+            "        debug: off",
+            "    }",
+        ])
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def measure(label, function, repeat):
+    seconds = min(timeit.repeat(function, number=1, repeat=repeat))
+    print("{0:<45} {1:>10.2f} ms".format(label, seconds * 1000))
+
+def main():
+    config_list = [
+        ("10 nodes", corosync_conf(10)),
+        ("1,000 nodes", corosync_conf(1000)),
+        # 50 nodes take 200 lines, the rest are logger subsections
+        ("10,000 lines", corosync_conf(50, (10000 - 220) // 6)),
+    ]
+    for label, conf_text in config_list:
+        assert (
+            config_parser.parse_string(conf_text).export()
+            ==
+            recursive_parse_string(conf_text).export()
+        )
+        print("{0}: {1} lines".format(label, conf_text.count("\n")))
+        measure(
+            "  parse_string",
+            lambda: config_parser.parse_string(conf_text),
+            5
+        )
+        measure(
+            "  previous recursive parser",
+            lambda: recursive_parse_string(conf_text),
+            5
+        )
+
+if __name__ == "__main__":
+    main()
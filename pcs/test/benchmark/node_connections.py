@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Count connections and TLS handshakes made by a command calling one node
+several times in a row, with and without reusing curl handles
+
+A local https server listening on port 2224 stands for pcsd, so pcsd must not
+be running on this machine. The openssl binary is needed to create
+a certificate for the server.
+
+Run from the pcs root dir:
+python -m pcs.test.benchmark.node_connections
+"""
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import logging
+import os.path
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+from pcs.common.curl_pool import CurlHandlePool, create_curl_share
+from pcs.lib import external
+
+
+# _add_device_model_net and node add call a node up to six times in a row
+CALLS_PER_COMMAND = 6
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+class CountingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, ssl_context):
+        HTTPServer.__init__(self, address, Handler)
+        self.socket = ssl_context.wrap_socket(self.socket, server_side=True)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.handshakes = 0
+            self.resumed_sessions = 0
+
+    def get_request(self):
+        sock, address = HTTPServer.get_request(self)
+        with self.lock:
+            self.handshakes += 1
+            if sock.session_reused:
+                self.resumed_sessions += 1
+        return sock, address
+
+class Reporter(object):
+    def process(self, report_item):
+        pass
+
+def create_certificate(tmp_dir):
+    cert_file = os.path.join(tmp_dir, "cert.pem")
+    key_file = os.path.join(tmp_dir, "key.pem")
+    subprocess.check_call(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-subj", "/CN=localhost", "-days", "1",
+            "-keyout", key_file, "-out", cert_file,
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    return cert_file, key_file
+
+def run_command(server, curl_handle_pool):
+    communicator = external.NodeCommunicator(
+        logging.getLogger("benchmark"), Reporter(), {}
+    )
+    original_get_pool = external.get_curl_handle_pool
+    external.get_curl_handle_pool = lambda: curl_handle_pool
+    server.reset()
+    start = time.time()
+    try:
+        for dummy in range(CALLS_PER_COMMAND):
+            communicator.call_host("localhost", "remote/status", None)
+    finally:
+        external.get_curl_handle_pool = original_get_pool
+    return time.time() - start
+
+def main():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
+        ssl_context.load_cert_chain(*create_certificate(tmp_dir))
+        server = CountingServer(("localhost", 2224), ssl_context)
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+
+        print("{0} calls to one node:".format(CALLS_PER_COMMAND))
+        for label, pool in [
+            ("  new handle for each call", CurlHandlePool(0)),
+            (
+                "  handles reused",
+                CurlHandlePool(4, create_curl_share())
+            ),
+        ]:
+            seconds = run_command(server, pool)
+            print(
+                "{0:<30} {1} handshakes ({2} resumed sessions), {3:.2f} ms"
+                .format(
+                    label,
+                    server.handshakes,
+                    server.resumed_sessions,
+                    seconds * 1000
+                )
+            )
+        server.shutdown()
+    finally:
+        shutil.rmtree(tmp_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+Measure how long it takes to start pcs and how many modules it imports when
+command modules are imported lazily and when all of them are imported at once
+as pcs did before
+
+Each measurement runs in a new python process, the best of several runs is
+shown. Python 3.7+ can show import times of all the modules:
+python -X importtime -c "import pcs.app"
+
+Run from the pcs root dir:
+python -m pcs.test.benchmark.startup
+"""
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import json
+import os.path
+import subprocess
+import sys
+
+
+PCS_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))
+)))
+REPEAT = 10
+
+COMMAND_MODULE_LIST = [
+    "acl", "alert", "booth", "cluster", "config", "constraint", "node", "pcsd",
+    "prop", "qdevice", "quorum", "resource", "status", "stonith",
+]
+
+SCRIPT = """
+import json, sys, time
+start = time.time()
+{imports}
+print(json.dumps([time.time() - start, len(sys.modules)]))
+"""
+
+def measure(import_list):
+    script = SCRIPT.format(
+        imports="\n".join(["import " + name for name in import_list])
+    )
+    best = None
+    for dummy in range(REPEAT):
+        output = subprocess.check_output(
+            [sys.executable, "-c", script], cwd=PCS_ROOT
+        )
+        seconds, modules = json.loads(output.decode("utf-8"))
+        if best is None or seconds < best[0]:
+            best = (seconds, modules)
+    return best
+
+def main():
+    case_list = [
+        # what pcs imported on start before
+        ("pcs.app, all commands", ["pcs.app", "pcs.cli.common.lib_wrapper"] + [
+            "pcs." + module for module in COMMAND_MODULE_LIST
+        ]),
+        ("pcs.app", ["pcs.app"]),
+        ("pcs.app, status command", ["pcs.app", "pcs.status"]),
+        ("pcs.app, resource command", ["pcs.app", "pcs.resource"]),
+        ("pcs.app, quorum command", [
+            "pcs.app", "pcs.quorum", "pcs.cli.common.lib_wrapper"
+        ]),
+    ]
+    for label, import_list in case_list:
+        seconds, modules = measure(import_list)
+        print("{0:<30} {1:>8.2f} ms {2:>6} modules".format(
+            label, seconds * 1000, modules
+        ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import json
+import os.path
+import subprocess
+import sys
+
+from pcs.test.tools.pcs_unittest import TestCase
+
+
+PCS_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)
+)))
+
+class LazyCommandImportTest(TestCase):
+    def imported_modules(self, code):
+        # a new process is needed, tests import everything
+        output = subprocess.check_output(
+            [
+                sys.executable,
+                "-c",
+                code
+                +
+                "\nimport json, sys\nprint(json.dumps(list(sys.modules)))"
+            ],
+            cwd=PCS_ROOT
+        )
+        # the code may print something, modules are on the last line
+        return set(json.loads(output.decode("utf-8").splitlines()[-1]))
+
+    def test_app_does_not_import_commands(self):
+        modules = self.imported_modules("import pcs.app")
+        for name in [
+            "pcs.acl",
+            "pcs.alert",
+            "pcs.booth",
+            "pcs.cli.common.lib_wrapper",
+            "pcs.cluster",
+            "pcs.config",
+            "pcs.constraint",
+            "pcs.node",
+            "pcs.pcsd",
+            "pcs.prop",
+            "pcs.qdevice",
+            "pcs.quorum",
+            "pcs.resource",
+            "pcs.status",
+            "pcs.stonith",
+        ]:
+            self.assertFalse(name in modules, name)
+
+    def test_status_does_not_import_usage(self):
+        modules = self.imported_modules(
+            "import pcs.app, pcs.utils, pcs.status"
+        )
+        for name in ["pcs.usage", "pcs.resource", "pcs.quorum", "pcs.qdevice"]:
+            self.assertFalse(name in modules, name)
+
+    def test_command_module_imported_when_run(self):
+        modules = self.imported_modules(
+            "import pcs.app\n"
+            "pcs.app.main(['property', 'help'])"
+        )
+        self.assertTrue("pcs.prop" in modules)
+        self.assertFalse("pcs.resource" in modules)
+
+    def test_completion_does_not_import_utils(self):
+        modules = self.imported_modules(
+            "import os\n"
+            "os.environ.update(COMP_WORDS='pcs resource cr', "
+            "COMP_LENGTHS='3 8 2', COMP_CWORD='2', PCS_AUTO_COMPLETE='1')\n"
+            # do not store the cache anywhere
+            "os.environ['HOME'] = '/nonexistent'\n"
+            "import pcs.settings\n"
+            "pcs.settings.completion_tree_cache_file = '/nonexistent/tree'\n"
+            "import pcs.app\n"
+            "try:\n"
+            "    pcs.app.main([])\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+        self.assertFalse("pcs.utils" in modules)
+        self.assertFalse("lxml" in modules)
+        self.assertFalse("lxml.etree" in modules)
@@ -8,7 +8,9 @@ from __future__ import (
 import os
 import shutil
 import socket
+from time import sleep
 from pcs.test.tools import pcs_unittest as unittest
+from pcs.test.tools.pcs_unittest import mock
 
 from pcs.test.tools.assertions import AssertPcsMixin
 from pcs.test.tools.misc import (
@@ -22,7 +24,7 @@ from pcs.test.tools.pcs_runner import (
     PcsRunner,
 )
 
-from pcs import utils
+from pcs import cluster, utils
 
 empty_cib = rc("cib-empty-withnodes.xml")
 temp_cib = rc("temp-cib.xml")
@@ -2869,3 +2871,42 @@ class ClusterEnableDisable(unittest.TestCase, AssertPcsMixin):
             "cluster disable rh7-1 rh7-2 --all",
             stdout_full="Error: Cannot specify both --all and a list of nodes.\n"
         )
+
+
+@mock.patch("pcs.cluster.print")
+class EnableDisableClusterNodes(unittest.TestCase):
+    @staticmethod
+    def fixture_action(node, quiet=False):
+        # the first node finishes last
+        sleep(.1 if node == "node1" else 0)
+        if node == "node3":
+            return 1, "{0}: error".format(node)
+        return 0, "done {0}\n".format(node)
+
+    def assert_printed_in_order(self, mock_print):
+        self.assertEqual(
+            [mock.call("node1: done node1"), mock.call("node2: done node2")],
+            mock_print.mock_calls
+        )
+
+    @mock.patch("pcs.utils.enableCluster")
+    @mock.patch("pcs.utils.err")
+    def test_enable(self, mock_err, mock_enable, mock_print):
+        mock_enable.side_effect = self.fixture_action
+        cluster.enable_cluster_nodes(["node1", "node2", "node3"])
+        self.assert_printed_in_order(mock_print)
+        mock_err.assert_called_once_with(
+            "unable to enable all nodes\nnode3: error"
+        )
+        for call in mock_enable.mock_calls:
+            self.assertEqual({"quiet": True}, call[2])
+
+    @mock.patch("pcs.utils.disableCluster")
+    @mock.patch("pcs.utils.err")
+    def test_disable(self, mock_err, mock_disable, mock_print):
+        mock_disable.side_effect = self.fixture_action
+        cluster.disable_cluster_nodes(["node1", "node2", "node3"])
+        self.assert_printed_in_order(mock_print)
+        mock_err.assert_called_once_with(
+            "unable to disable all nodes\nnode3: error"
+        )
@@ -5,9 +5,15 @@ from __future__ import (
     unicode_literals,
 )
 
-from pcs.test.tools.pcs_unittest import TestCase
+from pcs.test.tools.pcs_unittest import TestCase, mock
+import threading
 import time
 
+try:
+    from _thread import interrupt_main
+except ImportError:
+    from thread import interrupt_main
+
 from pcs.common import tools
 
 
@@ -64,6 +70,131 @@ class RunParallelTestCase(TestCase):
         self.assertTrue(elapsed_time > x)
         self.assertTrue(elapsed_time < sum([i + 1 for i in range(x)]))
 
+    def test_results_in_order(self):
+        def worker(i, factor=1):
+            time.sleep(0.1 * (3 - i))
+            return i * factor
+        self.assertEqual(
+            [0, 10, 20],
+            tools.run_parallel(
+                worker, [([i], {"factor": 10}) for i in range(3)]
+            )
+        )
+
+    @mock.patch("pcs.common.tools.settings.node_max_parallel", 2)
+    def test_max_workers_from_settings(self):
+        lock = threading.Lock()
+        running = []
+        max_running = []
+        def worker(i):
+            with lock:
+                running.append(i)
+                max_running.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(i)
+        tools.run_parallel(worker, [([i], {}) for i in range(6)])
+        self.assertEqual(2, max(max_running))
+
+    def test_raise_exception_when_all_finished(self):
+        out_list = []
+        def worker(i):
+            if i == 0:
+                raise TestException()
+            time.sleep(0.1)
+            out_list.append(i)
+        self.assertRaises(
+            TestException,
+            lambda: tools.run_parallel(worker, [([i], {}) for i in range(3)])
+        )
+        self.assertEqual([1, 2], sorted(out_list))
+
+
+class RunParallelBoundedTestCase(TestCase):
+    def test_results_in_order(self):
+        def worker(i):
+            time.sleep(0.1 * (3 - i))
+            return i * 10
+        self.assertEqual(
+            [(True, 0, None), (True, 10, None), (True, 20, None)],
+            tools.run_parallel_bounded(worker, range(3), max_workers=3)
+        )
+
+    def test_max_workers(self):
+        lock = threading.Lock()
+        running = []
+        max_running = []
+        def worker(i):
+            with lock:
+                running.append(i)
+                max_running.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(i)
+        result_list = tools.run_parallel_bounded(
+            worker, range(8), max_workers=3
+        )
+        self.assertEqual([(True, None, None)] * 8, result_list)
+        self.assertEqual(3, max(max_running))
+
+    def test_timeout(self):
+        def worker(seconds):
+            time.sleep(seconds)
+            return seconds
+        start_time = time.time()
+        self.assertEqual(
+            [(False, None, None), (True, 0, None), (True, 0.1, None)],
+            tools.run_parallel_bounded(
+                worker, [5, 0, 0.1], max_workers=2, timeout=0.5
+            )
+        )
+        self.assertTrue(time.time() - start_time < 2)
+
+    def test_exception(self):
+        exception = TestException()
+        def worker(i):
+            if i == 1:
+                raise exception
+            return i
+        self.assertEqual(
+            [(True, 0, None), (True, None, exception), (True, 2, None)],
+            tools.run_parallel_bounded(worker, range(3), max_workers=1)
+        )
+
+    def test_no_data(self):
+        self.assertEqual(
+            [], tools.run_parallel_bounded(lambda i: i, [], max_workers=2)
+        )
+
+    def test_system_exit(self):
+        def worker(i):
+            if i == 0:
+                raise SystemExit(1)
+            return i
+        result_list = tools.run_parallel_bounded(worker, range(2), 2)
+        self.assertTrue(isinstance(result_list[0][2], SystemExit))
+        self.assertEqual((True, 1, None), result_list[1])
+
+    def test_interrupted(self):
+        started = []
+        release = threading.Event()
+        def worker(i):
+            started.append(i)
+            if i == 0:
+                interrupt_main()
+            release.wait(5)
+        try:
+            self.assertRaises(
+                KeyboardInterrupt,
+                lambda: tools.run_parallel_bounded(
+                    worker, range(3), max_workers=1
+                )
+            )
+        finally:
+            release.set()
+        time.sleep(0.1)
+        self.assertEqual([0], started)
+
 
 class JoinMultilinesTest(TestCase):
     def test_empty_input(self):
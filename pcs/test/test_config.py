@@ -0,0 +1,138 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from io import BytesIO
+import tarfile
+from time import sleep
+
+from pcs.test.tools.pcs_unittest import TestCase, mock
+
+from pcs import config, utils
+
+
+COROSYNC_CONF = """\
+totem {
+    version: 2
+    cluster_name: test
+}
+
+nodelist {
+    node {
+        ring0_addr: node1
+        nodeid: 1
+    }
+
+    node {
+        ring0_addr: node2
+        nodeid: 2
+    }
+}
+"""
+
+STATUS_STOPPED = (
+    '{"corosync": false, "pacemaker": false, "cman": false}'
+)
+STATUS_RUNNING = (
+    '{"corosync": true, "pacemaker": true, "cman": false}'
+)
+
+def fixture_tarball():
+    tar_data = BytesIO()
+    tarball = tarfile.open(fileobj=tar_data, mode="w|bz2")
+    utils.tar_add_file_data(tarball, b"1", "version.txt")
+    utils.tar_add_file_data(
+        tarball, COROSYNC_CONF.encode("utf-8"), "corosync.conf"
+    )
+    tarball.close()
+    tar_data.seek(0)
+    return tar_data
+
+@mock.patch("pcs.config.utils.is_rhel6", lambda: False)
+@mock.patch("pcs.config.utils.restoreConfig")
+@mock.patch("pcs.config.utils.pauseConfigSyncing")
+@mock.patch("pcs.config.utils.checkStatus")
+class ConfigRestoreRemoteTest(TestCase):
+    def test_success(self, mock_status, mock_pause, mock_restore):
+        mock_status.return_value = (0, STATUS_STOPPED)
+        mock_pause.return_value = (0, "")
+        def restore(node, data):
+            # the first node finishes last
+            sleep(.1 if node == "node1" else 0)
+            return 0, "Succeeded on {0}\n".format(node)
+        mock_restore.side_effect = restore
+
+        tarball = fixture_tarball()
+        with mock.patch("pcs.config.print") as mock_print:
+            config.config_restore_remote(None, tarball)
+
+        self.assertEqual(
+            [
+                mock.call("node1: Succeeded on node1"),
+                mock.call("node2: Succeeded on node2"),
+            ],
+            mock_print.mock_calls
+        )
+
+        for mock_action in (mock_status, mock_pause, mock_restore):
+            self.assertEqual(
+                ["node1", "node2"],
+                sorted([call[0][0] for call in mock_action.call_args_list])
+            )
+        # the tarball is encoded only once for all nodes
+        self.assertIs(
+            mock_restore.call_args_list[0][0][1],
+            mock_restore.call_args_list[1][0][1]
+        )
+        self.assertEqual(
+            utils.format_restore_config_data(tarball.getvalue()),
+            mock_restore.call_args_list[0][0][1]
+        )
+
+    @mock.patch("pcs.config.utils.err")
+    def test_all_status_errors_reported(
+        self, mock_err, mock_status, mock_pause, mock_restore
+    ):
+        mock_status.side_effect = lambda node: (
+            (1, "Unable to connect to node1")
+            if node == "node1"
+            else (0, STATUS_RUNNING)
+        )
+
+        self.assertRaises(
+            SystemExit,
+            lambda: config.config_restore_remote(None, fixture_tarball())
+        )
+
+        mock_err.assert_has_calls([
+            mock.call("Unable to connect to node1", False),
+            mock.call(
+                "Cluster is currently running on node node2. You need to stop "
+                    "the cluster in order to restore the configuration."
+                ,
+                False
+            ),
+        ])
+        mock_pause.assert_not_called()
+        mock_restore.assert_not_called()
+
+    @mock.patch("pcs.config.utils.err")
+    def test_restore_errors_reported(
+        self, mock_err, mock_status, mock_pause, mock_restore
+    ):
+        mock_status.return_value = (0, STATUS_STOPPED)
+        mock_pause.return_value = (0, "")
+        mock_restore.side_effect = lambda node, data: (
+            (1, "{0}: restore failed".format(node))
+        )
+
+        config.config_restore_remote(None, fixture_tarball())
+
+        mock_err.assert_called_once_with(
+            "unable to restore all nodes\n"
+            "node1: restore failed\n"
+            "node2: restore failed"
+        )
@@ -957,6 +957,25 @@ section {
             config_parser.parse_string, string
         )
 
+    def test_deeply_nested_sections(self):
+        depth = 2000
+        string = "section {\n" * depth + "name: value\n" + "}\n" * depth
+        section = config_parser.parse_string(string)
+        for dummy_level in range(depth):
+            section = section.get_sections("section")[0]
+        self.assertEqual([["name", "value"]], section.get_attributes())
+
+        self.assertRaises(
+            config_parser.MissingClosingBraceException,
+            config_parser.parse_string,
+            "section {\n" * depth + "}\n" * (depth - 1)
+        )
+        self.assertRaises(
+            config_parser.UnexpectedClosingBraceException,
+            config_parser.parse_string,
+            "section {\n" * depth + "}\n" * (depth + 1)
+        )
+
     def test_full(self):
         string = """\
 # Please read the corosync.conf.5 manual page
@@ -244,6 +244,115 @@ class LibraryEnvironmentTest(TestCase):
         )
         self.assertFalse(env.cib_upgraded)
 
+    @patch_env("replace_cib_configuration_xml")
+    @patch_env("push_cib_diff_xml")
+    @patch_env("diff_cibs_xml")
+    @patch_env("get_cib_xml")
+    @mock.patch.object(
+        LibraryEnvironment,
+        "cmd_runner",
+        lambda self: "mock cmd runner"
+    )
+    def test_push_cib_diff_live(
+        self, mock_get_cib_xml, mock_diff_cibs, mock_push_diff,
+        mock_replace_cib
+    ):
+        mock_get_cib_xml.return_value = "<cib/>"
+        mock_diff_cibs.side_effect = ["<diff1/>", "<diff2/>"]
+        env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        env.get_cib()
+        env.push_cib(etree.XML('<cib a="1"/>'))
+        env.push_cib(etree.XML('<cib a="2"/>'))
+        self.assertEqual(
+            [
+                mock.call("mock cmd runner", "<cib/>", '<cib a="1"/>'),
+                mock.call("mock cmd runner", '<cib a="1"/>', '<cib a="2"/>'),
+            ],
+            mock_diff_cibs.mock_calls
+        )
+        self.assertEqual(
+            [
+                mock.call("mock cmd runner", "<diff1/>"),
+                mock.call("mock cmd runner", "<diff2/>"),
+            ],
+            mock_push_diff.mock_calls
+        )
+        mock_replace_cib.assert_not_called()
+
+    @patch_env("replace_cib_configuration_xml")
+    @patch_env("push_cib_diff_xml")
+    @patch_env("diff_cibs_xml")
+    @patch_env("get_cib_xml")
+    @mock.patch.object(
+        LibraryEnvironment,
+        "cmd_runner",
+        lambda self: "mock cmd runner"
+    )
+    def test_push_cib_diff_no_change_live(
+        self, mock_get_cib_xml, mock_diff_cibs, mock_push_diff,
+        mock_replace_cib
+    ):
+        mock_get_cib_xml.return_value = "<cib/>"
+        mock_diff_cibs.return_value = ""
+        env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        env.push_cib(env.get_cib())
+        mock_diff_cibs.assert_called_once_with(
+            "mock cmd runner", "<cib/>", "<cib/>"
+        )
+        mock_push_diff.assert_not_called()
+        mock_replace_cib.assert_not_called()
+
+    @patch_env("replace_cib_configuration_xml")
+    @patch_env("push_cib_diff_xml")
+    @patch_env("diff_cibs_xml")
+    @patch_env("get_cib_xml")
+    @mock.patch.object(
+        LibraryEnvironment,
+        "cmd_runner",
+        lambda self: "mock cmd runner"
+    )
+    def test_push_cib_diff_fails_live(
+        self, mock_get_cib_xml, mock_diff_cibs, mock_push_diff,
+        mock_replace_cib
+    ):
+        mock_get_cib_xml.return_value = "<cib/>"
+        mock_diff_cibs.return_value = "<diff/>"
+        mock_push_diff.side_effect = LibraryError(
+            reports.cib_push_error("reason", "")
+        )
+        env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        env.get_cib()
+        env.push_cib(etree.XML('<cib a="1"/>'))
+        mock_push_diff.assert_called_once_with("mock cmd runner", "<diff/>")
+        mock_replace_cib.assert_called_once_with(
+            "mock cmd runner",
+            '<cib a="1"/>'
+        )
+
+    @patch_env("replace_cib_configuration_xml")
+    @patch_env("diff_cibs_xml")
+    @patch_env("ensure_cib_version")
+    @patch_env("get_cib_xml")
+    @mock.patch.object(
+        LibraryEnvironment,
+        "cmd_runner",
+        lambda self: "mock cmd runner"
+    )
+    def test_push_cib_upgraded_no_diff_live(
+        self, mock_get_cib_xml, mock_ensure_cib_version, mock_diff_cibs,
+        mock_replace_cib
+    ):
+        mock_get_cib_xml.return_value = "<cib/>"
+        mock_ensure_cib_version.return_value = etree.XML('<cib upgraded="1"/>')
+        env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        env.push_cib(env.get_cib((1, 2, 3)))
+        mock_diff_cibs.assert_not_called()
+        mock_replace_cib.assert_called_once_with(
+            "mock cmd runner",
+            '<cib upgraded="1"/>'
+        )
+        self.assertFalse(env.cib_upgraded)
+
     @patch_env("qdevice_reload_on_nodes")
     @patch_env("check_corosync_offline_on_nodes")
     @patch_env("reload_corosync_config")
@@ -563,7 +672,9 @@ class LibraryEnvironmentTest(TestCase):
             {},
             None,
             [],
-            None
+            None,
+            env._unreachable_host_cache,
+            env._node_host_cache
         )
 
     @patch_env("NodeCommunicator")
@@ -590,9 +701,29 @@ class LibraryEnvironmentTest(TestCase):
             tokens,
             user,
             groups,
-            timeout
+            timeout,
+            env._unreachable_host_cache,
+            env._node_host_cache
         )
 
+    @patch_env("NodeCommunicator")
+    def test_node_communicators_share_unreachable_hosts(self, mock_comm):
+        env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        env.node_communicator()
+        env.node_communicator()
+        cache_list = [call[0][6] for call in mock_comm.call_args_list]
+        self.assertIsNotNone(cache_list[0])
+        self.assertIs(cache_list[0], cache_list[1])
+
+    @patch_env("NodeCommunicator")
+    def test_node_communicators_share_node_hosts(self, mock_comm):
+        env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        env.node_communicator()
+        env.node_communicator()
+        cache_list = [call[0][7] for call in mock_comm.call_args_list]
+        self.assertIsNotNone(cache_list[0])
+        self.assertIs(cache_list[0], cache_list[1])
+
     @patch_env("get_local_cluster_conf")
     def test_get_cluster_conf_live(self, mock_get_local_cluster_conf):
         env = LibraryEnvironment(
@@ -16,6 +16,7 @@ from pcs.test.tools.assertions import (
 )
 from pcs.test.tools.custom_mock import (
     MockCurl,
+    MockCurlMulti,
     MockLibraryReportProcessor,
 )
 from pcs.test.tools.pcs_unittest import mock
@@ -26,11 +27,13 @@ from pcs.common import (
     pcs_pycurl as pycurl,
     report_codes,
 )
+from pcs.common.curl_pool import CurlHandlePool
 from pcs.lib import reports
 from pcs.lib.errors import (
     LibraryError,
     ReportItemSeverity as severity
 )
+from pcs.lib.node import NodeAddresses
 
 import pcs.lib.external as lib
 
@@ -38,6 +41,7 @@ import pcs.lib.external as lib
 _chkconfig = settings.chkconfig_binary
 _service = settings.service_binary
 _systemctl = settings.systemctl_binary
+_systemctl_show_properties = "--property=LoadState,ActiveState,UnitFileState"
 
 
 @mock.patch("subprocess.Popen", autospec=True)
@@ -412,6 +416,13 @@ class NodeCommunicatorTest(TestCase):
     def setUp(self):
         self.mock_logger = mock.MagicMock(logging.Logger)
         self.mock_reporter = MockLibraryReportProcessor()
+        # do not let the tests share curl handles
+        patcher = mock.patch(
+            "pcs.lib.external.get_curl_handle_pool",
+            lambda: CurlHandlePool(0)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def fixture_logger_call_send(self, url, data):
         send_msg = "Sending HTTP Request to: {url}"
@@ -522,6 +533,7 @@ class NodeCommunicatorTest(TestCase):
             pycurl.SSL_VERIFYPEER: 0,
             pycurl.COPYPOSTFIELDS: data.encode("utf-8"),
             pycurl.TIMEOUT_MS: settings.default_request_timeout * 1000,
+            pycurl.CONNECTTIMEOUT_MS: settings.node_connect_timeout * 1000,
         }
 
         self.assertLessEqual(
@@ -579,6 +591,7 @@ class NodeCommunicatorTest(TestCase):
             pycurl.SSL_VERIFYPEER: 0,
             pycurl.COPYPOSTFIELDS: data.encode("utf-8"),
             pycurl.TIMEOUT_MS: settings.default_request_timeout * 1000,
+            pycurl.CONNECTTIMEOUT_MS: settings.node_connect_timeout * 1000,
         }
 
         self.assertLessEqual(
@@ -695,6 +708,21 @@ class NodeCommunicatorTest(TestCase):
             set(mock_pycurl_obj.opts.items())
         )
 
+    def test_connect_timeout_not_longer_than_timeout(self, mock_pycurl_init):
+        mock_pycurl_obj = MockCurl({pycurl.RESPONSE_CODE: 200}, b"", [])
+        mock_pycurl_init.return_value = mock_pycurl_obj
+
+        comm = lib.NodeCommunicator(self.mock_logger, self.mock_reporter, {})
+        dummy_response = comm.call_host("test_host", "test_request", None, 2)
+
+        self.assertLessEqual(
+            set([
+                (pycurl.TIMEOUT_MS, 2000),
+                (pycurl.CONNECTTIMEOUT_MS, 2000),
+            ]),
+            set(mock_pycurl_obj.opts.items())
+        )
+
     def test_auth_token(self, mock_pycurl_init):
         host = "test_host"
         token = "test_token"
@@ -990,6 +1018,401 @@ class NodeCommunicatorTest(TestCase):
         )
 
 
+@mock.patch("pcs.lib.external.pycurl.CurlMulti")
+@mock.patch("pcs.lib.external.pycurl.Curl")
+class NodeCommunicatorCallNodesManyTest(TestCase):
+    def setUp(self):
+        self.mock_reporter = MockLibraryReportProcessor()
+        self.communicator = lib.NodeCommunicator(
+            mock.MagicMock(logging.Logger), self.mock_reporter, {}
+        )
+        self.multi = MockCurlMulti()
+        patcher = mock.patch(
+            "pcs.lib.external.get_curl_handle_pool",
+            lambda: CurlHandlePool(0)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fixture_curl(self, response_code=200, output="", exception=None):
+        return MockCurl(
+            {pycurl.RESPONSE_CODE: response_code},
+            output.encode("utf-8"),
+            [],
+            exception
+        )
+
+    def call(self, node_list, request="remote/status"):
+        return list(self.communicator.call_nodes_many([
+            (NodeAddresses(node), request, None) for node in node_list
+        ]))
+
+    def test_success(self, mock_curl, mock_multi):
+        mock_multi.return_value = self.multi
+        curl_list = [
+            self.fixture_curl(output="output1"),
+            self.fixture_curl(output="output2"),
+        ]
+        mock_curl.side_effect = curl_list
+
+        self.assertEqual(
+            [(0, "output1", None), (1, "output2", None)],
+            self.call(["node1", "node2"])
+        )
+        self.assertEqual(
+            "https://node2:2224/remote/status".encode("utf-8"),
+            curl_list[1].opts[pycurl.URL]
+        )
+        self.assertEqual([], self.multi.handle_list)
+        self.assertTrue(self.multi.closed)
+
+    def test_errors(self, mock_curl, mock_multi):
+        mock_multi.return_value = self.multi
+        mock_curl.side_effect = [
+            self.fixture_curl(
+                exception=pycurl.error(pycurl.E_COULDNT_CONNECT, "refused")
+            ),
+            self.fixture_curl(response_code=401),
+            self.fixture_curl(output="output3"),
+        ]
+
+        result = self.call(["node1", "node2", "node3"])
+
+        self.assertEqual(
+            [0, 1, 2], sorted([index for index, _, _ in result])
+        )
+        result = dict([
+            (index, (response, exception))
+            for index, response, exception in result
+        ])
+        self.assertIsNone(result[0][0])
+        self.assertIsInstance(result[0][1], lib.NodeConnectionException)
+        self.assertEqual("node1", result[0][1].node)
+        self.assertIsNone(result[1][0])
+        self.assertIsInstance(result[1][1], lib.NodeAuthenticationException)
+        self.assertEqual(("output3", None), result[2])
+
+    def test_limit_parallel_requests(self, mock_curl, mock_multi):
+        mock_multi.return_value = self.multi
+        mock_curl.side_effect = [self.fixture_curl() for dummy in range(5)]
+
+        with mock.patch.object(settings, "node_max_parallel", 2):
+            result = self.call(["node{0}".format(i) for i in range(5)])
+
+        self.assertEqual(
+            [0, 1, 2, 3, 4], sorted([index for index, _, _ in result])
+        )
+        self.assertEqual(2, self.multi.max_handles_count)
+
+    def test_stop_reading(self, mock_curl, mock_multi):
+        mock_multi.return_value = self.multi
+        mock_curl.side_effect = [self.fixture_curl() for dummy in range(3)]
+
+        result_iterator = self.communicator.call_nodes_many([
+            (NodeAddresses(node), "remote/status", None)
+            for node in ["node1", "node2", "node3"]
+        ])
+        next(result_iterator)
+        result_iterator.close()
+
+        self.assertEqual([], self.multi.handle_list)
+        self.assertTrue(self.multi.closed)
+
+
+@mock.patch("pcs.lib.external.time.time")
+class UnreachableHostCacheTest(TestCase):
+    def setUp(self):
+        self.exception = lib.NodeConnectionException("node1", "cmd", "reason")
+
+    def test_not_failed(self, mock_time):
+        mock_time.return_value = 100
+        cache = lib.UnreachableHostCache(60)
+        cache.add_failure("node1", self.exception)
+        self.assertIsNone(cache.get_failure("node2"))
+
+    def test_failed(self, mock_time):
+        mock_time.return_value = 100
+        cache = lib.UnreachableHostCache(60)
+        cache.add_failure("node1", self.exception)
+        mock_time.return_value = 159
+        self.assertIs(self.exception, cache.get_failure("node1"))
+
+    def test_expired(self, mock_time):
+        mock_time.return_value = 100
+        cache = lib.UnreachableHostCache(60)
+        cache.add_failure("node1", self.exception)
+        mock_time.return_value = 160
+        self.assertIsNone(cache.get_failure("node1"))
+
+    def test_removed(self, mock_time):
+        mock_time.return_value = 100
+        cache = lib.UnreachableHostCache(60)
+        cache.add_failure("node1", self.exception)
+        cache.remove_failure("node1")
+        self.assertIsNone(cache.get_failure("node1"))
+
+    def test_disabled(self, mock_time):
+        mock_time.return_value = 100
+        cache = lib.UnreachableHostCache(0)
+        cache.add_failure("node1", self.exception)
+        self.assertIsNone(cache.get_failure("node1"))
+
+
+@mock.patch("pcs.lib.external.pycurl.Curl")
+class NodeCommunicatorUnreachableHostTest(TestCase):
+    def setUp(self):
+        self.mock_reporter = MockLibraryReportProcessor()
+        self.communicator = lib.NodeCommunicator(
+            mock.MagicMock(logging.Logger),
+            self.mock_reporter,
+            {},
+            unreachable_host_cache=lib.UnreachableHostCache(60)
+        )
+        patcher = mock.patch(
+            "pcs.lib.external.get_curl_handle_pool",
+            lambda: CurlHandlePool(0)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fixture_curl(self, exception=None, request_sent=False):
+        return MockCurl(
+            {pycurl.RESPONSE_CODE: 200},
+            b"output",
+            [(pycurl.DEBUG_HEADER_OUT, b"POST /request")] if request_sent
+                else [],
+            exception
+        )
+
+    def fixture_unreachable(
+        self, mock_curl, errno=pycurl.E_COULDNT_CONNECT, request_sent=False
+    ):
+        mock_curl.side_effect = [
+            self.fixture_curl(pycurl.error(errno, "reason"), request_sent)
+        ]
+        self.assertRaises(
+            lib.NodeCommunicationException,
+            lambda: self.communicator.call_host("node1", "request1", None)
+        )
+
+    def test_fail_fast(self, mock_curl):
+        self.fixture_unreachable(mock_curl)
+        with self.assertRaises(lib.NodeConnectionException) as context:
+            self.communicator.call_host("node1", "request2", None)
+        self.assertEqual("node1", context.exception.node)
+        self.assertEqual("request2", context.exception.command)
+        self.assertEqual("reason", context.exception.reason)
+        self.assertEqual(1, mock_curl.call_count)
+
+    def test_not_unreachable_when_request_sent(self, mock_curl):
+        self.fixture_unreachable(
+            mock_curl, pycurl.E_OPERATION_TIMEDOUT, request_sent=True
+        )
+        mock_curl.side_effect = [self.fixture_curl()]
+        self.assertEqual(
+            "output", self.communicator.call_host("node1", "request2", None)
+        )
+        self.assertEqual(2, mock_curl.call_count)
+
+    def test_connect_timeout(self, mock_curl):
+        mock_curl.side_effect = [
+            self.fixture_curl(pycurl.error(pycurl.E_OPERATION_TIMEDOUT, "r"))
+        ]
+        with self.assertRaises(
+            lib.NodeConnectionTimedOutException
+        ) as context:
+            self.communicator.call_host("node1", "request1", None)
+        self.assertFalse(context.exception.request_sent)
+        # the host is unreachable, the error is cached
+        self.assertRaises(
+            lib.NodeConnectionTimedOutException,
+            lambda: self.communicator.call_host("node1", "request2", None)
+        )
+        self.assertEqual(1, mock_curl.call_count)
+
+    def test_other_host_connected(self, mock_curl):
+        self.fixture_unreachable(mock_curl)
+        mock_curl.side_effect = [self.fixture_curl()]
+        self.assertEqual(
+            "output", self.communicator.call_host("node2", "request2", None)
+        )
+
+    def test_retry_unreachable(self, mock_curl):
+        self.fixture_unreachable(mock_curl)
+        mock_curl.side_effect = [self.fixture_curl(), self.fixture_curl()]
+        self.assertEqual(
+            "output",
+            self.communicator.call_host(
+                "node1", "request2", None, retry_unreachable=True
+            )
+        )
+        # the host is reachable again
+        self.assertEqual(
+            "output", self.communicator.call_host("node1", "request3", None)
+        )
+        self.assertEqual(3, mock_curl.call_count)
+
+    @mock.patch("pcs.lib.external.pycurl.CurlMulti")
+    def test_call_nodes_many(self, mock_multi, mock_curl):
+        self.fixture_unreachable(mock_curl)
+        mock_multi.return_value = MockCurlMulti()
+        mock_curl.side_effect = [self.fixture_curl()]
+        result = dict([
+            (index, (response, exception))
+            for index, response, exception in self.communicator.call_nodes_many(
+                [
+                    (NodeAddresses("node1"), "request2", None),
+                    (NodeAddresses("node2"), "request2", None),
+                ]
+            )
+        ])
+        self.assertIsNone(result[0][0])
+        self.assertIsInstance(result[0][1], lib.NodeConnectionException)
+        self.assertEqual(("output", None), result[1])
+        self.assertEqual(2, mock_curl.call_count)
+
+
+@mock.patch("pcs.lib.external.pycurl.Curl")
+class NodeCommunicatorRingFailoverTest(TestCase):
+    def setUp(self):
+        self.communicator = lib.NodeCommunicator(
+            mock.MagicMock(logging.Logger),
+            MockLibraryReportProcessor(),
+            {"node1-ring0": "token1"}
+        )
+        self.node = NodeAddresses("node1-ring0", "node1-ring1")
+        patcher = mock.patch(
+            "pcs.lib.external.get_curl_handle_pool",
+            lambda: CurlHandlePool(0)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fixture_curl(self, errno=None, request_sent=False):
+        return MockCurl(
+            {pycurl.RESPONSE_CODE: 200},
+            b"output",
+            [(pycurl.DEBUG_HEADER_OUT, b"POST /request")] if request_sent
+                else [],
+            None if errno is None else pycurl.error(errno, "reason")
+        )
+
+    def assert_urls(self, host_list, curl_list):
+        self.assertEqual(
+            [
+                "https://{0}:2224/request".format(host).encode("utf-8")
+                for host in host_list
+            ],
+            [curl.opts[pycurl.URL] for curl in curl_list]
+        )
+
+    def test_ring1_used(self, mock_curl):
+        curl_list = [
+            self.fixture_curl(pycurl.E_COULDNT_CONNECT),
+            self.fixture_curl(),
+            self.fixture_curl(),
+        ]
+        mock_curl.side_effect = curl_list
+        self.assertEqual(
+            "output", self.communicator.call_node(self.node, "request", None)
+        )
+        # ring1 is tried first next time
+        self.assertEqual(
+            "output", self.communicator.call_node(self.node, "request", None)
+        )
+        self.assert_urls(
+            ["node1-ring0", "node1-ring1", "node1-ring1"], curl_list
+        )
+        # the node is authenticated by its ring0 address
+        self.assertEqual(b"token=token1", curl_list[1].opts[pycurl.COOKIE])
+
+    def test_ring1_used_on_connect_timeout(self, mock_curl):
+        curl_list = [
+            self.fixture_curl(pycurl.E_OPERATION_TIMEDOUT),
+            self.fixture_curl(),
+        ]
+        mock_curl.side_effect = curl_list
+        self.assertEqual(
+            "output", self.communicator.call_node(self.node, "request", None)
+        )
+        self.assert_urls(["node1-ring0", "node1-ring1"], curl_list)
+
+    def test_not_resent_when_timed_out_after_sending(self, mock_curl):
+        # a reused connection reports no connect time, the request is sent
+        curl_list = [
+            self.fixture_curl(pycurl.E_OPERATION_TIMEDOUT, request_sent=True),
+        ]
+        mock_curl.side_effect = curl_list
+        self.assertRaises(
+            lib.NodeConnectionTimedOutException,
+            lambda: self.communicator.call_node(self.node, "request", None)
+        )
+        self.assert_urls(["node1-ring0"], curl_list)
+
+    def test_not_resent_when_connection_lost_after_sending(self, mock_curl):
+        curl_list = [
+            self.fixture_curl(pycurl.E_RECV_ERROR, request_sent=True),
+        ]
+        mock_curl.side_effect = curl_list
+        with self.assertRaises(lib.NodeConnectionException) as context:
+            self.communicator.call_node(self.node, "request", None)
+        self.assertTrue(context.exception.request_sent)
+        self.assert_urls(["node1-ring0"], curl_list)
+
+    def test_all_rings_unreachable(self, mock_curl):
+        curl_list = [
+            self.fixture_curl(pycurl.E_COULDNT_CONNECT),
+            self.fixture_curl(pycurl.E_COULDNT_CONNECT),
+        ]
+        mock_curl.side_effect = curl_list
+        with self.assertRaises(lib.NodeConnectionException) as context:
+            self.communicator.call_node(self.node, "request", None)
+        self.assertEqual("node1-ring1", context.exception.node)
+        self.assert_urls(["node1-ring0", "node1-ring1"], curl_list)
+
+    def test_no_ring1(self, mock_curl):
+        curl_list = [self.fixture_curl(pycurl.E_COULDNT_CONNECT)]
+        mock_curl.side_effect = curl_list
+        self.assertRaises(
+            lib.NodeConnectionException,
+            lambda: self.communicator.call_node(
+                NodeAddresses("node1-ring0"), "request", None
+            )
+        )
+        self.assert_urls(["node1-ring0"], curl_list)
+
+    @mock.patch("pcs.lib.external.pycurl.CurlMulti")
+    def test_call_nodes_many(self, mock_multi, mock_curl):
+        mock_multi.return_value = MockCurlMulti()
+        curl_list = [
+            self.fixture_curl(pycurl.E_COULDNT_CONNECT),
+            self.fixture_curl(),
+            self.fixture_curl(),
+        ]
+        mock_curl.side_effect = curl_list
+        result = list(self.communicator.call_nodes_many([
+            (self.node, "request", None),
+            (NodeAddresses("node2"), "request", None),
+        ]))
+        self.assertEqual(
+            [(0, "output", None), (1, "output", None)],
+            sorted(result)
+        )
+        self.assertEqual(
+            set([
+                "https://node1-ring0:2224/request".encode("utf-8"),
+                "https://node1-ring1:2224/request".encode("utf-8"),
+                "https://node2:2224/request".encode("utf-8"),
+            ]),
+            set([curl.opts[pycurl.URL] for curl in curl_list])
+        )
+        # ring1 is tried first next time
+        mock_curl.side_effect = [self.fixture_curl()]
+        self.assertEqual(
+            "output", self.communicator.call_node(self.node, "request", None)
+        )
+
+
 class NodeCommunicatorExceptionTransformTest(TestCase):
     def test_transform_error_400(self):
         node = "test_node"
@@ -1640,18 +2063,30 @@ class IsServiceEnabledTest(TestCase):
 
     def test_systemctl_enabled(self, mock_systemctl):
         mock_systemctl.return_value = True
-        self.mock_runner.run.return_value = ("enabled\n", "", 0)
+        self.mock_runner.run.return_value = (
+            "LoadState=loaded\nActiveState=inactive\nUnitFileState=enabled\n",
+            "",
+            0
+        )
         self.assertTrue(lib.is_service_enabled(self.mock_runner, self.service))
         self.mock_runner.run.assert_called_once_with(
-            [_systemctl, "is-enabled", self.service + ".service"]
+            [_systemctl, "show", _systemctl_show_properties]
+            +
+            [self.service + ".service"]
         )
 
     def test_systemctl_disabled(self, mock_systemctl):
         mock_systemctl.return_value = True
-        self.mock_runner.run.return_value = ("disabled\n", "", 2)
+        self.mock_runner.run.return_value = (
+            "LoadState=loaded\nActiveState=active\nUnitFileState=disabled\n",
+            "",
+            0
+        )
         self.assertFalse(lib.is_service_enabled(self.mock_runner, self.service))
         self.mock_runner.run.assert_called_once_with(
-            [_systemctl, "is-enabled", self.service + ".service"]
+            [_systemctl, "show", _systemctl_show_properties]
+            +
+            [self.service + ".service"]
         )
 
     def test_not_systemctl_enabled(self, mock_systemctl):
@@ -1679,18 +2114,30 @@ class IsServiceRunningTest(TestCase):
 
     def test_systemctl_running(self, mock_systemctl):
         mock_systemctl.return_value = True
-        self.mock_runner.run.return_value = ("active", "", 0)
+        self.mock_runner.run.return_value = (
+            "LoadState=loaded\nActiveState=active\nUnitFileState=disabled\n",
+            "",
+            0
+        )
         self.assertTrue(lib.is_service_running(self.mock_runner, self.service))
         self.mock_runner.run.assert_called_once_with(
-            [_systemctl, "is-active", self.service + ".service"]
+            [_systemctl, "show", _systemctl_show_properties]
+            +
+            [self.service + ".service"]
         )
 
     def test_systemctl_not_running(self, mock_systemctl):
         mock_systemctl.return_value = True
-        self.mock_runner.run.return_value = ("inactive", "", 2)
+        self.mock_runner.run.return_value = (
+            "LoadState=loaded\nActiveState=inactive\nUnitFileState=enabled\n",
+            "",
+            0
+        )
         self.assertFalse(lib.is_service_running(self.mock_runner, self.service))
         self.mock_runner.run.assert_called_once_with(
-            [_systemctl, "is-active", self.service + ".service"]
+            [_systemctl, "show", _systemctl_show_properties]
+            +
+            [self.service + ".service"]
         )
 
     def test_not_systemctl_running(self, mock_systemctl):
@@ -1711,95 +2158,194 @@ class IsServiceRunningTest(TestCase):
 
 
 @mock.patch("pcs.lib.external.is_systemctl")
-@mock.patch("pcs.lib.external.get_systemd_services")
 @mock.patch("pcs.lib.external.get_non_systemd_services")
 class IsServiceInstalledTest(TestCase):
     def setUp(self):
         self.mock_runner = mock.MagicMock(spec_set=lib.CommandRunner)
 
-    def test_installed_systemd(
-        self, mock_non_systemd, mock_systemd, mock_is_systemctl
-    ):
+    def fixture_systemctl_show(self, load_state):
+        self.mock_runner.run.return_value = (
+            "LoadState={0}\nActiveState=inactive\nUnitFileState=\n".format(
+                load_state
+            ),
+            "",
+            0
+        )
+
+    def test_installed_systemd(self, mock_non_systemd, mock_is_systemctl):
         mock_is_systemctl.return_value = True
-        mock_systemd.return_value = ["service1", "service2"]
-        mock_non_systemd.return_value = []
+        self.fixture_systemctl_show("loaded")
         self.assertTrue(lib.is_service_installed(self.mock_runner, "service2"))
-        self.assertEqual(mock_is_systemctl.call_count, 1)
-        mock_systemd.assert_called_once_with(self.mock_runner)
+        self.mock_runner.run.assert_called_once_with(
+            [_systemctl, "show", _systemctl_show_properties, "service2.service"]
+        )
         self.assertEqual(mock_non_systemd.call_count, 0)
 
-    def test_not_installed_systemd(
-            self, mock_non_systemd, mock_systemd, mock_is_systemctl
-    ):
+    def test_not_installed_systemd(self, mock_non_systemd, mock_is_systemctl):
         mock_is_systemctl.return_value = True
-        mock_systemd.return_value = ["service1", "service2"]
-        mock_non_systemd.return_value = []
+        self.fixture_systemctl_show("not-found")
         self.assertFalse(lib.is_service_installed(self.mock_runner, "service3"))
-        self.assertEqual(mock_is_systemctl.call_count, 1)
-        mock_systemd.assert_called_once_with(self.mock_runner)
+        self.mock_runner.run.assert_called_once_with(
+            [_systemctl, "show", _systemctl_show_properties, "service3.service"]
+        )
         self.assertEqual(mock_non_systemd.call_count, 0)
 
-    def test_installed_not_systemd(
-            self, mock_non_systemd, mock_systemd, mock_is_systemctl
-    ):
+    def test_installed_not_systemd(self, mock_non_systemd, mock_is_systemctl):
         mock_is_systemctl.return_value = False
-        mock_systemd.return_value = []
         mock_non_systemd.return_value = ["service1", "service2"]
         self.assertTrue(lib.is_service_installed(self.mock_runner, "service2"))
         self.assertEqual(mock_is_systemctl.call_count, 1)
         mock_non_systemd.assert_called_once_with(self.mock_runner)
-        self.assertEqual(mock_systemd.call_count, 0)
+        self.assertEqual(self.mock_runner.run.call_count, 0)
 
     def test_not_installed_not_systemd(
-            self, mock_non_systemd, mock_systemd, mock_is_systemctl
+        self, mock_non_systemd, mock_is_systemctl
     ):
         mock_is_systemctl.return_value = False
-
-        mock_systemd.return_value = []
         mock_non_systemd.return_value = ["service1", "service2"]
         self.assertFalse(lib.is_service_installed(self.mock_runner, "service3"))
         self.assertEqual(mock_is_systemctl.call_count, 1)
         mock_non_systemd.assert_called_once_with(self.mock_runner)
-        self.assertEqual(mock_systemd.call_count, 0)
+        self.assertEqual(self.mock_runner.run.call_count, 0)
 
     def test_installed_systemd_instance(
-        self, mock_non_systemd, mock_systemd, mock_is_systemctl
+        self, mock_non_systemd, mock_is_systemctl
     ):
         mock_is_systemctl.return_value = True
-        mock_systemd.return_value = ["service1", "service2@"]
-        mock_non_systemd.return_value = []
+        self.fixture_systemctl_show("loaded")
         self.assertTrue(
             lib.is_service_installed(self.mock_runner, "service2", "instance")
         )
-        self.assertEqual(mock_is_systemctl.call_count, 1)
-        mock_systemd.assert_called_once_with(self.mock_runner)
+        self.mock_runner.run.assert_called_once_with([
+            _systemctl,
+            "show",
+            _systemctl_show_properties,
+            "service2@instance.service",
+        ])
         self.assertEqual(mock_non_systemd.call_count, 0)
 
     def test_not_installed_systemd_instance(
-        self, mock_non_systemd, mock_systemd, mock_is_systemctl
+        self, mock_non_systemd, mock_is_systemctl
     ):
         mock_is_systemctl.return_value = True
-        mock_systemd.return_value = ["service1", "service2"]
-        mock_non_systemd.return_value = []
+        self.fixture_systemctl_show("not-found")
         self.assertFalse(
             lib.is_service_installed(self.mock_runner, "service2", "instance")
         )
-        self.assertEqual(mock_is_systemctl.call_count, 1)
-        mock_systemd.assert_called_once_with(self.mock_runner)
         self.assertEqual(mock_non_systemd.call_count, 0)
 
     def test_installed_not_systemd_instance(
-        self, mock_non_systemd, mock_systemd, mock_is_systemctl
+        self, mock_non_systemd, mock_is_systemctl
     ):
         mock_is_systemctl.return_value = False
-        mock_systemd.return_value = []
         mock_non_systemd.return_value = ["service1", "service2"]
         self.assertTrue(
             lib.is_service_installed(self.mock_runner, "service2", "instance")
         )
         self.assertEqual(mock_is_systemctl.call_count, 1)
         mock_non_systemd.assert_called_once_with(self.mock_runner)
-        self.assertEqual(mock_systemd.call_count, 0)
+
+
+@mock.patch("pcs.lib.external.is_systemctl")
+class GetServicesStateTest(TestCase):
+    def setUp(self):
+        self.mock_runner = mock.MagicMock(spec_set=lib.CommandRunner)
+
+    def test_no_services(self, mock_is_systemctl):
+        self.assertEqual({}, lib.get_services_state(self.mock_runner, []))
+        self.assertEqual(self.mock_runner.run.call_count, 0)
+
+    def test_systemd(self, mock_is_systemctl):
+        mock_is_systemctl.return_value = True
+        self.mock_runner.run.return_value = (outdent(
+            """\
+            LoadState=loaded
+            ActiveState=active
+            UnitFileState=enabled
+
+            LoadState=loaded
+            ActiveState=inactive
+            UnitFileState=static
+
+            LoadState=not-found
+            ActiveState=inactive
+            UnitFileState=
+            """
+        ), "", 0)
+        self.assertEqual(
+            {
+                "service1": {
+                    "installed": True, "enabled": True, "running": True,
+                },
+                "service2": {
+                    "installed": True, "enabled": True, "running": False,
+                },
+                "service3": {
+                    "installed": False, "enabled": False, "running": False,
+                },
+            },
+            lib.get_services_state(
+                self.mock_runner, ["service1", "service2", "service3"]
+            )
+        )
+        self.mock_runner.run.assert_called_once_with([
+            _systemctl,
+            "show",
+            _systemctl_show_properties,
+            "service1.service",
+            "service2.service",
+            "service3.service",
+        ])
+
+    def test_systemd_failure(self, mock_is_systemctl):
+        mock_is_systemctl.return_value = True
+        self.mock_runner.run.return_value = ("", "error", 1)
+        self.assertEqual(
+            {
+                "service1": {
+                    "installed": False, "enabled": False, "running": False,
+                },
+            },
+            lib.get_services_state(self.mock_runner, ["service1"])
+        )
+
+    def test_not_systemd(self, mock_is_systemctl):
+        mock_is_systemctl.return_value = False
+        def run(args):
+            if args == [_chkconfig]:
+                return (outdent(
+                    """\
+                    service1 0:off 1:off 2:on 3:on 4:on 5:on 6:off
+                    service2 0:off 1:off 2:off 3:off 4:off 5:off 6:off
+                    """
+                ), "", 0)
+            if args == [_chkconfig, "service1"]:
+                return ("", "", 0)
+            if args == [_chkconfig, "service2"]:
+                return ("", "", 1)
+            if args == [_service, "service1", "status"]:
+                return ("", "", 3)
+            if args == [_service, "service2", "status"]:
+                return ("", "", 0)
+            raise AssertionError("Unexpected command {0}".format(args))
+        self.mock_runner.run.side_effect = run
+        self.assertEqual(
+            {
+                "service1": {
+                    "installed": True, "enabled": True, "running": False,
+                },
+                "service2": {
+                    "installed": True, "enabled": False, "running": True,
+                },
+                "service3": {
+                    "installed": False, "enabled": False, "running": False,
+                },
+            },
+            lib.get_services_state(
+                self.mock_runner, ["service1", "service2", "service3"]
+            )
+        )
+        self.assertEqual(5, self.mock_runner.run.call_count)
 
 
 @mock.patch("pcs.lib.external.is_systemctl")
@@ -15,17 +15,109 @@ from pcs.test.tools.custom_mock import MockLibraryReportProcessor
 from pcs.test.tools.pcs_unittest import mock
 
 from pcs.common import report_codes
-from pcs.lib.external import NodeCommunicator, NodeAuthenticationException
+from pcs.lib.external import (
+    NodeAuthenticationException,
+    NodeCommunicationException,
+    NodeCommunicator,
+)
 from pcs.lib.node import NodeAddresses, NodeAddressesList
-from pcs.lib.errors import ReportItemSeverity as severity
+from pcs.lib import reports
+from pcs.lib.errors import LibraryError, ReportItemSeverity as severity
 
 import pcs.lib.nodes_task as lib
 
 
+def fake_call_nodes_many(call_node, reverse=False):
+    # emulates NodeCommunicator.call_nodes_many using a call_node mock, nodes
+    # respond in the reverse order if requested
+    def call_nodes_many(request_list, request_timeout=None):
+        indexed_request_list = list(enumerate(request_list))
+        if reverse:
+            indexed_request_list.reverse()
+        for index, (node, request, data) in indexed_request_list:
+            try:
+                yield index, call_node(node, request, data), None
+            except NodeCommunicationException as e:
+                yield index, None, e
+    return call_nodes_many
+
+class RunStepsOnNodesTest(TestCase):
+    def setUp(self):
+        self.node_list = [NodeAddresses("node{0}".format(i)) for i in range(3)]
+
+    def test_success(self):
+        log = []
+        lib.run_steps_on_nodes(
+            self.node_list,
+            [
+                lambda node: log.append(("step1", node.label)),
+                lambda node: log.append(("step2", node.label)),
+            ]
+        )
+        self.assertEqual(6, len(log))
+        for node in self.node_list:
+            node_log = [step for step, label in log if label == node.label]
+            self.assertEqual(["step1", "step2"], node_log)
+
+    def test_failed_node_stops_other_nodes_continue(self):
+        log = []
+        def step1(node):
+            if node.label == "node1":
+                raise NodeAuthenticationException(
+                    node.label, "command", "HTTP error: 401"
+                )
+            if node.label == "node2":
+                raise LibraryError(
+                    reports.invalid_response_format(node.label)
+                )
+        assert_raise_library_error(
+            lambda: lib.run_steps_on_nodes(
+                self.node_list,
+                [step1, lambda node: log.append(node.label)]
+            ),
+            (
+                severity.ERROR,
+                report_codes.NODE_COMMUNICATION_ERROR_NOT_AUTHORIZED,
+                {
+                    "node": "node1",
+                    "command": "command",
+                    "reason" : "HTTP error: 401",
+                }
+            ),
+            (
+                severity.ERROR,
+                report_codes.INVALID_RESPONSE_FORMAT,
+                {
+                    "node": "node2",
+                }
+            )
+        )
+        self.assertEqual(["node0"], log)
+
 class DistributeCorosyncConfTest(TestCase):
     def setUp(self):
         self.mock_reporter = MockLibraryReportProcessor()
         self.mock_communicator = "mock node communicator"
+        self.call_node = mock.Mock()
+
+    def fixture_corosync_live(self, mock_corosync_live, reverse=False):
+        call_nodes_many = fake_call_nodes_many(self.call_node, reverse)
+        mock_corosync_live.set_remote_corosync_conf_many.side_effect = (
+            lambda communicator, node_list, conf_text: call_nodes_many([
+                (node, "remote/set_corosync_conf", conf_text)
+                for node in node_list
+            ])
+        )
+
+    def assert_corosync_live_calls(
+        self, mock_corosync_live, node_addrs_list, conf_text
+    ):
+        set_conf_many = mock_corosync_live.set_remote_corosync_conf_many
+        set_conf_many.assert_called_once_with(
+            "mock node communicator", list(node_addrs_list), conf_text
+        )
+        self.assertEqual(1, len(mock_corosync_live.mock_calls))
+        self.assertEqual(len(node_addrs_list), self.call_node.call_count)
 
     @mock.patch("pcs.lib.nodes_task.corosync_live")
     def test_success(self, mock_corosync_live):
@@ -34,7 +126,7 @@ class DistributeCorosyncConfTest(TestCase):
         node_addrs_list = NodeAddressesList(
             [NodeAddresses(addr) for addr in nodes]
         )
-        mock_corosync_live.set_remote_corosync_conf = mock.MagicMock()
+        self.fixture_corosync_live(mock_corosync_live)
 
         lib.distribute_corosync_conf(
             self.mock_communicator,
@@ -43,21 +135,8 @@ class DistributeCorosyncConfTest(TestCase):
             conf_text
         )
 
-        corosync_live_calls = [
-            mock.call.set_remote_corosync_conf(
-                "mock node communicator", node_addrs_list[0], conf_text
-            ),
-            mock.call.set_remote_corosync_conf(
-                "mock node communicator", node_addrs_list[1], conf_text
-            ),
-        ]
-        self.assertEqual(
-            len(corosync_live_calls),
-            len(mock_corosync_live.mock_calls)
-        )
-        mock_corosync_live.set_remote_corosync_conf.assert_has_calls(
-            corosync_live_calls,
-            any_order=True
+        self.assert_corosync_live_calls(
+            mock_corosync_live, node_addrs_list, conf_text
         )
 
         assert_report_item_list_equal(
@@ -88,13 +167,13 @@ class DistributeCorosyncConfTest(TestCase):
         node_addrs_list = NodeAddressesList(
             [NodeAddresses(addr) for addr in nodes]
         )
-        mock_corosync_live.set_remote_corosync_conf = mock.MagicMock()
-        def raiser(comm, node, conf):
+        def raiser(node, request, data):
             if node.ring0 == nodes[1]:
                 raise NodeAuthenticationException(
                     nodes[1], "command", "HTTP error: 401"
                 )
-        mock_corosync_live.set_remote_corosync_conf.side_effect = raiser
+        self.call_node.side_effect = raiser
+        self.fixture_corosync_live(mock_corosync_live)
 
         assert_raise_library_error(
             lambda: lib.distribute_corosync_conf(
@@ -123,22 +202,9 @@ class DistributeCorosyncConfTest(TestCase):
             )
         )
 
-        corosync_live_calls = [
-            mock.call.set_remote_corosync_conf(
-                "mock node communicator", nodes[0], conf_text
-            ),
-            mock.call.set_remote_corosync_conf(
-                "mock node communicator", nodes[1], conf_text
-            ),
-        ]
-        self.assertEqual(
-            len(corosync_live_calls),
-            len(mock_corosync_live.mock_calls)
+        self.assert_corosync_live_calls(
+            mock_corosync_live, node_addrs_list, conf_text
         )
-        mock_corosync_live.set_remote_corosync_conf.assert_has_calls([
-            mock.call("mock node communicator", node_addrs_list[0], conf_text),
-            mock.call("mock node communicator", node_addrs_list[1], conf_text),
-        ], any_order=True)
 
         assert_report_item_list_equal(
             self.mock_reporter.report_item_list,
@@ -181,13 +247,13 @@ class DistributeCorosyncConfTest(TestCase):
         node_addrs_list = NodeAddressesList(
             [NodeAddresses(addr) for addr in nodes]
         )
-        mock_corosync_live.set_remote_corosync_conf = mock.MagicMock()
-        def raiser(comm, node, conf):
+        def raiser(node, request, data):
             if node.ring0 == nodes[1]:
                 raise NodeAuthenticationException(
                     nodes[1], "command", "HTTP error: 401"
                 )
-        mock_corosync_live.set_remote_corosync_conf.side_effect = raiser
+        self.call_node.side_effect = raiser
+        self.fixture_corosync_live(mock_corosync_live)
 
         lib.distribute_corosync_conf(
             self.mock_communicator,
@@ -197,22 +263,9 @@ class DistributeCorosyncConfTest(TestCase):
             skip_offline_nodes=True
         )
 
-        corosync_live_calls = [
-            mock.call.set_remote_corosync_conf(
-                "mock node communicator", nodes[0], conf_text
-            ),
-            mock.call.set_remote_corosync_conf(
-                "mock node communicator", nodes[1], conf_text
-            ),
-        ]
-        self.assertEqual(
-            len(corosync_live_calls),
-            len(mock_corosync_live.mock_calls)
+        self.assert_corosync_live_calls(
+            mock_corosync_live, node_addrs_list, conf_text
         )
-        mock_corosync_live.set_remote_corosync_conf.assert_has_calls([
-            mock.call("mock node communicator", node_addrs_list[0], conf_text),
-            mock.call("mock node communicator", node_addrs_list[1], conf_text),
-        ], any_order=True)
 
         assert_report_item_list_equal(
             self.mock_reporter.report_item_list,
@@ -246,10 +299,49 @@ class DistributeCorosyncConfTest(TestCase):
             ]
         )
 
+    @mock.patch("pcs.lib.nodes_task.corosync_live")
+    def test_report_errors_in_node_order(self, mock_corosync_live):
+        nodes = ["node1", "node2", "node3", "node4"]
+        def raiser(node, request, data):
+            if node.ring0 in (nodes[0], nodes[2]):
+                raise NodeAuthenticationException(
+                    node.ring0, "command", "HTTP error: 401"
+                )
+        self.call_node.side_effect = raiser
+        self.fixture_corosync_live(mock_corosync_live, reverse=True)
+
+        lib.distribute_corosync_conf(
+            self.mock_communicator,
+            self.mock_reporter,
+            NodeAddressesList([NodeAddresses(addr) for addr in nodes]),
+            "test conf text",
+            skip_offline_nodes=True
+        )
+
+        accepted = report_codes.COROSYNC_CONFIG_ACCEPTED_BY_NODE
+        failed = report_codes.COROSYNC_CONFIG_DISTRIBUTION_NODE_ERROR
+        self.assertEqual(
+            [
+                # nodes respond in reversed order
+                (accepted, nodes[3]),
+                (accepted, nodes[1]),
+                (failed, nodes[0]),
+                (failed, nodes[2]),
+            ],
+            [
+                (item.code, item.info["node"])
+                for item in self.mock_reporter.report_item_list
+                if item.code in (accepted, failed)
+            ]
+        )
+
 class CheckCorosyncOfflineTest(TestCase):
     def setUp(self):
         self.mock_reporter = MockLibraryReportProcessor()
         self.mock_communicator = mock.MagicMock(NodeCommunicator)
+        self.mock_communicator.call_nodes_many.side_effect = (
+            fake_call_nodes_many(self.mock_communicator.call_node)
+        )
 
     def test_success(self):
         nodes = ["node1", "node2"]
@@ -441,6 +533,39 @@ class CheckCorosyncOfflineTest(TestCase):
             ]
         )
 
+    def test_report_errors_in_node_order(self):
+        nodes = ["node1", "node2", "node3", "node4"]
+        self.mock_communicator.call_nodes_many.side_effect = (
+            fake_call_nodes_many(self.mock_communicator.call_node, reverse=True)
+        )
+        def side_effect(node, request, data):
+            if node.ring0 in (nodes[0], nodes[2]):
+                return '{' # invalid json
+            return '{"corosync": false}'
+        self.mock_communicator.call_node.side_effect = side_effect
+
+        lib.check_corosync_offline_on_nodes(
+            self.mock_communicator,
+            self.mock_reporter,
+            NodeAddressesList([NodeAddresses(addr) for addr in nodes]),
+            skip_offline_nodes=True
+        )
+
+        self.assertEqual(
+            [
+                # nodes respond in reversed order
+                (report_codes.COROSYNC_NOT_RUNNING_ON_NODE, nodes[3]),
+                (report_codes.COROSYNC_NOT_RUNNING_ON_NODE, nodes[1]),
+                (report_codes.COROSYNC_NOT_RUNNING_CHECK_NODE_ERROR, nodes[0]),
+                (report_codes.COROSYNC_NOT_RUNNING_CHECK_NODE_ERROR, nodes[2]),
+            ],
+            [
+                (item.code, item.info["node"])
+                for item in self.mock_reporter.report_item_list
+                if item.code != report_codes.COROSYNC_NOT_RUNNING_CHECK_STARTED
+            ]
+        )
+
 
 @mock.patch("pcs.lib.nodes_task.qdevice_client.remote_client_stop")
 @mock.patch("pcs.lib.nodes_task.qdevice_client.remote_client_start")
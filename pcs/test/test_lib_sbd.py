@@ -16,9 +16,9 @@ from pcs.test.tools.assertions import (
 from pcs.test.tools.custom_mock import MockLibraryReportProcessor
 
 from pcs.common import report_codes
+from pcs.lib import reports
 from pcs.lib.errors import (
     ReportItemSeverity as Severities,
-    ReportItem,
     LibraryError,
 )
 from pcs.lib.node import NodeAddresses
@@ -31,59 +31,6 @@ import pcs.lib.sbd as lib_sbd
 from pcs.lib.corosync.config_facade import ConfigFacade as CorosyncConfigFacade
 
 
-class TestException(Exception):
-    pass
-
-
-class RunParallelAndRaiseLibErrorOnFailureTest(TestCase):
-    def test_no_report_items(self):
-        # test that no exception has been raised
-        lib_sbd._run_parallel_and_raise_lib_error_on_failure(
-            lambda: [],
-            [([], {}) for _ in range(5)]
-        )
-
-    def test_failures(self):
-        def report_item_generator(i):
-            if i == 1:
-                raise NodeConnectionException("node", "command", "reason")
-            elif i == 2:
-                raise LibraryError(
-                    ReportItem.error(
-                        report_codes.COMMON_ERROR,
-                    ),
-                    ReportItem.info(
-                        report_codes.COMMON_INFO,
-                    )
-                )
-
-        assert_raise_library_error(
-            lambda: lib_sbd._run_parallel_and_raise_lib_error_on_failure(
-                report_item_generator,
-                [([i], {}) for i in range(5)]
-            ),
-            (
-                Severities.ERROR,
-                report_codes.NODE_COMMUNICATION_ERROR_UNABLE_TO_CONNECT,
-                {
-                    "node": "node",
-                    "command": "command",
-                    "reason": "reason"
-                }
-            ),
-            (
-                Severities.ERROR,
-                report_codes.COMMON_ERROR,
-                {}
-            ),
-            (
-                Severities.INFO,
-                report_codes.COMMON_INFO,
-                {}
-            )
-        )
-
-
 class EvenNumberOfNodesAndNoQdevice(TestCase):
     def setUp(self):
         self.mock_corosync_conf = mock.MagicMock(spec_set=CorosyncConfigFacade)
@@ -367,9 +314,9 @@ class CheckSbdOnNodeTest(TestCase):
         self.assertEqual(0, len(self.mock_rep.report_item_list))
 
 
-@mock.patch("pcs.lib.sbd._run_parallel_and_raise_lib_error_on_failure")
+@mock.patch("pcs.lib.sbd.check_sbd_on_node")
 class CheckSbdOnAllNodesTest(TestCase):
-    def test_success(self, mock_func):
+    def test_success(self, mock_check):
         mock_com = mock.MagicMock(spec_set=NodeCommunicator)
         mock_rep = MockLibraryReportProcessor()
         node_list = [NodeAddresses("node" + str(i)) for i in range(2)]
@@ -378,13 +325,46 @@ class CheckSbdOnAllNodesTest(TestCase):
             node_list[1]: "/dev/watchdog2"
         }
         lib_sbd.check_sbd_on_all_nodes(mock_rep, mock_com, data)
-        items = sorted(data.items())
-        mock_func.assert_called_once_with(
-            lib_sbd.check_sbd_on_node,
+        self.assertEqual(2, mock_check.call_count)
+        mock_check.assert_has_calls(
             [
-                ([mock_rep, mock_com, node, watchdog], {})
-                for node, watchdog in items
-            ]
+                mock.call(mock_rep, mock_com, node, watchdog)
+                for node, watchdog in data.items()
+            ],
+            any_order=True
+        )
+        assert_report_item_list_equal(
+            mock_rep.report_item_list,
+            [(Severities.INFO, report_codes.SBD_CHECK_STARTED, {})]
+        )
+
+    def test_failures(self, mock_check):
+        def check(report_processor, communicator, node, watchdog):
+            if node.label == "node0":
+                raise NodeConnectionException("node0", "command", "reason")
+            raise LibraryError(reports.sbd_not_installed(node.label))
+        mock_check.side_effect = check
+        node_list = [NodeAddresses("node" + str(i)) for i in range(2)]
+        assert_raise_library_error(
+            lambda: lib_sbd.check_sbd_on_all_nodes(
+                MockLibraryReportProcessor(),
+                mock.MagicMock(spec_set=NodeCommunicator),
+                dict([(node, "/dev/watchdog") for node in node_list])
+            ),
+            (
+                Severities.ERROR,
+                report_codes.NODE_COMMUNICATION_ERROR_UNABLE_TO_CONNECT,
+                {
+                    "node": "node0",
+                    "command": "command",
+                    "reason": "reason"
+                }
+            ),
+            (
+                Severities.ERROR,
+                report_codes.SBD_NOT_INSTALLED,
+                {"node": "node1"}
+            )
         )
 
 
@@ -439,32 +419,6 @@ SBD_WATCHDOG_TIMEOUT=0
         )
 
 
-@mock.patch("pcs.lib.sbd._run_parallel_and_raise_lib_error_on_failure")
-class SetSbdConfigOnAllNodesTest(TestCase):
-    def test_success(self, mock_func):
-        mock_com = mock.MagicMock(spec_set=NodeCommunicator)
-        mock_rep = MockLibraryReportProcessor()
-        watchdog_dict = dict([
-            (NodeAddresses("node" + str(i)), "/dev/watchdog" + str(i))
-            for i in range(5)
-        ])
-        node_list = list(watchdog_dict.keys())
-        config = {
-            "opt1": "val1",
-            "opt2": "val2"
-        }
-        lib_sbd.set_sbd_config_on_all_nodes(
-            mock_rep, mock_com, node_list, config, watchdog_dict
-        )
-        mock_func.assert_called_once_with(
-            lib_sbd.set_sbd_config_on_node,
-            [
-                ([mock_rep, mock_com, node, config, watchdog_dict[node]], {})
-                for node in node_list
-            ]
-        )
-
-
 class EnableSbdServiceTest(TestCase):
     def test_success(self):
         mock_communicator = mock.MagicMock(spec_set=NodeCommunicator)
@@ -500,19 +454,6 @@ class EnableSbdServiceOnNodeTest(TestCase):
         )
 
 
-@mock.patch("pcs.lib.sbd._run_parallel_and_raise_lib_error_on_failure")
-class EnableSbdServiceOnAllNodes(TestCase):
-    def test_success(self, mock_func):
-        mock_com = mock.MagicMock(spec_set=NodeCommunicator)
-        mock_rep = MockLibraryReportProcessor()
-        node_list = [NodeAddresses("node" + str(i)) for i in range(5)]
-        lib_sbd.enable_sbd_service_on_all_nodes(mock_rep, mock_com, node_list)
-        mock_func.assert_called_once_with(
-            lib_sbd.enable_sbd_service_on_node,
-            [([mock_rep, mock_com, node], {}) for node in node_list]
-        )
-
-
 class DisableSbdServiceTest(TestCase):
     def test_success(self):
         mock_communicator = mock.MagicMock(spec_set=NodeCommunicator)
@@ -548,19 +489,6 @@ class DisableSbdServiceOnNodeTest(TestCase):
         )
 
 
-@mock.patch("pcs.lib.sbd._run_parallel_and_raise_lib_error_on_failure")
-class DisableSbdServiceOnAllNodes(TestCase):
-    def test_success(self, mock_func):
-        mock_com = mock.MagicMock(spec_set=NodeCommunicator)
-        mock_rep = MockLibraryReportProcessor()
-        node_list = [NodeAddresses("node" + str(i)) for i in range(5)]
-        lib_sbd.disable_sbd_service_on_all_nodes(mock_rep, mock_com, node_list)
-        mock_func.assert_called_once_with(
-            lib_sbd.disable_sbd_service_on_node,
-            [([mock_rep, mock_com, node], {}) for node in node_list]
-        )
-
-
 class SetStonithWatchdogTimeoutToZeroTest(TestCase):
     def test_success(self):
         mock_communicator = mock.MagicMock(spec_set=NodeCommunicator)
@@ -571,60 +499,6 @@ class SetStonithWatchdogTimeoutToZeroTest(TestCase):
         )
 
 
-@mock.patch("pcs.lib.sbd.set_stonith_watchdog_timeout_to_zero")
-class SetStonithWatchdogTimeoutToZeroOnAllNodesTest(TestCase):
-    def setUp(self):
-        self.mock_com = mock.MagicMock(spec_set=NodeCommunicator)
-        self.node_list = [NodeAddresses("node" + str(i)) for i in range(5)]
-
-    def test_success(self, mock_func):
-        lib_sbd.set_stonith_watchdog_timeout_to_zero_on_all_nodes(
-            self.mock_com, self.node_list
-        )
-        func_calls = [mock.call(self.mock_com, node) for node in self.node_list]
-        self.assertEqual(mock_func.call_count, len(func_calls))
-        mock_func.assert_has_calls(func_calls)
-
-    def test_communication_error(self, mock_func):
-        def raiser(_, node):
-            if node == self.node_list[1]:
-                raise NodeConnectionException(
-                    self.node_list[1], "command", "reason"
-                )
-            elif node == self.node_list[4]:
-                raise NodeCommunicationException(
-                    self.node_list[4], "command", "reason"
-                )
-
-        mock_func.side_effect = raiser
-        assert_raise_library_error(
-            lambda: lib_sbd.set_stonith_watchdog_timeout_to_zero_on_all_nodes(
-                self.mock_com, self.node_list
-            ),
-            (
-                Severities.ERROR,
-                report_codes.NODE_COMMUNICATION_ERROR_UNABLE_TO_CONNECT,
-                {
-                    "node": self.node_list[1],
-                    "command": "command",
-                    "reason": "reason"
-                }
-            ),
-            (
-                Severities.ERROR,
-                report_codes.NODE_COMMUNICATION_ERROR,
-                {
-                    "node": self.node_list[4],
-                    "command": "command",
-                    "reason": "reason"
-                }
-            )
-        )
-        func_calls = [mock.call(self.mock_com, node) for node in self.node_list]
-        self.assertEqual(mock_func.call_count, len(func_calls))
-        mock_func.assert_has_calls(func_calls)
-
-
 class RemoveStonithWatchdogTimeoutTest(TestCase):
     def test_success(self):
         mock_communicator = mock.MagicMock(spec_set=NodeCommunicator)
@@ -635,60 +509,6 @@ class RemoveStonithWatchdogTimeoutTest(TestCase):
         )
 
 
-@mock.patch("pcs.lib.sbd.remove_stonith_watchdog_timeout")
-class RemoveStonithWatchdogTimeoutOnAllNodesTest(TestCase):
-    def setUp(self):
-        self.mock_com = mock.MagicMock(spec_set=NodeCommunicator)
-        self.node_list = [NodeAddresses("node" + str(i)) for i in range(5)]
-
-    def test_success(self, mock_func):
-        lib_sbd.remove_stonith_watchdog_timeout_on_all_nodes(
-            self.mock_com, self.node_list
-        )
-        func_calls = [mock.call(self.mock_com, node) for node in self.node_list]
-        self.assertEqual(mock_func.call_count, len(func_calls))
-        mock_func.assert_has_calls(func_calls)
-
-    def test_communication_error(self, mock_func):
-        def raiser(_, node):
-            if node == self.node_list[1]:
-                raise NodeConnectionException(
-                    self.node_list[1], "command", "reason"
-                )
-            elif node == self.node_list[4]:
-                raise NodeCommunicationException(
-                    self.node_list[4], "command", "reason"
-                )
-
-        mock_func.side_effect = raiser
-        assert_raise_library_error(
-            lambda: lib_sbd.remove_stonith_watchdog_timeout_on_all_nodes(
-                self.mock_com, self.node_list
-            ),
-            (
-                Severities.ERROR,
-                report_codes.NODE_COMMUNICATION_ERROR_UNABLE_TO_CONNECT,
-                {
-                    "node": self.node_list[1],
-                    "command": "command",
-                    "reason": "reason"
-                }
-            ),
-            (
-                Severities.ERROR,
-                report_codes.NODE_COMMUNICATION_ERROR,
-                {
-                    "node": self.node_list[4],
-                    "command": "command",
-                    "reason": "reason"
-                }
-            )
-        )
-        func_calls = [mock.call(self.mock_com, node) for node in self.node_list]
-        self.assertEqual(mock_func.call_count, len(func_calls))
-        mock_func.assert_has_calls(func_calls)
-
-
 class GetSbdConfigTest(TestCase):
     def test_success(self):
         mock_communicator = mock.MagicMock(spec_set=NodeCommunicator)
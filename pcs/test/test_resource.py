@@ -8,6 +8,14 @@ from __future__ import (
 import os
 import re
 import shutil
+try:
+    # python2
+    from cStringIO import StringIO
+except ImportError:
+    # python3
+    from io import StringIO
+
+from lxml import etree
 
 from pcs.test.tools.assertions import AssertPcsMixin
 from pcs.test.tools.misc import (
@@ -20,6 +28,7 @@ from pcs.test.tools.pcs_runner import (
     PcsRunner,
 )
 from pcs.test.tools import pcs_unittest as unittest
+from pcs.test.tools.pcs_unittest import mock
 
 from pcs import utils
 from pcs import resource
@@ -259,6 +268,42 @@ class ResourceTest(unittest.TestCase, AssertPcsMixin):
             """
         ))
 
+    def testResourceShowMultipleIds(self):
+        self.assert_pcs_success(
+            "resource create --no-default-ops ClusterIP ocf:heartbeat:IPaddr2"
+                " cidr_netmask=32 ip=192.168.0.99 op monitor interval=30s"
+        )
+        self.assert_pcs_success(
+            "resource create --no-default-ops D1 ocf:heartbeat:Dummy"
+                " --group G1"
+        )
+        self.assert_pcs_success(
+            "stonith create F1 fence_xvm"
+        )
+        self.assert_pcs_success("resource show G1 ClusterIP D1", outdent(
+            """\
+             Group: G1
+              Resource: D1 (class=ocf provider=heartbeat type=Dummy)
+               Operations: monitor interval=10 timeout=20 (D1-monitor-interval-10)
+             Resource: ClusterIP (class=ocf provider=heartbeat type=IPaddr2)
+              Attributes: cidr_netmask=32 ip=192.168.0.99
+              Operations: monitor interval=30s (ClusterIP-monitor-interval-30s)
+             Resource: D1 (class=ocf provider=heartbeat type=Dummy)
+              Operations: monitor interval=10 timeout=20 (D1-monitor-interval-10)
+            """
+        ))
+        self.assert_pcs_fail(
+            "resource show ClusterIP F1",
+            outdent(
+                """\
+                 Resource: ClusterIP (class=ocf provider=heartbeat type=IPaddr2)
+                  Attributes: cidr_netmask=32 ip=192.168.0.99
+                  Operations: monitor interval=30s (ClusterIP-monitor-interval-30s)
+                Error: unable to find resource 'F1'
+                """
+            )
+        )
+
     def testResourceUpdate(self):
         self.assert_pcs_success(
             "resource create --no-default-ops ClusterIP ocf:heartbeat:IPaddr2"
@@ -869,7 +914,7 @@ monitor interval=20 (A-monitor-interval-20)
 """)
 
         o,r = pcs(temp_cib, "resource delete AGroup")
-        ac(o,"Removing group: AGroup (and all resources within group)\nStopping all resources in group: AGroup...\nDeleting Resource - A1\nDeleting Resource - A2\nDeleting Resource (and group) - A3\n")
+        ac(o,"Removing group: AGroup (and all resources within group)\nDeleting Resource - A1\nDeleting Resource - A2\nDeleting Resource (and group) - A3\n")
         assert r == 0
 
         o,r = pcs(temp_cib, "resource show")
@@ -1304,7 +1349,6 @@ Ticket Constraints:
         output, returnVal = pcs(temp_large_cib, "resource delete dummies")
         ac(output, """\
 Removing group: dummies (and all resources within group)
-Stopping all resources in group: dummies...
 Deleting Resource (and group) - dummylarge
 """)
         assert returnVal == 0
@@ -1622,7 +1666,6 @@ Deleting Resource - D1
         output, returnVal = pcs(temp_large_cib, "resource delete dummies")
         ac(output, """\
 Removing group: dummies (and all resources within group)
-Stopping all resources in group: dummies...
 Deleting Resource (and group and clone) - dummylarge
 """)
         assert returnVal == 0
@@ -1756,7 +1799,6 @@ Deleting Resource - ClusterIP5
         ac(output, outdent(
             """\
             Removing group: dummies (and all resources within group)
-            Stopping all resources in group: dummies...
             Deleting Resource (and group and M/S) - dummylarge
             """
         ))
@@ -4341,7 +4383,7 @@ Error: role must be: Stopped, Started, Slave or Master (use --force to override)
         ))
 
         output, retVal = pcs(temp_cib, "resource delete dummies-clone")
-        ac(output, "Removing group: dummies (and all resources within group)\nStopping all resources in group: dummies...\nDeleting Resource - dummy1\nDeleting Resource - dummy2\nDeleting Resource (and group and clone) - dummy3\n")
+        ac(output, "Removing group: dummies (and all resources within group)\nDeleting Resource - dummy1\nDeleting Resource - dummy2\nDeleting Resource (and group and clone) - dummy3\n")
         assert retVal == 0
         output, retVal = pcs(temp_cib, "resource show")
         ac(output, "NO resources configured\n")
@@ -4413,7 +4455,7 @@ Error: role must be: Stopped, Started, Slave or Master (use --force to override)
         ))
 
         output, retVal = pcs(temp_cib, "resource delete dummies-master")
-        ac(output, "Removing group: dummies (and all resources within group)\nStopping all resources in group: dummies...\nDeleting Resource - dummy1\nDeleting Resource - dummy2\nDeleting Resource (and group and M/S) - dummy3\n")
+        ac(output, "Removing group: dummies (and all resources within group)\nDeleting Resource - dummy1\nDeleting Resource - dummy2\nDeleting Resource (and group and M/S) - dummy3\n")
         assert retVal == 0
         output, retVal = pcs(temp_cib, "resource show")
         ac(output, "NO resources configured\n")
@@ -4780,7 +4822,6 @@ class ResourcesReferencedFromAclTest(unittest.TestCase, AssertPcsMixin):
         self.assert_pcs_success('acl role create read-dummy read id dummy2')
         self.assert_pcs_success('resource delete dummy-group', [
             'Removing group: dummy-group (and all resources within group)',
-            'Stopping all resources in group: dummy-group...',
             'Deleting Resource - dummy1',
             'Deleting Resource (and group) - dummy2',
         ])
@@ -4792,7 +4833,6 @@ class ResourcesReferencedFromAclTest(unittest.TestCase, AssertPcsMixin):
         self.assert_pcs_success('acl role create acl-role-a read id dummy-group')
         self.assert_pcs_success('resource delete dummy-group', [
             'Removing group: dummy-group (and all resources within group)',
-            'Stopping all resources in group: dummy-group...',
             'Deleting Resource - dummy1',
             'Deleting Resource (and group) - dummy2',
         ])
@@ -4888,3 +4928,204 @@ class ResourceRemoveWithTicketTest(unittest.TestCase, AssertPcsMixin):
                 "Deleting Resource - A",
             ]
         )
+
+class ResourceRemoveManyTest(unittest.TestCase):
+    cib = """
+        <cib validate-with="pacemaker-1.2">
+          <configuration>
+            <resources>
+              <primitive id="A" class="ocf" provider="heartbeat" type="Dummy"/>
+              <group id="G">
+                <primitive id="B" class="ocf" provider="heartbeat"
+                  type="Dummy"/>
+                <primitive id="C" class="ocf" provider="heartbeat"
+                  type="Dummy"/>
+              </group>
+              <clone id="D-clone">
+                <primitive id="D" class="ocf" provider="heartbeat"
+                  type="Dummy"/>
+              </clone>
+              <primitive id="E" class="ocf" provider="heartbeat" type="Dummy"/>
+            </resources>
+            <constraints>
+              <rsc_location id="location-A" rsc="A" node="node1" score="1"/>
+              <rsc_order id="order-G-E" first="G" then="E"/>
+              <rsc_colocation id="colocation-D-clone-E" rsc="D-clone"
+                with-rsc="E" score="INFINITY"/>
+            </constraints>
+          </configuration>
+          <status/>
+        </cib>
+    """
+
+    def setUp(self):
+        self.state = "<resources/>"
+        self.pushed = []
+        self.working_cib = None
+        self.run = mock.Mock(return_value=("", 0))
+        for name, value in [
+            ("get_cib_snapshot", self.get_cib_snapshot),
+            ("get_cib_snapshot_readonly", lambda: etree.fromstring(self.cib)),
+            ("push_cib_snapshot", self.push_cib_snapshot),
+            ("getClusterState", self.get_state),
+            ("run", self.run),
+            ("usefile", False),
+        ]:
+            patcher = mock.patch.object(utils, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.dict(utils.pcs_options, {}, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def push(self, dom):
+        self.pushed.append(
+            etree.tostring(dom).decode() if utils.is_lxml(dom) else dom.toxml()
+        )
+
+    def get_cib_snapshot(self):
+        if self.working_cib is None:
+            self.working_cib = etree.fromstring(self.cib)
+        return self.working_cib
+
+    def push_cib_snapshot(self):
+        self.push(self.working_cib)
+        self.working_cib = None
+
+    def get_state(self):
+        crm_mon = etree.parse(rc("crm_mon.minimal.xml")).getroot()
+        crm_mon.append(etree.fromstring(self.state))
+        return crm_mon
+
+    def fixture_running(self, resource_id_list):
+        return "<resources>{0}</resources>".format("".join([
+            """
+            <resource id="{0}" role="Started" failed="false"
+              nodes_running_on="1"
+            >
+              <node name="node1" id="1" cached="false"/>
+            </resource>
+            """.format(resource_id)
+            for resource_id in resource_id_list
+        ]))
+
+    def remove(self, resource_id_list):
+        with mock.patch("sys.stdout", new_callable=StringIO) as stdout:
+            resource.resource_remove_many(resource_id_list)
+        return stdout.getvalue()
+
+    def test_removed_in_one_push(self):
+        output = self.remove(["A", "G", "D-clone"])
+        ac(
+            output,
+            outdent(
+                """\
+                Removing group: G (and all resources within group)
+                Removing Constraint - location-A
+                Removing Constraint - order-G-E
+                Removing Constraint - colocation-D-clone-E
+                Deleting Resource - A
+                Deleting Resource - B
+                Deleting Resource (and group) - C
+                Deleting Resource - D
+                """
+            )
+        )
+        self.assertEqual(1, len(self.pushed))
+        cib = etree.fromstring(self.pushed[0])
+        self.assertEqual(
+            ["E"],
+            cib.xpath("//resources/descendant::*/@id")
+        )
+        self.assertEqual([], cib.xpath("//constraints/*"))
+        self.run.assert_not_called()
+
+    def test_running_stopped_in_one_push(self):
+        self.state = self.fixture_running(["A", "B", "E"])
+
+        def run(args):
+            # resources are stopped when waiting finishes
+            self.state = self.fixture_running(["E"])
+            return "", 0
+        self.run.side_effect = run
+
+        output = self.remove(["A", "G"])
+        self.assertTrue(
+            output.startswith(outdent(
+                """\
+                Removing group: G (and all resources within group)
+                Stopping all resources in group: G...
+                Attempting to stop: A...Stopped
+                """
+            )),
+            output
+        )
+        self.assertEqual(2, len(self.pushed))
+        disabled = etree.fromstring(self.pushed[0])
+        self.assertEqual(
+            ["A", "G"],
+            disabled.xpath(
+                "//*[meta_attributes/nvpair[@name='target-role' "
+                "and @value='Stopped']]/@id"
+            )
+        )
+        self.run.assert_called_once_with(["crm_resource", "--wait"])
+        self.assertEqual(
+            ["D", "E"],
+            etree.fromstring(self.pushed[1]).xpath("//primitive/@id")
+        )
+
+    def test_group_not_stopped_when_forced(self):
+        self.state = self.fixture_running(["B"])
+        with mock.patch.dict(utils.pcs_options, {"--force": True}):
+            output = self.remove(["G"])
+        self.assertFalse("Stopping all resources in group" in output, output)
+        self.assertEqual(1, len(self.pushed))
+
+    def test_references_removed_once(self):
+        self.cib = self.cib.replace(
+            "</constraints>",
+            """
+              <rsc_order id="order-A-G" first="A" then="G"/>
+              <rsc_colocation id="colocation-set" score="INFINITY">
+                <resource_set id="colocation-set-1">
+                  <resource_ref id="A"/>
+                  <resource_ref id="G"/>
+                </resource_set>
+              </rsc_colocation>
+              </constraints>
+            """
+        )
+        output = self.remove(["A", "G"])
+        self.assertEqual(1, output.count("Removing Constraint - order-A-G"))
+        self.assertEqual(1, output.count("Removing set colocation-set-1"))
+        self.assertEqual(1, output.count("Removing constraint colocation-set"))
+        cib = etree.fromstring(self.pushed[0])
+        self.assertEqual(
+            ["colocation-D-clone-E"],
+            cib.xpath("//constraints/*/@id")
+        )
+
+    @mock.patch("pcs.resource.utils.err")
+    def test_not_stopped(self, mock_err):
+        mock_err.side_effect = SystemExit(1)
+        self.state = self.fixture_running(["A", "B"])
+        self.assertRaises(SystemExit, lambda: self.remove(["A", "G"]))
+        mock_err.assert_called_once_with(
+            "Unable to stop: A before deleting (re-run with --force to force "
+                "deletion)\n"
+            "Unable to stop group: G before deleting (re-run with --force to "
+                "force deletion)"
+        )
+        self.assertEqual(1, len(self.pushed))
+
+    @mock.patch("pcs.resource.utils.err")
+    def test_missing_resources(self, mock_err):
+        self.assertRaises(
+            SystemExit, lambda: self.remove(["A", "X", "G", "Y"])
+        )
+        mock_err.assert_has_calls([
+            mock.call("Resource 'X' does not exist.", False),
+            mock.call("Resource 'Y' does not exist.", False),
+        ])
+        self.assertEqual([], self.pushed)
@@ -6,10 +6,11 @@ from __future__ import (
 )
 
 import shutil
-from pcs.test.tools import pcs_unittest as unittest
-import xml.dom.minidom
+from lxml import etree
 
 from pcs import rule
+from pcs.test.tools import pcs_unittest as unittest
+from pcs.test.tools.assertions import assert_xml_equal
 from pcs.test.tools.misc import (
     ac,
     get_test_resource as rc,
@@ -1243,18 +1244,18 @@ class CibBuilderTest(unittest.TestCase):
         )
 
     def assertExpressionXml(self, rule_expression, rule_xml):
-        cib_dom = xml.dom.minidom.parse(empty_cib)
-        constraints = cib_dom.getElementsByTagName("constraints")[0]
-        constraint_el = constraints.appendChild(
-            cib_dom.createElement("rsc_location")
+        cib = etree.parse(empty_cib).getroot()
+        constraint_el = etree.SubElement(
+            cib.find(".//constraints"), "rsc_location", id="location-dummy"
         )
-        constraint_el.setAttribute("id", "location-dummy")
-        ac(
-            self.builder.build(
-                constraint_el,
-                self.parser.parse(rule_expression)
-            ).parentNode.toprettyxml(indent="    "),
-            rule_xml.lstrip().rstrip(" ")
+        assert_xml_equal(
+            rule_xml,
+            etree.tostring(
+                self.builder.build(
+                    constraint_el,
+                    self.parser.parse(rule_expression)
+                ).getparent()
+            ).decode()
         )
 
 
@@ -1648,14 +1649,14 @@ class ExportAsExpressionTest(unittest.TestCase):
         ac(
             export + "\n",
             rule.ExportAsExpression().get_string(
-                xml.dom.minidom.parseString(rule_xml).documentElement,
+                etree.fromstring(rule_xml),
                 normalize=False
             ) + "\n"
         )
         ac(
             export_normalized + "\n",
             rule.ExportAsExpression().get_string(
-                xml.dom.minidom.parseString(rule_xml).documentElement,
+                etree.fromstring(rule_xml),
                 normalize=True
             ) + "\n"
         )
@@ -1931,15 +1932,10 @@ Location Constraints:
         self.assertEqual(1, returnVal)
 
     def assertExpressionXml(self, rule_expression, rule_xml):
-        cib_dom = xml.dom.minidom.parse(empty_cib)
-        constraints = cib_dom.getElementsByTagName("constraints")[0]
-        constraint_el = constraints.appendChild(
-            cib_dom.createElement("rsc_location")
+        cib = etree.parse(empty_cib).getroot()
+        constraint_el = etree.SubElement(
+            cib.find(".//constraints"), "rsc_location", id="location-dummy"
         )
-        constraint_el.setAttribute("id", "location-dummy")
         options, rule_argv = rule.parse_argv(rule_expression)
         rule.dom_rule_add(constraint_el, options, rule_argv)
-        ac(
-            constraint_el.toprettyxml(indent="    "),
-            rule_xml.lstrip().rstrip(" ")
-        )
+        assert_xml_equal(rule_xml, etree.tostring(constraint_el).decode())
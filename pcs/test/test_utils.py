@@ -7,8 +7,10 @@ from __future__ import (
 
 import sys
 from pcs.test.tools import pcs_unittest as unittest
+from pcs.test.tools.pcs_unittest import mock
 import xml.dom.minidom
 import xml.etree.cElementTree as ET
+from lxml import etree
 from time import sleep
 
 try:
@@ -246,6 +248,47 @@ class UtilsTest(unittest.TestCase):
             utils.dom_get_resource_clone_ms_parent(cib_dom, "myGroupedResource")
         )
 
+    def testDomGetResourcesLxml(self):
+        cib = etree.fromstring(self.get_cib_resources().toxml())
+        def assert_found(method, element_id, found_id):
+            element = method(cib, element_id)
+            self.assertTrue(
+                element is not None,
+                "element with id '%s' not found" % element_id
+            )
+            self.assertEqual(found_id, element.get("id"))
+
+        assert_found(utils.dom_get_resource, "myResource", "myResource")
+        assert_found(
+            utils.dom_get_resource_clone,
+            "myClonedGroupedResource",
+            "myClonedGroupedResource"
+        )
+        assert_found(
+            utils.dom_get_resource_masterslave,
+            "myMasteredResource",
+            "myMasteredResource"
+        )
+        assert_found(utils.dom_get_group_clone, "myClonedGroup", "myClonedGroup")
+        assert_found(utils.dom_get_any_resource, "myMaster", "myMaster")
+        assert_found(
+            utils.dom_get_clone_ms_resource, "myGroupClone", "myClonedGroup"
+        )
+        assert_found(
+            utils.dom_get_resource_clone_ms_parent,
+            "myMasteredGroupedResource",
+            "myGroupMaster"
+        )
+        self.assertEqual(None, utils.dom_get_resource(cib, "myClone"))
+        self.assertEqual(
+            None, utils.dom_get_resource_clone(cib, "myGroupedResource")
+        )
+        self.assertEqual(None, utils.dom_get_group_masterslave(cib, "myGroup"))
+        self.assertEqual(None, utils.dom_get_any_resource(cib, "none"))
+        self.assertEqual(
+            None, utils.dom_get_resource_clone_ms_parent(cib, "myResource")
+        )
+
     def testDomGetResourceRemoteNodeName(self):
         dom = self.get_cib_empty()
         new_resources = xml.dom.minidom.parseString("""
@@ -559,6 +602,53 @@ class UtilsTest(unittest.TestCase):
             utils.validate_constraint_resource(dom, "myMasteredGroupedResource")
         )
 
+    @mock.patch.object(utils, "pcs_options", {})
+    def testValidateConstraintResourceLxml(self):
+        cib = etree.fromstring(self.get_cib_resources().toxml())
+        self.assertEqual(
+            (True, "", "myClone"),
+            utils.validate_constraint_resource(cib, "myClone")
+        )
+        self.assertEqual(
+            (True, "", "myGroup"),
+            utils.validate_constraint_resource(cib, "myGroup")
+        )
+        self.assertEqual(
+            (False, "Resource 'myNonexistent' does not exist", None),
+            utils.validate_constraint_resource(cib, "myNonexistent")
+        )
+        self.assertEqual(
+            (
+                False,
+                (
+                    "myClonedGroupedResource is a clone resource, you should "
+                    "use the clone id: myGroupClone when adding constraints. "
+                    "Use --force to override."
+                ),
+                "myGroupClone"
+            ),
+            utils.validate_constraint_resource(cib, "myClonedGroupedResource")
+        )
+        self.assertEqual(
+            (
+                False,
+                (
+                    "myMasteredGroup is a master/slave resource, you should "
+                    "use the master id: myGroupMaster when adding constraints."
+                    " Use --force to override."
+                ),
+                "myGroupMaster"
+            ),
+            utils.validate_constraint_resource(cib, "myMasteredGroup")
+        )
+
+    def testDoesIdExistLxml(self):
+        cib = etree.fromstring(self.get_cib_resources().toxml())
+        self.assertTrue(utils.does_id_exist(cib, "myResource"))
+        self.assertTrue(utils.does_id_exist(cib, "myClonedGroup"))
+        self.assertFalse(utils.does_id_exist(cib, "myNonexistent"))
+        self.assertFalse(utils.does_id_exist(cib, "cib"))
+
     def testValidateXmlId(self):
         self.assertEqual((True, ""), utils.validate_xml_id("dummy"))
         self.assertEqual((True, ""), utils.validate_xml_id("DUMMY"))
@@ -715,7 +805,7 @@ class UtilsTest(unittest.TestCase):
         return cib_dom
 
     def test_resource_running_on(self):
-        status = xml.dom.minidom.parseString("""
+        status = etree.fromstring("""
 <crm_mon>
     <summary />
     <nodes />
@@ -793,7 +883,7 @@ class UtilsTest(unittest.TestCase):
         </resource>
     </resources>
 </crm_mon>
-        """).documentElement
+        """)
 
         self.assertEqual(
             utils.resource_running_on("myResource", status),
@@ -1798,6 +1888,205 @@ class UtilsTest(unittest.TestCase):
         self.assertEqual(node.getAttribute("id"), node_id)
 
 
+@mock.patch("pcs.utils.run")
+class CibSessionTest(unittest.TestCase):
+    cib_xml = """
+        <cib>
+            <configuration>
+                <crm_config/>
+                <resources>
+                    <primitive id="R1" class="ocf" type="Dummy"/>
+                    <primitive id="R2" class="stonith" type="fence_xvm"/>
+                </resources>
+                <constraints/>
+            </configuration>
+            <status/>
+        </cib>
+    """
+
+    def setUp(self):
+        utils.cib_session.invalidate()
+        self.addCleanup(utils.cib_session.invalidate)
+
+    def test_load_cib_once(self, mock_run):
+        mock_run.return_value = (self.cib_xml, 0)
+        self.assertTrue(utils.does_exist("//primitive[@id='R1']"))
+        self.assertFalse(utils.does_exist("//primitive[@id='R3']"))
+        self.assertTrue(utils.is_stonith_resource("R2"))
+        self.assertEqual(
+            "R1",
+            utils.dom_get_resource(utils.get_cib_dom(), "R1").getAttribute("id")
+        )
+        mock_run.assert_called_once_with(["cibadmin", "-l", "-Q"])
+
+    def test_reload_after_invalidate(self, mock_run):
+        mock_run.return_value = (self.cib_xml, 0)
+        utils.get_cib()
+        utils.cib_session.invalidate()
+        utils.get_cib()
+        self.assertEqual(2, mock_run.call_count)
+
+    def test_get_cib_xpath(self, mock_run):
+        mock_run.return_value = (self.cib_xml, 0)
+        self.assertEqual("", utils.get_cib_xpath("//group"))
+        self.assertEqual("", utils.get_cib_xpath("//primitive[invalid"))
+        self.assertEqual(
+            '<primitive id="R1" class="ocf" type="Dummy"/>',
+            utils.get_cib_xpath("//primitive[@id='R1']")
+        )
+        element = xml.dom.minidom.parseString(
+            utils.get_cib_xpath("//primitive")
+        ).documentElement
+        self.assertEqual("xpath-query", element.tagName)
+        self.assertEqual(2, len(element.getElementsByTagName("primitive")))
+
+    def test_get_cib_scope(self, mock_run):
+        mock_run.return_value = (self.cib_xml, 0)
+        self.assertEqual("<crm_config/>", utils.get_cib("crm_config"))
+        self.assertEqual("<status/>", utils.get_cib("status"))
+        mock_run.assert_called_once_with(["cibadmin", "-l", "-Q"])
+
+    def test_changes_not_seen_until_pushed(self, mock_run):
+        mock_run.return_value = (self.cib_xml, 0)
+        resources = utils.get_cib_snapshot().find(".//resources")
+        resources.append(etree.Element("primitive", id="R3"))
+        self.assertIs(resources, utils.get_cib_snapshot().find(".//resources"))
+        self.assertFalse(utils.does_exist("//primitive[@id='R3']"))
+        self.assertIsNone(utils.dom_get_resource(utils.get_cib_dom(), "R3"))
+        mock_run.assert_called_once_with(["cibadmin", "-l", "-Q"])
+
+    def test_readonly_snapshot_not_copied(self, mock_run):
+        mock_run.return_value = (self.cib_xml, 0)
+        cib = utils.get_cib_snapshot_readonly()
+        self.assertIs(cib, utils.get_cib_snapshot_readonly())
+        self.assertIsNot(cib, utils.get_cib_snapshot())
+        utils.get_cib_snapshot().find(".//resources").append(
+            etree.Element("primitive", id="R3")
+        )
+        self.assertEqual([], cib.xpath("//primitive[@id='R3']"))
+        mock_run.assert_called_once_with(["cibadmin", "-l", "-Q"])
+
+    def test_push(self, mock_run):
+        mock_run.return_value = (self.cib_xml, 0)
+        resources = utils.get_cib_snapshot().find(".//resources")
+        resources.append(etree.Element("primitive", id="R3"))
+        utils.push_cib_snapshot()
+        self.assertEqual(2, mock_run.call_count)
+        args, dummy_kwargs = mock_run.call_args
+        self.assertEqual(
+            ["cibadmin", "--replace", "-V", "--xml-pipe", "-o", "configuration"],
+            args[0]
+        )
+        self.assertIn('<primitive id="R3"/>', args[2])
+        # the pushed cib is loaded again
+        utils.get_cib_snapshot()
+        self.assertEqual(3, mock_run.call_count)
+
+    def test_push_nothing(self, mock_run):
+        utils.push_cib_snapshot()
+        mock_run.assert_not_called()
+
+
+@mock.patch("pcs.utils.cib_session.invalidate")
+@mock.patch("pcs.utils.subprocess.Popen")
+class RunDropsCibSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.pcs_options = utils.pcs_options
+        utils.pcs_options = {}
+
+    def tearDown(self):
+        utils.pcs_options = self.pcs_options
+
+    def assert_drop(self, args, mock_popen, mock_invalidate):
+        mock_popen.return_value.communicate.return_value = ("", "")
+        mock_popen.return_value.returncode = 0
+        utils.run(args)
+        mock_invalidate.assert_called_once_with()
+
+    def assert_keep(self, args, mock_popen, mock_invalidate):
+        mock_popen.return_value.communicate.return_value = ("", "")
+        mock_popen.return_value.returncode = 0
+        utils.run(args)
+        mock_invalidate.assert_not_called()
+
+    def test_cib_query(self, mock_popen, mock_invalidate):
+        self.assert_keep(
+            ["cibadmin", "-Q", "--xpath", "//group"],
+            mock_popen,
+            mock_invalidate
+        )
+
+    def test_status_query(self, mock_popen, mock_invalidate):
+        self.assert_keep(["crm_mon", "--one-shot"], mock_popen, mock_invalidate)
+
+    def test_other_command(self, mock_popen, mock_invalidate):
+        self.assert_keep(
+            ["corosync-cfgtool", "-R"], mock_popen, mock_invalidate
+        )
+
+    def test_cib_replace(self, mock_popen, mock_invalidate):
+        self.assert_drop(
+            ["cibadmin", "--replace", "--xml-pipe"],
+            mock_popen,
+            mock_invalidate
+        )
+
+    def test_crm_tool(self, mock_popen, mock_invalidate):
+        self.assert_drop(
+            ["crm_resource", "-r", "R1", "-m", "-p", "target-role"],
+            mock_popen,
+            mock_invalidate
+        )
+
+    def test_crm_resource_query(self, mock_popen, mock_invalidate):
+        self.assert_keep(
+            ["crm_resource", "--wait", "--timeout=60"],
+            mock_popen,
+            mock_invalidate
+        )
+
+    def test_crm_resource_ban(self, mock_popen, mock_invalidate):
+        self.assert_drop(
+            ["crm_resource", "--resource", "R1", "--ban"],
+            mock_popen,
+            mock_invalidate
+        )
+
+    def test_crm_attribute_query(self, mock_popen, mock_invalidate):
+        self.assert_keep(
+            ["crm_attribute", "--type", "crm_config", "--name", "a", "-G"],
+            mock_popen,
+            mock_invalidate
+        )
+
+    def test_crm_attribute_update(self, mock_popen, mock_invalidate):
+        self.assert_drop(
+            [
+                "crm_attribute", "--type", "crm_config",
+                "--attr-name", "a", "--attr-value", "b"
+            ],
+            mock_popen,
+            mock_invalidate
+        )
+
+    def test_crm_attribute_delete(self, mock_popen, mock_invalidate):
+        self.assert_drop(
+            ["crm_attribute", "-t", "status", "-N", "node1", "-n", "a", "-D"],
+            mock_popen,
+            mock_invalidate
+        )
+
+    def test_crm_node_list(self, mock_popen, mock_invalidate):
+        self.assert_keep(["crm_node", "-l"], mock_popen, mock_invalidate)
+
+    def test_crm_node_remove(self, mock_popen, mock_invalidate):
+        self.assert_drop(
+            ["crm_node", "--force", "-R", "node1"],
+            mock_popen,
+            mock_invalidate
+        )
+
+
 class RunParallelTest(unittest.TestCase):
     def fixture_create_worker(self, log, name, sleepSeconds=0):
         def worker():
@@ -1811,8 +2100,7 @@ class RunParallelTest(unittest.TestCase):
             [
                 self.fixture_create_worker(log, 'first'),
                 self.fixture_create_worker(log, 'second'),
-            ],
-            wait_seconds=.1
+            ]
         )
 
         self.assertEqual(
@@ -1820,6 +2108,67 @@ class RunParallelTest(unittest.TestCase):
             sorted(['first', 'second'])
         )
 
+    def test_worker_exit_does_not_stop_others(self):
+        log = []
+        def exiting_worker():
+            sys.exit(1)
+        utils.run_parallel(
+            [
+                exiting_worker,
+                self.fixture_create_worker(log, 'second', .1),
+            ]
+        )
+        self.assertEqual(['second'], log)
+
+class MapParallelTest(unittest.TestCase):
+    def test_results_in_items_order(self):
+        def action(node, suffix, sleep_seconds=0):
+            sleep(sleep_seconds)
+            return node + suffix
+        self.assertEqual(
+            ["node1-x", "node2-x", "node3-x"],
+            utils.map_parallel(
+                lambda node, suffix: action(
+                    node, suffix, .1 if node == "node1" else 0
+                ),
+                ["node1", "node2", "node3"],
+                "-x"
+            )
+        )
+
+
+class RunCollectingErrorsTest(unittest.TestCase):
+    @mock.patch("pcs.utils.sys.stderr")
+    def test_collect_errors(self, mock_stderr):
+        def action():
+            utils.err("first", False)
+            utils.err("second")
+        result, error_list, exception = utils.run_collecting_errors(action)
+        self.assertIsNone(result)
+        self.assertEqual(["first", "second"], error_list)
+        self.assertTrue(isinstance(exception, SystemExit))
+        mock_stderr.write.assert_not_called()
+
+        utils.err("not collected", False)
+        mock_stderr.write.assert_called_once_with("Error: not collected\n")
+
+    def test_return_result(self):
+        self.assertEqual(
+            ("result", [], None),
+            utils.run_collecting_errors(lambda: "result")
+        )
+
+    @mock.patch("pcs.utils.sys.stderr")
+    def test_collect_only_current_thread(self, mock_stderr):
+        def action():
+            utils.run_parallel([lambda: utils.err("in thread", False)])
+            return "done"
+        self.assertEqual(
+            ("done", [], None),
+            utils.run_collecting_errors(action)
+        )
+        mock_stderr.write.assert_called_once_with("Error: in thread\n")
+
 
 class PrepareNodeNamesTest(unittest.TestCase):
     def test_return_original_when_is_in_pacemaker_nodes(self):
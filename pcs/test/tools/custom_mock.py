@@ -47,6 +47,9 @@ class MockCurl(object):
     def reset(self):
         self._opts = {}
 
+    def close(self):
+        pass
+
     def setopt(self, opt, val):
         if val is None:
             self.unsetopt(opt)
@@ -66,12 +69,59 @@ class MockCurl(object):
             AssertionError("info '#{0}' not defined".format(opt))
 
     def perform(self):
+        if pycurl.DEBUGFUNCTION in self._opts:
+            for msg_type, msg in self._debug_output_list or []:
+                self._opts[pycurl.DEBUGFUNCTION](msg_type, msg)
         if self._exception:
             #pylint: disable=raising-bad-type
             raise self._exception
         if pycurl.WRITEFUNCTION in self._opts:
             self._opts[pycurl.WRITEFUNCTION](self._output)
-        if pycurl.DEBUGFUNCTION in self._opts:
-            for msg_type, msg in self._debug_output_list:
-                self._opts[pycurl.DEBUGFUNCTION](msg_type, msg)
+
+
+class MockCurlMulti(object):
+    """
+    Performs MockCurl handles one by one when perform is called
+    """
+    def __init__(self):
+        self.handle_list = []
+        self.max_handles_count = 0
+        self.closed = False
+        self._ok_list = []
+        self._error_list = []
+
+    def add_handle(self, handle):
+        self.handle_list.append(handle)
+        self.max_handles_count = max(
+            self.max_handles_count, len(self.handle_list)
+        )
+
+    def remove_handle(self, handle):
+        self.handle_list.remove(handle)
+
+    def perform(self):
+        finished = set(self._ok_list) | set([
+            error[0] for error in self._error_list
+        ])
+        for handle in self.handle_list:
+            if handle in finished:
+                continue
+            try:
+                handle.perform()
+                self._ok_list.append(handle)
+            except pycurl.error as e:
+                self._error_list.append((handle, e.args[0], e.args[1]))
+        return 0, len(self.handle_list)
+
+    def info_read(self):
+        result = (0, self._ok_list, self._error_list)
+        self._ok_list = []
+        self._error_list = []
+        return result
+
+    def select(self, timeout):
+        pass
+
+    def close(self):
+        self.closed = True
 
@@ -6,11 +6,13 @@ from __future__ import (
 )
 
 from pcs.test.tools.assertions import assert_xml_equal
+from pcs.test.tools.pcs_unittest import mock
 
 class Call(object):
     command_completions = {
         "crm_resource": "/usr/sbin/crm_resource",
         "cibadmin": "/usr/sbin/cibadmin",
+        "crm_diff": "/usr/sbin/crm_diff",
         "crm_mon": "/usr/sbin/crm_mon",
     }
 
@@ -120,3 +122,47 @@ class Runner(object):
     def set_runs(self, run_list):
         self.run_list = run_list
         self.already_launched_list = []
+
+
+class TmpFiles(object):
+    """
+    Replacement of pcs.lib.tools.write_tmpfile keeping the data in memory
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.data_list = []
+
+    def write(self, data):
+        self.data_list.append(data)
+        tmpfile = mock.Mock()
+        tmpfile.name = self.get_name(len(self.data_list))
+        return tmpfile
+
+    @staticmethod
+    def get_name(order_num):
+        return "/fake/tmp/file.{0}".format(order_num)
+
+    def create_check_xml(self, order_num, expected_xml):
+        """
+        Create a Call check_stdin callable checking xml of a temporary file
+
+        int order_num -- which of the written files to check, starting with 1
+        bytes expected_xml -- expected content of the file
+        """
+        def tmpfile_xml_check(stdin, command, command_order_num):
+            if stdin:
+                raise AssertionError(
+                    "With command\n\n    '{0}'\n\nno stdin expected"
+                    .format(command)
+                )
+            assert_xml_equal(
+                expected_xml.decode(),
+                self.data_list[order_num - 1],
+                (
+                    "Trying to run command no. {0}"
+                    "\n\n    '{1}'\n\nwith expected xml in '{2}'.\n"
+                ).format(command_order_num, command, self.get_name(order_num))
+            )
+        return tmpfile_xml_check
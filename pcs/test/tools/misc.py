@@ -8,8 +8,10 @@ from __future__ import (
 import difflib
 import os.path
 import re
+import shutil
+import tempfile
 
-from pcs import utils
+from pcs import settings, utils
 from pcs.test.tools.pcs_unittest import (
     mock,
     skipUnless,
@@ -85,6 +87,29 @@ def create_patcher(target_prefix):
         )
     return patch
 
+class TemporaryAgentMetadataCache(object):
+    """
+    Point the agent metadata cache to a temporary directory, so tests neither
+    read nor fill the cache of the system. Meant to be used in setUpModule and
+    tearDownModule of modules loading agents' metadata.
+    """
+    def __init__(self):
+        self.__tmp_dir = None
+        self.__patcher = None
+
+    def start(self):
+        self.__tmp_dir = tempfile.mkdtemp()
+        self.__patcher = mock.patch.object(
+            settings,
+            "agent_metadata_cache_dir",
+            os.path.join(self.__tmp_dir, "agent_metadata_cache/")
+        )
+        self.__patcher.start()
+
+    def stop(self):
+        self.__patcher.stop()
+        shutil.rmtree(self.__tmp_dir)
+
 def outdent(text):
     line_list = text.splitlines()
     smallest_indentation = min([
@@ -161,6 +161,8 @@ Options:
     --version          Print pcs version information.
     --request-timeout  Timeout for each outgoing request to another node in
                        seconds. Default is 60s.
+    --max-parallel     Maximal number of nodes to communicate with at the
+                       same time. Default is 32.
 
 Commands:
     cluster     Configure cluster options and nodes.
@@ -192,12 +194,12 @@ Usage: pcs resource [commands]...
 Manage pacemaker resources
 
 Commands:
-    [show [<resource id>] | --full | --groups | --hide-inactive]
-        Show all currently configured resources or if a resource is specified
-        show the options for the configured resource.  If --full is specified,
-        all configured resource options will be displayed.  If --groups is
-        specified, only show groups (and their resources).  If --hide-inactive
-        is specified, only show active resources.
+    [show [<resource id>]... | --full | --groups | --hide-inactive]
+        Show all currently configured resources or if resources are specified
+        show the options for the configured resources.  If --full is
+        specified, all configured resource options will be displayed.  If
+        --groups is specified, only show groups (and their resources).  If
+        --hide-inactive is specified, only show active resources.
 
     list [filter] [--nodesc]
         Show list of all available resource agents (if filter is provided then
@@ -231,9 +233,33 @@ Commands:
                 ip=192.168.0.99 cidr_netmask=32 nic=eth2 \\
                 op monitor interval=30s
 
-    delete <resource id|group id|master id|clone id>
-        Deletes the resource, group, master or clone (and all resources within
-        the group/master/clone).
+    bulk-create <file> [--disabled] [--no-default-ops] [--force] [--wait[=n]]
+        Create resources, groups and clones described in the specified JSON or
+        YAML file (YAML requires the python yaml module) in one CIB update.
+        The file contains a list of resources, each of them is one of:
+            {"id": <resource id>, "agent": <standard>:<provider>:<type>,
+             "instance_attributes": {...}, "meta_attributes": {...},
+             "operations": [{"name": <operation action>, ...}, ...]}
+            {"type": "group", "id": <group id>, "resources": [<resource>...],
+             "meta_attributes": {...}}
+            {"type": "clone" | "master", "resource": <resource> | <group>,
+             "meta_attributes": {...}}
+        No resource is created if any of them cannot be created.  If
+        --disabled is specified the resources are not started automatically.
+        If --no-default-ops is specified, only operations required by pacemaker
+        are added to the resources, not all the operations their agents
+        define.  If --force is specified, agents which are not installed,
+        operations and instance attributes not defined by the agents and
+        missing required instance attributes are allowed.
+        If --wait is specified, pcs will wait up to 'n' seconds for the
+        resources to start and then return 0 if the resources are started, or
+        1 if they have not yet started.  If 'n' is not specified it defaults
+        to 60 minutes.
+
+    delete <resource id|group id|master id|clone id>...
+        Deletes the resources, groups, masters or clones (and all resources
+        within the groups/masters/clones).  Running resources are stopped and
+        all the specified resources are deleted at once.
 
     enable <resource id> [--wait[=n]]
         Allow the cluster to start the resource. Depending on the rest of the
@@ -760,9 +786,9 @@ Usage: pcs stonith [commands]...
 Configure fence devices for use with pacemaker
 
 Commands:
-    [show [stonith id]] [--full]
-        Show all currently configured stonith devices or if a stonith id is
-        specified show the options for the configured stonith device.  If
+    [show [<stonith id>]...] [--full]
+        Show all currently configured stonith devices or if stonith ids are
+        specified show the options for the configured stonith devices.  If
         --full is specified all configured stonith options will be displayed.
 
     list [filter] [--nodesc]
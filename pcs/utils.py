@@ -22,16 +22,21 @@ import getpass
 import base64
 import threading
 import logging
+from copy import deepcopy
+from lxml import etree
 
-from pcs import settings, usage
+from pcs import settings
 
 from pcs.common import (
     pcs_pycurl as pycurl,
     report_codes,
 )
+from pcs.common.curl_pool import get_curl_handle_pool
 from pcs.common.tools import (
     join_multilines,
+    run_parallel as tools_run_parallel,
     simple_cache,
+    xml_fromstring,
 )
 
 from pcs.cli.common import (
@@ -39,7 +44,6 @@ from pcs.cli.common import (
     middleware,
 )
 from pcs.cli.common.env import Env
-from pcs.cli.common.lib_wrapper import Library
 from pcs.cli.common.reports import (
     build_report_message,
     process_library_reports,
@@ -48,7 +52,7 @@ from pcs.cli.common.reports import (
 from pcs.cli.booth.command import DEFAULT_BOOTH_NAME
 import pcs.cli.booth.env
 
-from pcs.lib import reports, sbd
+from pcs.lib import pcsd_tokens, reports, sbd
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import (
@@ -57,9 +61,9 @@ from pcs.lib.external import (
     DisableServiceError,
     enable_service,
     EnableServiceError,
+    get_services_state,
     is_cman_cluster as lib_is_cman_cluster,
     is_proxy_set,
-    is_service_enabled,
     is_service_running,
     is_systemctl,
     _service,
@@ -95,14 +99,11 @@ pcs_options = {}
 class UnknownPropertyException(Exception):
     pass
 
-def getValidateWithVersion(dom):
-    cib = dom.getElementsByTagName("cib")
-    if len(cib) != 1:
+def getValidateWithVersion(cib):
+    if cib.tag != "cib":
         err("Bad cib")
 
-    cib = cib[0]
-
-    version = cib.getAttribute("validate-with")
+    version = cib.get("validate-with", "")
     r = re.compile(r"pacemaker-(\d+)\.(\d+)\.?(\d+)?")
     m = r.match(version)
     major = int(m.group(1))
@@ -113,7 +114,7 @@ def getValidateWithVersion(dom):
 # Check the current pacemaker version in cib and upgrade it if necessary
 # Returns False if not upgraded and True if upgraded
 def checkAndUpgradeCIB(major,minor,rev):
-    cmajor, cminor, crev = getValidateWithVersion(get_cib_dom())
+    cmajor, cminor, crev = getValidateWithVersion(get_cib_snapshot_readonly())
     if cmajor > major or (cmajor == major and cminor > minor) or (cmajor == major and cminor == minor and crev >= rev):
         return False
     else:
@@ -128,7 +129,7 @@ def cluster_upgrade():
 
 def cluster_upgrade_to_version(required_version):
     checkAndUpgradeCIB(*required_version)
-    dom = get_cib_dom()
+    dom = get_cib_snapshot()
     current_version = getValidateWithVersion(dom)
     if current_version < required_version:
         err(
@@ -229,11 +230,8 @@ def remove_uid_gid_file(uid,gid):
     return file_removed
 # Returns a dictionary {'nodeA':'tokenA'}
 def readTokens():
-    tokens = {}
-    output, retval = run_pcsdcli("read_tokens")
-    if retval == 0 and output['status'] == 'ok' and output['data']:
-        tokens = output['data']
-    return tokens
+    # read the tokens file directly, running pcsd-cli takes about a second
+    return pcsd_tokens.read_tokens()
 
 def repeat_if_timeout(send_http_request_function, repeat_count=15):
     def repeater(node, *args, **kwargs):
@@ -306,18 +304,32 @@ def stopCluster(node, quiet=False, pacemaker=True, corosync=True, force=True):
         timeout=timeout
     )
 
-def enableCluster(node):
-    return sendHTTPRequest(node, 'remote/cluster_enable', None, False, True)
+def enableCluster(node, quiet=False):
+    return sendHTTPRequest(
+        node, 'remote/cluster_enable', None, False, not quiet
+    )
 
-def disableCluster(node):
-    return sendHTTPRequest(node, 'remote/cluster_disable', None, False, True)
+def disableCluster(node, quiet=False):
+    return sendHTTPRequest(
+        node, 'remote/cluster_disable', None, False, not quiet
+    )
 
 def destroyCluster(node, quiet=False):
     return sendHTTPRequest(node, 'remote/cluster_destroy', None, not quiet, not quiet)
 
-def restoreConfig(node, tarball_data):
-    data = urllib_urlencode({"tarball": tarball_data})
-    return sendHTTPRequest(node, "remote/config_restore", data, False, True)
+def format_restore_config_data(tarball_data):
+    """
+    Return data for restoreConfig, encode them once when restoring many nodes
+    """
+    return urllib_urlencode({"tarball": tarball_data})
+
+def restoreConfig(node, restore_data):
+    """
+    restore_data -- tarball encoded by format_restore_config_data
+    """
+    return sendHTTPRequest(
+        node, "remote/config_restore", restore_data, False, False
+    )
 
 def pauseConfigSyncing(node, delay_seconds=300):
     data = urllib_urlencode({"sync_thread_pause": delay_seconds})
@@ -415,7 +427,8 @@ def sendHTTPRequest(
     if "--request-timeout" in pcs_options:
         timeout = pcs_options["--request-timeout"]
 
-    handler = pycurl.Curl()
+    curl_handle_pool = get_curl_handle_pool()
+    handler = curl_handle_pool.get_handle(host)
     handler.setopt(pycurl.PROTOCOLS, pycurl.PROTO_HTTPS)
     handler.setopt(pycurl.URL, url.encode("utf-8"))
     handler.setopt(pycurl.WRITEFUNCTION, output.write)
@@ -433,6 +446,7 @@ def sendHTTPRequest(
         handler.perform()
         response_data = output.getvalue().decode("utf-8")
         response_code = handler.getinfo(pycurl.RESPONSE_CODE)
+        curl_handle_pool.put_handle(host, handler)
         if printResult or printSuccess:
             print(host + ": " + response_data.strip())
         if "--debug" in pcs_options:
@@ -475,6 +489,7 @@ def sendHTTPRequest(
 
         return output
     except pycurl.error as e:
+        curl_handle_pool.put_handle(host, handler, reusable=False)
         if is_proxy_set(os.environ):
             print(
                 "Warning: Proxy is set in environment variables, try "
@@ -987,6 +1002,9 @@ def run(
         print(e.strerror)
         err("unable to locate command: " + args[0])
 
+    if _may_change_cib(command, args):
+        cib_session.invalidate()
+
     return output, returnVal
 
 @simple_cache
@@ -1160,27 +1178,25 @@ def call_local_pcsd(argv, interactive_auth=False, std_in=None):
     except KeyError:
         return [['Unable to communicate with pcsd'], 1, '', '']
 
-def map_for_error_list(callab, iterab):
-    error_list = []
-    for item in iterab:
-        (retval, err) = callab(item)
-        if retval != 0:
-            error_list.append(err)
-    return error_list
-
-def run_parallel(worker_list, wait_seconds=1):
-    thread_list = []
-    for worker in worker_list:
-        thread = threading.Thread(target=worker)
-        thread.daemon = True
-        thread.start()
-        thread_list.append(thread)
-
-    while thread_list:
-        for thread in thread_list:
-            thread.join(wait_seconds)
-            if not thread.is_alive():
-                thread_list.remove(thread)
+def map_parallel(callab, iterab, *args, **kwargs):
+    """
+    Call callab for all items at the same time, return results in items order
+
+    callable callab -- called with an item and args and kwargs
+    iterable iterab -- items, e.g. nodes
+    """
+    return tools_run_parallel(
+        callab, [([item] + list(args), kwargs) for item in iterab]
+    )
+
+def run_parallel(worker_list):
+    def run_worker(worker):
+        try:
+            worker()
+        except SystemExit:
+            # err has already printed the error, other nodes are processed
+            pass
+    tools_run_parallel(run_worker, [([worker], {}) for worker in worker_list])
 
 def create_task(report, action, node, *args, **kwargs):
     def worker():
@@ -1226,11 +1242,7 @@ def prepare_node_name(node, pm_nodes, cs_nodes):
 # Check is something exists in the CIB, if it does return it, if not, return
 #  an empty string
 def does_exist(xpath_query):
-    args = ["cibadmin", "-Q", "--xpath", xpath_query]
-    dummy_output,retval = run(args)
-    if (retval != 0):
-        return False
-    return True
+    return len(cib_session.xpath(xpath_query)) > 0
 
 def get_group_children(group_id):
     child_resources = []
@@ -1245,17 +1257,28 @@ def get_group_children(group_id):
                     child_resources.append(child.getAttribute("id"))
     return child_resources
 
+def _dom_get_first_found(dom, element_id, getter_list):
+    # lxml elements without children evaluate to False, so we cannot simply
+    # chain the getters with "or"
+    for getter in getter_list:
+        element = getter(dom, element_id)
+        if element is not None:
+            return element
+    return None
+
 def dom_get_clone_ms_resource(dom, clone_ms_id):
-    clone_ms = (
-        dom_get_clone(dom, clone_ms_id)
-        or
-        dom_get_master(dom, clone_ms_id)
+    clone_ms = _dom_get_first_found(
+        dom, clone_ms_id, [dom_get_clone, dom_get_master]
     )
-    if clone_ms:
+    if clone_ms is not None:
         return dom_elem_get_clone_ms_resource(clone_ms)
     return None
 
 def dom_elem_get_clone_ms_resource(clone_ms):
+    if is_lxml(clone_ms):
+        for child in clone_ms.iterchildren("group", "primitive"):
+            return child
+        return None
     for child in clone_ms.childNodes:
         if (
             child.nodeType == xml.dom.minidom.Node.ELEMENT_NODE
@@ -1266,14 +1289,18 @@ def dom_elem_get_clone_ms_resource(clone_ms):
     return None
 
 def dom_get_resource_clone_ms_parent(dom, resource_id):
-    resource = (
-        dom_get_resource(dom, resource_id)
-        or
-        dom_get_group(dom, resource_id)
+    resource = _dom_get_first_found(
+        dom, resource_id, [dom_get_resource, dom_get_group]
     )
+    if resource is None:
+        return None
     return dom_elem_get_resource_clone_ms_parent(resource)
 
 def dom_elem_get_resource_clone_ms_parent(resource):
+    if is_lxml(resource):
+        for clone in resource.iterancestors("clone", "master"):
+            return clone
+        return None
     clone = resource
     while True:
         if not isinstance(clone, xml.dom.minidom.Element):
@@ -1282,138 +1309,155 @@ def dom_elem_get_resource_clone_ms_parent(resource):
             return clone
         clone = clone.parentNode
 
-def dom_get_master(dom, master_id):
-    for master in dom.getElementsByTagName("master"):
-        if master.getAttribute("id") == master_id:
-            return master
+def is_lxml(element):
+    return isinstance(element, etree._Element)
+
+def _dom_get_element_by_tag_and_id(
+    dom, tag_name, element_id, ancestor_tag=None
+):
+    """
+    Return the first descendant of dom with the tag and id or None
+
+    dom -- minidom node or lxml element to search in
+    string tag_name -- tag of the wanted element
+    string element_id -- id of the wanted element
+    string ancestor_tag -- if set, the element has to be inside this tag
+    """
+    if is_lxml(dom):
+        found = dom.xpath(
+            "./descendant::{ancestor}{tag}[@id=$id]".format(
+                ancestor=(
+                    "{0}/descendant::".format(ancestor_tag) if ancestor_tag
+                    else ""
+                ),
+                tag=tag_name
+            ),
+            id=element_id
+        )
+        return found[0] if found else None
+    for element in dom.getElementsByTagName(tag_name):
+        if (
+            element.getAttribute("id") == element_id
+            and
+            (
+                not ancestor_tag
+                or
+                dom_get_parent_by_tag_name(element, ancestor_tag)
+            )
+        ):
+            return element
     return None
 
+def dom_get_master(dom, master_id):
+    return _dom_get_element_by_tag_and_id(dom, "master", master_id)
+
 def dom_get_clone(dom, clone_id):
-    for clone in dom.getElementsByTagName("clone"):
-        if clone.getAttribute("id") == clone_id:
-            return clone
-    return None
+    return _dom_get_element_by_tag_and_id(dom, "clone", clone_id)
 
 def dom_get_group(dom, group_id):
-    for group in dom.getElementsByTagName("group"):
-        if group.getAttribute("id") == group_id:
-            return group
-    return None
+    return _dom_get_element_by_tag_and_id(dom, "group", group_id)
 
 def dom_get_group_clone(dom, group_id):
-    for clone in dom.getElementsByTagName("clone"):
-        group = dom_get_group(clone, group_id)
-        if group:
-            return group
-    return None
+    return _dom_get_element_by_tag_and_id(dom, "group", group_id, "clone")
 
 def dom_get_group_masterslave(dom, group_id):
-    for master in dom.getElementsByTagName("master"):
-        group = dom_get_group(master, group_id)
-        if group:
-            return group
-    return None
+    return _dom_get_element_by_tag_and_id(dom, "group", group_id, "master")
 
 def dom_get_resource(dom, resource_id):
-    for primitive in dom.getElementsByTagName("primitive"):
-        if primitive.getAttribute("id") == resource_id:
-            return primitive
-    return None
+    return _dom_get_element_by_tag_and_id(dom, "primitive", resource_id)
 
 def dom_get_any_resource(dom, resource_id):
-    return (
-        dom_get_resource(dom, resource_id)
-        or
-        dom_get_group(dom, resource_id)
-        or
-        dom_get_clone(dom, resource_id)
-        or
-        dom_get_master(dom, resource_id)
+    return _dom_get_first_found(
+        dom,
+        resource_id,
+        [dom_get_resource, dom_get_group, dom_get_clone, dom_get_master]
     )
 
 def is_stonith_resource(resource_id):
     return does_exist("//primitive[@id='"+resource_id+"' and @class='stonith']")
 
 def dom_get_resource_clone(dom, resource_id):
-    for clone in dom.getElementsByTagName("clone"):
-        resource = dom_get_resource(clone, resource_id)
-        if resource:
-            return resource
-    return None
+    return _dom_get_element_by_tag_and_id(dom, "primitive", resource_id, "clone")
 
 def dom_get_resource_masterslave(dom, resource_id):
-    for master in dom.getElementsByTagName("master"):
-        resource = dom_get_resource(master, resource_id)
-        if resource:
-            return resource
-    return None
+    return _dom_get_element_by_tag_and_id(
+        dom, "primitive", resource_id, "master"
+    )
 
 # returns tuple (is_valid, error_message, correct_resource_id_if_exists)
 # there is a duplicate code in pcs/lib/cib/constraint/constraint.py
 # please use function in pcs/lib/cib/constraint/constraint.py
 def validate_constraint_resource(dom, resource_id):
-    resource_el = (
-        dom_get_clone(dom, resource_id)
-        or
-        dom_get_master(dom, resource_id)
+    resource_el = _dom_get_first_found(
+        dom, resource_id, [dom_get_clone, dom_get_master]
     )
-    if resource_el:
+    if resource_el is not None:
         # clone and master is always valid
         return True, "", resource_id
 
-    resource_el = (
-        dom_get_resource(dom, resource_id)
-        or
-        dom_get_group(dom, resource_id)
+    resource_el = _dom_get_first_found(
+        dom, resource_id, [dom_get_resource, dom_get_group]
     )
-    if not resource_el:
+    if resource_el is None:
         return False, "Resource '%s' does not exist" % resource_id, None
 
     clone_el = dom_get_resource_clone_ms_parent(dom, resource_id)
-    if not clone_el:
+    if clone_el is None:
         # primitive and group is valid if not in clone nor master
         return True, "", resource_id
+    if is_lxml(clone_el):
+        clone_tag, clone_id = clone_el.tag, clone_el.get("id")
+    else:
+        clone_tag, clone_id = clone_el.tagName, clone_el.getAttribute("id")
 
     if "--force" in pcs_options:
-        return (
-            True,
-            "",
-            clone_el.getAttribute("id") if clone_el else resource_id
-        )
+        return True, "", clone_id
 
-    if clone_el.tagName == "clone":
+    if clone_tag == "clone":
         return (
             False,
             "%s is a clone resource, you should use the clone id: %s "
                 "when adding constraints. Use --force to override."
-                % (resource_id, clone_el.getAttribute("id")),
-            clone_el.getAttribute("id")
+                % (resource_id, clone_id),
+            clone_id
         )
-    if clone_el.tagName == "master":
+    if clone_tag == "master":
         return (
             False,
             "%s is a master/slave resource, you should use the master id: %s "
                 "when adding constraints. Use --force to override."
-                % (resource_id, clone_el.getAttribute("id")),
-            clone_el.getAttribute("id")
+                % (resource_id, clone_id),
+            clone_id
         )
     return True, "", resource_id
 
 
 def dom_get_resource_remote_node_name(dom_resource):
-    if dom_resource.tagName != "primitive":
+    if is_lxml(dom_resource):
+        tag_name = dom_resource.tag
+        get_attr = lambda name: dom_resource.get(name, "")
+    else:
+        tag_name = dom_resource.tagName
+        get_attr = dom_resource.getAttribute
+    if tag_name != "primitive":
         return None
     if (
-        dom_resource.getAttribute("class").lower() == "ocf"
+        get_attr("class").lower() == "ocf"
         and
-        dom_resource.getAttribute("provider").lower() == "pacemaker"
+        get_attr("provider").lower() == "pacemaker"
         and
-        dom_resource.getAttribute("type").lower() == "remote"
+        get_attr("type").lower() == "remote"
     ):
-        return dom_resource.getAttribute("id")
+        return get_attr("id")
     return dom_get_meta_attr_value(dom_resource, "remote-node")
 
 def dom_get_meta_attr_value(dom_resource, meta_name):
+    if is_lxml(dom_resource):
+        found = dom_resource.xpath(
+            "./descendant::meta_attributes/descendant::nvpair[@name=$name]",
+            name=meta_name
+        )
+        return found[0].get("value", "") if found else None
     for meta in dom_resource.getElementsByTagName("meta_attributes"):
         for nvpair in meta.getElementsByTagName("nvpair"):
             if nvpair.getAttribute("name") == meta_name:
@@ -1421,18 +1465,20 @@ def dom_get_meta_attr_value(dom_resource, meta_name):
     return None
 
 def dom_get_element_with_id(dom, tag_name, element_id):
-    for elem in dom.getElementsByTagName(tag_name):
-        if elem.hasAttribute("id") and elem.getAttribute("id") == element_id:
-            return elem
-    return None
+    return _dom_get_element_by_tag_and_id(dom, tag_name, element_id)
 
 def dom_get_node(dom, node_name):
+    if is_lxml(dom):
+        found = dom.xpath("./descendant::node[@uname=$name]", name=node_name)
+        return found[0] if found else None
     for e in dom.getElementsByTagName("node"):
         if e.hasAttribute("uname") and e.getAttribute("uname") == node_name:
             return e
     return None
 
 def dom_get_children_by_tag_name(dom_el, tag_name):
+    if is_lxml(dom_el):
+        return list(dom_el.iterchildren(tag_name))
     return [
         node
         for node in dom_el.childNodes
@@ -1447,6 +1493,10 @@ def dom_get_child_by_tag_name(dom_el, tag_name):
     return None
 
 def dom_get_parent_by_tag_name(dom_el, tag_name):
+    if is_lxml(dom_el):
+        for parent in dom_el.iterancestors(tag_name):
+            return parent
+        return None
     parent = dom_el.parentNode
     while parent:
         if not isinstance(parent, xml.dom.minidom.Element):
@@ -1459,70 +1509,71 @@ def dom_get_parent_by_tag_name(dom_el, tag_name):
 def dom_attrs_to_list(dom_el, with_id=False):
     attributes = [
         "%s=%s" % (name, value)
-        for name, value in sorted(dom_el.attributes.items()) if name != "id"
+        for name, value in sorted(dom_el.attrib.items()) if name != "id"
     ]
     if with_id:
-        attributes.append("(id:%s)" % (dom_el.getAttribute("id")))
+        attributes.append("(id:%s)" % (dom_el.get("id", "")))
     return attributes
 
 def get_resource_for_running_check(cluster_state, resource_id, stopped=False):
-    for clone in cluster_state.getElementsByTagName("clone"):
-        if clone.getAttribute("id") == resource_id:
-            for child in clone.childNodes:
-                if (
-                    child.nodeType == child.ELEMENT_NODE
-                    and
-                    child.tagName in ["resource", "group"]
-                ):
-                    resource_id = child.getAttribute("id")
-                    # in a clone a resource can have an id of '<name>:N'
-                    if ":" in resource_id:
-                        parts = resource_id.rsplit(":", 1)
-                        if parts[1].isdigit():
-                            resource_id = parts[0]
-                    break
-    for group in cluster_state.getElementsByTagName("group"):
-        # If resource is a clone it can have an id of '<resource name>:N'
-        if (
-            group.getAttribute("id") == resource_id
-            or
-            group.getAttribute("id").startswith(resource_id + ":")
-        ):
-            if stopped:
-                elem = group.getElementsByTagName("resource")[0]
-            else:
-                elem = group.getElementsByTagName("resource")[-1]
-            resource_id = elem.getAttribute("id")
+    """
+    Return id of a resource which tells if the specified resource is running
+
+    etree cluster_state -- crm_mon xml output
+    string resource_id -- id of a resource, group, clone or master
+    bool stopped -- check for a stopped resource rather than a running one
+    """
+    for child in cluster_state.xpath(
+        "./descendant::clone[@id=$id]/*[self::resource or self::group][1]",
+        id=resource_id
+    ):
+        resource_id = child.get("id", "")
+        # in a clone a resource can have an id of '<name>:N'
+        if ":" in resource_id:
+            parts = resource_id.rsplit(":", 1)
+            if parts[1].isdigit():
+                resource_id = parts[0]
+    # If resource is a clone it can have an id of '<resource name>:N'
+    for group in cluster_state.xpath(
+        "(./descendant::group[@id=$id or starts-with(@id, $prefix)])[1]",
+        id=resource_id,
+        prefix=(resource_id + ":")
+    ):
+        group_resources = group.xpath("./descendant::resource")
+        elem = group_resources[0] if stopped else group_resources[-1]
+        resource_id = elem.get("id", "")
     return resource_id
 
 def resource_running_on(resource, passed_state=None, stopped=False):
     nodes_started = []
     nodes_master = []
     nodes_slave = []
-    state = passed_state if passed_state else getClusterState()
+    state = passed_state if passed_state is not None else getClusterState()
     resource_original = resource
     resource = get_resource_for_running_check(state, resource, stopped)
-    resources = state.getElementsByTagName("resource")
-    for res in resources:
-        # If resource is a clone it can have an id of '<resource name>:N'
-        # If resource is a clone it will be found more than once - cannot break
-        if (
-            (
-                res.getAttribute("id") == resource
-                or
-                res.getAttribute("id").startswith(resource+":")
-            )
+    role_to_nodes = {
+        "Started": nodes_started,
+        "Master": nodes_master,
+        "Slave": nodes_slave,
+    }
+    # If resource is a clone it can have an id of '<resource name>:N'
+    # If resource is a clone it will be found more than once - cannot break
+    for res in state.xpath(
+        """
+        ./descendant::resource[
+            (@id=$id or starts-with(@id, $prefix))
             and
-            res.getAttribute("failed") != "true"
-        ):
-            for node in res.getElementsByTagName("node"):
-                node_name = node.getAttribute("name")
-                if res.getAttribute("role") == "Started":
-                    nodes_started.append(node_name)
-                elif res.getAttribute("role") == "Master":
-                    nodes_master.append(node_name)
-                elif res.getAttribute("role") == "Slave":
-                    nodes_slave.append(node_name)
+            not(@failed="true")
+        ]
+        """,
+        id=resource,
+        prefix=(resource + ":")
+    ):
+        role = res.get("role")
+        if role in role_to_nodes:
+            role_to_nodes[role].extend([
+                node.get("name", "") for node in res.iterdescendants("node")
+            ])
     if not nodes_started and not nodes_master and not nodes_slave:
         message = "Resource '%s' is not running on any node" % resource_original
     else:
@@ -1580,26 +1631,184 @@ def validate_wait_get_timeout(need_cib_support=True):
     return wait_timeout
 
 
+class CibSession(object):
+    """
+    Snapshot of the CIB shared by all lookups done in one pcs process
+
+    The CIB is loaded by cibadmin only once and xpath / existence / dom lookups
+    are answered from memory. The snapshot is dropped when the CIB is pushed or
+    when a command which may change the CIB is run, so the next lookup loads
+    the CIB again.
+
+    Changes are built in a working copy of the snapshot shared by all writers
+    in the process and written back by push. Lookups keep answering from the
+    snapshot, so they see the CIB as it is in the cluster, not changes which
+    have not been pushed yet.
+    """
+    def __init__(self):
+        self.__source = None
+        self.__cib_xml = None
+        self.__cib_tree = None
+        self.__working_tree = None
+        # the snapshot may be used from several threads, e.g. by pcs status
+        self.__lock = threading.RLock()
+
+    def invalidate(self):
+        with self.__lock:
+            self.__source = None
+            self.__cib_xml = None
+            self.__cib_tree = None
+            self.__working_tree = None
+
+    def get_cib_xml(self):
+        # -f may be switched on and off in tests, so the snapshot is bound to
+        # the source it has been loaded from
+        source = (usefile, filename)
+        with self.__lock:
+            if self.__cib_xml is None or self.__source != source:
+                output, retval = run(["cibadmin", "-l", "-Q"])
+                if retval != 0:
+                    err("unable to get cib")
+                self.invalidate()
+                self.__source = source
+                self.__cib_xml = output
+            return self.__cib_xml
+
+    def get_cib_tree(self):
+        with self.__lock:
+            cib_xml = self.get_cib_xml()
+            if self.__cib_tree is None:
+                try:
+                    self.__cib_tree = xml_fromstring(cib_xml)
+                except etree.XMLSyntaxError:
+                    err("unable to get cib")
+            return self.__cib_tree
+
+    def get_working_tree(self):
+        """
+        Return a copy of the snapshot to build changes in
+        """
+        with self.__lock:
+            cib_tree = self.get_cib_tree()
+            if self.__working_tree is None:
+                self.__working_tree = deepcopy(cib_tree)
+            return self.__working_tree
+
+    def push(self, cib_upgraded=False):
+        """
+        Write the working copy back to the CIB, drop the snapshot
+
+        bool cib_upgraded -- replace the whole CIB not only its configuration
+        """
+        with self.__lock:
+            if self.__working_tree is None:
+                return
+            replace_cib_configuration(self.__working_tree, cib_upgraded)
+            # running cibadmin drops the snapshot, do not rely on it here
+            self.invalidate()
+
+    def get_scope_xml(self, scope):
+        element_list = self.get_cib_tree().xpath(
+            "/cib/{0} | /cib/configuration/{0}".format(scope)
+        )
+        if not element_list:
+            return None
+        return _cib_element_to_str(element_list[0])
+
+    def xpath(self, xpath_query):
+        """
+        Return a list of CIB elements matching xpath_query
+
+        string xpath_query -- xpath to evaluate, an invalid one matches nothing
+            the same way cibadmin fails on it
+        """
+        try:
+            found = self.get_cib_tree().xpath(xpath_query)
+        except etree.XPathError:
+            return []
+        if not isinstance(found, list):
+            return []
+        return [el for el in found if isinstance(el, etree._Element)]
+
+cib_session = CibSession()
+
+def _cib_element_to_str(element):
+    return etree.tostring(element, with_tail=False).decode()
+
+# pacemaker tools which only write the CIB when run with one of these options
+_CIB_WRITING_OPTIONS = {
+    "crm_attribute": (
+        "-v", "--update", "--attr-value", "-D", "--delete", "--delete-attr",
+    ),
+    "crm_node": ("-R", "--remove"),
+    "crm_resource": (
+        "-C", "--cleanup", "-R", "--refresh", "-P", "--reprobe",
+        "-U", "--clear", "--un-move", "-B", "--ban", "-M", "--move",
+        "-p", "--set-parameter", "-d", "--delete-parameter",
+        "-D", "--delete", "--restart",
+    ),
+}
+
+# pacemaker tools which never write the CIB
+_CIB_READING_COMMANDS = (
+    "crm_diff", "crm_mon", "crm_report", "crm_simulate", "crm_verify",
+)
+
+def _may_change_cib(command, args):
+    if command == "cibadmin":
+        return "-Q" not in args and "--query" not in args
+    if command in _CIB_WRITING_OPTIONS:
+        options = set([arg.split("=", 1)[0] for arg in args[1:]])
+        return bool(options.intersection(_CIB_WRITING_OPTIONS[command]))
+    return (
+        command[0:3] == "crm"
+        and
+        command not in _CIB_READING_COMMANDS
+    )
+
 # Return matches from the CIB with the xpath_query
 def get_cib_xpath(xpath_query):
-    args = ["cibadmin", "-Q", "--xpath", xpath_query]
-    output,retval = run(args)
-    if (retval != 0):
+    # mimic output of cibadmin --query --xpath
+    element_list = cib_session.xpath(xpath_query)
+    if not element_list:
         return ""
-    return output
+    if len(element_list) == 1:
+        return _cib_element_to_str(element_list[0])
+    return "<xpath-query>\n{0}\n</xpath-query>".format(
+        "\n".join([_cib_element_to_str(el) for el in element_list])
+    )
 
 def get_cib(scope=None):
-    command = ["cibadmin", "-l", "-Q"]
-    if scope:
-        command.append("--scope=%s" % scope)
-    output, retval = run(command)
+    if not scope:
+        return cib_session.get_cib_xml()
+    if is_valid_cib_scope(scope):
+        output = cib_session.get_scope_xml(scope)
+        if output is None:
+            err("unable to get cib, scope '%s' not present in cib" % scope)
+        return output
+    output, retval = run(["cibadmin", "-l", "-Q", "--scope=%s" % scope])
     if retval != 0:
-        if retval == 6 and scope:
+        if retval == 6:
             err("unable to get cib, scope '%s' not present in cib" % scope)
         else:
             err("unable to get cib")
     return output
 
+# Returns the cib as an lxml element to build changes in
+# The element is shared by all callers in this process until it is pushed by
+# push_cib_snapshot. Other lookups do not see changes which have not been
+# pushed.
+def get_cib_snapshot():
+    return cib_session.get_working_tree()
+
+def push_cib_snapshot(cib_upgraded=False):
+    cib_session.push(cib_upgraded)
+
+# Returns the cib as an lxml element for lookups, it must not be modified
+# The element is not copied, use get_cib_snapshot to build changes.
+def get_cib_snapshot_readonly():
+    return cib_session.get_cib_tree()
+
 def get_cib_dom():
     try:
         dom = parseString(get_cib())
@@ -1628,7 +1837,9 @@ def is_etree(var):
 
 # Replace only configuration section of cib with dom passed
 def replace_cib_configuration(dom, cib_upgraded=False):
-    if is_etree(dom):
+    if is_lxml(dom):
+        new_dom = etree.tostring(dom).decode()
+    elif is_etree(dom):
         #etree returns string in bytes: b'xml'
         #python 3 removed .encode() from byte strings
         #run(...) calls subprocess.Popen.communicate which calls encode...
@@ -1658,6 +1869,17 @@ def is_valid_cib_scope(scope):
 def does_id_exist(dom, check_id):
     # do not search in /cib/status, it may contain references to previously
     # existing and deleted resources and thus preventing creating them again
+    if is_lxml(dom):
+        return len(dom.xpath(
+            """
+            (
+                /cib/*[name()!="status"]/descendant::*
+                |
+                /*[name()!="cib"]/descendant-or-self::*
+            )[@id=$id]
+            """,
+            id=check_id
+        )) > 0
     if is_etree(dom):
         for elem in dom.findall(str(
             '(/cib/*[name()!="status"]|/*[name()!="cib"])/*'
@@ -1879,10 +2101,10 @@ def get_terminal_password(message="Password: "):
     else:
         return get_terminal_input(message)
 
-# Returns an xml dom containing the current status of the cluster
+# Returns an lxml element containing the current status of the cluster
 # DEPRECATED, please use ClusterState(getClusterStateXml()) instead
 def getClusterState():
-    return parseString(getClusterStateXml())
+    return xml_fromstring(getClusterStateXml())
 
 # DEPRECATED, please use lib.pacemaker.live.get_cluster_status_xml in new code
 def getClusterStateXml():
@@ -2135,14 +2357,39 @@ def is_rhel6():
 def is_cman_cluster():
     return lib_is_cman_cluster(cmd_runner())
 
+# errors of the current thread are collected here instead of being printed
+# while run_collecting_errors is running
+_err_collector = threading.local()
+
 def err(errorText, exit_after_error=True):
-    sys.stderr.write("Error: %s\n" % errorText)
+    error_list = getattr(_err_collector, "error_list", None)
+    if error_list is None:
+        sys.stderr.write("Error: %s\n" % errorText)
+    else:
+        error_list.append(errorText)
     if exit_after_error:
         sys.exit(1)
 
+def run_collecting_errors(action):
+    """
+    Call action, return errors it reported by err instead of printing them,
+        used to print errors of actions run in threads from the main thread
+
+    callable action -- takes no arguments
+    Return a (result, error message list, exception) tuple. Exception is
+    SystemExit raised by err, result is None in that case.
+    """
+    _err_collector.error_list = []
+    try:
+        return action(), _err_collector.error_list, None
+    except SystemExit as e:
+        return None, _err_collector.error_list, e
+    finally:
+        _err_collector.error_list = None
 
-def serviceStatus(prefix):
-    print("Daemon Status:")
+
+def get_service_status_lines(prefix):
+    lines = ["Daemon Status:"]
     service_def = [
         # (
         #     service name,
@@ -2155,19 +2402,23 @@ def serviceStatus(prefix):
         ("pcsd", True),
         (sbd.get_sbd_service_name(), False),
     ]
+    try:
+        state_dict = get_services_state(
+            cmd_runner(), [service for service, dummy in service_def]
+        )
+    except LibraryError:
+        return lines
     for service, display_always in service_def:
-        try:
-            running = is_service_running(cmd_runner(), service)
-            enabled = is_service_enabled(cmd_runner(), service)
-            if display_always or enabled or running:
-                print("{prefix}{service}: {active}/{enabled}".format(
-                    prefix=prefix,
-                    service=service,
-                    active=("active" if running else "inactive"),
-                    enabled=("enabled" if enabled else "disabled")
-                ))
-        except LibraryError:
-            pass
+        running = state_dict[service]["running"]
+        enabled = state_dict[service]["enabled"]
+        if display_always or enabled or running:
+            lines.append("{prefix}{service}: {active}/{enabled}".format(
+                prefix=prefix,
+                service=service,
+                active=("active" if running else "inactive"),
+                enabled=("enabled" if enabled else "disabled")
+            ))
+    return lines
 
 def enableServices():
     # do NOT handle SBD in here, it is started by pacemaker not systemd or init
@@ -2487,6 +2738,13 @@ def is_node_stop_cause_quorum_loss(quorum_info, local=True, node_list=None):
     return votes_after_stop < quorum_info["quorum"]
 
 def dom_prepare_child_element(dom_element, tag_name, id):
+    if is_lxml(dom_element):
+        child_element = dom_element.find("./{0}".format(tag_name))
+        if child_element is None:
+            child_element = etree.SubElement(
+                dom_element, tag_name, id=find_unique_id(dom_element, id)
+            )
+        return child_element
     dom = dom_element.ownerDocument
     child_elements = []
     for child in dom_element.childNodes:
@@ -2502,6 +2760,23 @@ def dom_prepare_child_element(dom_element, tag_name, id):
     return child_element
 
 def dom_update_nv_pair(dom_element, name, value, id_prefix=""):
+    if is_lxml(dom_element):
+        for el in dom_element.iterfind(".//nvpair"):
+            if el.get("name") == name:
+                if value == "":
+                    el.getparent().remove(el)
+                else:
+                    el.set("value", value)
+                return dom_element
+        if value != "":
+            etree.SubElement(
+                dom_element,
+                "nvpair",
+                id=id_prefix + name,
+                name=name,
+                value=value
+            )
+        return dom_element
     dom = dom_element.ownerDocument
     element_found = False
     for el in dom_element.getElementsByTagName("nvpair"):
@@ -2558,10 +2833,14 @@ def dom_update_utilization(dom_element, attributes, id_prefix=""):
         )
 
 def dom_update_meta_attr(dom_element, attributes):
+    get_id = (
+        (lambda element: element.get("id")) if is_lxml(dom_element)
+        else (lambda element: element.getAttribute("id"))
+    )
     meta_attributes = dom_prepare_child_element(
         dom_element,
         "meta_attributes",
-        dom_element.getAttribute("id") + "-meta_attributes"
+        get_id(dom_element) + "-meta_attributes"
     )
 
     for name, value in attributes:
@@ -2569,7 +2848,7 @@ def dom_update_meta_attr(dom_element, attributes):
             meta_attributes,
             name,
             value,
-            meta_attributes.getAttribute("id") + "-"
+            get_id(meta_attributes) + "-"
         )
 
 def get_utilization(element, filter_name=None):
@@ -2781,9 +3060,21 @@ def get_cli_env():
     env.request_timeout = pcs_options.get("--request-timeout")
     return env
 
+def _drop_cib_session(cib_middleware):
+    # library commands load and push the live cib on their own, the cib
+    # snapshot loaded by the legacy code is stale after they finish
+    def apply(next_in_line, env, *args, **kwargs):
+        try:
+            return cib_middleware(next_in_line, env, *args, **kwargs)
+        finally:
+            cib_session.invalidate()
+    return apply
+
 def get_middleware_factory():
     return middleware.create_middleware_factory(
-        cib=middleware.cib(usefile, get_cib, replace_cib_configuration),
+        cib=_drop_cib_session(
+            middleware.cib(usefile, get_cib, replace_cib_configuration)
+        ),
         corosync_conf_existing=middleware.corosync_conf_existing(
             pcs_options.get("--corosync_conf", None)
         ),
@@ -2798,6 +3089,8 @@ def get_middleware_factory():
     )
 
 def get_library_wrapper():
+    # the wrapper imports all library commands, import it only when needed
+    from pcs.cli.common.lib_wrapper import Library
     return Library(get_cli_env(), get_middleware_factory())
 
 
@@ -2833,6 +3126,7 @@ def exit_on_cmdline_input_errror(error, main_name, usage_name):
     if error.message:
         err(error.message)
     else:
+        from pcs import usage
         usage.show(main_name, [usage_name])
     sys.exit(1)
 
@@ -2841,10 +3135,7 @@ def get_report_processor():
 
 def get_set_properties(prop_name=None, defaults=None):
     properties = {} if defaults is None else dict(defaults)
-    (output, retVal) = run(["cibadmin","-Q","--scope", "crm_config"])
-    if retVal != 0:
-        err("unable to get crm_config\n"+output)
-    dom = parseString(output)
+    dom = parseString(get_cib("crm_config"))
     de = dom.documentElement
     crm_config_properties = de.getElementsByTagName("nvpair")
     for prop in crm_config_properties: